@@ -0,0 +1,90 @@
+# arrow_store.py
+import mmap
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# ─────────────────────────────────────────────────────────────
+# Memory-mapped Arrow datasets
+# Parquet has to be decoded into freshly allocated memory by every process
+# that loads it, so each server process (and each analyst it serves) holds
+# a private copy of the full dataset. A dataset stored as an uncompressed
+# Arrow IPC file is instead opened with mmap: the table's buffers are the
+# file's pages, and to_pandas(split_blocks=True) wraps them without copying
+# (numeric and datetime columns as numpy views, text as Arrow-backed str).
+# Pages are read in only for the columns a domain touches, are shared
+# through the OS page cache by every process that maps the file, and can be
+# dropped and re-read under memory pressure instead of being swapped.
+# read_arrow maps the file privately (copy-on-write pages) and views its
+# fixed-width columns as writable numpy arrays, so a frame stays writable
+# however long it outlives the cache entry it came from: pandas copies a
+# column shared with other frames before writing it, and a write to a
+# column no other frame holds dirties only the touched pages of this
+# process's mapping, never the file.
+# ─────────────────────────────────────────────────────────────
+ARROW_SUFFIX = ".arrow"
+
+
+def write_arrow(df: pd.DataFrame, basepath: str) -> str:
+    """Store `df` as an uncompressed Arrow IPC file (compressed buffers could not be mapped) at `basepath`.arrow."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path = basepath + ARROW_SUFFIX
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return path
+
+
+def open_arrow(path: str, columns=None) -> pa.Table:
+    """Memory-mapped table (no data read yet), optionally projected to `columns` (missing names ignored)."""
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table
+
+
+def _fixed_width_dtype(t: pa.DataType):
+    if pa.types.is_integer(t) or pa.types.is_floating(t):
+        return np.dtype(t.to_pandas_dtype())
+    if pa.types.is_timestamp(t) and t.tz is None:
+        return np.dtype(f"datetime64[{t.unit}]")
+    if pa.types.is_duration(t):
+        return np.dtype(f"timedelta64[{t.unit}]")
+    return None
+
+
+def _mapped_view(column: pa.ChunkedArray, mapping: mmap.mmap, origin: int):
+    """Writable numpy view of a null-free fixed-width column inside `mapping`; None for anything else."""
+    dtype = _fixed_width_dtype(column.type)
+    if dtype is None or column.num_chunks != 1 or column.null_count:
+        return None
+    arr = column.chunk(0)
+    offset = arr.buffers()[1].address - origin + arr.offset * dtype.itemsize
+    return np.frombuffer(mapping, dtype=dtype, count=len(arr), offset=offset)
+
+
+def read_arrow(path: str, columns=None) -> pd.DataFrame:
+    """
+    Writable pandas frame over a privately memory-mapped Arrow file; columns other than null-free
+    numbers, timestamps and durations are converted or copied as to_pandas would. Writes never reach
+    the file.
+    """
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    buffer = pa.py_buffer(mapping)
+    table = pa.ipc.open_file(pa.BufferReader(buffer)).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    converted = table.to_pandas(split_blocks=True)
+    data = {}
+    for i in range(table.num_columns):
+        view = _mapped_view(table.column(i), mapping, buffer.address)
+        if view is not None:
+            data[i] = view
+            continue
+        s = converted.iloc[:, i]
+        values = getattr(s.array, "_ndarray", None)     # numpy storage of numpy / datetime / categorical columns
+        data[i] = s.copy() if values is not None and not values.flags.writeable else s
+    out = pd.DataFrame(data, copy=False)
+    out.columns = converted.columns
+    return out
@@ -0,0 +1,136 @@
+"""
+Per-session memory of N concurrent users opening the same stored dataset: each user is a separate process
+(as with several server replicas / workers) that loads the dataset, runs a dashboard-style workload (filter,
+groupby over a dimension, one derived column) and reports its resident memory while all users hold their
+frames. Parquet (decoded into private memory per process) against a memory-mapped Arrow IPC file
+(arrow_store.py; pages shared through the OS). PSS splits shared pages between the processes mapping them.
+Also checks that a session's frame can still be written in place once the app cache has dropped the loaded
+dataset, and that such writes never reach the file.
+
+    python benchmarks/arrow_store.py --rows 2000000 --users 5
+    python benchmarks/arrow_store.py --file tickets_export.csv --users 5
+"""
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from arrow_store import read_arrow, write_arrow  # noqa: E402
+from cache_registry import cached, invalidate  # noqa: E402
+
+
+def _synthetic(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "ticket_id": np.arange(rows),
+        "created_time": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86_400, rows), unit="s"),
+        "technician": rng.choice([f"tech_{i}" for i in range(200)], rows),
+        "category": rng.choice([f"Category {i}" for i in range(40)], rows),
+        "subject": rng.choice([f"Printer {i} not working on floor {i % 9}" for i in range(20_000)], rows),
+        "resolution_hours": rng.gamma(2.0, 6.0, rows),
+        "csat": rng.integers(1, 6, rows).astype("float64"),
+    })
+
+
+def _memory_mb() -> dict:
+    """Resident / proportional / private memory of this process (Linux smaps_rollup)."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f.readlines()[1:]:
+            key, value = line.split(":", 1)
+            fields[key] = int(value.split()[0]) / 1024
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "private": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def _user(path: str, barrier, results) -> None:
+    load = read_arrow if path.endswith(".arrow") else pd.read_parquet
+    base = _memory_mb()
+    t0 = time.perf_counter()
+    df = load(path)
+    seconds = time.perf_counter() - t0
+    recent = df[df["created_time"] >= pd.Timestamp("2025-07-01")]
+    by_tech = recent.groupby("technician", observed=True)["resolution_hours"].mean()
+    df["breached"] = df["resolution_hours"] > 24
+    barrier.wait()                                   # every user holds its frame now
+    used = {k: v - base[k] for k, v in _memory_mb().items()}
+    results.put((used, seconds, len(by_tech)))
+    barrier.wait()
+
+
+def _writes_after_eviction(path: str) -> bool:
+    """Load through the app cache, evict the entry, then write into the frame the session kept."""
+    with open(path, "rb") as f:
+        stored = f.read()
+    df = cached(read_arrow)(path)
+    invalidate()
+    gc.collect()
+    df.loc[0, df.columns[0]] = df.iloc[1, 0]
+    for col in df.columns:
+        if pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].replace(df[col].iloc[0], -1.0)
+            df.loc[df.index[:10], col] = 0.0
+    with open(path, "rb") as f:
+        return f.read() == stored
+
+
+def _run(path: str, users: int) -> tuple:
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(users), ctx.Queue()
+    procs = [ctx.Process(target=_user, args=(path, barrier, results)) for _ in range(users)]
+    for p in procs:
+        p.start()
+    out = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    mem = {k: np.mean([o[0][k] for o in out]) for k in ("rss", "pss", "private")}
+    return mem, max(o[1] for o in out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--users", type=int, default=5)
+    ap.add_argument("--file", help="CSV/parquet to measure instead of synthetic data")
+    args = ap.parse_args()
+
+    if args.file:
+        df = pd.read_parquet(args.file) if args.file.endswith(".parquet") else pd.read_csv(args.file)
+    else:
+        df = _synthetic(args.rows)
+    if not {"created_time", "technician", "resolution_hours"} <= set(df.columns):
+        sys.exit("the workload needs created_time, technician and resolution_hours columns")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parquet = os.path.join(tmp, "ds.parquet")
+        df.to_parquet(parquet, index=False)
+        arrow = write_arrow(df, os.path.join(tmp, "ds"))
+        same = read_arrow(arrow).equals(pd.read_parquet(parquet))
+        print(f"rows={len(df):,}  cols={df.shape[1]}  users={args.users}  "
+              f"parquet={os.path.getsize(parquet) / 2**20:.0f} MB  arrow={os.path.getsize(arrow) / 2**20:.0f} MB")
+        print(f"{'per session (MB)':<30}{'load s':>8}{'RSS':>9}{'PSS':>9}{'private':>9}")
+        rows = {}
+        for label, path in (("parquet (before)", parquet), ("memory-mapped arrow (after)", arrow)):
+            mem, seconds = _run(path, args.users)
+            rows[label] = mem
+            print(f"{label:<30}{seconds:>8.2f}{mem['rss']:>9.0f}{mem['pss']:>9.0f}{mem['private']:>9.0f}")
+        before, after = rows.values()
+        print(f"total PSS of {args.users} users: {before['pss'] * args.users:,.0f} MB -> {after['pss'] * args.users:,.0f} MB")
+        print("stored frames match" if same else "MISMATCH between parquet and arrow frames")
+        print("writes after cache eviction ok, file unchanged" if _writes_after_eviction(arrow)
+              else "WRITES REACHED the arrow file")
+
+
+if __name__ == "__main__":
+    main()
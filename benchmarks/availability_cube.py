@@ -0,0 +1,191 @@
+"""
+Time the per-chart service / category / month groupbys the availability dashboard and recommendation
+sections ran before the service × month cube, against one cube build plus the same views as slices,
+and check that every slice matches its groupby. --sweep times several synthetic sizes and reports the
+smallest at which the cube is faster, on a rerun (cube cached) and on the first build.
+
+    python benchmarks/availability_cube.py --rows 200000
+    python benchmarks/availability_cube.py --file cleaned_availability.parquet --repeat 5
+    python benchmarks/availability_cube.py --sweep 20000 50000 100000 200000 1000000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from utils_service_availability.availability_cube import AvailabilityCube, build_cube  # noqa: E402
+
+
+def _synthetic(rows: int) -> pd.DataFrame:
+    """Shape of a cleaned availability upload (one row per service per report)."""
+    rng = np.random.default_rng(0)
+    services = [f"SVC-{i:03d}" for i in range(80)]
+    return pd.DataFrame({
+        "service_name": rng.choice(services, rows),
+        "service_category": rng.choice(["Infrastructure", "Applications", "Communication"], rows),
+        "report_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 540, rows), unit="D"),
+        "uptime_percentage": rng.uniform(95, 100, rows).round(2),
+        "downtime_minutes": rng.gamma(2, 20, rows).round(1),
+        "incident_count": rng.poisson(1.5, rows),
+        "estimated_cost_downtime": rng.uniform(0, 40_000, rows).round(2),
+        "recovery_time_minutes": rng.integers(5, 300, rows).astype(float),
+        "rto_target_minutes": rng.choice([60.0, 120.0, 240.0], rows),
+        "sla_met": rng.choice([1.0, 0.0], rows, p=[0.9, 0.1]),
+        "maintenance_type": rng.choice(["Scheduled", "Unplanned", "None"], rows),
+        "change_type": rng.choice(["Standard", "Normal", "Emergency"], rows),
+        "cpu_utilization": rng.uniform(5, 95, rows).round(1),
+    })
+
+
+def _groupby_views(df: pd.DataFrame) -> dict:
+    """The views as each chart / KPI / CIO table computed them (one groupby per view)."""
+    month = df["report_date"].dt.to_period("M").astype(str)
+    t = df.assign(month=month)
+    sched = t[t["maintenance_type"].astype(str).str.lower() == "scheduled"]
+    emer = t[t["change_type"].astype(str).str.lower() == "emergency"]
+    views = {
+        "kpi_uptime": t["uptime_percentage"].mean(),
+        "kpi_downtime": t["downtime_minutes"].sum(),
+        "kpi_incidents": t["incident_count"].sum(),
+        "kpi_cost": t["estimated_cost_downtime"].sum(),
+        "svc_downtime": t.groupby("service_name")["downtime_minutes"].sum(),
+        "svc_cost": t.groupby("service_name")["estimated_cost_downtime"].sum(),
+        "svc_incidents": t.groupby("service_name")["incident_count"].sum(),
+        "svc_uptime": t.groupby("service_name")["uptime_percentage"].mean(),
+        "svc_sla": t.groupby("service_name")["sla_met"].mean(),
+        "svc_recovery": t.groupby("service_name")["recovery_time_minutes"].mean(),
+        "svc_rto": t.groupby("service_name")["rto_target_minutes"].mean(),
+        "svc_rto_breaches": (t["recovery_time_minutes"] > t["rto_target_minutes"]).groupby(t["service_name"]).sum(),
+        "svc_cpu": t.groupby("service_name")["cpu_utilization"].mean(),
+        "cat_cost": t.groupby("service_category")["estimated_cost_downtime"].sum(),
+        "cat_downtime": t.groupby("service_category")["downtime_minutes"].sum(),
+        "month_uptime": t.groupby("month")["uptime_percentage"].mean(),
+        "month_cost": t.groupby("month")["estimated_cost_downtime"].sum(),
+        "month_recovery": t.groupby("month")["recovery_time_minutes"].mean(),
+        "month_service_uptime": t.groupby(["month", "service_name"])["uptime_percentage"].mean(),
+        "month_scheduled": sched.groupby("month").size(),
+        "svc_scheduled_downtime": sched.groupby("service_name")["downtime_minutes"].sum(),
+        "month_emergency": emer.groupby("month").size(),
+        "month_emergency_uptime": emer.groupby("month")["uptime_percentage"].mean(),
+        "month_emergency_downtime": emer.groupby("month")["downtime_minutes"].sum(),
+    }
+    return views
+
+
+def _cube_views(df: pd.DataFrame, cube=None) -> dict:
+    """The same views sliced from one cube build (or from `cube`, as on a rerun with the cube cached)."""
+    cube = cube if cube is not None else build_cube(df)
+    svc = cube.slice("service_name").set_index("service_name")
+    cat = cube.slice("service_category").set_index("service_category")
+    mon = cube.slice("month").set_index("month")
+    mon_svc = cube.slice(["month", "service_name"]).set_index(["month", "service_name"])
+    sched_m, emer_m = mon[mon["scheduled_count"] > 0], mon[mon["emergency_count"] > 0]
+    return {
+        "kpi_uptime": cube.total("uptime_percentage"),
+        "kpi_downtime": cube.total("downtime_minutes"),
+        "kpi_incidents": cube.total("incident_count"),
+        "kpi_cost": cube.total("estimated_cost_downtime"),
+        "svc_downtime": svc["downtime_minutes"],
+        "svc_cost": svc["estimated_cost_downtime"],
+        "svc_incidents": svc["incident_count"],
+        "svc_uptime": svc["uptime_percentage"],
+        "svc_sla": svc["sla_met"],
+        "svc_recovery": svc["recovery_time_minutes"],
+        "svc_rto": svc["rto_target_minutes"],
+        "svc_rto_breaches": svc["rto_breaches"],
+        "svc_cpu": svc["cpu_utilization"],
+        "cat_cost": cat["estimated_cost_downtime"],
+        "cat_downtime": cat["downtime_minutes"],
+        "month_uptime": mon["uptime_percentage"],
+        "month_cost": mon["estimated_cost_downtime"],
+        "month_recovery": mon["recovery_time_minutes"],
+        "month_service_uptime": mon_svc["uptime_percentage"],
+        "month_scheduled": sched_m["scheduled_count"],
+        "svc_scheduled_downtime": svc.loc[svc["scheduled_count"] > 0, "scheduled_downtime_minutes"],
+        "month_emergency": emer_m["emergency_count"],
+        "month_emergency_uptime": emer_m["emergency_uptime_percentage"],
+        "month_emergency_downtime": emer_m["emergency_downtime_minutes"],
+    }
+
+
+def _same(a, b) -> bool:
+    if np.isscalar(a):
+        return bool(np.isclose(a, b, rtol=1e-9, equal_nan=True))
+    a, b = pd.Series(a).sort_index(), pd.Series(b).sort_index()
+    return (len(a) == len(b) and list(map(str, a.index)) == list(map(str, b.index))
+            and np.allclose(a.to_numpy(float), b.to_numpy(float), rtol=1e-9, equal_nan=True))
+
+
+def _best(fn, df: pd.DataFrame, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _sweep(sizes: list, repeat: int) -> None:
+    print(f"{'rows':>10}{'groupbys':>10}{'cube':>10}{'rerun':>10}")
+    first_build = first_rerun = None
+    for rows in sorted(sizes):
+        df = _synthetic(rows)
+        t_group, _ = _best(_groupby_views, df, repeat)
+        t_cube, _ = _best(_cube_views, df, repeat)
+        cube = build_cube(df)
+        t_rerun, _ = _best(lambda d: _cube_views(d, AvailabilityCube(cells=cube.cells)), df, repeat)
+        print(f"{rows:>10,}{t_group:>10.3f}{t_cube:>10.3f}{t_rerun:>10.3f}")
+        if first_rerun is None and t_rerun < t_group:
+            first_rerun = rows
+        if first_build is None and t_cube < t_group:
+            first_build = rows
+    for label, rows in (("rerun (cube cached)", first_rerun), ("first build", first_build)):
+        print(f"cube pays off on {label} from {rows:,} rows" if rows is not None
+              else f"cube does not pay off on {label} up to {max(sizes):,} rows")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--file", help="cleaned availability CSV/Parquet to measure instead of synthetic data")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--sweep", type=int, nargs="+", help="synthetic row counts to compare")
+    args = ap.parse_args()
+
+    if args.sweep:
+        _sweep(args.sweep, args.repeat)
+        return
+
+    if args.file:
+        reader = pd.read_parquet if args.file.lower().endswith(".parquet") else pd.read_csv
+        df = reader(args.file)
+        df["report_date"] = pd.to_datetime(df["report_date"], errors="coerce")
+    else:
+        df = _synthetic(args.rows)
+
+    t_group, old = _best(_groupby_views, df, args.repeat)
+    t_cube, new = _best(_cube_views, df, args.repeat)
+    t_build, cube = _best(build_cube, df, args.repeat)
+    t_rerun, _ = _best(lambda d: _cube_views(d, AvailabilityCube(cells=cube.cells)), df, args.repeat)
+
+    print(f"rows={len(df):,}  views={len(old)}  cube cells={len(cube.cells):,}")
+    print(f"{'':<32}{'seconds':>10}")
+    print(f"{'per-view groupbys (before)':<32}{t_group:>10.3f}")
+    print(f"{'cube build + slices (after)':<32}{t_cube:>10.3f}")
+    print(f"{'  of which cube build':<32}{t_build:>10.3f}")
+    print(f"{'rerun with cube cached':<32}{t_rerun:>10.3f}")
+    print(f"{'speed-up':<32}{t_group / t_cube:>9.1f}x")
+    mismatched = [k for k in old if k in new and not _same(old[k], new[k])]
+    print("all views match" if not mismatched else f"MISMATCH: {', '.join(mismatched)}")
+
+
+if __name__ == "__main__":
+    main()
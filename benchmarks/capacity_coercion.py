@@ -0,0 +1,121 @@
+"""
+Counts `pd.to_numeric` coercions made by the capacity recommendation modules and dashboard per render:
+nullable Float64/Int64 columns (what data_cleaning_capacity emitted before the typed metric block)
+vs the float32/float64 block from utils_capacity.metric_block.build_metric_block.
+
+    python benchmarks/capacity_coercion.py --rows 50000
+    python benchmarks/capacity_coercion.py --file cleaned_capacity.parquet --top 15
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from utils_capacity.metric_block import build_metric_block, coercion_profiler  # noqa: E402
+from utils_capacity.recommendation_capacity import (  # noqa: E402
+    actionable_insight, bottleneck_identification, capacity_planning, capacity_utilization,
+    cost_benefit, energy_efficiency, executive_summary, implementation_plan,
+    infrastructure_inventory, network_capacity, resource_allocation, resource_efficiency,
+    risk_assessment, storage_capacity, virtualization_cloud, workload_analysis,
+)
+from utils_capacity.dashboard_capacity import dashboard_capacity  # noqa: E402
+
+MODULES = [
+    executive_summary, infrastructure_inventory, capacity_utilization, capacity_planning,
+    resource_efficiency, bottleneck_identification, resource_allocation, workload_analysis,
+    virtualization_cloud, storage_capacity, network_capacity, energy_efficiency,
+    cost_benefit, risk_assessment, actionable_insight, implementation_plan,
+]
+
+
+def _synthetic(rows: int) -> pd.DataFrame:
+    """Shape of a cleaned capacity upload before the metric block (convert_dtypes -> Float64/Int64)."""
+    rng = np.random.default_rng(0)
+    assets = rng.integers(0, max(1, rows // 30), rows)
+    df = pd.DataFrame({
+        "asset_id": pd.Series(assets).map(lambda a: f"SRV-{a:05d}"),
+        "data_timestamp": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 180, rows), unit="D"),
+        "component_type": rng.choice(["Server", "Storage", "Network", "VM Host"], rows),
+        "location": rng.choice(["KL", "Penang", "Johor", "Cyberjaya"], rows),
+        "vendor": rng.choice(["Dell", "HPE", "Cisco", "Lenovo"], rows),
+        "environment": rng.choice(["Prod", "DR", "UAT"], rows),
+        "avg_cpu_utilization": rng.uniform(5, 98, rows).round(2),
+        "avg_memory_utilization": rng.uniform(5, 98, rows).round(2),
+        "avg_storage_utilization": rng.uniform(5, 98, rows).round(2),
+        "avg_network_utilization": rng.uniform(5, 98, rows).round(2),
+        "projected_growth_pct": rng.uniform(-5, 30, rows).round(2),
+        "cpu_cores": rng.choice([8, 16, 32, 64], rows),
+        "memory_gb": rng.choice([32, 64, 128, 256], rows),
+        "storage_tb": rng.uniform(1, 50, rows).round(2),
+        "network_bandwidth_gbps": rng.choice([1, 10, 25, 40], rows),
+        "network_bandwidth_usage_gbps": rng.uniform(0.1, 20, rows).round(2),
+        "incident_count": rng.poisson(2, rows),
+        "downtime_minutes": rng.gamma(2, 30, rows).round(1),
+        "energy_consumption_kwh": rng.uniform(100, 2000, rows).round(1),
+        "cost_per_month_usd": rng.uniform(200, 8000, rows).round(2),
+        "potential_savings_usd": rng.uniform(0, 1500, rows).round(2),
+        "bottleneck_score": rng.uniform(0, 10, rows).round(2),
+    })
+    return df.convert_dtypes()
+
+
+def _render_all(df: pd.DataFrame) -> tuple:
+    pkg = os.path.join(ROOT, "utils_capacity")
+    t0 = time.perf_counter()
+    failures = []
+    with coercion_profiler(only_under=pkg) as profile:
+        for mod in MODULES:
+            fn = getattr(mod, mod.__name__.rsplit(".", 1)[-1])
+            try:
+                fn(df.copy(deep=False))
+            except Exception as e:  # a module failing on synthetic data should not hide the counts
+                failures.append(f"{mod.__name__}: {type(e).__name__}: {e}")
+        try:
+            dashboard_capacity(df.copy(deep=False))
+        except Exception as e:
+            failures.append(f"dashboard_capacity: {type(e).__name__}: {e}")
+    return profile, time.perf_counter() - t0, failures
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=50_000)
+    ap.add_argument("--file", help="cleaned capacity CSV/Parquet to measure instead of synthetic data")
+    ap.add_argument("--top", type=int, default=10, help="call sites to list for the nullable run")
+    args = ap.parse_args()
+
+    if args.file:
+        reader = pd.read_parquet if args.file.lower().endswith(".parquet") else pd.read_csv
+        nullable = reader(args.file).convert_dtypes()
+    else:
+        nullable = _synthetic(args.rows)
+    typed, block = build_metric_block(nullable)
+
+    before, t_before, fail_before = _render_all(nullable)
+    after, t_after, fail_after = _render_all(typed)
+
+    print(f"rows={len(nullable):,}  metrics in block={len(block.dtypes)}  "
+          f"flagged rows={int(block.invalid_rows.sum()):,}")
+    print(f"{'':<24}{'coercions':>12}{'render s':>12}")
+    print(f"{'nullable (before)':<24}{before.total:>12}{t_before:>12.2f}")
+    print(f"{'typed block (after)':<24}{after.total:>12}{t_after:>12.2f}")
+    print("\nTop coercion sites before:")
+    print(before.table().head(args.top).to_string(index=False))
+    if after.total:
+        print("\nRemaining coercion sites after:")
+        print(after.table().to_string(index=False))
+    for label, fails in (("before", fail_before), ("after", fail_after)):
+        for f in fails:
+            print(f"[{label}] module error: {f}")
+
+
+if __name__ == "__main__":
+    main()
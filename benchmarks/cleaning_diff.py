@@ -0,0 +1,104 @@
+"""
+Time and traced peak memory of the raw-vs-cleaned reporting the rich cleaners do: a deep raw
+snapshot with isnull()/duplicated()/dtype tables recomputed on both frames (before) against a
+copy-on-write snapshot profiled once and diffed with cleaning_diff (after). The cleaning itself
+is run once up front and is not part of either measurement.
+
+    python benchmarks/cleaning_diff.py --rows 500000
+    python benchmarks/cleaning_diff.py --file incidents_export.csv --repeat 1
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from cleaning_diff import diff_frames, profile_raw  # noqa: E402
+
+
+def _synthetic(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Created Time": rng.choice(np.array(["2025-01-05 10:00", "2025-02-12 09:30", "bad", None], dtype=object), rows),
+        "Priority": rng.choice(["P1", "P2", "P3"], rows),
+        "Technician": rng.choice([f"tech_{i}" for i in range(40)], rows),
+        "Resolution Hours": rng.choice(np.array(["1.5", "3", "n/a", None], dtype=object), rows),
+        "Feedback": rng.integers(1, 6, rows).astype("float64"),
+    })
+    return pd.concat([df, df.iloc[: rows // 50]], ignore_index=True)
+
+
+def _clean(df: pd.DataFrame):
+    col_map = {c: c.strip().lower().replace(" ", "_") for c in df.columns}
+    out = df.copy()
+    out.columns = list(col_map.values())
+    out["created_time"] = pd.to_datetime(out["created_time"], errors="coerce", format="%Y-%m-%d %H:%M")
+    out["resolution_hours"] = pd.to_numeric(out["resolution_hours"], errors="coerce")
+    return out.drop_duplicates(), col_map
+
+
+def _before(df: pd.DataFrame, cleaned: pd.DataFrame, col_map: dict):
+    raw = df.copy(deep=True)
+    stats = [int(raw.isnull().sum().sum()), raw.isnull().sum(), int(raw.duplicated().sum()), raw[raw.duplicated()]]
+    stats += [int(cleaned.isnull().sum().sum()), cleaned.isnull().sum()]
+    dtypes_raw = pd.DataFrame({"Column": raw.columns, "Raw dtypes": [str(t) for t in raw.dtypes]})
+    dtypes_raw["Column (standardized)"] = dtypes_raw["Column"].map(col_map)
+    dtypes_clean = pd.DataFrame({"Column (standardized)": cleaned.columns, "Cleaned dtypes": [str(t) for t in cleaned.dtypes]})
+    return dtypes_raw.merge(dtypes_clean, on="Column (standardized)", how="outer"), stats
+
+
+def _after(df: pd.DataFrame, cleaned: pd.DataFrame, col_map: dict):
+    raw = df.copy(deep=False)
+    profile = profile_raw(raw)
+    return diff_frames(profile, cleaned, col_map), raw.iloc[profile.duplicate_positions[:500]]
+
+
+def _measure(fn, args: tuple, repeat: int):
+    best, peak, out = float("inf"), 0, None
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return best, peak / 2**20, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--file", help="raw CSV/XLSX to measure instead of synthetic data")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.file:
+        reader = pd.read_excel if args.file.lower().endswith((".xlsx", ".xls")) else pd.read_csv
+        df = reader(args.file)
+    else:
+        df = _synthetic(args.rows)
+
+    cleaned, col_map = _clean(df)
+    t_old, m_old, (_, old_stats) = _measure(_before, (df, cleaned, col_map), args.repeat)
+    t_new, m_new, (diff, _) = _measure(_after, (df, cleaned, col_map), args.repeat)
+
+    print(f"rows={len(df):,}  cols={df.shape[1]}")
+    print(f"{'':<40}{'seconds':>10}{'peak MB':>10}")
+    print(f"{'deep snapshot + recomputed stats (before)':<40}{t_old:>10.3f}{m_old:>10.1f}")
+    print(f"{'profile + diff (after)':<40}{t_new:>10.3f}{m_new:>10.1f}")
+    print(f"{'speed-up':<40}{t_old / t_new:>9.1f}x")
+    same = old_stats[2] == diff.rows_deduplicated and old_stats[4] == int(diff.missing_table()["Missing"].sum())
+    print("duplicate and missing counts match" if same else "MISMATCH in duplicate / missing counts")
+    print(diff.columns.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
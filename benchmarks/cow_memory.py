@@ -0,0 +1,131 @@
+"""
+Peak-RSS comparison for one recommendation + report run: defensive `df.copy()` at every
+hand-off vs shared Copy-on-Write views (cow_context.shared_view).
+
+    python benchmarks/cow_memory.py --rows 1000000
+
+The frame is generated once and pickled; each mode loads it in a fresh interpreter so the
+peaks (and generation temporaries) do not contaminate each other.
+"""
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+N_MODULES = 6  # ticket_volume, resolution_time, sla, customer_satisfaction, technician, incident_trends
+
+
+def _reset_peak() -> None:
+    """Linux: restart the VmHWM high-water mark so loading the frame is not counted as the peak."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 2**10
+    except OSError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        if hasattr(info, "peak_wset"):  # Windows
+            return info.peak_wset / 2**20
+    except Exception:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _make_frame(rows: int):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(0)
+    created = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, rows), unit="s")
+    return pd.DataFrame({
+        "created_time": created.strftime("%Y-%m-%d %H:%M:%S"),
+        "resolved_time": (created + pd.to_timedelta(rng.integers(60, 5 * 86400, rows), unit="s")),
+        "priority": rng.choice(["P1", "P2", "P3", "Service Request"], rows),
+        "category": rng.choice(["Hardware", "Software", "Network", "Access"], rows),
+        "technician": rng.choice([f"tech_{i}" for i in range(40)], rows),
+        "department": rng.choice(["IT", "HR", "Finance", "Ops"], rows),
+        "resolution_time_hours": rng.gamma(2.0, 6.0, rows),
+        "feedback_score": rng.integers(1, 6, rows).astype("float64"),
+        "description": rng.choice(["printer jam", "vpn drop", "password reset", "disk full"], rows),
+    })
+
+
+def _module(df, take):
+    """What every recommendation sub-module does: take a working frame, derive a column, aggregate."""
+    import pandas as pd
+    local = take(df)
+    local["created_time"] = pd.to_datetime(local["created_time"], errors="coerce")
+    local["resolution_time_hours"] = local["resolution_time_hours"].clip(lower=0)
+    return local.groupby("technician", observed=True)["resolution_time_hours"].mean()
+
+
+def _run(mode: str, frame_path: str) -> None:
+    import pandas as pd
+    from cow_context import enable_copy_on_write, shared_view
+
+    enable_copy_on_write()
+    take = shared_view if mode == "cow" else (lambda d: d.copy())
+    df = pd.read_pickle(frame_path)
+    gc.collect()
+    _reset_peak()
+    base = _peak_rss_mb()
+
+    # recommendation tab: entry point working frame -> date filter -> each sub-module
+    work = take(df)
+    work["created_time"] = pd.to_datetime(work["created_time"], errors="coerce")
+    filtered = take(work[work["created_time"] >= work["created_time"].min()])
+    for _ in range(N_MODULES):
+        _module(filtered, take)
+
+    # report builder: _capture_module hands each module its own frame
+    for _ in range(N_MODULES):
+        _module(df, take)
+
+    print(f"{mode},{len(df)},{base:.1f},{_peak_rss_mb():.1f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--mode", choices=["copy", "cow"], help=argparse.SUPPRESS)
+    ap.add_argument("--frame", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.mode:
+        _run(args.mode, args.frame)
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        frame_path = os.path.join(tmp, "frame.pkl")
+        _make_frame(args.rows).to_pickle(frame_path)
+
+        print(f"{'mode':<6}{'rows':>10}{'loaded MB':>12}{'peak MB':>12}{'overhead MB':>14}")
+        for mode in ("copy", "cow"):
+            out = subprocess.run([sys.executable, __file__, "--mode", mode, "--frame", frame_path],
+                                 capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1]
+            _, rows, base, peak = out.split(",")
+            results[mode] = float(peak) - float(base)
+            print(f"{mode:<6}{int(rows):>10,}{float(base):>12.1f}{float(peak):>12.1f}{results[mode]:>14.1f}")
+    if results["copy"] > 0:
+        print(f"\nPeak overhead reduced by {100 * (1 - results['cow'] / results['copy']):.0f}% with shared views.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Time what a dashboard rerun pays to build its filter widgets: the sorted distinct labels of each filter
+column and the min / max of its date column, scanned from the frame on every rerun (before) against a
+lookup in the stored column profile, after its content-token check (dataset_stats.py; after). The
+one-off profiling cost, paid at ingest or on the first rerun of a dataset version, is reported
+separately. Checks that both give the same options and date spans.
+
+    python benchmarks/dataset_stats.py --rows 1000000
+    python benchmarks/dataset_stats.py --file tickets_export.csv --date created_time
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from dataset_stats import MAX_DISTINCT, FrameStats, content_token, profile_frame  # noqa: E402
+
+
+def _synthetic(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "ticket_id": np.arange(rows),
+        "created_time": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86_400, rows), unit="s"),
+        "technician": rng.choice([f"tech_{i}" for i in range(200)], rows),
+        "category": rng.choice([f"Category {i}" for i in range(40)], rows),
+        "priority": rng.choice(["P1", "P2", "P3", "P4", None], rows),
+        "site": rng.choice([f"Site {i}" for i in range(25)], rows),
+        "resolution_hours": rng.gamma(2.0, 6.0, rows),
+    })
+
+
+def _scan(df: pd.DataFrame, cols: list, date_col: str) -> tuple:
+    options = {c: sorted(df[c].dropna().astype(str).unique()) for c in cols}
+    return options, (df[date_col].min(), df[date_col].max())
+
+
+def _lookup(stats: FrameStats, cols: list, date_col: str) -> tuple:
+    if stats.profile["token"] != content_token(stats.frame):     # the freshness check frame_stats makes
+        return {}, None
+    return {c: stats.options(c) for c in cols}, stats.date_bounds(date_col)
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--file", help="CSV/parquet to measure instead of synthetic data")
+    ap.add_argument("--date", default="created_time", help="date column of the picker")
+    args = ap.parse_args()
+
+    if args.file:
+        df = pd.read_parquet(args.file) if args.file.endswith(".parquet") else pd.read_csv(args.file)
+    else:
+        df = _synthetic(args.rows)
+    if args.date not in df.columns:
+        sys.exit(f"no date column {args.date!r}")
+    df[args.date] = pd.to_datetime(df[args.date], errors="coerce")
+    cols = [c for c in df.columns if c != args.date and df[c].nunique() <= MAX_DISTINCT
+            and not pd.api.types.is_numeric_dtype(df[c])]
+
+    t0 = time.perf_counter()
+    profile = json.loads(json.dumps(profile_frame(df)))   # as stored in catalog.json
+    t_profile = time.perf_counter() - t0
+    stats = FrameStats(profile, df)
+
+    t_scan = _best(lambda: _scan(df, cols, args.date), args.repeat)
+    t_lookup = _best(lambda: _lookup(stats, cols, args.date), args.repeat)
+
+    print(f"rows={len(df):,}  filter columns={len(cols)}  date column={args.date}")
+    print(f"{'per rerun':<40}{'seconds':>10}")
+    print(f"{'scan options + min/max (before)':<40}{t_scan:>10.4f}")
+    print(f"{'stored profile lookup (after)':<40}{t_lookup:>10.4f}")
+    print(f"{'one-off profile_frame':<40}{t_profile:>10.4f}")
+    print(f"{'speed-up per rerun':<40}{t_scan / max(t_lookup, 1e-9):>9.0f}x")
+
+    (opts_a, (lo, hi)), (opts_b, bounds) = _scan(df, cols, args.date), _lookup(stats, cols, args.date)
+    same = opts_a == opts_b and bounds is not None and (lo, hi) == bounds
+    print("options and date spans match" if same else "MISMATCH between scan and stored profile")
+
+
+if __name__ == "__main__":
+    main()
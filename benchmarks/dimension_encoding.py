@@ -0,0 +1,90 @@
+"""
+Memory and groupby-speed comparison per domain: dimension columns as object strings (before)
+vs categoricals from dimension_encoding.encode_dimensions (after).
+
+    python benchmarks/dimension_encoding.py --rows 1000000
+    python benchmarks/dimension_encoding.py --file my_tickets.parquet   # measure a real dataset
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dimension_encoding import encode_dimensions  # noqa: E402
+
+# Typical dimension columns and cardinalities seen in each domain's uploads
+DOMAINS = {
+    "service_desk": {"technician": 60, "department": 25, "category": 18, "priority": 5, "request_status": 6},
+    "incident": {"technician": 60, "department": 25, "category": 18, "priority": 5, "status": 6},
+    "asset": {"department": 25, "location": 40, "vendor": 30, "status": 5, "asset_type": 20},
+    "capacity": {"component_type": 12, "location": 40, "vendor": 30, "environment": 4},
+    "service_availability": {"service_name": 80, "location": 40, "environment": 4, "priority": 5},
+    "change": {"category": 18, "status": 6, "approver": 35, "risk_level": 4, "change_type": 5},
+}
+
+
+def _synthetic(dims: dict, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {col: rng.choice([f"{col}_{i:03d}" for i in range(card)], rows).astype(object)
+            for col, card in dims.items()}
+    data["value"] = rng.gamma(2.0, 5.0, rows)
+    return pd.DataFrame(data)
+
+
+def _groupby_seconds(df: pd.DataFrame, cols, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for col in cols:
+            df.groupby(col, observed=True)["value"].agg(["size", "mean"])
+            df[col].isin(df[col].iloc[:3].tolist()).sum()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _measure(name: str, df: pd.DataFrame) -> dict:
+    # "before" = what the cleaners produced until now: labels as Python object strings
+    before = df.astype({c: object for c in df.columns if pd.api.types.is_string_dtype(df[c])})
+    after = encode_dimensions(before)
+    cols = [c for c in after.columns if isinstance(after[c].dtype, pd.CategoricalDtype)]
+    if "value" not in before.columns:
+        before = before.assign(value=1.0)
+        after = after.assign(value=1.0)
+    mb = lambda d: d[cols].memory_usage(deep=True, index=False).sum() / 2**20
+    return {
+        "domain": name,
+        "encoded cols": len(cols),
+        "MB before": mb(before),
+        "MB after": mb(after),
+        "groupby s before": _groupby_seconds(before, cols),
+        "groupby s after": _groupby_seconds(after, cols),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--file", help="CSV/Excel/Parquet file to measure instead of the synthetic domains")
+    args = ap.parse_args()
+
+    if args.file:
+        ext = os.path.splitext(args.file)[1].lower()
+        reader = {".csv": pd.read_csv, ".parquet": pd.read_parquet}.get(ext, pd.read_excel)
+        rows = [_measure(os.path.basename(args.file), reader(args.file))]
+    else:
+        rows = [_measure(name, _synthetic(dims, args.rows)) for name, dims in DOMAINS.items()]
+
+    out = pd.DataFrame(rows)
+    out["memory x"] = out["MB before"] / out["MB after"]
+    out["groupby x"] = out["groupby s before"] / out["groupby s after"]
+    with pd.option_context("display.float_format", "{:,.3f}".format, "display.width", 160):
+        print(out.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Time duplicate handling as the cleaners did it (duplicated() for the count, again for the rows to show,
+drop_duplicates() after cleaning, and all of it again when rows are appended and the frame re-uploaded)
+against one row-hash index per frame (duplicate_index.py) that is extended for the appended rows, and
+check that both find the same duplicates.
+
+    python benchmarks/duplicate_index.py --rows 500000
+    python benchmarks/duplicate_index.py --file tickets_export.csv --append 0.2 --repeat 1
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from duplicate_index import build_index, near_duplicate_key  # noqa: E402
+
+
+def _synthetic(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    subjects = np.array([f"{p}Printer {i} not working{s}" for i in range(2_000)
+                         for p, s in (("", ""), ("RE: ", "!"))], dtype=object)
+    df = pd.DataFrame({
+        "ticket_id": rng.integers(0, rows, rows),
+        "subject": rng.choice(subjects, rows),
+        "priority": rng.choice(["P1", "P2", "P3"], rows),
+        "technician": rng.choice([f"tech_{i}" for i in range(40)], rows),
+        "resolution_hours": rng.choice(np.array([1.5, 3.0, np.nan]), rows),
+    })
+    return pd.concat([df, df.iloc[: rows // 50]], ignore_index=True)
+
+
+def _legacy(df: pd.DataFrame, extra: pd.DataFrame):
+    counts = []
+    for frame in (df, pd.concat([df, extra], ignore_index=True)):
+        count = int(frame.duplicated().sum())
+        shown = frame[frame.duplicated()].head(1_000)
+        frame.drop_duplicates()
+        counts.append((count, shown.index.to_numpy()))
+    return counts
+
+
+def _indexed(df: pd.DataFrame, extra: pd.DataFrame):
+    counts = []
+    index = build_index(df)
+    for frame, idx in ((df, index), (pd.concat([df, extra], ignore_index=True), index.extend(extra))):
+        frame[idx.keep()]
+        counts.append((idx.count, idx.positions[:1_000]))
+    return counts
+
+
+def _best(fn, args: tuple, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=300_000)
+    ap.add_argument("--file", help="raw CSV/XLSX to measure instead of synthetic data")
+    ap.add_argument("--append", type=float, default=0.2, help="appended rows as a share of the frame")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.file:
+        reader = pd.read_excel if args.file.lower().endswith((".xlsx", ".xls")) else pd.read_csv
+        df = reader(args.file)
+    else:
+        df = _synthetic(args.rows)
+    extra = df.sample(frac=args.append, random_state=1).reset_index(drop=True)
+
+    t_old, old = _best(_legacy, (df, extra), args.repeat)
+    t_new, new = _best(_indexed, (df, extra), args.repeat)
+
+    print(f"rows={len(df):,} (+{len(extra):,} appended)  cols={df.shape[1]}")
+    print(f"{'':<44}{'seconds':>10}")
+    print(f"{'duplicated() x2 + drop_duplicates (before)':<44}{t_old:>10.3f}")
+    print(f"{'one row-hash index + extend (after)':<44}{t_new:>10.3f}")
+    print(f"{'speed-up':<44}{t_old / t_new:>9.1f}x")
+    same = all(a[0] == b[0] and np.array_equal(a[1], b[1]) for a, b in zip(old, new))
+    print("duplicate counts and rows match" if same else "MISMATCH in duplicate counts / rows")
+
+    key, label = near_duplicate_key(df)
+    if key is not None:
+        print(f"near-duplicates ({label}): {build_index(key).count:,}  exact: {new[0][0]:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Time multi-sheet workbook ingestion: parsing every sheet with pd.read_excel one after another against
+excel_ingest.convert_sheets (sheets parsed in worker processes, written to parquet), then what a later
+session pays to open the same sheets (read_excel again before, read_parquet after). Checks that the
+parquet files hold the same frames.
+
+    python benchmarks/excel_ingest.py --sheets 6 --rows 20000
+    python benchmarks/excel_ingest.py --file cmdb.xlsx --workers 4
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from excel_ingest import MAX_WORKERS, convert_sheets, list_sheets  # noqa: E402
+
+
+def _synthetic(path: str, sheets: int, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for k in range(sheets):
+            pd.DataFrame({
+                "asset_id": np.arange(rows),
+                "location": rng.choice([f"DC-{i}" for i in range(12)], rows),
+                "component_type": rng.choice(["CPU", "Memory", "Storage", "Network"], rows),
+                "utilization": rng.uniform(0, 1, rows).round(3),
+                "timestamp": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24, rows), unit="h"),
+            }).to_excel(writer, sheet_name=f"Site {k + 1}", index=False)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sheets", type=int, default=6)
+    ap.add_argument("--rows", type=int, default=20_000)
+    ap.add_argument("--workers", type=int, default=MAX_WORKERS)
+    ap.add_argument("--file", help="workbook to measure instead of a synthetic one")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if not path:
+            path = os.path.join(tmp, "workbook.xlsx")
+            _synthetic(path, args.sheets, args.rows)
+        sheets = list_sheets(path)
+
+        t0 = time.perf_counter()
+        frames = {s: pd.read_excel(path, sheet_name=s) for s in sheets}
+        t_seq = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        results = convert_sheets(path, sheets, [os.path.join(tmp, f"sheet_{i}") for i in range(len(sheets))],
+                                 workers=args.workers)
+        t_par = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        stored = {r.sheet: pd.read_parquet(r.path) for r in results if r.path}
+        t_reload = time.perf_counter() - t0
+
+        print(f"sheets={len(sheets)}  rows={sum(len(f) for f in frames.values()):,}  cores={os.cpu_count()}")
+        print(f"{'':<44}{'seconds':>10}")
+        print(f"{'read_excel, sheet by sheet (before)':<44}{t_seq:>10.3f}")
+        print(f"{f'convert_sheets, {args.workers} worker processes (after)':<44}{t_par:>10.3f}")
+        print(f"{'later session: read_excel again (before)':<44}{t_seq:>10.3f}")
+        print(f"{'later session: read_parquet (after)':<44}{t_reload:>10.3f}")
+        print(f"{'later-session speed-up':<44}{t_seq / t_reload:>9.1f}x")
+        same = len(stored) == len(frames)
+        for s, df in stored.items():
+            try:
+                pd.testing.assert_frame_equal(frames[s], df)
+            except AssertionError:
+                same = False
+        print("sheets match" if same else "MISMATCH between read_excel and stored parquet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Time the scorecard cleaner's placeholder/unicode pass and numeric-likeness coercion per cell (applymap +
+per-value re.sub, as data_cleaning_scorecard ran them) against the column-wise engine in
+utils_scorecard.text_cleaning, and check that both produce the same frame.
+
+    python benchmarks/scorecard_cleaning.py --rows 50000
+    python benchmarks/scorecard_cleaning.py --rows 300000 --cols 60 --repeat 1
+    python benchmarks/scorecard_cleaning.py --file scorecard_export.csv
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from utils_scorecard.text_cleaning import PLACEHOLDERS, clean_placeholders, coerce_numeric_columns  # noqa: E402
+
+
+def _synthetic(rows: int, cols: int) -> pd.DataFrame:
+    """Text-typed scorecard export: labels with placeholder / nbsp noise, formatted numbers, dates."""
+    rng = np.random.default_rng(0)
+    noise = np.array(["", " N/A", "-", "null", " ", "#N/A"], dtype=object)
+
+    def labels(pool, dirty=0.05):
+        v = rng.choice(np.array([f"\xa0{p}\u200b" if i % 3 == 0 else p for i, p in enumerate(pool)], dtype=object), rows)
+        mask = rng.random(rows) < dirty
+        v[mask] = rng.choice(noise, int(mask.sum()))
+        return v
+
+    def numbers(lo, hi, fmt, dirty=0.03):
+        v = np.array([fmt.format(x) for x in rng.uniform(lo, hi, rows)], dtype=object)
+        mask = rng.random(rows) < dirty
+        v[mask] = rng.choice(noise, int(mask.sum()))
+        return v
+
+    kinds = [
+        lambda: labels([f"Service {i}" for i in range(60)]),
+        lambda: labels(["Ali", "Bee", "Chen", "Devi", "Eng"]),
+        lambda: labels(["Met", "Not Met", "met"]),
+        lambda: labels(["Compliant", "Non-Compliant"]),
+        lambda: numbers(95, 100, "{:.2f}%"),
+        lambda: numbers(0, 50_000, "{:,.0f}"),
+        lambda: numbers(0, 600, "{:.1f}"),
+        lambda: labels([f"2025-{m:02d}-{d:02d}" for m in range(1, 13) for d in (1, 15)]),
+    ]
+    data = {f"col_{i:02d}_{['svc', 'owner', 'sla', 'compliance', 'uptime', 'cost', 'mins', 'date'][i % 8]}":
+            kinds[i % len(kinds)]() for i in range(cols)}
+    return pd.DataFrame(data, dtype=object)
+
+
+def _legacy(df: pd.DataFrame) -> pd.DataFrame:
+    """STEP 2 and STEP 4 of data_cleaning_scorecard as they ran per cell (pandas 2 semantics)."""
+    def _clean_cell(x):
+        if isinstance(x, str):
+            s = unicodedata.normalize("NFKC", x)
+            s = re.sub(r"[\u200B-\u200D\uFEFF\u2060\xa0]", "", s)  # zero-widths & nbsp
+            s = s.strip()
+            if s.lower() in PLACEHOLDERS:
+                return np.nan
+            return s
+        return np.nan if pd.isna(x) else x
+
+    cell_map = getattr(df, "applymap", None) or df.map     # applymap was removed in pandas 3
+    out = cell_map(_clean_cell).astype(object)             # text stays object, as applymap returned it on pandas 2
+    for col in out.columns:
+        if out[col].dtype == "object":
+            cleaned = out[col].map(str).apply(lambda x: re.sub(r"[,\s%]", "", x))   # astype(str) on pandas 2
+            coerced = pd.to_numeric(cleaned, errors="coerce")
+            if coerced.notna().mean() >= 0.6:
+                out[col] = coerced
+    return out
+
+
+def _engine(df: pd.DataFrame) -> pd.DataFrame:
+    return coerce_numeric_columns(clean_placeholders(df))
+
+
+def _best(fn, df: pd.DataFrame, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=50_000)
+    ap.add_argument("--cols", type=int, default=60)
+    ap.add_argument("--file", help="raw scorecard CSV/XLSX to measure instead of synthetic data")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.file:
+        reader = pd.read_excel if args.file.lower().endswith((".xlsx", ".xls")) else pd.read_csv
+        df = reader(args.file, dtype=object)
+    else:
+        df = _synthetic(args.rows, args.cols)
+
+    t_old, old = _best(_legacy, df, args.repeat)
+    t_new, new = _best(_engine, df, args.repeat)
+
+    print(f"rows={len(df):,}  cols={df.shape[1]}  cells={df.size:,}")
+    print(f"{'':<34}{'seconds':>10}")
+    print(f"{'per-cell applymap + re.sub (before)':<34}{t_old:>10.3f}")
+    print(f"{'column-wise engine (after)':<34}{t_new:>10.3f}")
+    print(f"{'speed-up':<34}{t_old / t_new:>9.1f}x")
+    numeric = [c for c in new.columns if new[c].dtype != object]
+    print(f"numeric columns converted: {len(numeric)} / {new.shape[1]}")
+    try:
+        pd.testing.assert_frame_equal(old, new)
+        print("outputs match")
+    except AssertionError as e:
+        print(f"MISMATCH: {e}")
+
+
+if __name__ == "__main__":
+    main()
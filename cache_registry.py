@@ -0,0 +1,281 @@
+# cache_registry.py
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import pandas as pd
+import streamlit as st
+
+# ─────────────────────────────────────────────────────────────
+# Dataset-scoped cache registry
+# Drop-in for @st.cache_data on functions whose results derive from the
+# active dataset (loads, prepared dashboard bases, engines, reports). Each
+# entry records the dataset id and version that was active when it was
+# computed, so reloading or removing one dataset drops only its own
+# artifacts. Entries are sized on insert and the least recently used are
+# evicted once the registry exceeds MAX_CACHE_BYTES.
+#
+# Engines that keep their own per-session state (incremental tables, date
+# indexes, memoised summaries) hold it in a session_store(): a bounded map
+# whose entries carry the same dataset scope, are dropped by invalidate()
+# with that dataset, and are counted in cache_stats() / cache_bytes().
+# ─────────────────────────────────────────────────────────────
+MAX_CACHE_BYTES = 1 << 30      # all datasets together (1 GiB)
+_SCOPE_KEY = "_cache_scope"
+_STORES_KEY = "_cache_session_stores"
+_LARGE_FRAME_ROWS = 100_000    # above this, fingerprint a fixed row sample (as st.cache_data does)
+_FINGERPRINT_SAMPLE = 10_000
+_SIZE_SAMPLE = 1_000           # rows of an object column measured to estimate its deep size
+
+
+@dataclass
+class _Entry:
+    value: object
+    func: str
+    dataset_id: object
+    version: object
+    nbytes: int
+    hits: int = 0
+    created: float = field(default_factory=time.time)
+
+
+_entries: "OrderedDict[tuple, _Entry]" = OrderedDict()   # least recently used first
+_lock = threading.RLock()
+_limits = {}                                             # func name -> max entries
+
+
+# ---------- scope ----------
+def set_scope(dataset_id, version=1) -> None:
+    """Dataset (id, version) that cached calls in this session are attributed to."""
+    st.session_state[_SCOPE_KEY] = (dataset_id, version)
+
+
+def current_scope() -> tuple:
+    return st.session_state.get(_SCOPE_KEY, (None, None))
+
+
+# ---------- keys & sizes ----------
+def fingerprint(value):
+    """Hashable content key for one argument: frames by shape, schema and (sampled) row hash."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        sample = value
+        if len(value) >= _LARGE_FRAME_ROWS:
+            sample = value.sample(n=_FINGERPRINT_SAMPLE, random_state=0)
+        try:
+            rows = int(pd.util.hash_pandas_object(sample, index=True).sum())
+        except TypeError:
+            rows = int(pd.util.hash_pandas_object(sample.astype(str), index=True).sum())
+        schema = (tuple(map(str, value.columns)), tuple(map(str, value.dtypes))) \
+            if isinstance(value, pd.DataFrame) else (str(value.name), str(value.dtype))
+        return (type(value).__name__, value.shape, schema, rows)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _object_nbytes(s: pd.Series) -> int:
+    """Bytes held by the Python objects of an object column, scaled up from an evenly spaced sample."""
+    if len(s) <= _SIZE_SAMPLE:
+        return int(s.memory_usage(index=False, deep=True) - s.memory_usage(index=False, deep=False))
+    sample = s.iloc[np.linspace(0, len(s) - 1, _SIZE_SAMPLE).astype("int64")]
+    per_row = (sample.memory_usage(index=False, deep=True) - sample.memory_usage(index=False, deep=False)) / _SIZE_SAMPLE
+    return int(per_row * len(s))
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=False)
+        total = int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+        columns = value.items() if isinstance(value, pd.DataFrame) else [(value.name, value)]
+        return total + sum(_object_nbytes(s) for _, s in columns if s.dtype == object)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, pd.Index):
+        extra = _object_nbytes(pd.Series(value, copy=False)) if value.dtype == object else 0
+        return int(value.memory_usage(deep=False)) + extra
+    if isinstance(value, (np.ndarray, pd.api.extensions.ExtensionArray)):
+        return int(value.nbytes)
+    if hasattr(value, "getbuffer"):
+        return value.getbuffer().nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if hasattr(value, "__dataclass_fields__"):
+        return sum(_nbytes(getattr(value, f)) for f in value.__dataclass_fields__)
+    return sys.getsizeof(value)
+
+
+# ---------- session stores ----------
+class SessionStore(MutableMapping):
+    """
+    One engine's per-session state. Each entry is tagged with the dataset scope active when it was
+    stored; at most `max_entries` are kept (oldest stored first out, `touch` marks one as recent).
+    Lookups are not limited to the active scope, so an engine can still find a frame's earlier rows
+    under another dataset (an appended upload).
+    """
+
+    def __init__(self, name: str, max_entries: int = None):
+        self.name = name
+        self.max_entries = max_entries
+        self._data: "OrderedDict[object, tuple]" = OrderedDict()   # key -> (scope, value)
+
+    def __getitem__(self, key):
+        return self._data[key][1]
+
+    def __setitem__(self, key, value) -> None:
+        self._data[key] = (current_scope(), value)
+        self._data.move_to_end(key)
+        while self.max_entries and len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __delitem__(self, key) -> None:
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def touch(self, key) -> None:
+        self._data.move_to_end(key)
+
+    def drop(self, dataset_id=None, keep_version=None) -> int:
+        """Remove entries stored under `dataset_id` (every version but `keep_version`; all with None); returns bytes."""
+        released = 0
+        for key, ((ds, version), value) in list(self._data.items()):
+            if dataset_id is None or (ds == dataset_id and version != keep_version):
+                released += _nbytes(value)
+                del self._data[key]
+        return released
+
+    def usage(self) -> list:
+        """(dataset_id, version, nbytes) per entry."""
+        return [(ds, version, _nbytes(value)) for (ds, version), value in self._data.values()]
+
+
+def _session_stores() -> dict:
+    try:
+        return st.session_state.setdefault(_STORES_KEY, {})
+    except Exception:   # no session (worker process / script without a runtime)
+        return {}
+
+
+def session_store(name: str, max_entries: int = None) -> SessionStore:
+    """This session's store for `name`, created on first use; `max_entries`, when given, bounds it."""
+    stores = st.session_state.setdefault(_STORES_KEY, {})
+    store = stores.get(name)
+    if store is None:
+        store = stores[name] = SessionStore(name, max_entries)
+    elif max_entries is not None:
+        store.max_entries = max_entries
+    return store
+
+
+def _out(value):
+    # Callers add columns to what they get back; a shallow copy keeps the cached frame intact under CoW
+    return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+
+# ---------- registry ----------
+def _evict() -> None:
+    total = sum(e.nbytes for e in _entries.values())
+    while total > MAX_CACHE_BYTES and len(_entries) > 1:
+        _, entry = _entries.popitem(last=False)
+        total -= entry.nbytes
+
+
+def _store(key: tuple, entry: _Entry) -> None:
+    with _lock:
+        _entries[key] = entry
+        limit = _limits.get(entry.func)
+        if limit:
+            mine = [k for k, e in _entries.items() if e.func == entry.func]
+            for k in mine[:max(0, len(mine) - limit)]:
+                _entries.pop(k, None)
+        _evict()
+
+
+def cached(func=None, *, max_entries: int = None):
+    """
+    Memoise `func` per (active dataset scope, arguments). Arguments whose name starts with an
+    underscore are not part of the key, as with st.cache_data. `func.clear()` drops its entries.
+    """
+    def decorate(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        sig = inspect.signature(fn)
+        _limits[name] = max_entries
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            dataset_id, version = current_scope()
+            key = (name, dataset_id, version,
+                   tuple((k, fingerprint(v)) for k, v in bound.arguments.items() if not k.startswith("_")))
+            with _lock:
+                entry = _entries.get(key)
+                if entry is not None:
+                    entry.hits += 1
+                    _entries.move_to_end(key)
+                    return _out(entry.value)
+            value = fn(*args, **kwargs)
+            _store(key, _Entry(value=value, func=name, dataset_id=dataset_id, version=version,
+                               nbytes=_nbytes(value)))
+            return _out(value)
+
+        wrapper.clear = lambda: invalidate(func=name)
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+def invalidate(dataset_id=None, func: str = None, keep_version=None) -> int:
+    """
+    Drop entries for `dataset_id` (all versions except `keep_version`) and/or for one function;
+    with no arguments, drop everything. Returns the number of bytes released.
+    """
+    released = 0
+    with _lock:
+        for key, entry in list(_entries.items()):
+            if dataset_id is not None and (entry.dataset_id != dataset_id or entry.version == keep_version):
+                continue
+            if func is not None and entry.func != func:
+                continue
+            released += _entries.pop(key).nbytes
+    for name, store in _session_stores().items():
+        if func is None or func == name:
+            released += store.drop(dataset_id, keep_version)
+    return released
+
+
+def cache_stats() -> pd.DataFrame:
+    """One row per (dataset, version, function): entries, megabytes and hits, largest first."""
+    with _lock:
+        rows = [{"dataset_id": str(e.dataset_id), "version": str(e.version), "function": ".".join(e.func.rsplit(".", 2)[-2:]),
+                 "entries": 1, "mb": e.nbytes / 1e6, "hits": e.hits} for e in _entries.values()]
+    rows += [{"dataset_id": str(ds), "version": str(version), "function": f"session:{name}",
+              "entries": 1, "mb": nbytes / 1e6, "hits": 0}
+             for name, store in _session_stores().items() for ds, version, nbytes in store.usage()]
+    if not rows:
+        return pd.DataFrame(columns=["dataset_id", "version", "function", "entries", "mb", "hits"])
+    stats = pd.DataFrame(rows)
+    stats = stats.groupby(["dataset_id", "version", "function"], as_index=False)[["entries", "mb", "hits"]].sum()
+    return stats.sort_values("mb", ascending=False).reset_index(drop=True)
+
+
+def cache_bytes() -> int:
+    """Registry entries plus this session's stores."""
+    with _lock:
+        total = sum(e.nbytes for e in _entries.values())
+    return total + sum(n for store in _session_stores().values() for _, _, n in store.usage())
@@ -0,0 +1,194 @@
+# cleaning_diff.py
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from duplicate_index import DuplicateIndex, duplicate_index
+
+# ─────────────────────────────────────────────────────────────
+# Raw vs cleaned diff
+# The cleaners used to keep a deep copy of the upload and recompute
+# isnull() / duplicated() / dtype tables on both frames. Instead the raw
+# frame is profiled once before cleaning — dtypes, per-column null counts,
+# a bit-packed null mask per column (1 bit per cell) and its row-hash
+# duplicate index (duplicate_index.py) — and the cleaned frame is diffed
+# against that profile: type changes, values coerced to null, columns
+# dropped/added and rows removed as duplicates. The raw frame itself is a
+# shallow (copy-on-write) view of the upload, so showing it costs no second
+# copy, and full tables are rendered a page at a time.
+# ─────────────────────────────────────────────────────────────
+PAGE_ROWS = 500
+
+
+@dataclass
+class RawProfile:
+    """What the diff needs from the raw upload, without keeping its values."""
+    columns: list
+    dtypes: list
+    nulls: np.ndarray                 # per column
+    null_bits: list                   # per column: np.packbits(isna)
+    index: pd.Index
+    duplicates_index: DuplicateIndex  # row hashes; rows repeating an earlier row
+
+    @property
+    def rows(self) -> int:
+        return len(self.index)
+
+    @property
+    def total_missing(self) -> int:
+        return int(self.nulls.sum())
+
+    @property
+    def duplicates(self) -> int:
+        return self.duplicates_index.count
+
+    @property
+    def duplicate_positions(self) -> np.ndarray:
+        return self.duplicates_index.positions
+
+    def dtype_table(self) -> pd.DataFrame:
+        return pd.DataFrame({"Column": self.columns, "Raw dtypes": self.dtypes})
+
+    def missing_table(self) -> pd.DataFrame:
+        return pd.DataFrame({"Column": self.columns, "Missing": self.nulls})
+
+    def null_mask(self, i: int) -> np.ndarray:
+        return np.unpackbits(self.null_bits[i], count=self.rows).astype(bool)
+
+
+def profile_raw(df: pd.DataFrame) -> RawProfile:
+    """Profile the upload in one pass per column (null mask) plus one row hash per row (duplicates)."""
+    nulls, bits = [], []
+    for i in range(df.shape[1]):
+        na = df.iloc[:, i].isna().to_numpy(dtype=bool)
+        nulls.append(int(na.sum()))
+        bits.append(np.packbits(na))
+    return RawProfile(
+        columns=[str(c) for c in df.columns],
+        dtypes=[str(t) for t in df.dtypes.values],
+        nulls=np.array(nulls, dtype="int64"),
+        null_bits=bits,
+        index=df.index,
+        duplicates_index=duplicate_index(df),
+    )
+
+
+@dataclass
+class CleaningDiff:
+    """
+    Cleaned frame vs its RawProfile.
+      - columns: Raw Column, Column (standardized), Raw dtypes, Cleaned dtypes, Change
+                 (unchanged / retyped / dropped / added), Raw Missing, Cleaned Missing, Coerced to Null
+      - rows_*: raw and cleaned row counts, rows removed and how many of those were raw duplicates
+      - aligned: cleaned rows could be matched to raw rows by index (Coerced to Null is exact)
+    """
+    columns: pd.DataFrame
+    rows_raw: int
+    rows_clean: int
+    rows_removed: int
+    rows_deduplicated: int
+    aligned: bool
+
+    @property
+    def coerced_to_null(self) -> int:
+        return int(self.columns["Coerced to Null"].sum())
+
+    @property
+    def retyped(self) -> list:
+        return self.columns.loc[self.columns["Change"] == "retyped", "Column (standardized)"].tolist()
+
+    def missing_table(self) -> pd.DataFrame:
+        kept = self.columns[self.columns["Change"] != "dropped"]
+        return pd.DataFrame({"Column": kept["Column (standardized)"].to_numpy(),
+                             "Missing": kept["Cleaned Missing"].astype("int64").to_numpy()})
+
+
+def _row_positions(raw: RawProfile, cleaned: pd.DataFrame):
+    """
+    Raw row position of each cleaned row, matched by index label (the cleaners filter and
+    de-duplicate without resetting the index); None when labels cannot be matched.
+    """
+    idx = cleaned.index
+    if idx.equals(raw.index):
+        return np.arange(raw.rows)
+    if not raw.index.is_unique:
+        return None
+    pos = raw.index.get_indexer(idx)
+    return None if (pos < 0).any() else pos
+
+
+def diff_frames(raw: RawProfile, cleaned: pd.DataFrame, col_map: dict = None) -> CleaningDiff:
+    """Column-level change statistics of `cleaned` against `raw`; `col_map` maps raw -> cleaned names."""
+    col_map = col_map or {}
+    pos = _row_positions(raw, cleaned)
+    clean_cols = {str(c): i for i, c in enumerate(cleaned.columns)}
+    clean_na = {}
+
+    def _clean_mask(name):
+        if name not in clean_na:
+            clean_na[name] = cleaned.iloc[:, clean_cols[name]].isna().to_numpy(dtype=bool)
+        return clean_na[name]
+
+    rows, matched = [], set()
+    for i, col in enumerate(raw.columns):
+        std = str(col_map.get(col, col))
+        row = {"Raw Column": col, "Column (standardized)": std, "Raw dtypes": raw.dtypes[i],
+               "Raw Missing": int(raw.nulls[i])}
+        if std not in clean_cols or std in matched:
+            row.update({"Cleaned dtypes": "dropped", "Change": "dropped", "Cleaned Missing": np.nan,
+                        "Coerced to Null": 0})
+        else:
+            matched.add(std)
+            na = _clean_mask(std)
+            dtype = str(cleaned.dtypes.iloc[clean_cols[std]])
+            if pos is not None:
+                coerced = int((na & ~raw.null_mask(i)[pos]).sum())
+            else:
+                coerced = max(0, int(na.sum()) - int(raw.nulls[i]))
+            row.update({"Cleaned dtypes": dtype, "Change": "retyped" if dtype != raw.dtypes[i] else "unchanged",
+                        "Cleaned Missing": int(na.sum()), "Coerced to Null": coerced})
+        rows.append(row)
+    for name in clean_cols:
+        if name not in matched:
+            rows.append({"Raw Column": "—", "Column (standardized)": name, "Raw dtypes": "—",
+                         "Raw Missing": np.nan, "Cleaned dtypes": str(cleaned.dtypes.iloc[clean_cols[name]]),
+                         "Change": "added", "Cleaned Missing": int(_clean_mask(name).sum()), "Coerced to Null": 0})
+
+    columns = pd.DataFrame(rows, columns=["Raw Column", "Column (standardized)", "Raw dtypes", "Cleaned dtypes",
+                                          "Change", "Raw Missing", "Cleaned Missing", "Coerced to Null"])
+    removed = raw.rows - len(cleaned)
+    if pos is not None:
+        gone = np.ones(raw.rows, dtype=bool)
+        gone[pos] = False
+        deduplicated = int(gone[raw.duplicate_positions].sum())
+    else:
+        deduplicated = min(max(removed, 0), raw.duplicates)
+    return CleaningDiff(columns=columns, rows_raw=raw.rows, rows_clean=len(cleaned),
+                        rows_removed=max(removed, 0), rows_deduplicated=deduplicated, aligned=pos is not None)
+
+
+# ---------- UI ----------
+def render_diff(diff: CleaningDiff) -> None:
+    """Row summary line and the aligned column change table."""
+    st.write(
+        f"**Rows:** {diff.rows_raw:,} raw → {diff.rows_clean:,} cleaned "
+        f"({diff.rows_removed:,} removed, {diff.rows_deduplicated:,} of them exact raw duplicates) · "
+        f"**Retyped columns:** {len(diff.retyped)} · **Values coerced to null:** {diff.coerced_to_null:,}"
+        + ("" if diff.aligned else " (estimated — cleaned rows could not be matched to raw rows)")
+    )
+    st.markdown("**Column Changes (Aligned by Standardized Name)**")
+    st.dataframe(diff.columns, use_container_width=True)
+
+
+def paged_dataframe(df: pd.DataFrame, key: str, page_rows: int = PAGE_ROWS, transform=None) -> None:
+    """Render `df` one page of rows at a time; `transform` (e.g. an Arrow sanitizer) runs on the page only."""
+    pages = max(1, -(-len(df) // page_rows))
+    page = 1
+    if pages > 1:
+        page = int(st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1, key=key))
+    start = (page - 1) * page_rows
+    chunk = df.iloc[start:start + page_rows]
+    st.caption(f"Rows {start + 1 if len(df) else 0:,}–{start + len(chunk):,} of {len(df):,}")
+    st.dataframe(transform(chunk) if transform else chunk, use_container_width=True)
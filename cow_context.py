@@ -0,0 +1,49 @@
+# cow_context.py
+import contextlib
+import pandas as pd
+
+# ---------- pandas Copy-on-Write ----------
+_PANDAS_MAJOR = int(pd.__version__.split(".")[0])
+
+
+def _cow_option_available() -> bool:
+    try:
+        pd.get_option("mode.copy_on_write")
+        return True
+    except Exception:
+        return False
+
+
+def cow_active() -> bool:
+    """True when derived frames share memory until written (always on from pandas 3.0)."""
+    if _PANDAS_MAJOR >= 3:
+        return True
+    if not _cow_option_available():
+        return False
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def enable_copy_on_write() -> bool:
+    """Turns on pandas CoW for the whole app where it is opt-in (pandas 1.5/2.x). Returns whether it is active."""
+    if _PANDAS_MAJOR < 3 and _cow_option_available():
+        pd.set_option("mode.copy_on_write", True)
+    return cow_active()
+
+
+@contextlib.contextmanager
+def copy_on_write():
+    """Scoped CoW for code paths that can run outside the app (e.g. report generation)."""
+    if _PANDAS_MAJOR < 3 and _cow_option_available():
+        with pd.option_context("mode.copy_on_write", True):
+            yield
+    else:
+        yield
+
+
+def shared_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    A frame a module may freely modify without affecting `df`.
+    Under CoW this is a lazy shallow copy (blocks are copied only when written);
+    without CoW it falls back to the old defensive deep copy.
+    """
+    return df.copy(deep=False) if cow_active() else df.copy()
@@ -0,0 +1,143 @@
+# dataset_stats.py
+import datetime
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ─────────────────────────────────────────────────────────────
+# Catalog column statistics
+# Filter widgets listed sorted(df[col].dropna().astype(str).unique()) and
+# date pickers took min()/max() of a full column on every rerun. A frame is
+# instead profiled once — rows, and per column: null count, distinct count,
+# the sorted distinct labels (up to MAX_DISTINCT) and min / max — and the
+# profile is stored in the dataset's catalog entry (catalog.json) under a
+# stage name: "raw" at ingest, one per dashboard for the prepared frame it
+# filters. Later reruns and sessions read the stored profile as long as the
+# frame still has the profiled rows and columns and the same content token
+# (dtypes plus a hash of TOKEN_ROWS evenly spaced rows), so a prepared frame
+# that changes under the same shape — e.g. after a cleaner changes — is
+# profiled again; a new dataset version starts over. Columns with more
+# labels than MAX_DISTINCT fall back to a scan of the frame.
+# ─────────────────────────────────────────────────────────────
+MAX_DISTINCT = 1_000            # labels kept per column (filter widgets beyond this are unusable anyway)
+DATE_TOKENS = ("date", "time")  # text columns named like this (and columns of date objects) get datetime min / max
+TOKEN_ROWS = 256                # rows hashed into a profile's content token
+_META_KEY = "_dataset_stats_meta"
+_WRITER_KEY = "_dataset_stats_writer"
+
+
+def _iso(value):
+    return None if pd.isna(value) else pd.Timestamp(value).isoformat()
+
+
+def _profile_column(s: pd.Series, name: str, max_distinct: int) -> dict:
+    out = {"nulls": int(s.isna().sum()), "distinct": None, "values": None, "min": None, "max": None, "kind": "text"}
+    if pd.api.types.is_datetime64_any_dtype(s):
+        out.update(kind="datetime", min=_iso(s.min()), max=_iso(s.max()))
+        return out
+    try:
+        codes, uniques = pd.factorize(s)
+    except TypeError:                      # unhashable cells (lists, dicts): counts only
+        return out
+    out["distinct"] = len(uniques)
+    if len(uniques) <= max_distinct:
+        out["values"] = sorted(pd.Series(np.asarray(uniques, dtype=object), dtype=object).astype(str).tolist())
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        lo, hi = s.min(), s.max()
+        out.update(kind="numeric", min=None if pd.isna(lo) else float(lo), max=None if pd.isna(hi) else float(hi))
+    elif len(uniques) and (any(t in name.lower() for t in DATE_TOKENS) or isinstance(uniques[0], datetime.date)):
+        parsed = pd.to_datetime(pd.Series(np.asarray(uniques, dtype=object), dtype=object), errors="coerce")
+        if parsed.notna().any():
+            out.update(kind="datetime", min=_iso(parsed.min()), max=_iso(parsed.max()))
+    return out
+
+
+def content_token(df: pd.DataFrame) -> str:
+    """Cheap content check for a stored profile: column dtypes and a hash of TOKEN_ROWS evenly spaced rows."""
+    positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), TOKEN_ROWS)).astype("int64")) if len(df) else []
+    sample = df.iloc[positions]
+    try:
+        rows = pd.util.hash_pandas_object(sample, index=False)
+    except TypeError:                      # unhashable cells (lists, dicts)
+        rows = pd.util.hash_pandas_object(sample.astype(str), index=False)
+    digest = hashlib.sha1(rows.to_numpy().tobytes())
+    digest.update("|".join(map(str, df.dtypes)).encode())
+    return digest.hexdigest()[:16]
+
+
+def profile_frame(df: pd.DataFrame, max_distinct: int = MAX_DISTINCT) -> dict:
+    """JSON-ready profile of `df`: {"rows", "token", "columns": {name: {kind, nulls, distinct, values, min, max}}}."""
+    return {
+        "rows": int(len(df)),
+        "token": content_token(df),
+        "columns": {str(c): _profile_column(df.iloc[:, i], str(c), max_distinct) for i, c in enumerate(df.columns)},
+    }
+
+
+@dataclass
+class FrameStats:
+    """A stored profile read back for one frame; `frame` is only consulted when the profile cannot answer."""
+    profile: dict
+    frame: pd.DataFrame = None
+
+    @property
+    def rows(self) -> int:
+        return self.profile["rows"]
+
+    def column(self, col) -> dict:
+        return self.profile["columns"].get(str(col))
+
+    def nulls(self, col) -> int:
+        c = self.column(col)
+        return c["nulls"] if c else 0
+
+    def options(self, col) -> list:
+        """Sorted distinct labels of `col` as strings (what the filter widgets list); [] when absent."""
+        c = self.column(col)
+        if c is None:
+            return []
+        if c["values"] is not None:
+            return list(c["values"])
+        if self.frame is None:
+            return []
+        return sorted(self.frame[col].dropna().astype(str).unique())
+
+    def date_bounds(self, col):
+        """(min, max) Timestamps of a datetime-like column; None when absent or without valid dates."""
+        c = self.column(col)
+        if c is None or c["kind"] != "datetime" or c["min"] is None:
+            return None
+        return pd.Timestamp(c["min"]), pd.Timestamp(c["max"])
+
+
+# ---------- catalog binding ----------
+def bind_catalog(meta: dict, save) -> None:
+    """Catalog entry of the active dataset (profiles are stored in meta["stats"]) and how to persist it."""
+    st.session_state[_META_KEY] = meta
+    st.session_state[_WRITER_KEY] = save
+
+
+def _matches(profile: dict, df: pd.DataFrame) -> bool:
+    return (profile.get("rows") == len(df) and list(profile.get("columns", {})) == [str(c) for c in df.columns]
+            and profile.get("token") == content_token(df))
+
+
+def frame_stats(df: pd.DataFrame, stage: str) -> FrameStats:
+    """
+    Stored profile of `df` under `stage` for the active dataset, profiling (and persisting) it first
+    when missing or when `df` no longer has the profiled rows / columns / content token.
+    """
+    meta = st.session_state.get(_META_KEY)
+    stored = (meta or {}).get("stats", {}).get(stage)
+    if stored is not None and _matches(stored, df):
+        return FrameStats(stored, df)
+    profile = profile_frame(df)
+    if meta is not None:
+        meta.setdefault("stats", {})[stage] = profile
+        save = st.session_state.get(_WRITER_KEY)
+        if save is not None:
+            save()
+    return FrameStats(profile, df)
@@ -0,0 +1,185 @@
+# date_range_filter.py
+import streamlit as st
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+
+from cache_registry import current_scope, session_store
+from cow_context import shared_view
+from dimension_encoding import drop_unused_categories
+
+INDEX_CACHE_SIZE = 4          # last N (dataset, date column) indexes kept per session
+SLICE_CACHE_SIZE = 4          # last N (dataset, range) slices kept per session
+_INDEX_STORE = "date_range_indexes"
+_SLICE_STORE = "date_range_slices"
+
+
+# ---------- date order ----------
+@dataclass
+class DateIndex:
+    """
+    Sort permutation of one dataset by its datetime column (undated rows last) and the parsed
+    timestamps in that order. Any [start, end] day range is a contiguous run of the permutation,
+    found with searchsorted; its rows are taken from the caller's frame on demand, so no reordered
+    copy of the dataset is kept.
+      - order: row positions in date order; None when the frame is already in date order
+      - stamps: parsed date column in date order (NaT last)
+      - dated: number of rows with a valid date
+    """
+    order: np.ndarray
+    stamps: pd.api.extensions.ExtensionArray
+    dated: int
+
+    @property
+    def empty(self) -> bool:
+        return self.dated == 0
+
+    @property
+    def min_date(self):
+        return self.stamps[0].date() if not self.empty else None
+
+    @property
+    def max_date(self):
+        return self.stamps[self.dated - 1].date() if not self.empty else None
+
+    def positions(self, start_date, end_date):
+        """Positions [lo, hi) in date order of the days start_date..end_date (both inclusive)."""
+        keys = self.stamps.asi8[:self.dated]   # int64 view in the column's own unit (UTC when tz-aware)
+        unit = self.stamps.unit
+        start = np.datetime64(pd.Timestamp(start_date), unit).astype("int64")
+        end = np.datetime64(pd.Timestamp(end_date) + pd.Timedelta(days=1), unit).astype("int64")
+        return int(np.searchsorted(keys, start, side="left")), int(np.searchsorted(keys, end, side="left"))
+
+    def take(self, df: pd.DataFrame, lo: int, hi: int, date_col: str, day_col: str) -> pd.DataFrame:
+        """Rows lo..hi (date order) of `df`, with `date_col` parsed and `day_col` added."""
+        out = df.iloc[lo:hi] if self.order is None else df.iloc[self.order[lo:hi]]
+        out = out.copy(deep=False)
+        stamps = pd.Series(self.stamps[lo:hi], index=out.index)
+        out[date_col] = stamps
+        out[day_col] = stamps.dt.date
+        return out
+
+    def slice(self, df: pd.DataFrame, start_date, end_date, date_col: str, day_col: str) -> pd.DataFrame:
+        return self.take(df, *self.positions(start_date, end_date), date_col, day_col)
+
+    def whole(self, df: pd.DataFrame, date_col: str, day_col: str) -> pd.DataFrame:
+        return self.take(df, 0, len(self.stamps), date_col, day_col)
+
+
+def _build_index(df: pd.DataFrame, date_col: str) -> DateIndex:
+    ts = pd.to_datetime(df[date_col], errors="coerce")
+    order = np.argsort(ts.to_numpy(dtype="datetime64[ns]"), kind="stable")  # NaT sorts last
+    stamps = ts.array.take(order)
+    dated = int(ts.notna().sum())
+    in_order = bool((order == np.arange(len(order))).all())
+    return DateIndex(order=None if in_order else order, stamps=stamps, dated=dated)
+
+
+# ---------- dataset identity ----------
+def _fingerprint(df: pd.DataFrame, date_col: str):
+    """
+    Key for the date order of `df`. With a dataset active, its (id, version) identifies the data, so
+    the key is that scope plus the frame's shape, schema and end dates (no pass over the rows);
+    without one, the row count and a hash of the full date column (all the index depends on).
+    """
+    dataset_id, version = current_scope()
+    if dataset_id is not None:
+        col = df[date_col]
+        ends = (col.iloc[0], col.iloc[-1]) if len(df) else ()
+        return ("scope", dataset_id, version, len(df), tuple(map(str, df.columns)),
+                tuple(map(str, df.dtypes)), tuple(map(str, ends)))
+    try:
+        dates = int(pd.util.hash_pandas_object(df[date_col], index=False).sum())
+    except TypeError:
+        # unhashable cells (lists/dicts) -> fall back to their string form
+        dates = int(pd.util.hash_pandas_object(df[date_col].astype(str), index=False).sum())
+    return (len(df), str(df[date_col].dtype), dates)
+
+
+# ---------- index & slice caches ----------
+def _lru(name: str, key, build, size: int):
+    cache = session_store(name, size)
+    if key in cache:
+        cache.touch(key)
+        return cache[key]
+    cache[key] = build()
+    return cache[key]
+
+
+def _index_for(df: pd.DataFrame, date_col: str, token=None) -> DateIndex:
+    key = (date_col, token or _fingerprint(df, date_col))
+    return _lru(_INDEX_STORE, key, lambda: _build_index(df, date_col), INDEX_CACHE_SIZE)
+
+
+def _slice_for(df: pd.DataFrame, start_date, end_date, date_col: str, day_col: str, token=None) -> pd.DataFrame:
+    """
+    Filtered frame for one range, kept for the last SLICE_CACHE_SIZE ranges so reruns on an unchanged
+    picker reuse it. Slices of a frame already in date order are views; otherwise each is a gathered
+    copy of its rows, which is what the small bound is for.
+    """
+    token = token or _fingerprint(df, date_col)
+
+    def build():
+        index = _index_for(df, date_col, token)
+        return drop_unused_categories(index.slice(df, start_date, end_date, date_col, day_col))
+
+    key = (date_col, day_col, token, start_date, end_date)
+    return _lru(_SLICE_STORE, key, build, SLICE_CACHE_SIZE).copy(deep=False)
+
+
+def date_index(df: pd.DataFrame, date_col: str = "created_time") -> DateIndex:
+    """Date order of `df`, built once per date-column content and reused across reruns."""
+    return _index_for(df, date_col)
+
+
+def slice_date_range(df: pd.DataFrame, start_date, end_date,
+                     date_col: str = "created_time", day_col: str = "created_date") -> pd.DataFrame:
+    """
+    Rows whose `date_col` falls on start_date..end_date (inclusive). The rows come back in
+    `date_col` order, not in the order of `df`.
+    """
+    return _slice_for(df, start_date, end_date, date_col, day_col)
+
+
+# ---------- PUBLIC UI ----------
+def date_range_filter(
+    df: pd.DataFrame,
+    date_col: str = "created_time",
+    day_col: str = "created_date",
+    start_key: str = "start_date_picker",
+    end_key: str = "end_date_picker",
+    reset_key: str = "reset_button_2",
+):
+    """
+    Renders the Start/End date pickers + reset button shared by the recommendation tabs and
+    returns the filtered frame (None when start > end). Frames without a usable `date_col`
+    are returned unfiltered. Filtered (and reset) frames are in `date_col` order with undated
+    rows last, not in the order of `df`.
+    """
+    if date_col not in df.columns or df[date_col].isna().all():
+        return shared_view(df)
+
+    token = _fingerprint(df, date_col)
+    index = _index_for(df, date_col, token)
+    if index.empty:
+        return index.whole(df, date_col, day_col)
+
+    min_date, max_date = index.min_date, index.max_date
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date, key=start_key)
+    with col2:
+        end_date = st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date, key=end_key)
+
+    st.markdown(f"🗓️ **Selected Range:** `{start_date.strftime('%d/%m/%Y')}` → `{end_date.strftime('%d/%m/%Y')}`")
+
+    reset_filter = st.button("🔁 Reset to Default", key=reset_key)
+
+    if reset_filter:
+        st.info("Showing all available data (no date filter applied).")
+        return index.whole(df, date_col, day_col)
+    if start_date > end_date:
+        st.warning("⚠️ Start date is after end date. Please select a valid range.")
+        return None
+
+    return _slice_for(df, start_date, end_date, date_col, day_col, token)
@@ -0,0 +1,84 @@
+# dimension_encoding.py
+import pandas as pd
+
+from cleaning_executor import ExecutionReport, run_columns
+
+# ---------- dimension columns ----------
+# Low/medium-cardinality labels every domain groups/filters by. Matched case-insensitively,
+# so raw headers such as "Approver" (change data is not snake_cased) are covered too.
+DIMENSION_COLUMNS = (
+    "technician", "department", "category", "subcategory", "priority",
+    "request_status", "status", "location", "vendor", "component_type",
+    "approver", "environment", "site", "region", "service_name",
+    "asset_type", "manufacturer", "brand", "assigned_group", "support_group",
+    "impact", "urgency", "change_type", "risk_level", "server_type", "device_type",
+    "breach_reason",
+)
+
+MAX_UNIQUE = 5000          # above this a column is an identifier/free text, not a dimension
+MAX_UNIQUE_RATIO = 0.5     # ... or when most values are distinct
+
+
+def _is_string_labels(s: pd.Series) -> bool:
+    if not (pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)):
+        return False
+    return pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty")
+
+
+def is_dimension(s: pd.Series) -> bool:
+    """
+    Already categorical, or string labels with at most MAX_UNIQUE distinct values *and* at most
+    MAX_UNIQUE_RATIO × rows of them (both limits apply; a column failing either stays as it is).
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return True
+    if len(s) == 0 or not _is_string_labels(s):
+        return False
+    n_unique = s.nunique(dropna=True)
+    return n_unique <= MAX_UNIQUE and n_unique <= max(1, MAX_UNIQUE_RATIO * len(s))
+
+
+def _encode(s: pd.Series) -> pd.Series:
+    return s.astype("category") if is_dimension(s) else s
+
+
+def encode_dimensions(df: pd.DataFrame, columns=DIMENSION_COLUMNS, exclude=(), report: ExecutionReport = None,
+                      workers: int = None) -> pd.DataFrame:
+    """
+    Cleaning-layer step: store dimension columns as pandas categoricals (int codes + one copy of
+    each label). Values and NaN are unchanged; `==`, `.isin`, `.str`, groupby and value_counts
+    all keep working. Columns that fail `is_dimension` are left as they are. Columns are encoded
+    in parallel (cleaning_executor.py).
+    """
+    wanted = {c.lower() for c in columns} - {c.lower() for c in exclude}
+    tasks = [(col, _encode) for col in df.columns
+             if str(col).lower() in wanted and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    out = df
+    for col, encoded in run_columns(df, tasks, "dimensions", workers, report).items():
+        if out is df:
+            out = df.copy(deep=False)
+        out[col] = encoded
+    return out
+
+
+# ---------- filtering / display edge ----------
+def drop_unused_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """After row filtering: forget labels with no rows, so value_counts/groupby show only what is there."""
+    cols = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    if not cols:
+        return df
+    out = df.copy(deep=False)
+    for col in cols:
+        out[col] = out[col].cat.remove_unused_categories()
+    return out
+
+
+def arrow_safe_categorical(s: pd.Series) -> pd.Series:
+    """Keep the dictionary encoding for Arrow; only non-string category labels are stringified."""
+    if pd.api.types.infer_dtype(s.cat.categories, skipna=True) == "string":
+        return s
+    try:
+        return s.cat.rename_categories(lambda c: str(c))
+    except ValueError:
+        # two labels collapse to the same string (e.g. 1 and "1") -> plain strings
+        return s.astype("string")
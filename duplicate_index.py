@@ -0,0 +1,212 @@
+# duplicate_index.py
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from cache_registry import session_store
+
+# ─────────────────────────────────────────────────────────────
+# Row-hash duplicate index
+# Every row gets one 64-bit content hash, computed once per frame: text
+# columns are factorized and only their distinct values are hashed (then
+# taken back to the rows); numeric / datetime columns are hashed directly;
+# the per-column hashes are mixed as pd.util.hash_pandas_object does.
+# Values hash alike exactly when DataFrame.duplicated compares them equal:
+# numbers by value whatever their dtype (1 == 1.0 == True, -0.0 == 0.0),
+# datetimes whatever their unit, a string never as a number, and every
+# missing value (None, NaN, NaT, NA) as one. The
+# same hashes answer "how many duplicates", "which rows" (display sample),
+# "drop them", and — because they depend only on row content — extend to
+# appended rows: a re-uploaded frame whose leading rows hash exactly as an
+# indexed frame keeps that frame's duplicate flags, and only the appended
+# rows are checked against them. Near-duplicate
+# keys (e.g. ticket id + normalised subject) are hashed the same way from
+# a key frame instead of the whole row.
+# ─────────────────────────────────────────────────────────────
+ID_COLUMNS = ("request_id", "ticket_id", "ticket_number", "incident_id", "change_id", "number", "id")
+TEXT_COLUMNS = ("subject", "title", "short_description", "summary")
+SAMPLE_ROWS = 1_000              # duplicate rows kept for display
+_REPLY_PREFIX = r"^\s*((re|fw|fwd)\s*:\s*)+"
+_NA_HASH = np.uint64(0x9E3779B97F4A7C15)
+_STORE = "duplicate_indexes"
+_MAX_INDEXES = 8
+_PREFIX_PROBES = 64              # rows sampled to rule out stored prefixes before hashing the frame
+
+
+def _numeric_hash(v: np.ndarray) -> np.ndarray:
+    """Hash of numbers by value: whole floats and bools as the equal int64, other floats as float64."""
+    if v.dtype.kind in "biu" and not (v.dtype == np.uint64 and len(v) and v.max() >= 2 ** 63):
+        return pd.util.hash_array(v.astype("int64"), categorize=False)
+    if v.dtype.kind != "f":
+        return pd.util.hash_array(v, categorize=False)
+    v = v.astype("float64") + 0.0          # -0.0 -> 0.0
+    na = np.isnan(v)
+    out = pd.util.hash_array(np.where(na, np.nan, v), categorize=False)
+    out[na] = _NA_HASH
+    whole = ~na & np.isfinite(v) & (v == np.trunc(v)) & (np.abs(v) < 2.0 ** 63)
+    if whole.any():
+        out[whole] = pd.util.hash_array(v[whole].astype("int64"), categorize=False)
+    return out
+
+
+def _temporal_hash(v: np.ndarray) -> np.ndarray:
+    try:
+        v = v.astype(f"{v.dtype.kind}8[ns]")
+    except (OverflowError, ValueError):    # outside the ns range: hash in the column's own unit
+        pass
+    out = pd.util.hash_array(v, categorize=False)
+    out[np.isnat(v)] = _NA_HASH
+    return out
+
+
+def _object_hash(values: np.ndarray) -> np.ndarray:
+    """Hash of distinct object values: strings as themselves, numbers by value, anything else by type and text."""
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        return pd.util.hash_array(values, categorize=False)
+    n = len(values)
+    # ints beyond int64 fall through to their text
+    ints = np.fromiter((isinstance(x, (int, np.integer, np.bool_)) and -2 ** 63 <= int(x) < 2 ** 63
+                        for x in values), dtype=bool, count=n)
+    floats = np.fromiter((isinstance(x, (float, np.floating)) for x in values), dtype=bool, count=n)
+    rest = ~(ints | floats)
+    out = np.empty(n, dtype="uint64")
+    if ints.any():
+        out[ints] = _numeric_hash(np.array(values[ints].tolist(), dtype="int64"))
+    if floats.any():
+        out[floats] = _numeric_hash(np.array(values[floats].tolist(), dtype="float64"))
+    if rest.any():
+        tagged = [x if isinstance(x, str) else f"\x00{type(x).__name__}:{x}" for x in values[rest]]
+        out[rest] = pd.util.hash_array(np.array(tagged, dtype=object), categorize=False)
+    return out
+
+
+def _column_hash(s: pd.Series) -> np.ndarray:
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind in "biufc":
+        return _numeric_hash(s.to_numpy())
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind in "mM":
+        return _temporal_hash(s.to_numpy())
+    if isinstance(s.dtype, pd.DatetimeTZDtype):
+        return _temporal_hash(s.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy())
+    codes, uniques = pd.factorize(s)
+    values = np.asarray(uniques, dtype=object)
+    return np.append(_object_hash(values), _NA_HASH)[codes]
+
+
+def row_hashes(df: pd.DataFrame, columns=None) -> np.ndarray:
+    """One uint64 per row from the values of `columns` (default: all), independent of the index."""
+    series = [df.iloc[:, i] for i in range(df.shape[1])] if columns is None else [df[c] for c in columns]
+    out = np.full(len(df), 0x345678, dtype="uint64")
+    mult = np.full(1, 1000003, dtype="uint64")
+    for i, s in enumerate(series):
+        out ^= _column_hash(s)
+        out *= mult
+        mult += np.uint64(82520 + 2 * (len(series) - i))
+    return out + np.uint64(97531)
+
+
+def normalize_text(s: pd.Series) -> pd.Series:
+    """Lower-cased, punctuation-free, single-spaced text with reply/forward prefixes removed (per distinct value)."""
+    codes, uniques = pd.factorize(s)
+    u = pd.Series(np.asarray(uniques, dtype=object), dtype=object).map(str).str.lower()
+    u = u.str.replace(_REPLY_PREFIX, "", regex=True).str.replace(r"[^\w\s]", " ", regex=True)
+    u = u.str.replace(r"\s+", " ", regex=True).str.strip()
+    values = np.append(u.to_numpy(dtype=object), None)[codes]
+    return pd.Series(values, index=s.index, name=s.name, dtype=object)
+
+
+def near_duplicate_key(df: pd.DataFrame, ids=ID_COLUMNS, texts=TEXT_COLUMNS):
+    """
+    Key frame of the first id column and first free-text column present (text normalised), and a label
+    for it; (None, None) when `df` has neither.
+    """
+    id_col = next((c for c in ids if c in df.columns), None)
+    text_col = next((c for c in texts if c in df.columns), None)
+    if id_col is None or text_col is None:
+        return None, None
+    key = pd.DataFrame({id_col: df[id_col], text_col: normalize_text(df[text_col])}, index=df.index)
+    return key, f"{id_col} + normalised {text_col}"
+
+
+@dataclass
+class DuplicateIndex:
+    """
+    Row hashes of one frame and what follows from them.
+      - hashes: uint64 per row
+      - mask: True for rows whose content already appeared earlier in the frame (keep="first")
+    """
+    hashes: np.ndarray
+    mask: np.ndarray
+
+    @classmethod
+    def from_hashes(cls, hashes: np.ndarray) -> "DuplicateIndex":
+        return cls(hashes=hashes, mask=pd.Series(hashes).duplicated().to_numpy())
+
+    @property
+    def count(self) -> int:
+        return int(self.mask.sum())
+
+    @property
+    def positions(self) -> np.ndarray:
+        return np.flatnonzero(self.mask)
+
+    def sample(self, n: int = SAMPLE_ROWS) -> np.ndarray:
+        """Positions of up to `n` duplicate rows, spread evenly across the frame."""
+        pos = self.positions
+        if len(pos) <= n:
+            return pos
+        return pos[np.linspace(0, len(pos) - 1, n).astype("int64")]
+
+    def keep(self) -> np.ndarray:
+        """Boolean row filter equivalent to drop_duplicates()."""
+        return ~self.mask
+
+    def extend(self, new_rows: pd.DataFrame, columns=None) -> "DuplicateIndex":
+        """Index for the frame with `new_rows` appended; only the new rows are hashed."""
+        return self._append(row_hashes(new_rows, columns))
+
+    def _append(self, new_hashes: np.ndarray) -> "DuplicateIndex":
+        hashes = np.concatenate([self.hashes, new_hashes])
+        seen = pd.Series(hashes).duplicated().to_numpy()[len(self.hashes):]
+        return DuplicateIndex(hashes=hashes, mask=np.concatenate([self.mask, seen]))
+
+
+def build_index(df: pd.DataFrame, columns=None) -> DuplicateIndex:
+    return DuplicateIndex.from_hashes(row_hashes(df, columns))
+
+
+# ---------- session reuse (appended uploads) ----------
+def _probe_positions(n: int) -> np.ndarray:
+    return np.unique(np.linspace(0, n - 1, min(n, _PREFIX_PROBES)).astype("int64")) if n else np.empty(0, "int64")
+
+
+def duplicate_index(df: pd.DataFrame, columns=None) -> DuplicateIndex:
+    """
+    `build_index`, reused within the session: when `df` starts with the rows of a frame indexed earlier
+    (same columns, and every row of that prefix hashes the same), its duplicate flags are kept and only
+    the remaining rows are checked. A fixed row sample rules out non-matching prefixes before `df` is
+    hashed; it never decides a reuse on its own.
+    """
+    store = session_store(_STORE, _MAX_INDEXES)
+    signature = tuple(map(str, df.columns if columns is None else columns))
+
+    base, hashes = None, None
+    for (sig, n), (probe, index) in sorted(store.items(), key=lambda kv: -kv[0][1]):
+        if sig != signature or n > len(df):
+            continue
+        if not np.array_equal(row_hashes(df.iloc[_probe_positions(n)], columns), probe):
+            continue
+        if hashes is None:
+            hashes = row_hashes(df, columns)
+        if np.array_equal(hashes[:n], index.hashes):
+            base = (n, index)
+            break
+    if base is not None and base[0] == len(df):
+        return base[1]
+    if base is not None:
+        index = base[1]._append(hashes[base[0]:])
+    else:
+        index = build_index(df, columns) if hashes is None else DuplicateIndex.from_hashes(hashes)
+
+    store[(signature, len(df))] = (index.hashes[_probe_positions(len(df))], index)
+    return index
@@ -0,0 +1,160 @@
+# excel_ingest.py
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime as _dt
+
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# Multi-sheet Excel ingestion
+# pd.read_excel(buffer) parses only the first sheet, and parsing .xlsx with
+# openpyxl is slow enough that CMDB / capacity workbooks take minutes. An
+# upload is instead staged to disk once, its sheet names listed (read-only,
+# without parsing cells), and the selected sheets parsed in worker
+# processes — openpyxl parsing is pure Python, so threads would serialise
+# on the GIL — each worker writing its sheet straight to parquet (or to an
+# Arrow file for memory-mapped storage, arrow_store.py), so no frame is
+# pickled back. The file manager records the sheet -> dataset mapping in
+# catalog.json; later sessions load the stored files only.
+# ─────────────────────────────────────────────────────────────
+EXCEL_SUFFIXES = (".xlsx", ".xlsm", ".xls")
+MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))   # each worker holds one parsed sheet in memory
+
+
+@dataclass
+class SheetResult:
+    """
+    One converted sheet.
+      - path: file written by the worker (the backend's, else parquet, else pickle); None when
+              nothing could be written, with the reason in `error`
+      - shape: (rows, columns) of the parsed sheet
+      - seconds: parse + write time in the worker
+      - stats: column profile of the sheet (dataset_stats.profile_frame) for its catalog entry
+      - error: why the sheet is stored as pickle, or was not stored at all
+    """
+    sheet: str
+    path: str
+    shape: tuple
+    seconds: float
+    error: str = None
+    stats: dict = None
+
+
+def is_excel(name: str) -> bool:
+    return name.lower().endswith(EXCEL_SUFFIXES)
+
+
+def list_sheets(path: str) -> list:
+    """Sheet names in workbook order, without reading any cells."""
+    if path.lower().endswith(".xls"):
+        with pd.ExcelFile(path) as book:
+            return list(book.sheet_names)
+    from openpyxl import load_workbook
+    book = load_workbook(path, read_only=True)
+    try:
+        return list(book.sheetnames)
+    finally:
+        book.close()
+
+
+def read_sheet(path: str, sheet: str) -> pd.DataFrame:
+    return pd.read_excel(path, sheet_name=sheet)
+
+
+def _looks_datetime_object_series(s: pd.Series) -> bool:
+    if s.dtype != "object":
+        return False
+    # any real datetime-like python objects hiding in an object column?
+    try:
+        return s.map(lambda x: isinstance(x, (pd.Timestamp, _dt))).any()
+    except Exception:
+        return False
+
+
+def normalize_for_storage(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of `df` that parquet / Arrow can hold: datetime objects parsed, mixed object columns as strings."""
+    out = df.copy()
+    for col in out.columns:
+        s = out[col]
+
+        # If it's already a pandas datetime dtype, keep it
+        if pd.api.types.is_datetime64_any_dtype(s):
+            continue
+
+        # If it's an object column containing datetime objects, coerce to pandas datetime
+        if _looks_datetime_object_series(s):
+            out[col] = pd.to_datetime(s, errors="coerce")
+            continue
+
+        # If it's an object column with messy mixed types (strings, numbers, None),
+        # cast to "string" dtype (Arrow-friendly) instead of Python-object.
+        if s.dtype == "object":
+            try:
+                out[col] = s.astype("string")
+            except Exception:
+                out[col] = s.astype(str)
+
+    return out
+
+
+def _write_parquet(df: pd.DataFrame, basepath: str) -> str:
+    out = basepath + ".parquet"
+    df.to_parquet(out, index=False)
+    return out
+
+
+def _write_pickle(df: pd.DataFrame, basepath: str) -> str:
+    out = basepath + ".pkl"
+    with open(out, "wb") as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return out
+
+
+def _store_sheet(df: pd.DataFrame, basepath: str, backend: str):
+    """
+    Write `df` with the same fallbacks as the file manager's own saves: the backend as parsed, then
+    normalised, then parquet (for arrow), then pickle. Returns (path, error of the last failed write).
+    """
+    writers = [_write_parquet]
+    if backend == "arrow":
+        from arrow_store import write_arrow
+        writers.insert(0, write_arrow)
+    error, normalized = None, None
+    for write in writers:
+        for frame in ("parsed", "normalized"):
+            try:
+                if frame == "normalized" and normalized is None:
+                    normalized = normalize_for_storage(df)
+                return write(df if frame == "parsed" else normalized, basepath), None
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+    try:
+        return _write_pickle(df, basepath), f"stored as pickle ({error})"
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _convert_sheet(job: tuple) -> SheetResult:
+    """Worker: parse and profile one sheet and write it to `basepath`.parquet (or .arrow / .pkl)."""
+    from dataset_stats import profile_frame
+    path, sheet, basepath, backend = job
+    t0 = time.perf_counter()
+    df = read_sheet(path, sheet)
+    stats = profile_frame(df)
+    out, error = _store_sheet(df, basepath, backend)
+    return SheetResult(sheet, out, df.shape, time.perf_counter() - t0, error, stats)
+
+
+def convert_sheets(path: str, sheets: list, basepaths: list, workers: int = None, backend: str = "parquet") -> list:
+    """Parse `sheets` of the workbook at `path` into `backend` files at `basepaths` (one per sheet), in sheet order."""
+    jobs = [(path, sheet, base, backend) for sheet, base in zip(sheets, basepaths)]
+    workers = min(workers or MAX_WORKERS, len(jobs))
+    if workers <= 1:
+        return [_convert_sheet(job) for job in jobs]
+    # spawn: the app process runs server threads that must not be forked
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_convert_sheet, jobs))
@@ -1,11 +1,18 @@
 # file_manager.py
 import streamlit as st
 import pandas as pd
-import os, json, uuid, io, pickle
+import os, json, uuid, io, pickle, hashlib, time
 from datetime import datetime as _dt
 
+from cache_registry import MAX_CACHE_BYTES, cache_bytes, cache_stats, cached, invalidate, set_scope
+from dataset_stats import bind_catalog, profile_frame
+from excel_ingest import (
+    MAX_WORKERS as _SHEET_WORKERS, convert_sheets, is_excel, list_sheets, normalize_for_storage,
+)
+
 DATA_DIR = ".streamlit_data"
 CATALOG_PATH = os.path.join(DATA_DIR, "catalog.json")
+_HASH_CHUNK = 1 << 20  # bytes read per step when fingerprinting an upload
 
 # ---------- simple uploaded_file-like shim ----------
 class _UploadedShim:
@@ -24,7 +31,7 @@ def _load_catalog():
                 return json.load(f)
         except Exception:
             pass
-    return {"datasets": {}, "last_active_id": None, "auto_load": True}
+    return {"datasets": {}, "workbooks": {}, "last_active_id": None, "auto_load": True, "storage": "parquet"}
 
 def _save_catalog(cat):
     _ensure_dirs()
@@ -38,8 +45,29 @@ def _parquet_available():
     except Exception:
         return False
 
+def _storage_backend() -> str:
+    """"arrow" (memory-mapped, shared between processes) or "parquet" (compact) for newly stored datasets."""
+    if "catalog" not in st.session_state:
+        return "parquet"
+    return st.session_state.catalog.get("storage", "parquet")
+
+def _save_arrow(df: pd.DataFrame, basepath: str):
+    from arrow_store import write_arrow
+    try:
+        return write_arrow(df, basepath)
+    except Exception:
+        try:
+            return write_arrow(normalize_for_storage(df), basepath)
+        except Exception:
+            return None  # -> Parquet / Pickle below
+
 def _save_df(df: pd.DataFrame, basepath: str):
-    # Try Parquet first (best for speed/size), then normalize and retry, then fall back to Pickle.
+    # Memory-mapped Arrow when selected; else (or if Arrow cannot hold the frame) Parquet first
+    # (best for speed/size), then normalize and retry, then fall back to Pickle.
+    if _storage_backend() == "arrow" and _parquet_available():
+        path = _save_arrow(df, basepath)
+        if path:
+            return path
     if _parquet_available():
         try:
             path = basepath + ".parquet"
@@ -47,7 +75,7 @@ def _save_df(df: pd.DataFrame, basepath: str):
             return path
         except Exception as e1:
             try:
-                df2 = _normalize_for_storage(df)
+                df2 = normalize_for_storage(df)
                 path = basepath + ".parquet"
                 df2.to_parquet(path, index=False)
                 return path
@@ -70,6 +98,9 @@ def _save_df(df: pd.DataFrame, basepath: str):
 
 
 def _load_df(path: str) -> pd.DataFrame:
+    if path.endswith(".arrow"):
+        from arrow_store import read_arrow
+        return read_arrow(path)
     if path.endswith(".parquet"):
         return pd.read_parquet(path)
     if path.endswith(".pkl"):
@@ -79,6 +110,23 @@ def _load_df(path: str) -> pd.DataFrame:
         return pd.read_csv(path)
     raise ValueError(f"Unsupported storage format: {path}")
 
+# ---------- upload fingerprint ----------
+def _content_hash(uploaded_file) -> str:
+    """sha256 of the upload's bytes, read in chunks; leaves the file positioned at the start."""
+    h = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in iter(lambda: uploaded_file.read(_HASH_CHUNK), b""):
+        h.update(chunk)
+    uploaded_file.seek(0)
+    return h.hexdigest()
+
+def _find_by_hash(content_hash: str):
+    """Id of a stored dataset with these exact file contents, if any."""
+    for ds_id, meta in st.session_state.datasets.items():
+        if meta.get("content_hash") == content_hash and os.path.exists(meta["path"]):
+            return ds_id
+    return None
+
 # ---------- parse uploaded files ----------
 def _read_uploaded_file(uploaded_file) -> pd.DataFrame:
     name = uploaded_file.name.lower()
@@ -106,6 +154,10 @@ def _bootstrap_state():
         st.session_state.datasets = {}  # id -> meta
     if "active_id" not in st.session_state:
         st.session_state.active_id = None
+    if "ingested_uploads" not in st.session_state:
+        st.session_state.ingested_uploads = {}  # uploader file_id -> dataset id (skip on reruns)
+    if "staged_workbooks" not in st.session_state:
+        st.session_state.staged_workbooks = {}  # content hash -> (staged .xlsx path, sheet names)
 
     # re-index persisted datasets
     if not st.session_state.datasets:
@@ -119,27 +171,152 @@ def _bootstrap_state():
             if last_id in st.session_state.datasets and os.path.exists(st.session_state.datasets[last_id]["path"]):
                 st.session_state.active_id = last_id
 
-def _add_dataset(df: pd.DataFrame, display_name: str):
-    ds_id = str(uuid.uuid4())[:8]
-    basepath = os.path.join(DATA_DIR, f"ds_{ds_id}")
-    path = _save_df(df, basepath)
+def _activate(ds_id: str):
+    st.session_state.active_id = ds_id
+    st.session_state.catalog["last_active_id"] = ds_id
+    _save_catalog(st.session_state.catalog)
+
+def _new_id():
+    return str(uuid.uuid4())[:8]
+
+def _add_dataset(df: pd.DataFrame, display_name: str, content_hash: str = None):
+    ds_id = _new_id()
+    path = _save_df(df, os.path.join(DATA_DIR, f"ds_{ds_id}"))
+    return _register_dataset(ds_id, path, display_name, df.shape, content_hash, stats=profile_frame(df))
 
+def _register_dataset(ds_id: str, path: str, display_name: str, shape, content_hash: str = None, sheet: str = None,
+                      stats: dict = None):
     meta = {
         "name": display_name,
         "path": path,
         "created_at": _dt.now().isoformat(timespec="seconds"),
-        "shape": list(df.shape),
+        "shape": list(shape),
+        "content_hash": content_hash,
+        "version": 1,
     }
+    if sheet is not None:
+        meta["sheet"] = sheet
+    if stats is not None:
+        meta["stats"] = {"raw": stats}  # column profile taken at ingest (dataset_stats.py)
     st.session_state.datasets[ds_id] = meta
     st.session_state.catalog.setdefault("datasets", {})[ds_id] = meta
     st.session_state.catalog["last_active_id"] = ds_id
     st.session_state.active_id = ds_id
     _save_catalog(st.session_state.catalog)
+    return ds_id
+
+def _ingest_upload(up):
+    """
+    Store one upload unless its contents are already stored. The uploader hands the same files
+    back on every rerun, so each file is handled once per session (by file_id); a new upload whose
+    bytes match a stored dataset reuses that dataset (and everything cached for its path).
+    """
+    file_id = getattr(up, "file_id", None) or f"{up.name}:{up.size}"
+    if file_id in st.session_state.ingested_uploads:
+        return
+    content_hash = _content_hash(up)
+    if is_excel(up.name):
+        _ingest_workbook(up, file_id, content_hash)
+        return
+    existing = _find_by_hash(content_hash)
+    if existing:
+        st.session_state.ingested_uploads[file_id] = existing
+        _activate(existing)
+        st.sidebar.info(f"Already stored: {up.name} → {st.session_state.datasets[existing]['name']}")
+        return
+    df = _read_uploaded_file(up)
+    st.session_state.ingested_uploads[file_id] = _add_dataset(df, up.name, content_hash)
+    st.sidebar.success(f"Added: {up.name} ({df.shape[0]} rows)")
+
+# ---------- multi-sheet workbooks ----------
+def _stage_workbook(up, content_hash: str):
+    """Copy the upload to disk (worker processes read it from there) and list its sheets; once per session."""
+    staged = st.session_state.staged_workbooks.get(content_hash)
+    if staged and os.path.exists(staged[0]):
+        return staged
+    _ensure_dirs()
+    path = os.path.join(DATA_DIR, f"wb_{content_hash[:16]}{os.path.splitext(up.name)[1].lower()}")
+    up.seek(0)
+    with open(path, "wb") as f:
+        for chunk in iter(lambda: up.read(_HASH_CHUNK), b""):
+            f.write(chunk)
+    up.seek(0)
+    staged = (path, list_sheets(path))
+    st.session_state.staged_workbooks[content_hash] = staged
+    return staged
+
+def _convert_workbook(up, content_hash: str, xlsx_path: str, sheets: list, all_sheets: list):
+    """Parse `sheets` in worker processes (parquet written by the workers) and register one dataset per sheet."""
+    book = st.session_state.catalog.setdefault("workbooks", {}).setdefault(
+        content_hash, {"name": up.name, "sheets": all_sheets, "datasets": {}})
+    ids = [_new_id() for _ in sheets]
+    t0 = time.perf_counter()
+    results = convert_sheets(xlsx_path, sheets, [os.path.join(DATA_DIR, f"ds_{i}") for i in ids],
+                             backend=_storage_backend() if _parquet_available() else "parquet")
+    rows = stored = 0
+    for ds_id, res in zip(ids, results):
+        if res.path is None:  # the worker exhausted every fallback; the sheet is not re-parsed here
+            st.sidebar.error(f"Failed to store sheet {res.sheet!r} of {up.name}: {res.error}")
+            continue
+        if res.error:
+            st.sidebar.warning(f"Sheet {res.sheet!r} of {up.name}: {res.error}")
+        name = up.name if len(all_sheets) == 1 else f"{up.name} › {res.sheet}"
+        _register_dataset(ds_id, res.path, name, res.shape, content_hash, sheet=res.sheet, stats=res.stats)
+        book["datasets"][res.sheet] = ds_id
+        rows += res.shape[0]
+        stored += 1
+    if not stored:
+        return
+    _save_catalog(st.session_state.catalog)
+    st.sidebar.success(
+        f"Added: {up.name} — {stored} sheet{'s' if stored > 1 else ''}, {rows:,} rows "
+        f"({time.perf_counter() - t0:.1f}s, {min(_SHEET_WORKERS, len(sheets))} worker process"
+        f"{'es' if min(_SHEET_WORKERS, len(sheets)) > 1 else ''})"
+    )
+
+def _ingest_workbook(up, file_id: str, content_hash: str):
+    """
+    Excel upload: every sheet can become its own dataset. Sheets stored from an earlier upload of the
+    same bytes (catalog["workbooks"]) are reused; multi-sheet workbooks wait for the user to pick sheets.
+    """
+    book = st.session_state.catalog.setdefault("workbooks", {}).get(content_hash, {})
+    stored = {s: i for s, i in book.get("datasets", {}).items() if i in st.session_state.datasets}
+    sheets = book.get("sheets") or _stage_workbook(up, content_hash)[1]
+
+    if len(sheets) == 1:
+        selected = sheets
+    else:
+        with st.sidebar.form(f"sheets_{file_id}"):
+            selected = st.multiselect(f"Sheets to import from {up.name}", sheets,
+                                      default=list(stored) or sheets, key=f"sheet_pick_{file_id}")
+            if not st.form_submit_button(f"📑 Import {len(sheets)}-sheet workbook"):
+                return
+        if not selected:
+            st.sidebar.warning("Select at least one sheet.")
+            return
+
+    missing = [s for s in selected if s not in stored]
+    if missing:
+        xlsx_path = _stage_workbook(up, content_hash)[0]
+        try:
+            _convert_workbook(up, content_hash, xlsx_path, missing, sheets)
+        finally:
+            os.remove(xlsx_path)  # the sheets are parquet now; the workbook is never parsed again
+            st.session_state.staged_workbooks.pop(content_hash, None)
+        stored = st.session_state.catalog["workbooks"][content_hash]["datasets"]
+    else:
+        st.sidebar.info(f"Already stored: {up.name} ({len(selected)} sheet{'s' if len(selected) > 1 else ''})")
+    kept = [s for s in selected if s in stored]
+    if not kept:  # no selected sheet could be stored; the sidebar shows why
+        return
+    st.session_state.ingested_uploads[file_id] = stored[kept[0]]
+    _activate(stored[kept[0]])
 
 def _delete_dataset(ds_id: str):
     meta = st.session_state.datasets.get(ds_id)
     if not meta:
         return
+    invalidate(ds_id)  # first: drops the cached frame, releasing a memory-mapped file before it is removed
     try:
         if os.path.exists(meta["path"]):
             os.remove(meta["path"])
@@ -147,12 +324,25 @@ def _delete_dataset(ds_id: str):
         pass
     st.session_state.datasets.pop(ds_id, None)
     st.session_state.catalog["datasets"].pop(ds_id, None)
+    for book in st.session_state.catalog.get("workbooks", {}).values():
+        book["datasets"] = {s: i for s, i in book["datasets"].items() if i != ds_id}
     if st.session_state.active_id == ds_id:
         st.session_state.active_id = None
         st.session_state.catalog["last_active_id"] = None
     _save_catalog(st.session_state.catalog)
 
-@st.cache_data(show_spinner=False)
+def _reload_dataset(ds_id: str) -> int:
+    """New version of one dataset: its load and everything derived from it are recomputed. Returns bytes released."""
+    meta = st.session_state.datasets.get(ds_id)
+    if not meta:
+        return 0
+    meta["version"] = int(meta.get("version", 1)) + 1
+    meta.pop("stats", None)  # profiles describe the previous version
+    st.session_state.catalog.setdefault("datasets", {})[ds_id] = meta
+    _save_catalog(st.session_state.catalog)
+    return invalidate(ds_id, keep_version=meta["version"])
+
+@cached(max_entries=4)
 def _cached_load_df(path: str):
     return _load_df(path)
 
@@ -170,9 +360,7 @@ def file_manager_ui(label="📂 Data Manager (multi-file + persistent)"):
     if uploads:
         for up in uploads:
             try:
-                df = _read_uploaded_file(up)
-                _add_dataset(df, up.name)
-                st.sidebar.success(f"Added: {up.name} ({df.shape[0]} rows)")
+                _ingest_upload(up)
             except Exception as e:
                 st.sidebar.error(f"Failed to load {up.name}: {e}")
 
@@ -198,8 +386,9 @@ def file_manager_ui(label="📂 Data Manager (multi-file + persistent)"):
     colA, colB = st.sidebar.columns(2)
     with colA:
         if st.button("🔄 Reload from disk"):
-            st.cache_data.clear()
-            st.sidebar.info("Reloaded cache.")
+            released = _reload_dataset(st.session_state.active_id)
+            st.sidebar.info(f"Reloaded {st.session_state.datasets[st.session_state.active_id]['name']} "
+                            f"({released / 1e6:.1f} MB of cached results dropped).")
     with colB:
         if st.button("🗑️ Remove dataset"):
             _delete_dataset(st.session_state.active_id)
@@ -213,15 +402,32 @@ def file_manager_ui(label="📂 Data Manager (multi-file + persistent)"):
         st.session_state.catalog["auto_load"] = auto
         _save_catalog(st.session_state.catalog)
 
+    mapped = st.sidebar.toggle(
+        "Store new datasets memory-mapped (Arrow)",
+        value=_storage_backend() == "arrow",
+        help="Larger files on disk, but every session and server process shares one copy of the data in memory.",
+    )
+    if mapped != (_storage_backend() == "arrow"):
+        st.session_state.catalog["storage"] = "arrow" if mapped else "parquet"
+        _save_catalog(st.session_state.catalog)
+
     # show a tiny summary and preview (optional UI sugar)
     meta = st.session_state.datasets[st.session_state.active_id]
     st.caption(f"**Active dataset:** {meta['name']}  |  stored: `{os.path.basename(meta['path'])}`  |  shape: {tuple(meta['shape'])}")
+    set_scope(st.session_state.active_id, meta.get("version", 1))
+    bind_catalog(meta, lambda: _save_catalog(st.session_state.catalog))
     try:
         df = _cached_load_df(meta["path"])
     except Exception as e:
         st.error(f"Failed to load active dataset: {e}")
         return None
 
+    with st.sidebar.expander(f"🧠 Cache: {cache_bytes() / 1e6:.1f} / {MAX_CACHE_BYTES / 1e6:.0f} MB"):
+        stats = cache_stats()
+        names = {ds_id: m["name"] for ds_id, m in st.session_state.datasets.items()}
+        stats["dataset_id"] = stats["dataset_id"].map(lambda i: names.get(i, i))
+        st.dataframe(stats.rename(columns={"dataset_id": "dataset"}), hide_index=True, use_container_width=True)
+
     # stash meta for compatibility helpers
     st.session_state["active_meta"] = meta
     return df
@@ -232,36 +438,3 @@ def get_active_uploaded_like():
     if not meta:
         return None
     return _UploadedShim(meta["name"])
-
-def _looks_datetime_object_series(s: pd.Series) -> bool:
-    if s.dtype != "object":
-        return False
-    # any real datetime-like python objects hiding in an object column?
-    try:
-        return s.map(lambda x: isinstance(x, (pd.Timestamp, _dt))).any()
-    except Exception:
-        return False
-
-def _normalize_for_storage(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    for col in out.columns:
-        s = out[col]
-
-        # If it's already a pandas datetime dtype, keep it
-        if pd.api.types.is_datetime64_any_dtype(s):
-            continue
-
-        # If it's an object column containing datetime objects, coerce to pandas datetime
-        if _looks_datetime_object_series(s):
-            out[col] = pd.to_datetime(s, errors="coerce")
-            continue
-
-        # If it's an object column with messy mixed types (strings, numbers, None),
-        # cast to "string" dtype (Arrow-friendly) instead of Python-object.
-        if s.dtype == "object":
-            try:
-                out[col] = s.astype("string")
-            except Exception:
-                out[col] = s.astype(str)
-
-    return out
@@ -18,6 +18,12 @@ import types
 import datetime as _dt
 
 from file_manager import file_manager_ui, get_active_uploaded_like
+from cache_registry import cached
+from dataset_stats import frame_stats
+from cow_context import enable_copy_on_write
+
+# Modules share the loaded frame; pandas copies a column only when it is written
+enable_copy_on_write()
 
 #-----------------------------------------------------------------------------------------------------------------------------------------
 
@@ -165,14 +171,10 @@ import datetime as _dt_again
 import pandas as _pd
 import streamlit as _st_again
 
-@st.cache_data(
-    show_spinner=False,
-    # Safety net: treat function objects as a constant hash so cache never chokes on them
-    hash_funcs={types.FunctionType: lambda _: "FUNC-IGNORED"}
-)
+@cached(max_entries=8)
 def _generate_report_cached(_generator_func, df, client_name, period, logo_path):
     """
-    Leading underscore on `_generator_func` tells Streamlit NOT to hash this arg.
+    Leading underscore on `_generator_func` keeps it out of the cache key (see cache_registry.cached).
     """
     return _generator_func(
         df,
@@ -248,14 +250,11 @@ def export_report_ui(
 # (Optional) helper to infer a human-friendly period from your DF
 def _infer_period_from_df(df: _pd.DataFrame) -> str:
     try:
-        if "created_time" in df.columns:
-            s = _pd.to_datetime(df["created_time"], errors="coerce").dropna()
-        elif "created_date" in df.columns:
-            s = _pd.to_datetime(df["created_date"], errors="coerce").dropna()
-        else:
-            s = _pd.Series([], dtype="datetime64[ns]")
-        if not s.empty:
-            dmin, dmax = s.min().date(), s.max().date()
+        # date span from the dataset's ingest-time column profile (catalog.json), not a scan per rerun
+        col = "created_time" if "created_time" in df.columns else ("created_date" if "created_date" in df.columns else None)
+        bounds = frame_stats(df, "raw").date_bounds(col) if col else None
+        if bounds:
+            dmin, dmax = bounds[0].date(), bounds[1].date()
             if dmin.year == dmax.year:
                 return dmin.strftime("%b %Y") if dmin.month == dmax.month else f"{dmin.strftime('%b')}–{dmax.strftime('%b %Y')}"
             return f"{dmin.strftime('%b %Y')} – {dmax.strftime('%b %Y')}"
@@ -0,0 +1,233 @@
+# schema_registry.py
+import functools
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from cleaning_executor import ExecutionReport, run_columns
+
+# ─────────────────────────────────────────────────────────────
+# Declarative column schemas
+# Each domain registers the columns it knows (aliases, dtype, unit, boolean
+# vocabulary) plus token rules for columns it only recognises by name. A
+# schema is compiled against an upload's (normalised) column names into a
+# cleaning plan — renames plus one conversion per column — and the plan is
+# cached by (domain, columns), so re-uploading the same layout skips the
+# alias / token matching. Conversions run once per column on its distinct
+# values (factorize → convert uniques → take), not per cell, and the
+# columns are converted in parallel (cleaning_executor.py).
+# ─────────────────────────────────────────────────────────────
+DTYPES = ("datetime", "timedelta", "numeric", "bool", "text")
+TRUE_VALUES = frozenset({"true", "yes", "y", "1"})
+FALSE_VALUES = frozenset({"false", "no", "n", "0"})
+# Unit suffixes / symbols stripped (with thousands separators and spaces) before numeric parsing
+UNITS = {
+    "percent": r"%",
+    "minutes": r"minutes?|mins?",
+    "hours": r"hours?|hrs?",
+    "ms": r"ms",
+    "currency": r"rm|myr|usd|\$",
+    "gb": r"gb",
+    "tb": r"tb",
+    "gbps": r"gbps",
+    "kwh": r"kwh",
+    "kg": r"kg",
+}
+_PLAN_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    How one column is typed.
+      - dtype: one of DTYPES; "text" claims the column so no token rule converts it
+      - aliases: other (normalised) names the column arrives under; renamed to `name` when `name` is absent
+      - unit: key of UNITS stripped before numeric parsing (also shown in the plan summary)
+      - dayfirst: datetime parsing order
+      - text_only: datetime only for text columns that are not entirely numeric
+      - true_values / false_values: boolean vocabulary, matched case-insensitively after strip
+      - na: value for rows outside the vocabulary; min_share: keep the column unchanged unless at
+            least this share of rows maps to True/False
+    """
+    name: str = ""
+    dtype: str = "text"
+    aliases: tuple = ()
+    unit: str = None
+    dayfirst: bool = False
+    text_only: bool = False
+    true_values: frozenset = TRUE_VALUES
+    false_values: frozenset = FALSE_VALUES
+    na: object = pd.NA
+    min_share: float = 0.0
+
+
+@dataclass(frozen=True)
+class TokenRule:
+    """Applies `spec` to undeclared columns whose name contains any of `tokens` (first matching rule wins)."""
+    tokens: tuple
+    spec: ColumnSpec
+
+
+@dataclass(frozen=True)
+class DomainSchema:
+    domain: str
+    columns: tuple = ()
+    rules: tuple = ()
+
+
+@dataclass(frozen=True)
+class CleaningPlan:
+    """
+    A schema resolved against one column layout.
+      - renames: (alias found, canonical name) pairs
+      - steps: (column, ColumnSpec, source) — source is "declared", "alias" or "token:<token>"
+    """
+    domain: str
+    renames: tuple
+    steps: tuple
+
+    def summary(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [{"Column": c, "Type": s.dtype, "Unit": s.unit or "", "Source": src} for c, s, src in self.steps],
+            columns=["Column", "Type", "Unit", "Source"],
+        )
+
+
+_SCHEMAS = {}
+
+
+def register(schema: DomainSchema) -> DomainSchema:
+    for spec in schema.columns:
+        if spec.dtype not in DTYPES:
+            raise ValueError(f"{schema.domain}.{spec.name}: unknown dtype '{spec.dtype}'")
+        if spec.unit is not None and spec.unit not in UNITS:
+            raise ValueError(f"{schema.domain}.{spec.name}: unknown unit '{spec.unit}'")
+    _SCHEMAS[schema.domain] = schema
+    compile_plan.cache_clear()
+    return schema
+
+
+def get_schema(domain: str) -> DomainSchema:
+    if domain not in _SCHEMAS:
+        raise KeyError(f"No schema registered for '{domain}'. Registered: {', '.join(sorted(_SCHEMAS)) or 'none'}")
+    return _SCHEMAS[domain]
+
+
+@functools.lru_cache(maxsize=_PLAN_CACHE_SIZE)
+def compile_plan(domain: str, columns: tuple) -> CleaningPlan:
+    """Renames and per-column conversions of `domain`'s schema for this column layout."""
+    schema = get_schema(domain)
+    present = set(columns)
+    renames, steps, claimed = [], [], set()
+    for spec in schema.columns:
+        if spec.name in present:
+            source = spec.name, "declared"
+        else:
+            alias = next((a for a in spec.aliases if a in present and a not in claimed), None)
+            if alias is None:
+                continue
+            renames.append((alias, spec.name))
+            source = alias, "alias"
+        claimed.add(source[0])
+        if spec.dtype != "text":
+            steps.append((spec.name, spec, source[1]))
+
+    renamed = dict(renames)
+    for col in columns:
+        if col in claimed or col in renamed:
+            continue
+        for rule in schema.rules:
+            tok = next((t for t in rule.tokens if t in col), None)
+            if tok is not None:
+                if rule.spec.dtype != "text":
+                    steps.append((col, rule.spec, f"token:{tok}"))
+                break
+    return CleaningPlan(domain=domain, renames=tuple(renames), steps=tuple(steps))
+
+
+# ---------- conversions (on distinct values) ----------
+def _is_text(s: pd.Series) -> bool:
+    return s.dtype == object or pd.api.types.is_string_dtype(s.dtype)
+
+
+def _by_uniques(s: pd.Series, convert) -> pd.Series:
+    """convert() applied to the distinct values of `s`, then broadcast back to the rows."""
+    codes, uniques = pd.factorize(s)
+    values = convert(pd.Series(np.asarray(uniques, dtype=object), dtype=object))
+    if (codes < 0).any():
+        values = pd.concat([values, convert(pd.Series([None], dtype=object))], ignore_index=True)
+    return pd.Series(values.to_numpy()[codes], index=s.index, name=s.name, dtype=values.dtype)
+
+
+def _to_number(s: pd.Series, unit: str = None) -> pd.Series:
+    noise = r"[,\s]" if unit is None else rf"[,\s]|{UNITS[unit]}"
+    text = s.map(lambda x: x if pd.isna(x) else str(x))
+    return pd.to_numeric(text.str.replace(noise, "", regex=True, flags=re.IGNORECASE), errors="coerce")
+
+
+def _convert_datetime(s: pd.Series, spec: ColumnSpec) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    if spec.text_only and (not _is_text(s) or pd.to_numeric(s, errors="coerce").notna().all()):
+        return s
+    if not _is_text(s):
+        return pd.to_datetime(s, errors="coerce", dayfirst=spec.dayfirst)
+    return _by_uniques(s, lambda u: pd.to_datetime(u, errors="coerce", dayfirst=spec.dayfirst))
+
+
+def _convert_timedelta(s: pd.Series, spec: ColumnSpec) -> pd.Series:
+    if pd.api.types.is_timedelta64_dtype(s):
+        return s
+    if not _is_text(s):
+        return pd.to_timedelta(s, errors="coerce")
+    return _by_uniques(s, lambda u: pd.to_timedelta(u, errors="coerce"))
+
+
+def _convert_numeric(s: pd.Series, spec: ColumnSpec) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return s
+    if not _is_text(s):
+        return pd.to_numeric(s, errors="coerce")
+    return _by_uniques(s, lambda u: _to_number(u, spec.unit))
+
+
+def _convert_bool(s: pd.Series, spec: ColumnSpec) -> pd.Series:
+    codes, uniques = pd.factorize(s)
+    keys = [str(u).strip().lower() for u in uniques]
+    mapped = np.array([True if k in spec.true_values else False if k in spec.false_values else None for k in keys]
+                      + [None], dtype=object)
+    hit = (mapped != None)[codes]  # noqa: E711 — elementwise on an object array
+    if spec.min_share and (not len(s) or hit.mean() < spec.min_share):
+        return s
+    values = mapped[codes]
+    if not hit.all():
+        values[~hit] = spec.na
+    if hit.all() or not pd.isna(spec.na):
+        values = values.astype(bool)
+    return pd.Series(values, index=s.index, name=s.name)
+
+
+_CONVERTERS = {
+    "datetime": _convert_datetime,
+    "timedelta": _convert_timedelta,
+    "numeric": _convert_numeric,
+    "bool": _convert_bool,
+}
+
+
+def apply_plan(plan: CleaningPlan, df: pd.DataFrame, report: ExecutionReport = None,
+               workers: int = None) -> pd.DataFrame:
+    """`df` with the plan's renames and one conversion per planned column (columns run in parallel)."""
+    out = df.rename(columns=dict(plan.renames)) if plan.renames else df.copy()
+    tasks = [(col, lambda s, spec=spec: _CONVERTERS[spec.dtype](s, spec)) for col, spec, _ in plan.steps]
+    for col, converted in run_columns(out, tasks, f"schema:{plan.domain}", workers, report).items():
+        out[col] = converted
+    return out
+
+
+def apply_schema(domain: str, df: pd.DataFrame, report: ExecutionReport = None, workers: int = None):
+    """Compile (or reuse) the plan for `df`'s layout and apply it; returns (cleaned frame, plan)."""
+    plan = compile_plan(domain, tuple(df.columns))
+    return apply_plan(plan, df, report, workers), plan
@@ -0,0 +1,18 @@
+import logging
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_session():
+    """Each test starts without a dataset scope or session-state caches."""
+    import streamlit as st
+    st.session_state.clear()
+    yield
+    st.session_state.clear()
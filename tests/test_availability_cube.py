@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from utils_service_availability.availability_cube import build_cube, cell_ids, month_codes
+from utils_service_availability.cost_attribution import build_attribution
+
+
+def _reports(rows: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "service_name": rng.choice(["Email", "ERP", "VPN", None], rows),
+        "service_category": rng.choice(["Apps", "Infra"], rows),
+        "business_impact": rng.choice(["High", "Low"], rows),
+        "root_cause": rng.choice(["Network", "Software", None], rows),
+        "report_date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 120, rows), unit="D"),
+        "uptime_percentage": np.where(rng.random(rows) < 0.1, np.nan, rng.uniform(95, 100, rows)),
+        "downtime_minutes": rng.gamma(2, 20, rows),
+        "incident_count": rng.poisson(1.5, rows),
+        "estimated_cost_downtime": np.where(rng.random(rows) < 0.2, np.nan, rng.uniform(0, 5000, rows)),
+    })
+    df.loc[df.index[::50], "report_date"] = pd.NaT
+    return df
+
+
+def test_month_codes_label_each_month():
+    df = _reports(200)
+    codes, labels = month_codes(df)
+    expected = df["report_date"].dt.to_period("M").astype(str).where(df["report_date"].notna())
+    assert [labels.get(c) for c in codes] == [None if pd.isna(e) else e for e in expected]
+
+
+def test_cell_ids_group_like_groupby():
+    df = _reports()
+    inverse, cells = cell_ids(df, ["service_name", "month"])
+    sums = np.bincount(inverse, weights=df["downtime_minutes"].to_numpy(), minlength=len(cells))
+    month = df["report_date"].dt.to_period("M").astype(str).where(df["report_date"].notna())
+    ref = df.groupby([df["service_name"], month], dropna=False)["downtime_minutes"].sum()
+    assert len(cells) == len(ref)
+    got = pd.Series(sums, index=pd.MultiIndex.from_frame(cells.fillna("∅")))
+    ref.index = pd.MultiIndex.from_frame(ref.index.to_frame().fillna("∅"))
+    assert np.allclose(got.sort_index(), ref.sort_index())
+
+
+def test_cube_slices_match_groupby():
+    df = _reports()
+    svc = build_cube(df).slice("service_name").set_index("service_name")
+    ref = df.groupby("service_name")
+    assert np.allclose(svc["downtime_minutes"], ref["downtime_minutes"].sum())
+    assert np.allclose(svc["uptime_percentage"], ref["uptime_percentage"].mean())
+    assert np.allclose(svc["incident_count"], ref["incident_count"].sum())
+
+
+def test_cost_attribution_by_dimension():
+    df = _reports()
+    by_root = build_attribution(df).by("root_cause").set_index("root_cause")["reported_cost"]
+    ref = df.groupby("root_cause")["estimated_cost_downtime"].sum()
+    assert np.allclose(by_root.sort_index(), ref.sort_index())
+    assert "month" not in build_attribution(df.drop(columns="report_date")).cells.columns
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from cache_registry import _nbytes, cache_bytes, cache_stats, cached, invalidate, session_store, set_scope
+
+
+def test_cached_entries_follow_the_dataset_version():
+    calls = []
+
+    @cached
+    def double(df: pd.DataFrame) -> pd.DataFrame:
+        calls.append(1)
+        return df * 2
+
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    set_scope("ds", 1)
+    double(df)
+    double(df)
+    set_scope("ds", 2)
+    double(df)
+    assert len(calls) == 2
+    invalidate("ds", keep_version=2)
+    set_scope("ds", 1)
+    double(df)
+    assert len(calls) == 3
+    double.clear()
+
+
+def test_session_store_is_bounded_oldest_first():
+    store = session_store("test_bounded", max_entries=3)
+    for i in range(5):
+        store[i] = i
+    assert list(store) == [2, 3, 4]
+    store.touch(2)
+    store[5] = 5
+    assert list(store) == [4, 2, 5]
+
+
+def test_invalidate_drops_session_entries_of_the_dataset():
+    store = session_store("test_scoped")
+    set_scope("a", 1)
+    store["old"] = np.zeros(1000)
+    set_scope("a", 2)
+    store["new"] = np.zeros(1000)
+    set_scope("b", 1)
+    store["other"] = np.zeros(1000)
+    released = invalidate("a", keep_version=2)
+    assert sorted(store) == ["new", "other"] and released >= 8000
+    invalidate("b")
+    assert list(store) == ["new"]
+
+
+def test_session_stores_are_counted_in_cache_size():
+    before = cache_bytes()
+    set_scope("sized", 1)
+    session_store("test_sized")["frame"] = pd.DataFrame({"x": np.arange(100_000)})
+    assert cache_bytes() - before >= 800_000
+    stats = cache_stats()
+    assert "session:test_sized" in set(stats["function"])
+
+
+def test_object_columns_are_sized_from_a_sample():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "label": pd.Series(rng.choice(["short", "a much longer label value"], 50_000), dtype=object),
+        "n": rng.random(50_000),
+    })
+    exact = int(df.memory_usage(index=True, deep=True).sum())
+    assert abs(_nbytes(df) - exact) / exact < 0.05
@@ -0,0 +1,61 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from cache_registry import set_scope
+from date_range_filter import date_index, slice_date_range
+
+
+def _tickets(rows: int = 5000, in_order: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90 * 86_400, rows), unit="s")
+    df = pd.DataFrame({"created_time": stamps, "x": rng.integers(0, 5, rows)})
+    if in_order:
+        df = df.sort_values("created_time", ignore_index=True)
+    df.loc[::97, "created_time"] = pd.NaT
+    return df
+
+
+def _expected(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    days = pd.to_datetime(df["created_time"], errors="coerce").dt.date
+    return df[(days >= start) & (days <= end)]
+
+
+def test_slice_matches_boolean_mask():
+    df = _tickets()
+    start, end = dt.date(2024, 1, 10), dt.date(2024, 2, 3)
+    out = slice_date_range(df, start, end)
+    assert sorted(out.index) == sorted(_expected(df, start, end).index)
+    assert out["created_time"].is_monotonic_increasing
+    assert (out["created_date"] == out["created_time"].dt.date).all()
+
+
+def test_string_dates_and_bounds():
+    df = _tickets()
+    df["created_time"] = df["created_time"].astype(str).where(df["created_time"].notna())
+    index = date_index(df)
+    parsed = pd.to_datetime(df["created_time"])
+    assert (index.min_date, index.max_date) == (parsed.min().date(), parsed.max().date())
+    start, end = dt.date(2024, 3, 1), dt.date(2024, 3, 1)
+    assert len(slice_date_range(df, start, end)) == len(_expected(df, start, end))
+
+
+def test_repeat_range_reuses_the_slice_without_sharing_columns():
+    df = _tickets(in_order=True)
+    start, end = dt.date(2024, 1, 5), dt.date(2024, 1, 20)
+    first = slice_date_range(df, start, end)
+    first["added"] = 1
+    again = slice_date_range(df, start, end)
+    assert "added" not in again.columns
+    assert np.shares_memory(again["x"].to_numpy(), first["x"].to_numpy())
+
+
+def test_scope_key_tracks_dataset_version():
+    df = _tickets()
+    start, end = dt.date(2024, 1, 1), dt.date(2024, 1, 31)
+    set_scope("tickets", 1)
+    before = len(slice_date_range(df, start, end))
+    shifted = df.assign(created_time=df["created_time"] + pd.Timedelta(days=40))
+    set_scope("tickets", 2)
+    assert len(slice_date_range(shifted, start, end)) == len(_expected(shifted, start, end)) != before
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from duplicate_index import build_index, duplicate_index
+
+
+def _tickets(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "ticket_id": rng.integers(0, rows // 2, rows),
+        "category": rng.choice(["Network", "Access", None], rows),
+        "hours": rng.choice([0.0, -0.0, 1.5, np.nan], rows),
+        "created": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 5, rows), unit="D"),
+    })
+
+
+FRAMES = {
+    "numeric with NaN and signed zero": pd.DataFrame({"x": [0.0, -0.0, np.nan, np.nan, 1.0], "k": 1}),
+    "missing text": pd.DataFrame({"x": pd.Series([None, np.nan, "a", "a", None], dtype=object), "k": 1}),
+    "categorical": pd.DataFrame({"x": pd.Categorical(["a", None, "a", None, "b"]), "k": [1, 1, 1, 1, 2]}),
+    "mixed object": pd.DataFrame({"x": pd.Series([1, 1.0, True, "1", 2 ** 70, 2 ** 70, 1.5], dtype=object), "k": 1}),
+    "nullable": pd.DataFrame({"x": pd.array([1, None, 1, None], dtype="Int64"), "k": 1}),
+    "datetime": pd.DataFrame({"x": pd.to_datetime(["2025-01-01", None, None, "2025-01-01"]), "k": 1}),
+    "tickets": _tickets(5000),
+}
+
+
+@pytest.mark.parametrize("name", FRAMES)
+def test_index_matches_duplicated(name):
+    df = FRAMES[name]
+    index = build_index(df)
+    expected = df.duplicated()
+    assert np.array_equal(index.mask, expected.to_numpy())
+    assert index.count == int(expected.sum())
+    pd.testing.assert_frame_equal(df[index.keep()], df.drop_duplicates())
+
+
+@pytest.mark.parametrize("head, tail", [
+    (_tickets(3000, seed=1), _tickets(1000, seed=2)),
+    (pd.DataFrame({"x": [1, 2], "k": 1}), pd.DataFrame({"x": [1.0, np.nan], "k": 1})),
+    (pd.DataFrame({"x": [True, False], "k": 1}), pd.DataFrame({"x": [1, 0], "k": 1})),
+    (pd.DataFrame({"x": ["a", "b"], "k": 1}), pd.DataFrame({"x": pd.Categorical(["b", None]), "k": 1})),
+    (pd.DataFrame({"x": pd.to_datetime(["2025-01-01"]).as_unit("s"), "k": 1}),
+     pd.DataFrame({"x": pd.to_datetime(["2025-01-01", None]).as_unit("ns"), "k": 1})),
+])
+def test_extend_matches_duplicated_of_the_appended_frame(head, tail):
+    index = build_index(head).extend(tail)
+    assert np.array_equal(index.mask, pd.concat([head, tail], ignore_index=True).duplicated().to_numpy())
+
+
+def test_session_index_reuses_an_indexed_prefix():
+    df = _tickets(4000)
+    first = duplicate_index(df.iloc[:3000])
+    assert duplicate_index(df.iloc[:3000].copy()) is first
+    grown = duplicate_index(df)
+    assert np.array_equal(grown.hashes[:3000], first.hashes)
+    assert np.array_equal(grown.mask, df.duplicated().to_numpy())
+
+
+def test_session_index_ignores_a_changed_prefix():
+    df = _tickets(4000)
+    duplicate_index(df.iloc[:3000])
+    changed = df.copy()
+    changed.loc[1, "category"] = "Changed"       # row 1 is not among the probed rows
+    index = duplicate_index(changed)
+    assert np.array_equal(index.mask, changed.duplicated().to_numpy())
@@ -0,0 +1,16 @@
+import pandas as pd
+
+from excel_ingest import _store_sheet, normalize_for_storage
+
+
+def test_mixed_columns_are_normalised_in_the_worker(tmp_path):
+    df = pd.DataFrame({"mixed": pd.Series([1, "a", 2.5], dtype=object), "n": [1, 2, 3]})
+    path, error = _store_sheet(df, str(tmp_path / "sheet"), "parquet")
+    assert path.endswith(".parquet") and error is None
+    pd.testing.assert_frame_equal(pd.read_parquet(path), normalize_for_storage(df), check_dtype=False)
+
+
+def test_unwritable_sheet_reports_its_error(tmp_path):
+    df = pd.DataFrame({"n": [1, 2, 3]})
+    path, error = _store_sheet(df, str(tmp_path / "missing" / "sheet"), "parquet")
+    assert path is None and "FileNotFoundError" in error
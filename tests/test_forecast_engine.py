@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from cache_registry import session_store
+from utils_capacity import forecast_engine
+from utils_capacity.forecast_engine import _MAX_STATES, _STORE, _fit_metric
+
+
+def _panel(days: int, assets: int = 5, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    t = np.repeat(np.arange(days, dtype=float), assets)
+    asset = np.tile([f"a{i}" for i in range(assets)], days)
+    return pd.DataFrame({"asset": asset, "t": t, "y": 40 + 0.5 * t + rng.normal(0, 1, len(t))})
+
+
+def test_appended_days_are_folded_in():
+    full = _panel(30)
+    _fit_metric(full[full["t"] < 20], ("cpu", 0))
+    state, mode = _fit_metric(full, ("cpu", 0))
+    fresh, _ = _fit_metric(full, ("cpu", 1))
+    assert mode == "incremental"
+    assert np.allclose(state.xtx, fresh.xtx) and np.allclose(state.xty, fresh.xty)
+    assert _fit_metric(full, ("cpu", 0))[1] == "cached"
+
+
+def test_state_store_is_bounded():
+    panel = _panel(10)
+    for origin in range(_MAX_STATES + 5):
+        _fit_metric(panel, ("cpu", origin))
+    store = session_store(_STORE)
+    assert len(store) == _MAX_STATES
+    assert ("cpu", 0) not in store and ("cpu", _MAX_STATES + 4) in store
+    assert forecast_engine._MAX_STATES == store.max_entries
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from utils_capacity.scenario_engine import Scenario, asset_vectors, evaluate_scenarios, latest_per_asset
+
+
+def _daily(days: int = 5) -> pd.DataFrame:
+    """Three assets reported every day; only the last day puts asset b over the risk threshold."""
+    dates = pd.date_range("2025-03-01", periods=days, freq="D")
+    rows = []
+    for d in dates:
+        rows.append({"asset_id": "a", "data_date": d, "avg_cpu_utilization": 20.0, "cost_per_month_usd": 100.0})
+        rows.append({"asset_id": "b", "data_date": d, "avg_cpu_utilization": 90.0 if d == dates[-1] else 50.0,
+                     "cost_per_month_usd": 200.0})
+        rows.append({"asset_id": "c", "data_date": d, "avg_cpu_utilization": 60.0, "cost_per_month_usd": 300.0})
+    return pd.DataFrame(rows).sample(frac=1.0, random_state=0)   # exports are not in date order
+
+
+def test_latest_per_asset_keeps_latest_snapshot():
+    latest = latest_per_asset(_daily())
+    assert sorted(latest["asset_id"]) == ["a", "b", "c"]
+    assert latest.set_index("asset_id").loc["b", "avg_cpu_utilization"] == 90.0
+
+
+def test_rows_without_asset_id_are_kept():
+    df = _daily(2)
+    df.loc[df.index[:2], "asset_id"] = np.nan
+    latest = latest_per_asset(df)
+    assert latest["asset_id"].isna().sum() == 2
+    assert latest["asset_id"].dropna().is_unique
+
+
+def test_frame_without_asset_id_is_unchanged():
+    df = _daily().drop(columns="asset_id")
+    assert latest_per_asset(df) is df
+
+
+def test_summary_counts_assets_not_asset_days():
+    df = _daily()
+    assert asset_vectors(df).n == 3
+    out = evaluate_scenarios(df, [Scenario(), Scenario(rightsizing_pct=25)])
+    base, rsize = out.iloc[0], out.iloc[1]
+    assert base["assets_at_risk"] == 1 and abs(base["risk_share_pct"] - 100 / 3) < 1e-9
+    assert base["projected_cost_usd"] == 600.0
+    assert rsize["assets_rightsized"] == 1          # only asset a sits below 40% CPU
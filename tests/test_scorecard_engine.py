@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from cache_registry import set_scope
+from utils_scorecard.scorecard_engine import build_table, monthly, scorecard_table
+
+
+def _frame(rows: int, seed: int = 0, start: str = "2025-01-01") -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "service_name": rng.choice(["Email", "ERP", "VPN"], rows),
+        "service_owner": rng.choice(["Ops", "Apps"], rows),
+        "report_date": pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, 90, rows), unit="D"),
+        "uptime_percent": rng.uniform(95, 100, rows),
+        "incident_count": rng.poisson(3, rows),
+        "changes_successful": rng.poisson(4, rows),
+        "changes_emergency": rng.poisson(1, rows),
+    })
+
+
+def _numbers(table) -> pd.DataFrame:
+    t = table.rollup(["service_name", "month"]).sort_values(["service_name", "month"]).reset_index(drop=True)
+    return t.select_dtypes("number")
+
+
+def test_monthly_matches_groupby():
+    df = _frame(2000)
+    month = df["report_date"].dt.to_period("M").astype(str)
+    out = monthly(df, ["uptime_percent", "incident_count"]).set_index("report_month")
+    assert np.allclose(out["uptime_percent"], df.groupby(month)["uptime_percent"].mean())
+    assert np.allclose(out["incident_count"], df.groupby(month)["incident_count"].sum())
+
+
+def test_repeat_calls_on_one_frame_share_the_table():
+    df = _frame(500, seed=1)
+    assert scorecard_table(df) is scorecard_table(df)
+
+
+def test_appended_rows_are_merged_into_the_stored_table():
+    df = _frame(3000, seed=2)
+    scorecard_table(df)
+    grown = pd.concat([df, _frame(400, seed=3, start="2025-04-01")], ignore_index=True)
+    table = scorecard_table(grown)
+    assert table.appended_rows == 400
+    assert np.allclose(_numbers(table), _numbers(build_table(grown)), equal_nan=True)
+
+
+def test_keyed_lookup_follows_the_dataset_version():
+    df = _frame(800, seed=4)
+    set_scope("scorecard-test", 1)
+    first = scorecard_table(df.copy(deep=False), key=("all",))
+    assert scorecard_table(df.copy(deep=False), key=("all",)) is first
+    set_scope("scorecard-test", 2)
+    changed = df.assign(incident_count=df["incident_count"] + 1)
+    assert scorecard_table(changed, key=("all",)).totals()["incident_count"] == first.totals()["incident_count"] + len(df)
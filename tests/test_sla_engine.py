@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from cache_registry import set_scope
+from utils_service_desk_pfomance.sla_engine import sla_aggregates
+
+
+def _tickets(rows: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "created_time": pd.date_range("2025-01-01", periods=rows, freq="h"),
+        "priority": rng.choice(["P1", "Priority 2", "p3", None], rows),
+        "sla_met": rng.choice(["Yes", "No"], rows),
+        "category": rng.choice(["Network", "Access"], rows),
+    })
+
+
+def test_rates_match_the_flags():
+    df = _tickets()
+    agg = sla_aggregates(df)
+    met = df["sla_met"].eq("Yes")
+    assert np.isclose(agg.overall_rate, met.mean())
+    by_cat = agg.by_category["met"]
+    assert (by_cat == met.groupby(df["category"]).sum()).all()
+
+
+def test_aggregates_are_reused_for_the_same_dataset_frame():
+    df = _tickets()
+    set_scope("tickets", 1)
+    first = sla_aggregates(df)
+    assert sla_aggregates(df.copy(deep=False)) is first
+    set_scope("tickets", 2)
+    assert sla_aggregates(df) is not first
@@ -6,6 +6,9 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
+from cache_registry import cached
+from dataset_stats import frame_stats
+
 # ---- Visual defaults ----
 px.defaults.template = "plotly_white"
 PX_PALETTE = px.colors.qualitative.Safe
@@ -45,7 +48,7 @@ def _apply_bar_labels(fig, show_labels: bool, fmt: str = None):
             tr.update(texttemplate=fmt if fmt else "%{value}")
     return fig
 
-@st.cache_data(show_spinner=False)
+@cached
 def _prep_base(df: pd.DataFrame):
     d = df.copy()
 
@@ -158,6 +161,7 @@ except Exception:
 def dashboard_asset(df: pd.DataFrame):
     st.markdown("## 🖥️ IT Asset Inventory Dashboard")
     df = _prep_base(df)
+    stats = frame_stats(df, "dashboard_asset")  # filter options / date span from the catalog, not a scan per rerun
 
     # ---------------- Sidebar controls ----------------
     with st.sidebar:
@@ -178,9 +182,8 @@ def dashboard_asset(df: pd.DataFrame):
             key="asset_flt_date_col"
         )
 
-        if date_col_choice != "(none)" and df[date_col_choice].notna().any():
-            min_d = pd.to_datetime(df[date_col_choice]).min()
-            max_d = pd.to_datetime(df[date_col_choice]).max()
+        if date_col_choice != "(none)" and stats.date_bounds(date_col_choice):
+            min_d, max_d = stats.date_bounds(date_col_choice)
             date_range = st.date_input(
                 "Date range",
                 value=(min_d.date(), max_d.date()),
@@ -193,7 +196,7 @@ def dashboard_asset(df: pd.DataFrame):
         def _opt(col_alias_list):
             for c in col_alias_list:
                 if c in df.columns:
-                    return sorted([v for v in df[c].dropna().astype(str).unique()])
+                    return stats.options(c)
             return []
 
         # Common asset filters
@@ -3,6 +3,8 @@ import streamlit as st
 import io
 import re
 import numpy as np
+from cleaning_diff import diff_frames, paged_dataframe, profile_raw, render_diff
+from dimension_encoding import arrow_safe_categorical, encode_dimensions
 
 # --------- helpers ---------
 def to_snake(name: str) -> str:
@@ -27,7 +29,7 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
       - Lists/dicts/tuples in cells -> string
       - Pandas nullable Int64 -> float64 (preserve NaN)
       - datetimes -> naive datetime64[ns]
-      - categoricals -> string
+      - categoricals kept dictionary-encoded (labels as strings)
     """
     out = df.copy()
 
@@ -57,9 +59,9 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
         elif pd.api.types.is_datetime64_any_dtype(s):
             out[col] = pd.to_datetime(s, errors="coerce").dt.tz_localize(None)
 
-        # 4) categoricals -> string
-        elif pd.api.types.is_categorical_dtype(s):
-            out[col] = s.astype("string")
+        # 4) categoricals stay categorical (Arrow dictionary); only labels are stringified
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = arrow_safe_categorical(s)
 
     return out
 
@@ -149,8 +151,9 @@ def classify_type_from_name(raw_name: str):
 
 # --------- main cleaning pipeline ---------
 def data_cleaning_asset(df, uploaded_file):
-    # keep a RAW snapshot (exactly as uploaded)
-    raw_df_snapshot = df.copy(deep=True)
+    # keep a RAW snapshot (exactly as uploaded): a copy-on-write view, profiled once for the raw-vs-cleaned diff
+    raw_df_snapshot = df.copy(deep=False)
+    raw_profile = profile_raw(raw_df_snapshot)
 
     st.success("✅ File successfully loaded!")
 
@@ -161,32 +164,32 @@ def data_cleaning_asset(df, uploaded_file):
 
     # a) number of rows and columns
     col1, col2 = st.columns(2)
-    col1.metric("Rows (Raw)", raw_df_snapshot.shape[0])
-    col2.metric("Columns (Raw)", raw_df_snapshot.shape[1])
+    col1.metric("Rows (Raw)", raw_profile.rows)
+    col2.metric("Columns (Raw)", len(raw_profile.columns))
 
     # b) total missing values
-    total_missing_raw = int(raw_df_snapshot.isnull().sum().sum())
+    total_missing_raw = raw_profile.total_missing
     m1, _m2 = st.columns(2)
     m1.metric("Total Missing Values (Raw)", total_missing_raw)
 
     # c) data types
     st.markdown("**Data Types (Raw)**")
-    st.dataframe(_dtype_table(raw_df_snapshot, "Raw dtypes"), use_container_width=True)
+    st.dataframe(raw_profile.dtype_table(), use_container_width=True)
 
     # d) missing value table
     col_mv, _ = st.columns([3, 1])
     with col_mv:
         st.markdown("**Missing Values by Column (Raw)**")
         st.dataframe(
-            raw_df_snapshot.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+            raw_profile.missing_table(),
             use_container_width=True
         )
 
     # e) duplicated rows
-    dup_count_raw = int(raw_df_snapshot.duplicated().sum())
+    dup_count_raw = raw_profile.duplicates
     st.write(f"**Duplicated Rows (Raw):** {dup_count_raw}")
     if dup_count_raw > 0:
-        st.dataframe(raw_df_snapshot[raw_df_snapshot.duplicated()], use_container_width=True)
+        paged_dataframe(raw_df_snapshot.iloc[raw_profile.duplicates_index.sample()], key="asset_raw_dup_page")
 
     # f) datetime columns (raw)
     raw_datetime_cols = [c for c in raw_df_snapshot.columns if pd.api.types.is_datetime64_any_dtype(raw_df_snapshot[c])]
@@ -296,6 +299,9 @@ def data_cleaning_asset(df, uploaded_file):
     else:
         st.warning("`type` column not found after standardization — asset classification skipped.")
 
+    # Dimension columns -> categoricals (int codes + one copy of each label) for every downstream groupby/filter
+    df = encode_dimensions(df)
+
     # ==============================
     # ii. AFTER CLEANING
     # ==============================
@@ -307,7 +313,8 @@ def data_cleaning_asset(df, uploaded_file):
     ac2.metric("Columns (Cleaned)", df.shape[1])
 
     # b) total missing value
-    total_missing_clean = int(df.isnull().sum().sum())
+    diff = diff_frames(raw_profile, df, col_map)
+    total_missing_clean = int(diff.missing_table()["Missing"].sum())
     cm1, _cm2 = st.columns(2)
     cm1.metric("Total Missing Values (Cleaned)", total_missing_clean)
 
@@ -318,7 +325,7 @@ def data_cleaning_asset(df, uploaded_file):
     # d) missing value table
     st.markdown("**Missing Values by Column (Cleaned)**")
     st.dataframe(
-        df.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+        diff.missing_table(),
         use_container_width=True
     )
 
@@ -335,25 +342,7 @@ def data_cleaning_asset(df, uploaded_file):
     # ==============================
     st.subheader("🔍 Compare Raw Data vs Cleaned Data")
 
-    # Build dtype tables
-    dtypes_raw = _dtype_table(raw_df_snapshot, "Raw dtypes")
-    dtypes_clean = _dtype_table(df, "Cleaned dtypes")
-
-    # Add a normalized key for raw columns so they align with cleaned
-    dtypes_raw["Column (standardized)"] = dtypes_raw["Column"].map(col_map)
-    dtypes_clean = dtypes_clean.rename(columns={"Column": "Column (standardized)"})
-
-    # Merge on the standardized column name
-    dtype_compare = dtypes_raw.merge(dtypes_clean, on="Column (standardized)", how="outer")
-    dtype_compare = dtype_compare.rename(columns={"Column": "Raw Column"})
-    # mark dropped columns in comparison
-    dropped_mask = dtype_compare["Cleaned dtypes"].isna() & dtype_compare["Raw dtypes"].notna()
-    dtype_compare.loc[dropped_mask, "Cleaned dtypes"] = "dropped"
-    # Reorder for readability
-    dtype_compare = dtype_compare[["Raw Column", "Column (standardized)", "Raw dtypes", "Cleaned dtypes"]].fillna("—")
-
-    st.markdown("**Data Types (Aligned by Standardized Name)**")
-    st.dataframe(dtype_compare, use_container_width=True)
+    render_diff(diff)
 
     # b) sample data — STACKED (Raw on top, Cleaned below)
     st.markdown("**Sample – Raw Data**")
@@ -394,9 +383,9 @@ def data_cleaning_asset(df, uploaded_file):
         # Use the in-memory snapshots you already have to avoid _UploadedShim issues
         if view_option == "Raw Data":
             st.markdown("### 🗃️ Raw Data (Full Table)")
-            st.dataframe(raw_df_snapshot, use_container_width=True)
+            paged_dataframe(raw_df_snapshot, key="asset_raw_page")
         else:
             st.markdown("### 🧼 Cleaned Data (Full Table)")
-            st.dataframe(df, use_container_width=True)
+            paged_dataframe(df, key="asset_clean_page")
 
     return df
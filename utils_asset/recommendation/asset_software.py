@@ -53,7 +53,7 @@ def asset_software(df_filtered: pd.DataFrame):
     for c in ["os", "av_status", "av_version", "warranty_end", "department",
               "software_name", "version", "license_type", "license_key",
               "installation_date", "license_expiration_date"]:
-        if c in df.columns and df[c].dtype == "O":
+        if c in df.columns and (df[c].dtype == "O" or isinstance(df[c].dtype, pd.CategoricalDtype)):
             df[c] = df[c].astype(str).str.strip().replace({"nan": np.nan, "": np.nan})
     for c in ["warranty_end", "installation_date", "license_expiration_date", "update_on", "warranty_start"]:
         if c in df.columns:
@@ -10,38 +10,16 @@ from utils_asset.recommendation.asset_hardware import asset_hardware
 from utils_asset.recommendation.asset_software import asset_software
 from utils_asset.recommendation.asset_assignments import asset_assignments
 from utils_asset.recommendation.asset_lifecycle import asset_lifecycle
+from date_range_filter import date_range_filter
 
 #------------------------------------------------------------------------------------------------------------------------------
 
 def recommendation_asset(df):
     st.markdown("---")
 
-    if 'created_time' in df.columns and not df['created_time'].isna().all():
-        df['created_time'] = pd.to_datetime(df['created_time'], errors='coerce')
-        df['created_date'] = df['created_time'].dt.date
-        min_date = df['created_date'].min()
-        max_date = df['created_date'].max()
-
-        col1, col2 = st.columns(2)
-        with col1:
-            start_date = st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date, key="start_date_picker")
-        with col2:
-            end_date = st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date, key="end_date_picker")
-
-        st.markdown(f"🗓️ **Selected Range:** `{start_date.strftime('%d/%m/%Y')}` → `{end_date.strftime('%d/%m/%Y')}`")
-
-        reset_filter = st.button("🔁 Reset to Default", key="reset_button_2")
-
-        if reset_filter:
-            df_filtered = df.copy()
-            st.info("Showing all available data (no date filter applied).")
-        elif start_date > end_date:
-            st.warning("⚠️ Start date is after end date. Please select a valid range.")
-            return
-        else:
-            df_filtered = df[(df['created_date'] >= start_date) & (df['created_date'] <= end_date)]
-    else:
-        df_filtered = df.copy()
+    df_filtered = date_range_filter(df)
+    if df_filtered is None:
+        return
 
 #----------------------------------------------------------------------------------------------------------------------------------------------
 
@@ -0,0 +1,147 @@
+# utils_capacity/aggregate_store.py
+
+import pandas as pd
+from dataclasses import dataclass, field
+
+from cache_registry import cached
+from utils_capacity.metric_block import as_numeric
+
+# ─────────────────────────────────────────────────────────────
+# Capacity aggregate store
+# One pass per dimension over every numeric metric of the (filtered) capacity
+# frame: mean / sum / median / count, asset counts, daily means and modal
+# histogram bands. The recommendation modules and the dashboard read their
+# per-type / per-location / per-month figures from here instead of running
+# their own groupby over the same columns.
+# ─────────────────────────────────────────────────────────────
+DIMENSIONS = ("component_type", "location", "vendor", "environment", "month", "day")
+STATS = ("mean", "sum", "median", "count")
+HIST_BINS = 20
+
+# Per-row metrics several views derive the same way (projected = current × (1 + growth), capped at 100)
+_GROWTH_DELTAS = {
+    "cpu_growth_delta": "avg_cpu_utilization",
+    "mem_growth_delta": "avg_memory_utilization",
+}
+
+
+def _day_column(df: pd.DataFrame):
+    for col in ["data_timestamp", "data_date", "date"]:
+        if col in df.columns:
+            d = pd.to_datetime(df[col], errors="coerce").dt.normalize()
+            if d.notna().any():
+                return d
+    return None
+
+
+def _month_column(df: pd.DataFrame, day):
+    if "month" in df.columns:
+        m = df["month"]
+        return m.dt.to_timestamp() if isinstance(m.dtype, pd.PeriodDtype) else m
+    if day is not None:
+        return day.dt.to_period("M").dt.to_timestamp()
+    return None
+
+
+def _metric_frame(df: pd.DataFrame) -> pd.DataFrame:
+    cols = [c for c in df.columns
+            if c not in DIMENSIONS
+            and pd.api.types.is_numeric_dtype(df[c])
+            and not pd.api.types.is_bool_dtype(df[c])]
+    m = pd.DataFrame({c: as_numeric(df[c], errors="coerce") for c in cols}, index=df.index)
+    if "projected_growth_pct" in m.columns:
+        growth = 1 + m["projected_growth_pct"] / 100.0
+        for name, base in _GROWTH_DELTAS.items():
+            if base in m.columns:
+                m[name] = (m[base] * growth).clip(upper=100) - m[base]
+    if {"avg_cpu_utilization", "avg_memory_utilization"} <= set(m.columns):
+        # bottleneck score used by the bottleneck views: mean of CPU and memory utilization per row
+        m["cpu_mem_score"] = (m["avg_cpu_utilization"] + m["avg_memory_utilization"]) / 2
+    return m
+
+
+def _modal_band(values: pd.Series, bins: int = HIST_BINS):
+    """Most populated of `bins` equal-width bands -> (label, count); same bands as pd.cut(bins=bins)."""
+    s = values.dropna()
+    if s.empty:
+        return None, 0
+    vc = pd.cut(s, bins=bins, include_lowest=True).value_counts().sort_values(ascending=False)
+    return str(vc.index[0]), int(vc.iloc[0])
+
+
+@dataclass
+class CapacityAggregates:
+    """
+    Pre-aggregated capacity figures for one dataset.
+      - by[dim]:  index = dimension value (sorted), columns = (metric, stat) plus ("asset_id", "nunique")
+                  and ("_rows", "size")
+      - totals:   metric -> {mean, sum, median, count, min, max} over all rows
+      - bands:    metric -> (modal histogram band label, rows in it)
+    """
+    by: dict = field(default_factory=dict)
+    totals: dict = field(default_factory=dict)
+    bands: dict = field(default_factory=dict)
+
+    def has(self, dim: str, metric: str = None) -> bool:
+        if dim not in self.by:
+            return False
+        return metric is None or (metric, "mean") in self.by[dim].columns
+
+    def series(self, dim: str, metric: str, stat: str = "mean") -> pd.Series:
+        """Per-`dim` value of `metric` (like df.groupby(dim)[metric].<stat>())."""
+        if not self.has(dim, metric):
+            return pd.Series(dtype="float64", name=metric)
+        return self.by[dim][(metric, stat)].rename(metric).rename_axis(dim)
+
+    def table(self, dim: str, metric: str, stat: str = "mean", name: str = None) -> pd.DataFrame:
+        """Two-column frame [dim, name or metric] (like groupby(dim, as_index=False)[metric].<stat>())."""
+        return self.series(dim, metric, stat).rename(name or metric).reset_index()
+
+    def assets(self, dim: str, name: str = "asset_id") -> pd.DataFrame:
+        """Distinct assets per `dim` value -> [dim, name]."""
+        if dim not in self.by or ("asset_id", "nunique") not in self.by[dim].columns:
+            return pd.DataFrame(columns=[dim, name])
+        return self.by[dim][("asset_id", "nunique")].rename(name).rename_axis(dim).reset_index()
+
+    def modal_band(self, metric: str):
+        return self.bands.get(metric, (None, 0))
+
+    def total(self, metric: str, stat: str = "mean") -> float:
+        return self.totals.get(metric, {}).get(stat, float("nan"))
+
+
+def _aggregate(df: pd.DataFrame) -> CapacityAggregates:
+    metrics = _metric_frame(df)
+    day = _day_column(df)
+    keys = {dim: df[dim] for dim in DIMENSIONS[:4] if dim in df.columns}
+    month = _month_column(df, day)
+    if month is not None:
+        keys["month"] = month
+    if day is not None:
+        keys["day"] = day
+
+    by = {}
+    for dim, key in keys.items():
+        grouped = metrics.groupby(key.rename(dim), observed=True, sort=True)
+        sizes = grouped.size()
+        table = grouped.agg(list(STATS)) if len(metrics.columns) else pd.DataFrame(index=sizes.index)
+        table[("_rows", "size")] = sizes
+        if "asset_id" in df.columns:
+            table[("asset_id", "nunique")] = df["asset_id"].groupby(key.rename(dim), observed=True, sort=True).nunique()
+        by[dim] = table
+
+    totals, bands = {}, {}
+    for col in metrics.columns:
+        s = metrics[col]
+        totals[col] = {
+            "mean": float(s.mean()), "sum": float(s.sum()), "median": float(s.median()),
+            "count": int(s.count()), "min": float(s.min()), "max": float(s.max()),
+        }
+        bands[col] = _modal_band(s)
+    return CapacityAggregates(by=by, totals=totals, bands=bands)
+
+
+@cached
+def capacity_aggregates(df: pd.DataFrame) -> CapacityAggregates:
+    """Aggregate store for `df`, built once per dataset content (shared by all capacity views)."""
+    return _aggregate(df)
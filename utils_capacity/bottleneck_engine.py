@@ -0,0 +1,197 @@
+# utils_capacity/bottleneck_engine.py
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+
+from cache_registry import cached
+from utils_capacity.forecast_engine import METRIC_COLUMNS, series_dates, asset_keys
+from utils_capacity.metric_block import as_numeric
+
+# ─────────────────────────────────────────────────────────────
+# Bottleneck detection
+# Daily per-asset utilization is scanned once for sustained breaches: runs of
+# consecutive days at or above the breach level, per metric, plus runs where
+# two or more metrics breach together (co-saturation). The runs are kept as an
+# interval index (sorted by start, with per-location / per-type positions) so
+# the dashboard can ask "what was breaching in this window / at this site"
+# without going back to the raw rows.
+# ─────────────────────────────────────────────────────────────
+BREACH_LEVEL = 85.0
+SUSTAIN_DAYS = 3             # consecutive breach days before a breach counts as sustained
+CO_SATURATION_MIN = 2        # metrics breaching on the same asset-day for co-saturation
+CO_SATURATION = "Co-saturation"
+CO_SATURATION_WEIGHT = 2     # hot-asset score: a co-saturated day counts as this many breach days
+INDEX_DIMENSIONS = ("location", "component_type")
+
+_INTERVAL_COLUMNS = ["asset", "metric", "start", "end", "days", "peak", "mean", "metrics", *INDEX_DIMENSIONS]
+
+
+def _daily_panel(df: pd.DataFrame):
+    """Daily mean per (asset, day), sorted by asset then day. None when there is no date or metric."""
+    cols = [c for c in METRIC_COLUMNS.values() if c in df.columns]
+    dates = series_dates(df)
+    if not cols or dates is None:
+        return None, cols
+    base = pd.DataFrame({"asset": asset_keys(df), "day": dates})
+    for c in cols:
+        base[c] = as_numeric(df[c], errors="coerce").astype("float64")
+    base = base.dropna(subset=["day"])
+    daily = base.groupby(["asset", "day"], sort=True, observed=True)[cols].mean().reset_index()
+    return daily, cols
+
+
+def _runs(asset: np.ndarray, day: np.ndarray, hit: np.ndarray) -> np.ndarray:
+    """
+    Run id per row for rows where `hit` is True (-1 elsewhere). Rows must be sorted by asset, day;
+    a run continues while the same asset breaches on the next calendar day.
+    """
+    same_asset = np.r_[False, asset[1:] == asset[:-1]]
+    next_day = np.r_[False, np.diff(day) == np.timedelta64(1, "D")]
+    prev_hit = np.r_[False, hit[:-1]]
+    starts = hit & ~(same_asset & next_day & prev_hit)
+    run = np.cumsum(starts) - 1
+    return np.where(hit, run, -1)
+
+
+def _intervals(daily: pd.DataFrame, hit: np.ndarray, value: np.ndarray, metric: str,
+               sustain_days: int, breached: pd.DataFrame = None) -> pd.DataFrame:
+    run = _runs(daily["asset"].to_numpy(), daily["day"].to_numpy(), hit)
+    rows = run >= 0
+    if not rows.any():
+        return pd.DataFrame(columns=_INTERVAL_COLUMNS[:8])
+    g = pd.DataFrame({
+        "run": run[rows],
+        "asset": daily["asset"].to_numpy()[rows],
+        "day": daily["day"].to_numpy()[rows],
+        "value": value[rows],
+    }).groupby("run", sort=False)
+    out = g.agg(asset=("asset", "first"), start=("day", "min"), end=("day", "max"),
+                days=("day", "size"), peak=("value", "max"), mean=("value", "mean"))
+    if breached is not None:
+        names = breached.columns.to_numpy()
+        which = breached[rows].groupby(run[rows], sort=False).any()
+        out["metrics"] = [", ".join(names[m]) for m in which.reindex(out.index).to_numpy()]
+    else:
+        out["metrics"] = metric
+    out.insert(1, "metric", metric)
+    return out[out["days"] >= sustain_days].reset_index(drop=True)
+
+
+# =========================
+# Interval index
+# =========================
+@dataclass
+class BottleneckIndex:
+    """
+    Sustained breach intervals for one dataset.
+      - intervals: asset, metric (or "Co-saturation"), start, end, days, peak, mean, metrics,
+                   location, component_type; sorted by start
+      - positions: dimension -> value -> row positions in `intervals`
+    """
+    intervals: pd.DataFrame
+    level: float = BREACH_LEVEL
+    sustain_days: int = SUSTAIN_DAYS
+    assets_scanned: int = 0
+    positions: dict = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return self.intervals.empty
+
+    def query(self, start=None, end=None, metric=None, **dims) -> pd.DataFrame:
+        """
+        Intervals overlapping [start, end] (either side open when None), optionally for one metric
+        and dimension values, e.g. query("2025-03-01", "2025-03-31", location=["KL"]).
+        Adds days_in_range: breach days that fall inside the window.
+        """
+        iv = self.intervals
+        if iv.empty:
+            return iv.assign(days_in_range=pd.Series(dtype="int64"))
+        q_start = pd.Timestamp(start) if start is not None else iv["start"].min()
+        q_end = pd.Timestamp(end) if end is not None else iv["end"].max()
+        stop = np.searchsorted(iv["start"].to_numpy(), np.datetime64(q_end), side="right")
+        mask = np.zeros(len(iv), dtype=bool)
+        mask[:stop] = iv["end"].to_numpy()[:stop] >= np.datetime64(q_start)
+        if metric is not None:
+            mask &= iv["metric"].isin([metric] if isinstance(metric, str) else metric).to_numpy()
+        for dim, values in dims.items():
+            if values is None or dim not in self.positions:
+                continue
+            keep = np.zeros(len(iv), dtype=bool)
+            for v in ([values] if isinstance(values, str) else values):
+                keep[self.positions[dim].get(str(v), [])] = True
+            mask &= keep
+        out = iv[mask].copy()
+        lo = out["start"].where(out["start"] > q_start, q_start)
+        hi = out["end"].where(out["end"] < q_end, q_end)
+        out["days_in_range"] = (hi - lo).dt.days + 1
+        return out.reset_index(drop=True)
+
+    def hot_assets(self, k: int = 10, start=None, end=None, **dims) -> pd.DataFrame:
+        """Top-k assets by breach days in range (co-saturated days weighted by CO_SATURATION_WEIGHT)."""
+        q = self.query(start, end, **dims)
+        if q.empty:
+            return pd.DataFrame(columns=["asset", "breach_days", "co_saturation_days", "intervals", "peak", "score"])
+        co = q["metric"] == CO_SATURATION
+        g = q.assign(breach_days=q["days_in_range"].where(~co, 0),
+                     co_saturation_days=q["days_in_range"].where(co, 0))
+        out = g.groupby("asset", sort=False).agg(
+            breach_days=("breach_days", "sum"), co_saturation_days=("co_saturation_days", "sum"),
+            intervals=("metric", "size"), peak=("peak", "max"),
+        )
+        out["score"] = out["breach_days"] + CO_SATURATION_WEIGHT * out["co_saturation_days"]
+        return out.nlargest(k, ["score", "peak"]).reset_index()
+
+    def summary(self, start=None, end=None, **dims) -> pd.DataFrame:
+        """Per metric: sustained intervals, distinct assets and breach days in range."""
+        q = self.query(start, end, **dims)
+        if q.empty:
+            return pd.DataFrame(columns=["metric", "intervals", "assets", "breach_days", "longest_days"])
+        return q.groupby("metric", sort=False).agg(
+            intervals=("asset", "size"), assets=("asset", "nunique"),
+            breach_days=("days_in_range", "sum"), longest_days=("days", "max"),
+        ).reset_index()
+
+
+def _build(df: pd.DataFrame, level: float, sustain_days: int) -> BottleneckIndex:
+    daily, cols = _daily_panel(df)
+    if daily is None or daily.empty:
+        return BottleneckIndex(intervals=pd.DataFrame(columns=_INTERVAL_COLUMNS), level=level,
+                               sustain_days=sustain_days)
+
+    values = daily[cols].to_numpy()
+    with np.errstate(invalid="ignore"):
+        breached = values >= level
+    names = {c: m for m, c in METRIC_COLUMNS.items()}
+    frames = [_intervals(daily, breached[:, i], values[:, i], names[c], sustain_days) for i, c in enumerate(cols)]
+
+    co_hit = breached.sum(axis=1) >= CO_SATURATION_MIN
+    if len(cols) >= CO_SATURATION_MIN and co_hit.any():
+        co_peak = np.nanmax(np.where(breached, values, np.nan), axis=1, initial=-np.inf)
+        frames.append(_intervals(daily, co_hit, co_peak, CO_SATURATION, sustain_days,
+                                 breached=pd.DataFrame(breached, columns=[names[c] for c in cols])))
+
+    intervals = pd.concat([f for f in frames if not f.empty] or [frames[0]], ignore_index=True)
+    keys = asset_keys(df)
+    for dim in INDEX_DIMENSIONS:
+        if dim in df.columns:
+            first = df[dim].astype(str).groupby(keys, sort=False).first()
+            intervals[dim] = intervals["asset"].map(first)
+        else:
+            intervals[dim] = None
+    intervals = intervals.sort_values(["start", "end", "asset"], kind="stable").reset_index(drop=True)
+    intervals = intervals[_INTERVAL_COLUMNS]
+
+    positions = {
+        dim: {str(v): np.asarray(idx) for v, idx in intervals.groupby(dim, sort=False).indices.items()}
+        for dim in INDEX_DIMENSIONS if intervals[dim].notna().any()
+    }
+    return BottleneckIndex(intervals=intervals, level=level, sustain_days=sustain_days,
+                           assets_scanned=int(daily["asset"].nunique()), positions=positions)
+
+
+@cached
+def bottleneck_index(df: pd.DataFrame, level: float = BREACH_LEVEL, sustain_days: int = SUSTAIN_DAYS) -> BottleneckIndex:
+    """Sustained-breach interval index for `df`, built once per dataset content and settings."""
+    return _build(df, level, sustain_days)
@@ -5,6 +5,13 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+from cache_registry import cached
+from dataset_stats import frame_stats
+from utils_capacity.forecast_engine import saturation_forecast
+from utils_capacity.metric_block import as_numeric
+from utils_capacity.aggregate_store import capacity_aggregates
+from utils_capacity.scenario_engine import Scenario, evaluate_scenarios
+from utils_capacity.bottleneck_engine import bottleneck_index
 
 # ---- Visual defaults (Company Blue & White) ----
 px.defaults.template = "plotly_white"
@@ -37,7 +44,7 @@ def _apply_bar_labels(fig, show_labels: bool, fmt: str = None):
     fig.update_traces(texttemplate=fmt if fmt else "%{y}", textposition="outside", cliponaxis=False)
     return fig
 
-@st.cache_data(show_spinner=False)
+@cached
 def _prep_base(df: pd.DataFrame):
     d = df.copy()
 
@@ -65,7 +72,7 @@ def _prep_base(df: pd.DataFrame):
         "potential_savings_usd",
     ]:
         if col in d.columns:
-            d[col] = pd.to_numeric(d[col], errors="coerce")
+            d[col] = as_numeric(d[col], errors="coerce")
 
     # Convenience columns
     if "resolution_time" in d.columns and pd.api.types.is_timedelta64_dtype(d["resolution_time"]):
@@ -120,14 +127,14 @@ def k(name: str) -> str:
 def dashboard_capacity(df: pd.DataFrame):
     st.markdown("## 🧮 IT Infrastructure Capacity — Executive Visual Dashboard")
     df = _prep_base(df)
+    stats = frame_stats(df, "dashboard_capacity")  # filter options / date span from the catalog, not a scan per rerun
 
     # ---------------- Sidebar controls ----------------
     with st.sidebar:
         st.markdown("### 🔎 Filters")
         # Date range from data_date if available
-        if "data_date" in df.columns and not pd.isna(df["data_date"]).all():
-            min_d = pd.to_datetime(df["data_date"]).min()
-            max_d = pd.to_datetime(df["data_date"]).max()
+        if "data_date" in df.columns and stats.date_bounds("data_date"):
+            min_d, max_d = stats.date_bounds("data_date")
             date_range = st.date_input(
                 "Date range",
                 value=(min_d.date(), max_d.date()),
@@ -140,7 +147,7 @@ def dashboard_capacity(df: pd.DataFrame):
 
 
         def _opt(col):
-            return sorted([v for v in df[col].dropna().astype(str).unique()]) if col in df.columns else []
+            return stats.options(col)
 
         comp = st.multiselect("Component Type", _opt("component_type"), key=k("cap_flt_component"))
         loc = st.multiselect("Location", _opt("location"), key=k("cap_flt_location"))
@@ -162,12 +169,9 @@ def dashboard_capacity(df: pd.DataFrame):
     df_filtered = df.copy()
     if clear:
         comp = loc = vendor = env = critical = []
-        if "data_date" in df_filtered.columns:
+        if "data_date" in df_filtered.columns and stats.date_bounds("data_date"):
             # reset date range to full span
-            date_range = (
-                pd.to_datetime(df_filtered["data_date"]).min().date(),
-                pd.to_datetime(df_filtered["data_date"]).max().date(),
-            )
+            date_range = tuple(d.date() for d in stats.date_bounds("data_date"))
 
     if date_range and "data_date" in df_filtered.columns:
         start_date, end_date = date_range if isinstance(date_range, tuple) else (date_range, date_range)
@@ -186,6 +190,9 @@ def dashboard_capacity(df: pd.DataFrame):
     if critical and "criticality" in df_filtered.columns:
         df_filtered = df_filtered[df_filtered["criticality"].astype[str].isin(critical)]
 
+    # Per-type / per-location / per-month aggregates shared by every section below
+    agg = capacity_aggregates(df_filtered)
+
     # ===== KPIs =====
     st.markdown("---")
     st.markdown("### 🔹 Key Metrics")
@@ -199,7 +206,7 @@ def dashboard_capacity(df: pd.DataFrame):
 
     # Avg Utilizations
     def _avg(col):
-        return float(pd.to_numeric(df_filtered[col], errors="coerce").dropna().mean()) if col in df_filtered.columns else np.nan
+        return agg.total(col, "mean") if col in df_filtered.columns else np.nan
 
     avg_cpu = _avg("avg_cpu_utilization")
     avg_mem = _avg("avg_memory_utilization")
@@ -217,8 +224,8 @@ def dashboard_capacity(df: pd.DataFrame):
         k2.metric("Avg Utilization", "N/A")
 
     # Monthly Cost / Potential Savings
-    total_cost = pd.to_numeric(df_filtered.get("cost_per_month_usd", pd.Series(dtype=float)), errors="coerce").sum()
-    total_sav = pd.to_numeric(df_filtered.get("potential_savings_usd", pd.Series(dtype=float)), errors="coerce").sum()
+    total_cost = agg.total("cost_per_month_usd", "sum") if "cost_per_month_usd" in df_filtered.columns else 0.0
+    total_sav = agg.total("potential_savings_usd", "sum") if "potential_savings_usd" in df_filtered.columns else 0.0
     k3.metric("Total Monthly Cost", f"${total_cost:,.2f}" if total_cost == total_cost else "—")
     k4.metric("Est. Potential Savings", f"${total_sav:,.2f}" if total_sav == total_sav else "—")
 
@@ -262,7 +269,7 @@ def dashboard_capacity(df: pd.DataFrame):
         # Cost Distribution by Component Type (Donut)
         if {"component_type", "cost_per_month_usd"} <= set(df_filtered.columns):
             cost_by_type = (
-                df_filtered.groupby("component_type", as_index=False)["cost_per_month_usd"].sum().sort_values("cost_per_month_usd", ascending=False)
+                agg.table("component_type", "cost_per_month_usd", "sum").sort_values("cost_per_month_usd", ascending=False)
             )
             fig = px.pie(
                 cost_by_type,
@@ -318,7 +325,7 @@ def dashboard_capacity(df: pd.DataFrame):
         # Treemap — Share of Assets by Type
         if "component_type" in df_filtered.columns:
             if "asset_id" in df_filtered.columns:
-                treemap_df = df_filtered.groupby("component_type", as_index=False)["asset_id"].nunique().rename(columns={"asset_id": "count"})
+                treemap_df = agg.assets("component_type", name="count")
             else:
                 treemap_df = df_filtered["component_type"].value_counts().reset_index()
                 treemap_df.columns = ["component_type", "count"]
@@ -329,7 +336,7 @@ def dashboard_capacity(df: pd.DataFrame):
     with ii3:
         # Cost Distribution by Component Type (Donut) — inventory section as well
         if {"component_type", "cost_per_month_usd"} <= set(df_filtered.columns):
-            cost_by_type = df_filtered.groupby("component_type", as_index=False)["cost_per_month_usd"].sum()
+            cost_by_type = agg.table("component_type", "cost_per_month_usd", "sum")
             fig = px.pie(
                 cost_by_type,
                 values="cost_per_month_usd",
@@ -342,7 +349,7 @@ def dashboard_capacity(df: pd.DataFrame):
     with ii4:
         # Asset Count by Location (Bar)
         if {"location", "asset_id"} <= set(df_filtered.columns):
-            loc_counts = df_filtered.groupby("location", as_index=False)["asset_id"].nunique().sort_values("asset_id", ascending=False)
+            loc_counts = agg.assets("location").sort_values("asset_id", ascending=False)
             fig = px.bar(loc_counts, x="location", y="asset_id", text="asset_id", title="Asset Count by Location", color_discrete_sequence=PX_SEQ)
             fig = _apply_bar_labels(fig, show_labels)
             st.plotly_chart(fig, use_container_width=True, key=k("cap_inv_loc_bar"))
@@ -517,9 +524,7 @@ def dashboard_capacity(df: pd.DataFrame):
     with cp2:
         # CPU Growth by Component Type (Projected - Current)
         if {"component_type", "avg_cpu_utilization", "projected_cpu_utilization"} <= set(df_filtered.columns):
-            dfc = df_filtered.copy()
-            dfc["cpu_growth_delta"] = dfc["projected_cpu_utilization"] - dfc["avg_cpu_utilization"]
-            g = dfc.groupby("component_type", as_index=False)["cpu_growth_delta"].mean()
+            g = agg.table("component_type", "cpu_growth_delta")
             fig = px.bar(g, x="component_type", y="cpu_growth_delta", title="Average CPU Growth by Component Type (%)", color_discrete_sequence=PX_SEQ, text="cpu_growth_delta")
             fig = _apply_bar_labels(fig, show_labels, fmt="%{text:.2f}")
             st.plotly_chart(fig, use_container_width=True, key=k("capplan_cpu_growth"))
@@ -540,13 +545,36 @@ def dashboard_capacity(df: pd.DataFrame):
     with cp4:
         # Memory Growth by Component Type
         if {"component_type", "avg_memory_utilization", "projected_memory_utilization"} <= set(df_filtered.columns):
-            dfm = df_filtered.copy()
-            dfm["mem_growth_delta"] = dfm["projected_memory_utilization"] - dfm["avg_memory_utilization"]
-            g = dfm.groupby("component_type", as_index=False)["mem_growth_delta"].mean()
+            g = agg.table("component_type", "mem_growth_delta")
             fig = px.bar(g, x="component_type", y="mem_growth_delta", title="Average Memory Growth by Component Type (%)", color_discrete_sequence=PX_SEQ, text="mem_growth_delta")
             fig = _apply_bar_labels(fig, show_labels, fmt="%{text:.2f}")
             st.plotly_chart(fig, use_container_width=True, key=k("capplan_mem_growth"))
 
+    # Days until saturation (per-asset trend + weekly seasonality over data_date)
+    forecast = saturation_forecast(df_filtered)
+    if not forecast.empty:
+        cp5, cp6 = st.columns(2)
+        with cp5:
+            soon = forecast.soonest(80, top=15)
+            soon = soon[soon["days_to_80"] > 0]
+            if not soon.empty:
+                soon = soon.assign(label=soon["asset"] + " · " + soon["metric"]).sort_values("days_to_80", ascending=False)
+                fig = px.bar(soon, x="days_to_80", y="label", color="metric", orientation="h",
+                             title="Days Until 80% Saturation (Soonest Assets)",
+                             labels={"days_to_80": "Days until 80%", "label": "Asset · Metric"},
+                             color_discrete_sequence=PX_SEQ, text="days_to_80")
+                fig = _apply_bar_labels(fig, show_labels, fmt="%{text:.0f}")
+                st.plotly_chart(fig, use_container_width=True, key=k("capplan_sat_days"))
+        with cp6:
+            summ = forecast.summary(windows=(30, 90, 180))
+            long = summ.melt(id_vars=["metric"], value_vars=[c for c in summ.columns if c.startswith("≥")],
+                             var_name="window", value_name="asset_count")
+            fig = px.bar(long, x="window", y="asset_count", color="metric", barmode="group",
+                         title="Assets Reaching Saturation by Horizon", labels={"asset_count": "Assets"},
+                         color_discrete_sequence=PX_SEQ, text="asset_count")
+            fig = _apply_bar_labels(fig, show_labels, fmt="%{text:.0f}")
+            st.plotly_chart(fig, use_container_width=True, key=k("capplan_sat_horizon"))
+
     # =========================================================
     # 5) Resource Efficiency (Under/Over Utilized)
     # =========================================================
@@ -607,7 +635,7 @@ def dashboard_capacity(df: pd.DataFrame):
 
         t6a, t6b = st.columns(2)
         with t6a:
-            _g1 = _d.groupby("component_type", as_index=False)["bottleneck_score"].mean()
+            _g1 = agg.table("component_type", "cpu_mem_score", name="bottleneck_score")
             _fig1 = px.bar(
                 _g1.sort_values("bottleneck_score", ascending=False),
                 x="component_type", y="bottleneck_score",
@@ -637,6 +665,33 @@ def dashboard_capacity(df: pd.DataFrame):
             _fig3.update_traces(texttemplate="%{text:.2f}", textposition="outside")
             st.plotly_chart(_fig3, use_container_width=True, key=k("cap6_bneck_top10"))
 
+    # Sustained breaches: the index is built once on the unfiltered data and queried with the filters
+    _bix = bottleneck_index(df)
+    if not _bix.empty:
+        _q_start, _q_end = (date_range if isinstance(date_range, tuple) and len(date_range) == 2 else (None, None))
+        _q_dims = {"location": loc or None, "component_type": comp or None}
+        _bsum = _bix.summary(_q_start, _q_end, **_q_dims)
+        _bhot = _bix.hot_assets(10, _q_start, _q_end, **_q_dims)
+
+        t6c, t6d = st.columns(2)
+        with t6c:
+            _fig4 = px.bar(
+                _bsum, x="metric", y="breach_days", text="intervals",
+                title=f"Sustained Breach Days by Metric (≥{_bix.level:.0f}%, {_bix.sustain_days}+ days)",
+                labels={"metric": "Metric", "breach_days": "Breach Days", "intervals": "Intervals"},
+                color_discrete_sequence=PX_SEQ,
+            )
+            _fig4.update_traces(texttemplate="%{text} intervals", textposition="outside")
+            st.plotly_chart(_fig4, use_container_width=True, key=k("cap6_bneck_sustained"))
+        with t6d:
+            _fig5 = px.bar(
+                _bhot, x="asset", y=["breach_days", "co_saturation_days"],
+                title="Top 10 Hot Assets — Breach and Co-saturation Days",
+                labels={"asset": "Asset", "value": "Days", "variable": "Type"},
+                color_discrete_sequence=PX_SEQ,
+            )
+            st.plotly_chart(_fig5, use_container_width=True, key=k("cap6_bneck_hot_assets"))
+
     # =========================================================
     # 7) Target 7 — Resource Allocation Efficiency
     # =========================================================
@@ -665,7 +720,7 @@ def dashboard_capacity(df: pd.DataFrame):
             st.plotly_chart(_fig5, use_container_width=True, key=k("cap7_balance_scatter"))
 
     if {"component_type","avg_cpu_utilization"} <= set(df_filtered.columns):
-        _comp = df_filtered.groupby("component_type", as_index=False)["avg_cpu_utilization"].mean()
+        _comp = agg.table("component_type", "avg_cpu_utilization")
 
         t7c, t7d = st.columns(2)
         with t7c:
@@ -698,7 +753,7 @@ def dashboard_capacity(df: pd.DataFrame):
         t8a, t8b = st.columns(2)
         with t8a:
             if "component_type" in df_filtered.columns:
-                _comp2 = df_filtered.groupby("component_type", as_index=False)["avg_cpu_utilization"].mean()
+                _comp2 = agg.table("component_type", "avg_cpu_utilization")
                 _fig8 = px.bar(
                     _comp2, x="component_type", y="avg_cpu_utilization",
                     text="avg_cpu_utilization",
@@ -796,12 +851,12 @@ def dashboard_capacity(df: pd.DataFrame):
 
     _df_st = df_filtered.copy()
     if "storage_capacity_tb" not in _df_st.columns and "storage_tb" in _df_st.columns:
-        _df_st["storage_capacity_tb"] = pd.to_numeric(_df_st["storage_tb"], errors="coerce")
+        _df_st["storage_capacity_tb"] = as_numeric(_df_st["storage_tb"], errors="coerce")
     if "storage_used_tb" not in _df_st.columns and {"avg_storage_utilization","storage_capacity_tb"} <= set(_df_st.columns):
-        _df_st["storage_used_tb"] = (pd.to_numeric(_df_st["avg_storage_utilization"], errors="coerce")/100.0) * pd.to_numeric(_df_st["storage_capacity_tb"], errors="coerce")
+        _df_st["storage_used_tb"] = (as_numeric(_df_st["avg_storage_utilization"], errors="coerce")/100.0) * as_numeric(_df_st["storage_capacity_tb"], errors="coerce")
     if {"storage_used_tb","storage_capacity_tb"} <= set(_df_st.columns):
-        _cap = pd.to_numeric(_df_st["storage_capacity_tb"], errors="coerce").replace(0, np.nan)
-        _used = pd.to_numeric(_df_st["storage_used_tb"], errors="coerce")
+        _cap = as_numeric(_df_st["storage_capacity_tb"], errors="coerce").replace(0, np.nan)
+        _used = as_numeric(_df_st["storage_used_tb"], errors="coerce")
         _df_st["storage_utilization_pct"] = (_used / _cap) * 100
 
     if {"asset_id","storage_utilization_pct"} <= set(_df_st.columns):
@@ -918,7 +973,7 @@ def dashboard_capacity(df: pd.DataFrame):
             _fig23.update_traces(texttemplate="%{text:.2f}", textposition="outside")
             st.plotly_chart(_fig23, use_container_width=True, key=k("cap11_net_top_nodes"))
         with t11d:
-            _total_bw = float(pd.to_numeric(df_filtered.get("network_bandwidth_usage_gbps", pd.Series([])), errors="coerce").sum())
+            _total_bw = float(as_numeric(df_filtered.get("network_bandwidth_usage_gbps", pd.Series([])), errors="coerce").sum())
             if _total_bw > 0:
                 _fig24 = px.pie(
                     _top10n, names="asset_id", values="network_bandwidth_usage_gbps",
@@ -936,10 +991,10 @@ def dashboard_capacity(df: pd.DataFrame):
     # Power vs Utilization
     _ene = df_filtered.copy()
     if "power_kw" not in _ene.columns and "power_watts" in _ene.columns:
-        _ene["power_kw"] = pd.to_numeric(_ene["power_watts"], errors="coerce") / 1000.0
+        _ene["power_kw"] = as_numeric(_ene["power_watts"], errors="coerce") / 1000.0
     if "power_kw" in _ene.columns and "avg_cpu_utilization" in _ene.columns:
-        _ene["power_kw"] = pd.to_numeric(_ene["power_kw"], errors="coerce")
-        _ene["avg_cpu_utilization"] = pd.to_numeric(_ene["avg_cpu_utilization"], errors="coerce")
+        _ene["power_kw"] = as_numeric(_ene["power_kw"], errors="coerce")
+        _ene["avg_cpu_utilization"] = as_numeric(_ene["avg_cpu_utilization"], errors="coerce")
 
         t12a, t12b = st.columns(2)
         with t12a:
@@ -969,7 +1024,7 @@ def dashboard_capacity(df: pd.DataFrame):
     elif "data_timestamp" in _pue.columns:
         _pue["date"] = pd.to_datetime(_pue["data_timestamp"], errors="coerce"); _date_col = "date"
     if _date_col and "pue" in _pue.columns:
-        _pue["pue"] = pd.to_numeric(_pue["pue"], errors="coerce")
+        _pue["pue"] = as_numeric(_pue["pue"], errors="coerce")
         _fig1203 = px.line(
             _pue.sort_values(_date_col), x=_date_col, y="pue",
             title="PUE Trend Over Time",
@@ -982,9 +1037,9 @@ def dashboard_capacity(df: pd.DataFrame):
     # Energy Consumption by Asset
     _ek = df_filtered.copy()
     if "energy_kwh_month" in _ek.columns:
-        _ek["energy_kwh_month"] = pd.to_numeric(_ek["energy_kwh_month"], errors="coerce")
+        _ek["energy_kwh_month"] = as_numeric(_ek["energy_kwh_month"], errors="coerce")
     elif {"power_kw","runtime_hours_month"} <= set(_ek.columns):
-        _ek["energy_kwh_month"] = pd.to_numeric(_ek["power_kw"], errors="coerce") * pd.to_numeric(_ek["runtime_hours_month"], errors="coerce")
+        _ek["energy_kwh_month"] = as_numeric(_ek["power_kw"], errors="coerce") * as_numeric(_ek["runtime_hours_month"], errors="coerce")
 
     if {"asset_id","energy_kwh_month"} <= set(_ek.columns):
         t12c, t12d = st.columns(2)
@@ -1011,9 +1066,9 @@ def dashboard_capacity(df: pd.DataFrame):
     # Energy Intensity by Component
     _ei = df_filtered.copy()
     if "energy_kwh_month" in _ei.columns:
-        _ei["energy_kwh_month"] = pd.to_numeric(_ei["energy_kwh_month"], errors="coerce")
+        _ei["energy_kwh_month"] = as_numeric(_ei["energy_kwh_month"], errors="coerce")
     elif {"power_kw","runtime_hours_month"} <= set(_ei.columns):
-        _ei["energy_kwh_month"] = pd.to_numeric(_ei["power_kw"], errors="coerce") * pd.to_numeric(_ei["runtime_hours_month"], errors="coerce")
+        _ei["energy_kwh_month"] = as_numeric(_ei["power_kw"], errors="coerce") * as_numeric(_ei["runtime_hours_month"], errors="coerce")
 
     if {"component_type","energy_kwh_month"} <= set(_ei.columns):
         t12e, t12f = st.columns(2)
@@ -1041,13 +1096,13 @@ def dashboard_capacity(df: pd.DataFrame):
     # Energy Cost vs Utilization
     _ec = df_filtered.copy()
     if "monthly_energy_cost_usd" not in _ec.columns and {"energy_kwh_month","energy_cost_per_kwh_usd"} <= set(_ec.columns):
-        _ec["monthly_energy_cost_usd"] = pd.to_numeric(_ec["energy_kwh_month"], errors="coerce") * pd.to_numeric(_ec["energy_cost_per_kwh_usd"], errors="coerce")
+        _ec["monthly_energy_cost_usd"] = as_numeric(_ec["energy_kwh_month"], errors="coerce") * as_numeric(_ec["energy_cost_per_kwh_usd"], errors="coerce")
 
     if {"avg_cpu_utilization","monthly_energy_cost_usd"} <= set(_ec.columns):
         t12g, t12h = st.columns(2)
         with t12g:
-            _ec["avg_cpu_utilization"] = pd.to_numeric(_ec["avg_cpu_utilization"], errors="coerce")
-            _ec["monthly_energy_cost_usd"] = pd.to_numeric(_ec["monthly_energy_cost_usd"], errors="coerce")
+            _ec["avg_cpu_utilization"] = as_numeric(_ec["avg_cpu_utilization"], errors="coerce")
+            _ec["monthly_energy_cost_usd"] = as_numeric(_ec["monthly_energy_cost_usd"], errors="coerce")
             _fig1208 = px.scatter(
                 _ec, x="avg_cpu_utilization", y="monthly_energy_cost_usd",
                 trendline="ols",
@@ -1068,9 +1123,9 @@ def dashboard_capacity(df: pd.DataFrame):
     # Carbon Emissions (Estimated)
     _co2 = df_filtered.copy()
     if "co2_kg_month" in _co2.columns:
-        _co2["co2_kg_month"] = pd.to_numeric(_co2["co2_kg_month"], errors="coerce")
+        _co2["co2_kg_month"] = as_numeric(_co2["co2_kg_month"], errors="coerce")
     elif {"energy_kwh_month","emission_factor_kg_per_kwh"} <= set(_co2.columns):
-        _co2["co2_kg_month"] = pd.to_numeric(_co2["energy_kwh_month"], errors="coerce") * pd.to_numeric(_co2["emission_factor_kg_per_kwh"], errors="coerce")
+        _co2["co2_kg_month"] = as_numeric(_co2["energy_kwh_month"], errors="coerce") * as_numeric(_co2["emission_factor_kg_per_kwh"], errors="coerce")
 
     if {"asset_id","co2_kg_month"} <= set(_co2.columns):
         t12i, t12j = st.columns(2)
@@ -1095,3 +1150,47 @@ def dashboard_capacity(df: pd.DataFrame):
                     color_discrete_sequence=PX_SEQ,
                 )
                 st.plotly_chart(_fig1211, use_container_width=True, key=k("cap12_co2_vs_energy_scatter"))
+
+    # =========================================================
+    # 13) What-if Scenarios
+    # =========================================================
+    st.markdown("---")
+    st.markdown("### 13) 🧪 What-if Scenarios")
+
+    if {"avg_cpu_utilization", "cost_per_month_usd"} <= set(df_filtered.columns):
+        w1, w2, w3, w4 = st.columns(4)
+        _growth = w1.slider("Demand growth (%)", 0, 100, 15, step=5, key=k("cap13_growth"))
+        _ratio = w2.slider("Consolidation ratio (N:1, assets < 30% CPU)", 1.0, 4.0, 2.0, step=0.5, key=k("cap13_consol"))
+        _rsize = w3.slider("Right-sizing (% capacity, assets < 40% CPU)", 0, 60, 25, step=5, key=k("cap13_rightsize"))
+        _tier = w4.slider("Storage tiered (%)", 0, 80, 30, step=10, key=k("cap13_tiering"))
+
+        _sims = evaluate_scenarios(df_filtered, [
+            Scenario(name="Baseline"),
+            Scenario(name="Selected", growth_pct=_growth, consolidation_ratio=_ratio,
+                     rightsizing_pct=_rsize, tiering_pct=_tier),
+        ]).set_index("name")
+        _b, _s = _sims.loc["Baseline"], _sims.loc["Selected"]
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Projected Monthly Cost", f"${_s['projected_cost_usd']:,.0f}",
+                  delta=f"{-_s['savings_usd']:,.0f}", delta_color="inverse")
+        m2.metric("Savings", f"{_s['savings_pct']:.1f}%")
+        m3.metric("Assets at ≥85%", f"{int(_s['assets_at_risk']):,}",
+                  delta=f"{int(_s['assets_at_risk'] - _b['assets_at_risk']):+,}", delta_color="inverse")
+        m4.metric("Consolidated / Right-sized", f"{int(_s['assets_consolidated']):,} / {int(_s['assets_rightsized']):,}")
+
+        _util_cols = [c for c in _sims.columns if c.startswith("projected_") and c.endswith("_pct")]
+        _cmp = (
+            _sims[_util_cols].T.rename(index=lambda c: c[len("projected_"):-len("_pct")].title())
+            .rename_axis("metric").reset_index()
+            .melt(id_vars="metric", var_name="scenario", value_name="utilization_pct")
+        )
+        _fig1301 = px.bar(
+            _cmp, x="metric", y="utilization_pct", color="scenario", barmode="group",
+            text="utilization_pct",
+            title="Mean Projected Utilization — Baseline vs Selected Scenario (%)",
+            labels={"metric": "Metric", "utilization_pct": "Mean Utilization (%)", "scenario": "Scenario"},
+            color_discrete_sequence=PX_SEQ,
+        )
+        _fig1301.update_traces(texttemplate="%{text:.1f}%", textposition="outside")
+        st.plotly_chart(_fig1301, use_container_width=True, key=k("cap13_whatif_util"))
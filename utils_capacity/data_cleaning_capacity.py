@@ -3,6 +3,13 @@ import numpy as np
 import streamlit as st
 import io
 import re
+from cleaning_diff import diff_frames, paged_dataframe, profile_raw, render_diff
+from cleaning_executor import ExecutionReport
+from dimension_encoding import arrow_safe_categorical, encode_dimensions
+from duplicate_index import build_index
+from schema_registry import apply_schema
+from utils_capacity.metric_block import build_metric_block
+from utils_capacity.schema import SCHEMA
 
 # --------- helpers ---------
 PLACEHOLDERS = {'#N/A','N/A','n/a','NA','null','NULL','########','#####','', ' ', '#VALUE!'}
@@ -29,7 +36,7 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
       - Lists/dicts/tuples in cells -> string
       - Pandas nullable Int64 -> float64 (preserve NaN)
       - datetimes -> naive datetime64[ns]
-      - categoricals -> string
+      - categoricals kept dictionary-encoded (labels as strings)
     """
     out = df.copy()
 
@@ -59,9 +66,9 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
         elif pd.api.types.is_datetime64_any_dtype(s):
             out[col] = pd.to_datetime(s, errors="coerce").dt.tz_localize(None)
 
-        # 4) categoricals -> string
-        elif pd.api.types.is_categorical_dtype(s):
-            out[col] = s.astype("string")
+        # 4) categoricals stay categorical (Arrow dictionary); only labels are stringified
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = arrow_safe_categorical(s)
 
     return out
 
@@ -93,8 +100,9 @@ def _to_numeric(series: pd.Series) -> pd.Series:
 
 # --------- main cleaning pipeline ---------
 def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
-    # keep a RAW snapshot (exactly as uploaded)
-    raw_df_snapshot = df.copy(deep=True)
+    # keep a RAW snapshot (exactly as uploaded): a copy-on-write view, profiled once for the raw-vs-cleaned diff
+    raw_df_snapshot = df.copy(deep=False)
+    raw_profile = profile_raw(raw_df_snapshot)
 
     st.success("✅ File successfully loaded!")
 
@@ -105,32 +113,32 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
 
     # a) number of rows and columns
     col1, col2 = st.columns(2)
-    col1.metric("Rows (Raw)", raw_df_snapshot.shape[0])
-    col2.metric("Columns (Raw)", raw_df_snapshot.shape[1])
+    col1.metric("Rows (Raw)", raw_profile.rows)
+    col2.metric("Columns (Raw)", len(raw_profile.columns))
 
     # b) total missing values
-    total_missing_raw = int(raw_df_snapshot.isnull().sum().sum())
+    total_missing_raw = raw_profile.total_missing
     m1, _m2 = st.columns(2)
     m1.metric("Total Missing Values (Raw)", total_missing_raw)
 
     # c) data types
     st.markdown("**Data Types (Raw)**")
-    st.dataframe(_dtype_table(raw_df_snapshot, "Raw dtypes"), use_container_width=True)
+    st.dataframe(raw_profile.dtype_table(), use_container_width=True)
 
     # d) missing value table
     col_mv, _ = st.columns([3, 1])
     with col_mv:
         st.markdown("**Missing Values by Column (Raw)**")
         st.dataframe(
-            raw_df_snapshot.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+            raw_profile.missing_table(),
             use_container_width=True
         )
 
     # e) duplicated rows
-    dup_count_raw = int(raw_df_snapshot.duplicated().sum())
+    dup_count_raw = raw_profile.duplicates
     st.write(f"**Duplicated Rows (Raw):** {dup_count_raw}")
     if dup_count_raw > 0:
-        st.dataframe(raw_df_snapshot[raw_df_snapshot.duplicated()], use_container_width=True)
+        paged_dataframe(raw_df_snapshot.iloc[raw_profile.duplicates_index.sample()], key="capacity_raw_dup_page")
 
     # f) datetime columns (raw)
     raw_datetime_cols = [c for c in raw_df_snapshot.columns if pd.api.types.is_datetime64_any_dtype(raw_df_snapshot[c])]
@@ -160,10 +168,11 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
     # 1) Replace only true placeholders with NaN
     df = df.replace(list(PLACEHOLDERS), np.nan)
 
-    # 2) Convert datetime-like columns (heuristic)
-    datetime_cols = [c for c in df.columns if any(tok in c for tok in ["date", "time", "timestamp"])]
-    for c in datetime_cols:
-        df[c] = pd.to_datetime(df[c], errors="coerce", dayfirst=True)
+    timings = ExecutionReport()   # per-column timings of the parallel cleaning steps
+    # 2) Schema-typed columns (utils_capacity/schema.py): critical metrics with their units, datetime-like
+    #    and status/flag columns, one conversion per column; the plan is cached per layout
+    df, plan = apply_schema(SCHEMA.domain, df, report=timings)
+    datetime_cols = [c for c, spec, _ in plan.steps if spec.dtype == "datetime"]
 
     # 3) Convert numeric-like "text" columns broadly
     for c in df.columns:
@@ -187,28 +196,14 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
                 vals = vals * 100.0
         df[c] = vals.round(2).astype("Float64")
 
-    # 5) Boolean / categorical normalization for status-like flags
-    bool_like_cols = [c for c in df.columns if any(tok in c for tok in ["flag", "status", "bottleneck"])]
-    for c in bool_like_cols:
-        mapped = df[c].astype(str).str.lower().map({
-            "true": True, "false": False, "yes": True, "no": False, "1": True, "0": False
-        })
-        if mapped.notna().mean() >= 0.6:
-            df[c] = mapped.fillna(False)
-
-    # 6) Numeric integrity for critical metrics
-    numeric_cols = [
-        "cpu_cores","memory_gb","storage_tb","network_bandwidth_gbps",
-        "incident_count","downtime_minutes","avg_response_time_ms",
-        "energy_consumption_kwh","co2_emission_kg","cost_per_month_usd",
-        "potential_savings_usd","sustainability_score"
-    ]
+    # 5) Numeric integrity for critical metrics
+    numeric_cols = [spec.name for spec in SCHEMA.columns if spec.dtype == "numeric"]
     for c in numeric_cols:
         if c in df.columns:
             df[c] = _to_numeric(df[c])
             df[c] = df[c].fillna(0)
 
-    # 7) Handle missing values (context-aware)
+    # 6) Handle missing values (context-aware)
     for c in df.columns:
         if df[c].isna().any():
             if pd.api.types.is_numeric_dtype(df[c]):
@@ -219,7 +214,7 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
                 mode = df[c].mode()
                 df[c] = df[c].fillna(mode.iloc[0] if not mode.empty else "Unknown")
 
-    # 8) Explicit business fills
+    # 7) Explicit business fills
     if "bottleneck_cause" in df.columns:
         df["bottleneck_cause"] = df["bottleneck_cause"].fillna("none")
 
@@ -229,22 +224,30 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
         else:
             df["vm_density_ratio"] = df["vm_density_ratio"].fillna("none")
 
-    # 9) Drop duplicate rows
-    dup_clean = int(df.duplicated().sum())
+    # 8) Drop duplicate rows
+    clean_dups = build_index(df)      # one row hash: count and filter
+    dup_clean = clean_dups.count
     if dup_clean:
         st.info(f"🔁 Dropping exact duplicate rows: {dup_clean}")
-        df = df.drop_duplicates()
+        df = df[clean_dups.keep()]
 
-    # 10) Derive helper month column if we have any parsed datetime column
+    # 9) Derive helper month column if we have any parsed datetime column
     date_col = next((c for c in datetime_cols if c in df.columns and pd.api.types.is_datetime64_any_dtype(df[c])), None)
     if date_col:
         df["month"] = df[date_col].dt.to_period("M")
     else:
         st.info("ℹ️ No valid datetime column found for month derivation.")
 
-    # 11) Convert to pandas' nullable dtypes for stability
+    # 10) Convert to pandas' nullable dtypes for stability
     df = df.convert_dtypes()
 
+    # 11) Typed metric block: numeric metrics as plain float32 (percentages) / float64 columns,
+    #     coerced once here so the recommendation modules and dashboard read them as-is
+    df, metric_block = build_metric_block(df)
+
+    # Dimension columns -> categoricals (int codes + one copy of each label) for every downstream groupby/filter
+    df = encode_dimensions(df, report=timings)
+
     # ==============================
     # ii. AFTER CLEANING
     # ==============================
@@ -256,7 +259,8 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
     ac2.metric("Columns (Cleaned)", df.shape[1])
 
     # b) total missing value
-    total_missing_clean = int(df.isnull().sum().sum())
+    diff = diff_frames(raw_profile, df, col_map)
+    total_missing_clean = int(diff.missing_table()["Missing"].sum())
     cm1, _cm2 = st.columns(2)
     cm1.metric("Total Missing Values (Cleaned)", total_missing_clean)
 
@@ -264,10 +268,19 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
     st.markdown("**Data Types (Cleaned)**")
     st.dataframe(_dtype_table(df, "Cleaned dtypes"), use_container_width=True)
 
+    # c2) validation flags on the typed metric block
+    st.markdown("**Metric Validation (Cleaned)**")
+    flagged = metric_block.summary()
+    if flagged.empty:
+        st.write(f"All {len(metric_block.dtypes)} numeric metrics passed validation (no missing, negative or >100% values).")
+    else:
+        st.write(f"**Rows with at least one flagged metric:** {int(metric_block.invalid_rows.sum())}")
+        st.dataframe(flagged, use_container_width=True)
+
     # d) missing value table
     st.markdown("**Missing Values by Column (Cleaned)**")
     st.dataframe(
-        df.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+        diff.missing_table(),
         use_container_width=True
     )
 
@@ -275,6 +288,11 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
     cleaned_datetime_cols = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
     st.write("**Datetime Columns Detected (Cleaned):** " + (", ".join(cleaned_datetime_cols) if cleaned_datetime_cols else "None"))
 
+    with st.expander("🧭 Cleaning Plan (schema)"):
+        st.dataframe(plan.summary(), use_container_width=True)
+        st.caption(f"⏱️ {timings.summary()}")
+        st.dataframe(timings.table(), use_container_width=True)
+
     # g) sample data
     st.markdown("**Sample Cleaned Data:**")
     st.dataframe(df.head(), use_container_width=True)
@@ -284,27 +302,7 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
     # ==============================
     st.subheader("🔍 Compare Raw Data vs Cleaned Data")
 
-    # Build dtype tables
-    dtypes_raw = _dtype_table(raw_df_snapshot, "Raw dtypes")
-    dtypes_clean = _dtype_table(df, "Cleaned dtypes")
-
-    # Add a normalized key for raw columns so they align with cleaned
-    dtypes_raw["Column (standardized)"] = dtypes_raw["Column"].map(col_map)
-    dtypes_clean = dtypes_clean.rename(columns={"Column": "Column (standardized)"})
-
-    # Merge on the standardized column name
-    dtype_compare = dtypes_raw.merge(dtypes_clean, on="Column (standardized)", how="outer")
-    dtype_compare = dtype_compare.rename(columns={"Column": "Raw Column"})
-
-    # >>> Mark columns dropped during cleaning in the comparison table <<<
-    dropped_mask = dtype_compare["Cleaned dtypes"].isna() & dtype_compare["Raw dtypes"].notna()
-    dtype_compare.loc[dropped_mask, "Cleaned dtypes"] = "dropped"
-
-    # Reorder for readability
-    dtype_compare = dtype_compare[["Raw Column", "Column (standardized)", "Raw dtypes", "Cleaned dtypes"]].fillna("—")
-
-    st.markdown("**Data Types (Aligned by Standardized Name)**")
-    st.dataframe(dtype_compare, use_container_width=True)
+    render_diff(diff)
 
     # b) sample data — STACKED (Raw on top, Cleaned below)
     st.markdown("**Sample – Raw Data**")
@@ -343,24 +341,10 @@ def data_cleaning_capacity(df: pd.DataFrame, uploaded_file):
     view_option = st.radio("Select which data to view:", ("Raw Data", "Cleaned Data"), horizontal=True)
     with st.expander("📂 Click to view full table"):
         if view_option == "Raw Data":
-            file_name = uploaded_file.name.lower() if hasattr(uploaded_file, "name") else ""
-            try:
-                if file_name.endswith(".csv"):
-                    raw_df = pd.read_csv(uploaded_file)
-                elif file_name.endswith((".xlsx", ".xls")):
-                    raw_df = pd.read_excel(uploaded_file, engine="openpyxl")
-                else:
-                    st.error("❌ Unsupported file format. Please upload CSV or Excel.")
-                    raw_df = None
-
-                if raw_df is not None:
-                    st.markdown("### 🗃️ Raw Data (Full Table)")
-                    st.dataframe(raw_df, use_container_width=True)
-
-            except Exception as e:
-                st.error(f"⚠️ Could not read raw file: {e}")
+            st.markdown("### 🗃️ Raw Data (Full Table)")
+            paged_dataframe(raw_df_snapshot, key="capacity_raw_page")
         else:
             st.markdown("### 🧼 Cleaned Data (Full Table)")
-            st.dataframe(df, use_container_width=True)
+            paged_dataframe(df, key="capacity_clean_page")
 
     return df
@@ -0,0 +1,263 @@
+# utils_capacity/forecast_engine.py
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+
+from cache_registry import session_store
+from utils_capacity.metric_block import as_numeric
+
+# ─────────────────────────────────────────────────────────────
+# Per-asset saturation forecasting
+#   y(t) = b0 + b1·t [+ b2·sin(2πt/7) + b3·cos(2πt/7)]   (t = days since first data_date)
+# fitted for every asset at once from additive normal-equation statistics
+# (XᵀX, Xᵀy per asset). New days only add their own XᵀX / Xᵀy, so a refit
+# touches the new rows; the history is re-read only when it changed.
+# statsmodels (already used for seasonal_decompose) offers Holt-Winters /
+# ETS, but each fit is a numerical optimisation of one series (~0.1 s, i.e.
+# minutes for a few hundred assets × 4 metrics) and their results cannot be
+# extended with new days without refitting; one batched solve covers every
+# asset and folds appended days in.
+# ─────────────────────────────────────────────────────────────
+METRIC_COLUMNS = {
+    "CPU": "avg_cpu_utilization",
+    "Memory": "avg_memory_utilization",
+    "Storage": "avg_storage_utilization",
+    "Network": "avg_network_utilization",
+}
+SATURATION_LEVELS = (80, 90)
+SEASON_DAYS = 7
+MIN_POINTS = 3          # distinct days an asset needs before it gets a trend
+HORIZON_DAYS = 3650     # beyond this "days until saturation" is reported as not on current trend
+
+_DATE_CANDIDATES = ["data_date", "data_timestamp", "date", "report_date", "timestamp"]
+_STORE = "capacity_forecast_state"
+_MAX_STATES = 16        # fitted (metric, origin) states kept per session: 4 metrics × 4 datasets
+
+
+def series_dates(df: pd.DataFrame):
+    """Day of each row, from the same columns dashboard_capacity uses for data_date."""
+    for col in _DATE_CANDIDATES:
+        if col in df.columns:
+            d = pd.to_datetime(df[col], errors="coerce").dt.normalize()
+            if d.notna().any():
+                return d
+    return None
+
+
+def asset_keys(df: pd.DataFrame) -> pd.Series:
+    if "asset_id" in df.columns:
+        return df["asset_id"].astype(str)
+    return pd.Series("All assets", index=df.index)
+
+
+# =========================
+# Normal-equation statistics
+# =========================
+def _design(t: np.ndarray, seasonal: bool) -> np.ndarray:
+    cols = [np.ones_like(t), t]
+    if seasonal:
+        w = 2 * np.pi * t / SEASON_DAYS
+        cols += [np.sin(w), np.cos(w)]
+    return np.column_stack(cols)
+
+
+def _stats(codes: np.ndarray, t: np.ndarray, y: np.ndarray, n_assets: int, seasonal: bool):
+    """Per-asset XᵀX (n, p, p), Xᵀy (n, p), observation count and last t, via bincount."""
+    X = _design(t, seasonal)
+    p = X.shape[1]
+    xtx = np.empty((n_assets, p, p))
+    for i in range(p):
+        for j in range(i, p):
+            xtx[:, i, j] = xtx[:, j, i] = np.bincount(codes, weights=X[:, i] * X[:, j], minlength=n_assets)
+    xty = np.column_stack([np.bincount(codes, weights=X[:, i] * y, minlength=n_assets) for i in range(p)])
+    n_obs = np.bincount(codes, minlength=n_assets)
+    last_t = np.full(n_assets, -np.inf)
+    np.maximum.at(last_t, codes, t)
+    return xtx, xty, n_obs, last_t
+
+
+def _solve(xtx: np.ndarray, xty: np.ndarray, n_obs: np.ndarray) -> np.ndarray:
+    """Batched least squares; seasonal terms only where there is enough history for them."""
+    n, p = xty.shape
+    beta = np.full((n, 4), np.nan)
+    ridge = 1e-9 * np.eye(p)
+
+    full = n_obs >= max(MIN_POINTS, p + 2)
+    if p > 2 and full.any():
+        beta[full, :p] = np.linalg.solve(xtx[full] + ridge, xty[full][..., None])[..., 0]
+    trend_only = (n_obs >= MIN_POINTS) & ~(full if p > 2 else np.zeros(n, dtype=bool))
+    if trend_only.any():
+        beta[trend_only, :2] = np.linalg.solve(xtx[trend_only][:, :2, :2] + ridge[:2, :2],
+                                               xty[trend_only][:, :2, None])[..., 0]
+        beta[trend_only, 2:] = 0.0
+    if p == 2:
+        beta[:, 2:] = np.where(np.isnan(beta[:, :1]), np.nan, 0.0)
+    return beta
+
+
+@dataclass
+class _FitState:
+    origin: pd.Timestamp
+    seasonal: bool
+    assets: pd.Index
+    xtx: np.ndarray
+    xty: np.ndarray
+    n_obs: np.ndarray
+    last_t: np.ndarray
+    upto: float            # last t folded into the statistics
+    history_hash: int      # hash of the rows with t <= upto
+
+
+def _hash_rows(panel: pd.DataFrame) -> int:
+    return int(pd.util.hash_pandas_object(panel, index=False).sum())
+
+
+def _fit_metric(panel: pd.DataFrame, state_key) -> tuple:
+    """panel: asset, t, y (daily mean per asset). Returns (_FitState, mode) with mode full/incremental/cached."""
+    store = session_store(_STORE, _MAX_STATES)
+    prev = store.get(state_key)
+    if prev is not None:
+        store.touch(state_key)
+    span = panel["t"].max() if len(panel) else 0.0
+    seasonal = span >= 2 * SEASON_DAYS
+
+    if prev is not None and prev.seasonal == seasonal:
+        old = panel[panel["t"] <= prev.upto]
+        if _hash_rows(old) == prev.history_hash:
+            new = panel[panel["t"] > prev.upto]
+            if new.empty:
+                return prev, "cached"
+            assets = prev.assets.union(pd.Index(new["asset"].unique()))
+            pos = prev.assets.get_indexer(assets)
+            keep = pos >= 0
+            p = prev.xty.shape[1]
+            xtx = np.zeros((len(assets), p, p)); xtx[keep] = prev.xtx[pos[keep]]
+            xty = np.zeros((len(assets), p)); xty[keep] = prev.xty[pos[keep]]
+            n_obs = np.zeros(len(assets), dtype=np.int64); n_obs[keep] = prev.n_obs[pos[keep]]
+            last_t = np.full(len(assets), -np.inf); last_t[keep] = prev.last_t[pos[keep]]
+
+            codes = assets.get_indexer(new["asset"])
+            d_xtx, d_xty, d_n, d_last = _stats(codes, new["t"].to_numpy(float), new["y"].to_numpy(float),
+                                               len(assets), seasonal)
+            state = _FitState(prev.origin, seasonal, assets, xtx + d_xtx, xty + d_xty, n_obs + d_n,
+                              np.maximum(last_t, d_last), float(span), _hash_rows(panel))
+            store[state_key] = state
+            return state, "incremental"
+
+    assets = pd.Index(panel["asset"].unique())
+    codes = assets.get_indexer(panel["asset"])
+    xtx, xty, n_obs, last_t = _stats(codes, panel["t"].to_numpy(float), panel["y"].to_numpy(float),
+                                     len(assets), seasonal)
+    state = _FitState(state_key[-1], seasonal, assets, xtx, xty, n_obs, last_t, float(span), _hash_rows(panel))
+    store[state_key] = state
+    return state, "full"
+
+
+# =========================
+# Forecast results
+# =========================
+@dataclass
+class SaturationForecast:
+    """One row per (asset, metric): fitted trend/seasonality and days until each saturation level."""
+    params: pd.DataFrame
+    origin: pd.Timestamp = None
+    fit_modes: dict = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return self.params.empty
+
+    def soonest(self, level: int = SATURATION_LEVELS[0], top: int = 15) -> pd.DataFrame:
+        """Assets closest to `level` (any metric), soonest first; only those on a rising path."""
+        col = f"days_to_{level}"
+        d = self.params[np.isfinite(self.params[col])]
+        return d.sort_values([col, "level_now"], ascending=[True, False]).head(top).reset_index(drop=True)
+
+    def summary(self, windows=(30, 90, 180)) -> pd.DataFrame:
+        """Assets reaching each saturation level within each window, per metric."""
+        rows = []
+        for metric, g in self.params.groupby("metric", sort=False):
+            row = {"metric": metric, "assets": len(g)}
+            for level in SATURATION_LEVELS:
+                days = g[f"days_to_{level}"]
+                row[f"already ≥{level}%"] = int((days == 0).sum())
+                for w in windows:
+                    row[f"≥{level}% in {w}d"] = int(((days > 0) & (days <= w)).sum())
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def projection(self, asset: str, metric: str, horizon_days: int = 90) -> pd.DataFrame:
+        """Fitted + projected daily curve for one asset (columns: date, fitted)."""
+        row = self.params[(self.params["asset"] == asset) & (self.params["metric"] == metric)]
+        if row.empty or self.origin is None:
+            return pd.DataFrame(columns=["date", "fitted"])
+        r = row.iloc[0]
+        t = np.arange(0, r["last_t"] + horizon_days + 1, dtype=float)
+        w = 2 * np.pi * t / SEASON_DAYS
+        y = r["b0"] + r["b1"] * t + r["b2"] * np.sin(w) + r["b3"] * np.cos(w)
+        return pd.DataFrame({"date": self.origin + pd.to_timedelta(t, unit="D"), "fitted": np.clip(y, 0, 100)})
+
+
+def _days_until(level_peak: np.ndarray, slope: np.ndarray, level: float) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.where(slope > 0, (level - level_peak) / slope, np.inf)
+    days = np.where(level_peak >= level, 0.0, days)
+    days = np.where(days > HORIZON_DAYS, np.inf, days)
+    return np.where(np.isnan(level_peak) | np.isnan(slope), np.nan, np.ceil(days))
+
+
+def saturation_forecast(df: pd.DataFrame) -> SaturationForecast:
+    """Fit every asset × utilization metric in `df` and report days until 80% / 90% saturation."""
+    cols = [m for m in METRIC_COLUMNS.values() if m in df.columns]
+    dates = series_dates(df)
+    empty = SaturationForecast(params=pd.DataFrame())
+    if not cols or dates is None:
+        return empty
+
+    base = pd.DataFrame({"asset": asset_keys(df), "day": dates})
+    for c in cols:
+        base[c] = as_numeric(df[c], errors="coerce").astype("float64")
+    base = base.dropna(subset=["day"])
+    if base.empty:
+        return empty
+
+    origin = base["day"].min()
+    daily = base.groupby(["asset", "day"], sort=True, observed=True)[cols].mean().reset_index()
+    daily["t"] = (daily["day"] - origin).dt.days.astype("float64")
+
+    frames, modes = [], {}
+    for metric, col in METRIC_COLUMNS.items():
+        if col not in cols:
+            continue
+        panel = daily[["asset", "t", col]].rename(columns={col: "y"}).dropna(subset=["y"])
+        if panel.empty:
+            continue
+        state, modes[metric] = _fit_metric(panel, (col, origin))
+        beta = _solve(state.xtx, state.xty, state.n_obs)
+
+        last_t = state.last_t
+        level_now = beta[:, 0] + beta[:, 1] * last_t
+        amp = np.hypot(beta[:, 2], beta[:, 3])
+        peak_now = level_now + amp
+        out = pd.DataFrame({
+            "asset": state.assets.astype(str),
+            "metric": metric,
+            "n_obs": state.n_obs,
+            "last_t": last_t,
+            "last_date": origin + pd.to_timedelta(last_t, unit="D"),
+            "b0": beta[:, 0], "b1": beta[:, 1], "b2": beta[:, 2], "b3": beta[:, 3],
+            "slope_per_day": beta[:, 1],
+            "seasonal_amp": amp,
+            "level_now": np.clip(level_now, 0, 100),
+        })
+        for level in SATURATION_LEVELS:
+            out[f"days_to_{level}"] = _days_until(peak_now, beta[:, 1], level)
+            out[f"date_{level}"] = out["last_date"] + pd.to_timedelta(
+                out[f"days_to_{level}"].where(np.isfinite(out[f"days_to_{level}"])), unit="D")
+        frames.append(out[out["n_obs"] >= MIN_POINTS])
+
+    if not frames:
+        return empty
+    params = pd.concat(frames, ignore_index=True)
+    return SaturationForecast(params=params, origin=origin, fit_modes=modes)
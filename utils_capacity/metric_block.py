@@ -0,0 +1,164 @@
+# utils_capacity/metric_block.py
+
+import contextlib
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# Typed metric block
+# data_cleaning_capacity coerces every numeric metric ONCE into a plain numpy
+# float column (float32 for bounded percentages, float64 for money/counts), so
+# the recommendation modules and the dashboard read it as-is. `as_numeric` is
+# the drop-in for `pd.to_numeric(..., errors="coerce")` that only does work
+# when a column has not been through the block (e.g. uncleaned uploads).
+# ─────────────────────────────────────────────────────────────
+PERCENT_TOKENS = ("utilization", "uptime", "percent")
+SIGNED_TOKENS = ("growth_pct", "delta", "change", "variance", "trend", "score")
+
+PERCENT_DTYPE = np.float32
+VALUE_DTYPE = np.float64
+
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def metric_dtype(col: str):
+    """float32 for 0–100 percentages, float64 for everything else (costs, energy, counts)."""
+    c = str(col).lower()
+    if any(tok in c for tok in PERCENT_TOKENS) and not any(tok in c for tok in SIGNED_TOKENS):
+        return PERCENT_DTYPE
+    return VALUE_DTYPE
+
+
+def _is_metric(s: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s)
+
+
+def is_typed(s) -> bool:
+    """Already a plain numpy float/int column -> nothing left to coerce."""
+    return isinstance(s, pd.Series) and isinstance(s.dtype, np.dtype) and s.dtype.kind in "fiu"
+
+
+def as_numeric(x, errors: str = "coerce"):
+    """`pd.to_numeric(x, errors=...)` that is a no-op for columns emitted by the metric block."""
+    if is_typed(x):
+        return x
+    return pd.to_numeric(x, errors=errors)
+
+
+# =========================
+# Block construction (cleaning layer)
+# =========================
+@dataclass
+class MetricBlock:
+    """
+    Typed numeric columns of a cleaned capacity frame.
+      - dtypes: column -> numpy dtype emitted
+      - flags:  per-row validation flags (True = problem), one column per "<metric>__<rule>"
+    Rules: missing (no value after coercion), negative (below 0 where only >= 0 makes sense),
+    over_100 (percentage above 100).
+    """
+    dtypes: dict
+    flags: pd.DataFrame
+
+    def summary(self) -> pd.DataFrame:
+        """Flagged rows per metric and rule (only rules with at least one hit)."""
+        if self.flags.empty:
+            return pd.DataFrame(columns=["Column", "Rule", "Rows Flagged"])
+        counts = self.flags.sum()
+        counts = counts[counts > 0]
+        parts = counts.index.str.rsplit("__", n=1)
+        return pd.DataFrame({
+            "Column": [p[0] for p in parts],
+            "Rule": [p[1] for p in parts],
+            "Rows Flagged": counts.to_numpy(dtype="int64"),
+        })
+
+    @property
+    def invalid_rows(self) -> pd.Series:
+        """True for rows with at least one flagged metric."""
+        if self.flags.empty:
+            return pd.Series(False, index=self.flags.index)
+        return self.flags.any(axis=1)
+
+
+def _validation_flags(col: str, vals: np.ndarray, was_missing: np.ndarray) -> dict:
+    c = str(col).lower()
+    flags = {f"{col}__missing": was_missing}
+    if not any(tok in c for tok in SIGNED_TOKENS):
+        with np.errstate(invalid="ignore"):
+            flags[f"{col}__negative"] = vals < 0
+    if metric_dtype(col) is PERCENT_DTYPE:
+        with np.errstate(invalid="ignore"):
+            flags[f"{col}__over_100"] = vals > 100
+    return flags
+
+
+def build_metric_block(df: pd.DataFrame, exclude=()) -> tuple:
+    """
+    Cast every numeric (non-boolean) column of `df` to its numpy float dtype, NaN for missing.
+    Returns (typed frame, MetricBlock). Values are unchanged apart from the float32 rounding of
+    percentages (stored to 2 decimals by the cleaner).
+    """
+    out = df.copy(deep=False)
+    dtypes, flags = {}, {}
+    skip = set(exclude)
+    for col in df.columns:
+        s = df[col]
+        if col in skip or not _is_metric(s):
+            continue
+        dtype = metric_dtype(col)
+        vals = s.to_numpy(dtype=dtype, na_value=np.nan)
+        out[col] = pd.Series(vals, index=df.index, name=col)
+        dtypes[col] = np.dtype(dtype)
+        flags.update(_validation_flags(col, vals, np.isnan(vals)))
+    return out, MetricBlock(dtypes=dtypes, flags=pd.DataFrame(flags, index=df.index))
+
+
+# =========================
+# Coercion-count profiler
+# =========================
+class CoercionProfile:
+    """Counts real `pd.to_numeric` calls, keyed by "<file>:<function>" of the caller."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def table(self) -> pd.DataFrame:
+        rows = sorted(self.calls.items(), key=lambda kv: (-kv[1], kv[0]))
+        return pd.DataFrame(rows, columns=["Call site", "Coercions"])
+
+
+@contextlib.contextmanager
+def coercion_profiler(only_under: str = None):
+    """
+    Patch `pandas.to_numeric` for the duration of the block and count every call.
+    `only_under` restricts counting to callers whose file lives under that directory.
+    Fallbacks inside `as_numeric` are attributed to the module that called it.
+    """
+    profile = CoercionProfile()
+    original = pd.to_numeric
+    root = os.path.abspath(only_under) if only_under else None
+
+    def counting_to_numeric(*args, **kwargs):
+        frame = sys._getframe(1)
+        while frame.f_back is not None and os.path.abspath(frame.f_code.co_filename) == _THIS_FILE:
+            frame = frame.f_back  # attribute as_numeric fallbacks to the module that asked
+        path = os.path.abspath(frame.f_code.co_filename)
+        if root is None or path.startswith(root):
+            profile.calls[f"{os.path.relpath(path)}:{frame.f_code.co_name}"] += 1
+        return original(*args, **kwargs)
+
+    pd.to_numeric = counting_to_numeric
+    try:
+        yield profile
+    finally:
+        pd.to_numeric = original
@@ -1,6 +1,9 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils_capacity.metric_block import as_numeric
+from utils_capacity.aggregate_store import capacity_aggregates
+from utils_capacity.bottleneck_engine import bottleneck_index, CO_SATURATION
 
 # 🔹 Mesiniaga theme
 px.defaults.template = "plotly_white"
@@ -18,6 +21,8 @@ def render_cio_tables(title, cio_data):
         st.markdown(cio_data["satisfaction"], unsafe_allow_html=True)
 
 def bottleneck_identification(df):
+    agg = capacity_aggregates(df)
+    bix = bottleneck_index(df)
     # ==========================
     # 1️⃣ Identify Bottlenecks by Component
     # ==========================
@@ -26,10 +31,10 @@ def bottleneck_identification(df):
 
             df = df.copy()
             df["bottleneck_score"] = (
-                pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
-                + pd.to_numeric(df["avg_memory_utilization"], errors="coerce")
+                as_numeric(df["avg_cpu_utilization"], errors="coerce")
+                + as_numeric(df["avg_memory_utilization"], errors="coerce")
             ) / 2
-            bottlenecks = df.groupby("component_type")["bottleneck_score"].mean().reset_index()
+            bottlenecks = agg.table("component_type", "cpu_mem_score", name="bottleneck_score")
 
             # Graph 1: Average bottleneck score by component type
             fig_bar = px.bar(
@@ -80,8 +85,8 @@ Why this matters: Concentrated bottlenecks are leading indicators of future inci
             )
             st.plotly_chart(fig_hist, use_container_width=True, key="bottleneck_hist")
 
-            max_score = pd.to_numeric(df["bottleneck_score"], errors="coerce").max()
-            min_score = pd.to_numeric(df["bottleneck_score"], errors="coerce").min()
+            max_score = as_numeric(df["bottleneck_score"], errors="coerce").max()
+            min_score = as_numeric(df["bottleneck_score"], errors="coerce").min()
 
             st.write(f"""
 What this graph is: A histogram showing the distribution of bottleneck scores across all individual assets.
@@ -109,8 +114,8 @@ Why this matters: A large group of assets with high bottleneck scores represents
             # ==========================
             # CIO Recommendations for Component Bottlenecks
             # ==========================
-            total_cost = float(pd.to_numeric(df.get("cost_per_month_usd", 0), errors="coerce").fillna(0).sum())
-            pot_savings = float(pd.to_numeric(df.get("potential_savings_usd", 0), errors="coerce").fillna(0).sum())
+            total_cost = float(as_numeric(df.get("cost_per_month_usd", 0), errors="coerce").fillna(0).sum())
+            pot_savings = float(as_numeric(df.get("potential_savings_usd", 0), errors="coerce").fillna(0).sum())
             savings_ratio = (pot_savings / total_cost) if total_cost else 0
 
             cio_component = {
@@ -155,7 +160,7 @@ Why this matters: A large group of assets with high bottleneck scores represents
 
             peak_asset = top10.iloc[0]
             low_asset = top10.iloc[-1]
-            mean_score = pd.to_numeric(top10["bottleneck_score"], errors="coerce").mean()
+            mean_score = as_numeric(top10["bottleneck_score"], errors="coerce").mean()
 
             st.write(f"""
 What this graph is: A ranked bar chart showing the top ten assets by bottleneck score.
@@ -181,8 +186,8 @@ Why this matters: The top ten bottlenecked assets form a practical risk ledger.
 """)
 
             # CIO Recommendations for Top Bottlenecked Assets
-            total_cost = float(pd.to_numeric(df.get("cost_per_month_usd", 0), errors="coerce").fillna(0).sum())
-            pot_savings = float(pd.to_numeric(df.get("potential_savings_usd", 0), errors="coerce").fillna(0).sum())
+            total_cost = float(as_numeric(df.get("cost_per_month_usd", 0), errors="coerce").fillna(0).sum())
+            pot_savings = float(as_numeric(df.get("potential_savings_usd", 0), errors="coerce").fillna(0).sum())
             savings_ratio = (pot_savings / total_cost) if total_cost else 0
 
             cio_top = {
@@ -209,3 +214,90 @@ Why this matters: The top ten bottlenecked assets form a practical risk ledger.
 """
             }
             render_cio_tables("Top Bottlenecked Assets — CIO Recommendations", cio_top)
+
+    # ==========================
+    # 3️⃣ Sustained Breaches & Co-saturation
+    # ==========================
+    with st.expander("📌 Sustained Breaches & Co-saturation"):
+        if not bix.empty:
+            summary = bix.summary()
+            fig_sum = px.bar(
+                summary,
+                x="metric",
+                y="breach_days",
+                text="intervals",
+                title=f"Sustained Breach Days by Metric (≥{bix.level:.0f}% for {bix.sustain_days}+ consecutive days)",
+                labels={"metric": "Metric", "breach_days": "Breach Days", "intervals": "Intervals"},
+                color_discrete_sequence=PX_SEQ
+            )
+            fig_sum.update_traces(texttemplate="%{text} intervals", textposition="outside")
+            st.plotly_chart(fig_sum, use_container_width=True, key="bottleneck_sustained_bar")
+
+            hot = bix.hot_assets(10)
+            fig_hot = px.bar(
+                hot,
+                x="asset",
+                y=["breach_days", "co_saturation_days"],
+                title="Top 10 Hot Assets — Sustained Breach and Co-saturation Days",
+                labels={"asset": "Asset ID", "value": "Days", "variable": "Type"},
+                color_discrete_sequence=PX_SEQ
+            )
+            st.plotly_chart(fig_hot, use_container_width=True, key="bottleneck_hot_assets")
+
+            iv = bix.intervals
+            co = summary[summary["metric"] == CO_SATURATION]
+            co_intervals = int(co["intervals"].sum()) if not co.empty else 0
+            co_assets = int(co["assets"].sum()) if not co.empty else 0
+            single = summary[summary["metric"] != CO_SATURATION]
+            worst_metric = single.sort_values("breach_days", ascending=False).iloc[0] if not single.empty else None
+            longest = iv.sort_values(["days", "peak"], ascending=False).iloc[0]
+            top_hot = hot.iloc[0]
+            affected = iv["asset"].nunique()
+            affected_share = affected / bix.assets_scanned * 100 if bix.assets_scanned else 0
+            co_common = (iv.loc[iv["metric"] == CO_SATURATION, "metrics"].value_counts().index[0]
+                         if co_intervals else "none")
+            worst_text = (f"{worst_metric['metric']} accounts for the most sustained breach days "
+                          f"({int(worst_metric['breach_days']):,} across {int(worst_metric['assets']):,} assets)"
+                          if worst_metric is not None else "No single metric shows sustained breaches")
+
+            st.write(f"""
+What this graph is: The first chart counts days spent in sustained breach per metric, where a breach is sustained once an asset stays at or above {bix.level:.0f}% for at least {bix.sustain_days} consecutive days; Co-saturation counts days on which two or more metrics breached together on the same asset. The second chart ranks the ten assets with the most breach days, weighting co-saturated days double.
+
+X-axis: Metric (first chart) and Asset ID (second chart).  
+Y-axis: Breach days.
+
+What it shows in your data: {affected:,} of {bix.assets_scanned:,} assets ({affected_share:.2f}%) had at least one sustained breach. {worst_text}. {co_intervals:,} co-saturation intervals were found on {co_assets:,} assets, most often {co_common}. The longest single interval is {int(longest['days'])} days of {longest['metric']} on {longest['asset']} ({longest['start']:%Y-%m-%d} to {longest['end']:%Y-%m-%d}, peak {longest['peak']:.2f}%). The hottest asset is {top_hot['asset']} with {int(top_hot['breach_days'])} breach days and {int(top_hot['co_saturation_days'])} co-saturated days.
+
+Overall: Sustained breaches separate assets that are genuinely short of capacity from those that only spike. Co-saturation marks assets where adding one resource will not help, because a second resource is exhausted at the same time.
+
+How to read it operationally:
+
+Persistence: Long intervals on one metric point to a sizing problem on that resource; many short intervals point to scheduling or burst behaviour.
+
+Co-saturation: Assets that saturate CPU and memory together usually need workload movement or a larger instance class rather than a single resource upgrade.
+
+Hot list: Use the top ten as the remediation queue and expect them to leave the list once capacity or placement is corrected.
+
+Why this matters: Averages hide assets that spend days pinned at their limit. Measuring duration and overlap of breaches directs investment to the assets that actually constrain service.
+""")
+
+            cio_sustained = {
+                "cost": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Upgrade only assets with sustained breaches | **Phase 1 – Filter:** Limit capacity purchases to assets with sustained intervals rather than one-day spikes.<br><br>**Phase 2 – Size:** Size each upgrade to the resource that breaches, using the interval peak.<br><br>**Phase 3 – Verify:** Confirm the asset leaves the hot list after the change. | - Avoids buying capacity for transient spikes.<br><br>- Targets spend at the resource that is actually exhausted.<br><br> | Formula: upgrade candidates = assets with ≥1 sustained interval. Dataset: {affected:,} of {bix.assets_scanned:,} assets ({affected_share:.2f}%). | Sustained breach bars show which resource drives the spend. |
+""",
+                "performance": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Rebalance co-saturated assets | **Phase 1 – Identify:** Take assets with co-saturation intervals, most often {co_common}.<br><br>**Phase 2 – Move:** Move workloads or change instance class instead of adding a single resource.<br><br>**Phase 3 – Monitor:** Track co-saturation days per asset after the change. | - Removes bottlenecks that single-resource upgrades cannot fix.<br><br>- Reduces incident risk on the most constrained assets.<br><br> | Formula: co-saturation intervals × days. Dataset: {co_intervals:,} intervals on {co_assets:,} assets. | Co-saturation bar and the second series of the hot-asset chart. |
+""",
+                "satisfaction": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Prioritise the hot-asset queue by service impact | **Phase 1 – Map:** Map the ten hot assets to the services they support.<br><br>**Phase 2 – Fix:** Remediate in order of service criticality, starting with {top_hot['asset']}.<br><br>**Phase 3 – Communicate:** Share progress with service owners as assets drop off the list. | - Protects user-facing services first.<br><br>- Gives stakeholders a visible, shrinking risk list.<br><br> | Formula: hot score = breach days + 2 × co-saturated days. Dataset: top asset scores {int(top_hot['score'])}. | Hot-asset ranking chart. |
+"""
+            }
+            render_cio_tables("Sustained Breaches — CIO Recommendations", cio_sustained)
+        else:
+            st.info("Sustained breach detection needs per-asset utilization with a date column (e.g. data_date or data_timestamp).")
@@ -4,6 +4,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import numpy as np
+from utils_capacity.forecast_engine import saturation_forecast
+from utils_capacity.metric_block import as_numeric
+from utils_capacity.aggregate_store import capacity_aggregates
 
 # === Mesiniaga visual identity (blue & white) ===
 px.defaults.template = "plotly_white"
@@ -21,25 +24,25 @@ def render_cio_tables(title, cio_data):
 
 def _safe_mean(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").dropna().mean())
+        return float(as_numeric(series, errors="coerce").dropna().mean())
     except Exception:
         return float("nan")
 
 def _safe_min(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").dropna().min())
+        return float(as_numeric(series, errors="coerce").dropna().min())
     except Exception:
         return float("nan")
 
 def _safe_max(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").dropna().max())
+        return float(as_numeric(series, errors="coerce").dropna().max())
     except Exception:
         return float("nan")
 
 def _safe_sum(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").fillna(0).sum())
+        return float(as_numeric(series, errors="coerce").fillna(0).sum())
     except Exception:
         return 0.0
 
@@ -58,6 +61,97 @@ def _ratio(a, b):
         return "0.00"
 
 def capacity_planning(df):
+    agg = capacity_aggregates(df)
+
+    # =========================
+    # Saturation Forecast (per-asset trend + weekly seasonality)
+    # =========================
+    with st.expander("📌 Saturation Forecast"):
+        forecast = saturation_forecast(df)
+        if forecast.empty:
+            st.info("Saturation forecast needs asset utilization metrics with a dated history (data_date / data_timestamp).")
+        else:
+            params = forecast.params
+            soon80 = forecast.soonest(80, top=15)
+            upcoming = soon80[soon80["days_to_80"] > 0]
+            if upcoming.empty:
+                upcoming = soon80
+
+            if not upcoming.empty:
+                upcoming = upcoming.assign(label=upcoming["asset"] + " · " + upcoming["metric"])
+                fig_sat = px.bar(
+                    upcoming.sort_values("days_to_80", ascending=False),
+                    x="days_to_80",
+                    y="label",
+                    orientation="h",
+                    color="metric",
+                    title="Days Until 80% Saturation (Soonest Assets)",
+                    labels={"days_to_80": "Days until 80%", "label": "Asset · Metric"},
+                    color_discrete_sequence=PX_SEQ
+                )
+                st.plotly_chart(fig_sat, use_container_width=True, key="capplan_sat_days")
+
+            n_pairs = len(params)
+            n_assets = params["asset"].nunique()
+            already80 = int((params["days_to_80"] == 0).sum())
+            already90 = int((params["days_to_90"] == 0).sum())
+            within90_80 = int(((params["days_to_80"] > 0) & (params["days_to_80"] <= 90)).sum())
+            within90_90 = int(((params["days_to_90"] > 0) & (params["days_to_90"] <= 90)).sum())
+            rising = int((params["slope_per_day"] > 0).sum())
+            med_days = _safe_mean(params.loc[params["days_to_80"] > 0, "days_to_80"].replace(np.inf, np.nan))
+            first = upcoming.iloc[0] if not upcoming.empty else None
+            first_txt = (
+                f"{first['asset']} ({first['metric']}) is the first to cross 80%, in about {first['days_to_80']:.0f} days "
+                f"from a current level of {first['level_now']:.2f}% rising {first['slope_per_day']:.3f} points per day."
+                if first is not None else "No asset is on a rising path towards 80% within the forecast horizon."
+            )
+            worst_metric = params.groupby("metric")["days_to_80"].apply(lambda s: int(((s >= 0) & (s <= 90)).sum())).idxmax()
+
+            st.write(f"""
+What this graph is: A horizontal bar chart of the assets and metrics that are forecast to reach 80% utilization soonest.
+
+X-axis: Days from the latest data date until the fitted trend, including its weekly peak, reaches 80%.
+Y-axis: Asset and metric (CPU, Memory, Storage or Network).
+
+What it shows in your data: {n_pairs} asset-metric series across {n_assets} assets were fitted with a linear trend and a 7-day seasonal cycle, and {rising} of them are trending upward.
+{already80} series already peak at or above 80% and {already90} already peak at or above 90%.
+{within90_80} more series are forecast to reach 80% within 90 days and {within90_90} are forecast to reach 90% within 90 days; the average lead time to 80% for the rising series is {med_days:.0f} days.
+{first_txt}
+{worst_metric} has the most series at or approaching 80% within 90 days.
+
+Overall: Short bars are the capacity tickets to open now, while long bars are early warnings that can be handled inside the normal planning cycle.
+Series with a flat or falling trend do not appear because they are not on course to saturate.
+
+How to read it operationally:
+
+Peaks: Treat any series with fewer than 30 days to 80% as an immediate rebalancing or upgrade candidate, because weekly peaks will start breaching before the average does.
+Lead time: Compare the days to 90% with your procurement and change lead times so that orders are placed before the asset runs out of headroom.
+Seasonality: Assets with a large weekly swing reach saturation on their busiest day first, so scheduling batch work away from those days buys time cheaply.
+Refresh: The forecast refits automatically as new daily data arrives, so re-check this view after each data load.
+
+Why this matters: Knowing when each asset saturates, not just how busy it is today, turns capacity management from reactive firefighting into scheduled, budgeted work that protects performance and customer experience.
+""")
+
+            cio_sat = {
+                "cost": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Time upgrades to the forecast date | **Phase 1 – Rank:** Sort assets by days until 80% and 90% saturation. **Phase 2 – Align:** Place orders only for the {within90_80} series that reach 80% within 90 days. **Phase 3 – Defer:** Push the remaining purchases to later budget cycles. | Avoids buying capacity early for assets that still have headroom. | Deferred spend = upgrade cost × series with more than 90 days to 80%. | {already80} series already peak at or above 80% and {within90_80} reach it within 90 days. |
+| Reclaim headroom from flat or falling assets | **Phase 1 – Identify:** List the {n_pairs - rising} series with a flat or falling trend. **Phase 2 – Consolidate:** Move workloads from saturating assets onto them. **Phase 3 – Retire:** Decommission hosts that become idle. | Uses existing capacity before buying new capacity. | Savings = hosts retired × monthly run cost. | {rising} of {n_pairs} series are rising; the rest are candidates to absorb load. |
+""",
+                "performance": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Act on series already in the risk band | **Phase 1 – Triage:** Review the {already90} series already peaking at or above 90%. **Phase 2 – Rebalance:** Shift or throttle workloads on those assets. **Phase 3 – Verify:** Confirm the next forecast shows their peak below 80%. | Removes the assets most likely to cause latency and timeouts. | Effort = assets × rebalancing hours. | {first_txt} |
+| Flatten weekly peaks | **Phase 1 – Detect:** Use the seasonal amplitude to find assets with a large weekly swing. **Phase 2 – Reschedule:** Move batch and backup jobs off the busiest day. **Phase 3 – Track:** Watch the days until 80% lengthen. | Extends time to saturation without new hardware. | Cost = scheduling effort only. | Weekly peaks are included in the forecast, so lower peaks directly push out the saturation date. |
+""",
+                "satisfaction": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Publish a saturation calendar | **Phase 1 – Summarise:** Share the assets reaching 80% and 90% in the next 30, 90 and 180 days. **Phase 2 – Map:** Link them to the business services they host. **Phase 3 – Communicate:** Give service owners the planned upgrade dates. | Business teams see capacity risk before users feel it. | Cost = reporting effort only. | {within90_90} series reach 90% within 90 days; {worst_metric} is the most pressured metric. |
+"""
+            }
+            render_cio_tables("Saturation Forecast — CIO Recommendations", cio_sat)
 
     # =========================
     # CPU Capacity Planning
@@ -66,8 +160,8 @@ def capacity_planning(df):
         if {"avg_cpu_utilization", "projected_growth_pct"} <= set(df.columns):
             df = df.copy()
             df["projected_cpu_utilization"] = (
-                pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
-                * (1 + pd.to_numeric(df["projected_growth_pct"], errors="coerce") / 100.0)
+                as_numeric(df["avg_cpu_utilization"], errors="coerce")
+                * (1 + as_numeric(df["projected_growth_pct"], errors="coerce") / 100.0)
             ).clip(upper=100)
 
             # Graph 1: Scatter current vs projected CPU
@@ -115,8 +209,7 @@ Why this matters: CPU saturation directly drives latency, timeouts and SLA breac
 
             # Graph 2: CPU Growth by Component Type
             if "component_type" in df.columns:
-                df["cpu_growth_delta"] = df["projected_cpu_utilization"] - pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
-                growth_by_type = df.groupby("component_type", as_index=False)["cpu_growth_delta"].mean()
+                growth_by_type = agg.table("component_type", "cpu_growth_delta")
                 fig_cpu_bar = px.bar(
                     growth_by_type,
                     x="component_type",
@@ -190,8 +283,8 @@ Why this matters: Targeting capacity investments on the fastest-growing families
         if {"avg_memory_utilization", "projected_growth_pct"} <= set(df.columns):
             df = df.copy()
             df["projected_memory_utilization"] = (
-                pd.to_numeric(df["avg_memory_utilization"], errors="coerce")
-                * (1 + pd.to_numeric(df["projected_growth_pct"], errors="coerce") / 100.0)
+                as_numeric(df["avg_memory_utilization"], errors="coerce")
+                * (1 + as_numeric(df["projected_growth_pct"], errors="coerce") / 100.0)
             ).clip(upper=100)
 
             # Graph 1: Scatter current vs projected Memory
@@ -239,8 +332,7 @@ Why this matters: Memory saturation translates directly into pauses, crashes and
 
             # Graph 2: Memory Growth by Component Type
             if "component_type" in df.columns:
-                df["mem_growth_delta"] = df["projected_memory_utilization"] - pd.to_numeric(df["avg_memory_utilization"], errors="coerce")
-                growth_by_type_m = df.groupby("component_type", as_index=False)["mem_growth_delta"].mean()
+                growth_by_type_m = agg.table("component_type", "mem_growth_delta")
                 fig_mem_bar = px.bar(
                     growth_by_type_m,
                     x="component_type",
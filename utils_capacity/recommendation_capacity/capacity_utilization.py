@@ -4,6 +4,8 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils_capacity.metric_block import as_numeric
+from utils_capacity.aggregate_store import capacity_aggregates
 
 # === Mesiniaga visual identity (blue & white) ===
 px.defaults.template = "plotly_white"
@@ -21,25 +23,25 @@ def render_cio_tables(title, cio_data):
 
 def _safe_sum(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").fillna(0).sum())
+        return float(as_numeric(series, errors="coerce").fillna(0).sum())
     except Exception:
         return 0.0
 
 def _safe_mean(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").dropna().mean())
+        return float(as_numeric(series, errors="coerce").dropna().mean())
     except Exception:
         return float("nan")
 
 def _safe_min(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").dropna().min())
+        return float(as_numeric(series, errors="coerce").dropna().min())
     except Exception:
         return float("nan")
 
 def _safe_max(series):
     try:
-        return float(pd.to_numeric(series, errors="coerce").dropna().max())
+        return float(as_numeric(series, errors="coerce").dropna().max())
     except Exception:
         return float("nan")
 
@@ -57,24 +59,9 @@ def _ratio(a, b):
     except Exception:
         return "0.00"
 
-def _modal_bin(series, bins=20):
-    s = pd.to_numeric(series, errors="coerce").dropna()
-    if s.empty:
-        return None, 0
-    cats = pd.cut(s, bins=bins, include_lowest=True)
-    vc = cats.value_counts().sort_values(ascending=False)
-    top_bin = vc.index[0]
-    top_cnt = int(vc.iloc[0])
-    return str(top_bin), top_cnt
-
-def _median_by(group_df, value_col, group_col):
-    g = (
-        group_df[[group_col, value_col]]
-        .dropna()
-        .groupby(group_col)[value_col]
-        .median()
-        .sort_values(ascending=False)
-    )
+def _median_by(agg, value_col, group_col):
+    """Highest / lowest per-group median from the capacity aggregate store."""
+    g = agg.series(group_col, value_col, "median").dropna().sort_values(ascending=False)
     if g.empty:
         return None, None, None, None
     top_name = g.index[0]
@@ -84,13 +71,14 @@ def _median_by(group_df, value_col, group_col):
     return top_name, top_val, low_name, low_val
 
 def capacity_utilization(df):
+    agg = capacity_aggregates(df)
 
     # =======================
     # 1) CPU Utilization
     # =======================
     with st.expander("📌 CPU Utilization Distribution"):
         if "avg_cpu_utilization" in df.columns:
-            cpu = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
+            cpu = as_numeric(df["avg_cpu_utilization"], errors="coerce")
 
             # Graph 1: Histogram
             fig_cpu_hist = px.histogram(
@@ -107,7 +95,7 @@ def capacity_utilization(df):
             cpu_min = _safe_min(cpu)
             cpu_max = _safe_max(cpu)
             n_assets = int(df["asset_id"].nunique()) if "asset_id" in df.columns else len(df)
-            bin_label, bin_count = _modal_bin(cpu, bins=20)
+            bin_label, bin_count = agg.modal_band("avg_cpu_utilization")
             st.write(f"""
 **What this graph is:** A histogram showing **CPU utilization distribution** across assets.  
 - **X-axis:** CPU utilization bands (%).  
@@ -138,7 +126,7 @@ def capacity_utilization(df):
 
             # Analysis for Box Plot
             if "component_type" in df.columns:
-                top_name, top_med, low_name, low_med = _median_by(df, "avg_cpu_utilization", "component_type")
+                top_name, top_med, low_name, low_med = _median_by(agg, "avg_cpu_utilization", "component_type")
                 if top_name is not None:
                     st.write(f"""
 **What this graph is:** A box plot showing **CPU utilization spread by component type**.  
@@ -195,15 +183,8 @@ def capacity_utilization(df):
 """)
 
             # Graph 3: Time trend (date-only)
-            if "data_timestamp" in df.columns:
-                df_ts = df.copy()
-                df_ts["data_timestamp"] = pd.to_datetime(df_ts["data_timestamp"], errors="coerce")
-                df_ts["day"] = df_ts["data_timestamp"].dt.normalize()
-                ts = (
-                    df_ts.dropna(subset=["day"])
-                    .groupby("day", as_index=False)["avg_cpu_utilization"].mean()
-                    .sort_values("day")
-                )
+            if agg.has("day", "avg_cpu_utilization"):
+                ts = agg.table("day", "avg_cpu_utilization")
                 if not ts.empty and len(ts) > 1:
                     fig_cpu_trend = px.line(
                         ts,
@@ -291,7 +272,7 @@ def capacity_utilization(df):
     # =======================
     with st.expander("📌 Memory Utilization Distribution"):
         if "avg_memory_utilization" in df.columns:
-            mem = pd.to_numeric(df["avg_memory_utilization"], errors="coerce")
+            mem = as_numeric(df["avg_memory_utilization"], errors="coerce")
 
             # Graph 1: Box plot by component type
             fig_mem_box = px.box(
@@ -309,7 +290,7 @@ def capacity_utilization(df):
             mem_max = _safe_max(mem)
             n_assets = int(df["asset_id"].nunique()) if "asset_id" in df.columns else len(df)
             if "component_type" in df.columns:
-                top_name, top_med, low_name, low_med = _median_by(df, "avg_memory_utilization", "component_type")
+                top_name, top_med, low_name, low_med = _median_by(agg, "avg_memory_utilization", "component_type")
                 if top_name is not None:
                     st.write(f"""
 **What this graph is:** A box plot showing **memory utilization spread by component type**.  
@@ -376,7 +357,7 @@ def capacity_utilization(df):
             st.plotly_chart(fig_mem_hist, use_container_width=True, key="cap_mem_hist")
 
             # Analysis for Memory Histogram
-            bin_label, bin_count = _modal_bin(mem, bins=20)
+            bin_label, bin_count = agg.modal_band("avg_memory_utilization")
             st.write(f"""
 **What this graph is:** A histogram showing **memory utilization distribution**.  
 - **X-axis:** Memory utilization bands (%).  
@@ -396,15 +377,8 @@ def capacity_utilization(df):
 """)
 
             # Graph 3: Memory trend over time
-            if "data_timestamp" in df.columns:
-                df_ts = df.copy()
-                df_ts["data_timestamp"] = pd.to_datetime(df_ts["data_timestamp"], errors="coerce")
-                df_ts["day"] = df_ts["data_timestamp"].dt.normalize()
-                ts = (
-                    df_ts.dropna(subset=["day"])
-                    .groupby("day", as_index=False)["avg_memory_utilization"].mean()
-                    .sort_values("day")
-                )
+            if agg.has("day", "avg_memory_utilization"):
+                ts = agg.table("day", "avg_memory_utilization")
                 if not ts.empty and len(ts) > 1:
                     fig_mem_trend = px.line(
                         ts,
@@ -490,7 +464,7 @@ def capacity_utilization(df):
     # =======================
     with st.expander("📌 Storage Utilization and Capacity"):
         if "avg_storage_utilization" in df.columns:
-            sto = pd.to_numeric(df["avg_storage_utilization"], errors="coerce")
+            sto = as_numeric(df["avg_storage_utilization"], errors="coerce")
 
             # Graph 1: Histogram
             fig_sto_hist = px.histogram(
@@ -507,7 +481,7 @@ def capacity_utilization(df):
             sto_min = _safe_min(sto)
             sto_max = _safe_max(sto)
             n_assets = int(df["asset_id"].nunique()) if "asset_id" in df.columns else len(df)
-            bin_label, bin_count = _modal_bin(sto, bins=20)
+            bin_label, bin_count = agg.modal_band("avg_storage_utilization")
             st.write(f"""
 **What this graph is:** A histogram showing **storage utilization distribution**.  
 - **X-axis:** Storage utilization bands (%).  
@@ -556,15 +530,8 @@ def capacity_utilization(df):
 """)
 
             # Graph 3: Time trend (date-only)
-            if "data_timestamp" in df.columns:
-                df_ts = df.copy()
-                df_ts["data_timestamp"] = pd.to_datetime(df_ts["data_timestamp"], errors="coerce")
-                df_ts["day"] = df_ts["data_timestamp"].dt.normalize()
-                ts = (
-                    df_ts.dropna(subset=["day"])
-                    .groupby("day", as_index=False)["avg_storage_utilization"].mean()
-                    .sort_values("day")
-                )
+            if agg.has("day", "avg_storage_utilization"):
+                ts = agg.table("day", "avg_storage_utilization")
                 if not ts.empty and len(ts) > 1:
                     fig_sto_trend = px.line(
                         ts,
@@ -650,7 +617,7 @@ def capacity_utilization(df):
     # =======================
     with st.expander("📌 Network Utilization and Throughput"):
         if "avg_network_utilization" in df.columns:
-            net = pd.to_numeric(df["avg_network_utilization"], errors="coerce")
+            net = as_numeric(df["avg_network_utilization"], errors="coerce")
 
             # Graph 1: Histogram
             fig_net_hist = px.histogram(
@@ -667,7 +634,7 @@ def capacity_utilization(df):
             net_min = _safe_min(net)
             net_max = _safe_max(net)
             n_assets = int(df["asset_id"].nunique()) if "asset_id" in df.columns else len(df)
-            bin_label, bin_count = _modal_bin(net, bins=20)
+            bin_label, bin_count = agg.modal_band("avg_network_utilization")
             st.write(f"""
 **What this graph is:** A histogram showing **network utilization distribution**.  
 - **X-axis:** Network utilization bands (%).  
@@ -718,15 +685,8 @@ def capacity_utilization(df):
 """)
 
             # Graph 3: Time trend (date-only)
-            if "data_timestamp" in df.columns:
-                df_ts = df.copy()
-                df_ts["data_timestamp"] = pd.to_datetime(df_ts["data_timestamp"], errors="coerce")
-                df_ts["day"] = df_ts["data_timestamp"].dt.normalize()
-                ts = (
-                    df_ts.dropna(subset=["day"])
-                    .groupby("day", as_index=False)["avg_network_utilization"].mean()
-                    .sort_values("day")
-                )
+            if agg.has("day", "avg_network_utilization"):
+                ts = agg.table("day", "avg_network_utilization")
                 if not ts.empty and len(ts) > 1:
                     fig_net_trend = px.line(
                         ts,
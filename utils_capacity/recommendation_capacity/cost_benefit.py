@@ -2,6 +2,9 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils_capacity.metric_block import as_numeric
+from utils_capacity.aggregate_store import capacity_aggregates
+from utils_capacity.scenario_engine import evaluate_scenarios, scenario_grid, standard_scenarios
 
 # --- Visual identity: professional blue & white (global) ---
 px.defaults.template = "plotly_white"
@@ -20,6 +23,7 @@ def render_cio_tables(title, cio_data):
 
 
 def cost_benefit(df):
+    agg = capacity_aggregates(df)
 
     # ======================================================
     # Subtarget 1: Cost vs Utilization
@@ -27,8 +31,8 @@ def cost_benefit(df):
     with st.expander("📌 Monthly Cost vs Utilization"):
         if {"cost_per_month_usd", "avg_cpu_utilization"} <= set(df.columns):
             df = df.copy()
-            df["avg_cpu_utilization"] = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
-            df["cost_per_month_usd"] = pd.to_numeric(df["cost_per_month_usd"], errors="coerce")
+            df["avg_cpu_utilization"] = as_numeric(df["avg_cpu_utilization"], errors="coerce")
+            df["cost_per_month_usd"] = as_numeric(df["cost_per_month_usd"], errors="coerce")
 
             # Graph 1: Scatter plot
             fig1 = px.scatter(
@@ -44,10 +48,10 @@ def cost_benefit(df):
 
             # --- Analysis for Graph 1 (Scatter) ---
             n_assets = len(df)
-            avg_cost_sc = float(df["cost_per_month_usd"].mean())
-            max_cost_sc = float(df["cost_per_month_usd"].max())
-            min_cost_sc = float(df["cost_per_month_usd"].min())
-            avg_util_sc = float(df["avg_cpu_utilization"].mean())
+            avg_cost_sc = agg.total("cost_per_month_usd", "mean")
+            max_cost_sc = agg.total("cost_per_month_usd", "max")
+            min_cost_sc = agg.total("cost_per_month_usd", "min")
+            avg_util_sc = agg.total("avg_cpu_utilization", "mean")
             hi_cost_q3 = df["cost_per_month_usd"].quantile(0.75)
             hi_cost_low_util_cnt = int(((df["avg_cpu_utilization"] < 30) & (df["cost_per_month_usd"] >= hi_cost_q3)).sum())
 
@@ -84,9 +88,9 @@ Why this matters: Misaligned cost to utilization creates direct financial drag b
             st.plotly_chart(fig2, use_container_width=True, key="cost_hist")
 
             # --- Analysis for Graph 2 (Histogram) ---
-            avg_cost = float(df["cost_per_month_usd"].mean())
-            max_cost = float(df["cost_per_month_usd"].max())
-            min_cost = float(df["cost_per_month_usd"].min())
+            avg_cost = agg.total("cost_per_month_usd", "mean")
+            max_cost = agg.total("cost_per_month_usd", "max")
+            min_cost = agg.total("cost_per_month_usd", "min")
             p90_cost = float(df["cost_per_month_usd"].quantile(0.90))
             high_tail_cnt = int((df["cost_per_month_usd"] >= p90_cost).sum())
 
@@ -112,18 +116,21 @@ Why this matters: Understanding where cost is concentrated enables you to direct
 """)
 
             # Dynamic analysis for CIO tables (kept as-is, uses combined context)
-            ineff = df[(df["avg_cpu_utilization"] < 30) & (df["cost_per_month_usd"] > df["cost_per_month_usd"].mean())]
-            avg_cost_combo = float(df["cost_per_month_usd"].mean())
-            avg_util_combo = float(df["avg_cpu_utilization"].mean())
+            avg_cost_combo = agg.total("cost_per_month_usd", "mean")
+            avg_util_combo = agg.total("avg_cpu_utilization", "mean")
+            ineff = df[(df["avg_cpu_utilization"] < 30) & (df["cost_per_month_usd"] > avg_cost_combo)]
             ineff_count = len(ineff)
+            whatif = standard_scenarios(df)
+            consol = whatif.loc["Consolidate 2:1 below 30% CPU"]
+            rsize = whatif.loc["Right-size 25% below 40% CPU"]
 
             # CIO Recommendations
             cio_cost_util = {
                 "cost": f"""
 | Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
 |---|---|---|---|---|
-| Decommission underutilized high-cost assets | **Phase 1 – Identify:** Identify systems that consistently run below 30 percent utilization over a reasonable time window by using trend data rather than a single snapshot so that you focus on truly underutilized assets instead of temporary dips.<br><br>**Phase 2 – Validate:** Validate workload dependencies and ownership for each candidate system to confirm that no critical services, integrations, or compliance obligations depend on it before any shutdown is planned.<br><br>**Phase 3 – Decommission or Merge:** Decommission idle assets or merge their remaining workloads onto better utilized platforms and update inventory, monitoring, and cost allocation records so that there are no hidden ghost systems left consuming spend. | - Eliminates recurring maintenance and license costs for servers that are no longer required which directly reduces monthly infrastructure and software bills.<br><br>- Reduces the time engineers spend patching, backing up, and monitoring low value assets which frees up capacity for modernization and higher impact work.<br><br>- Shrinks the physical and logical footprint of the estate which lowers complexity in capacity planning and simplifies security and compliance checks.<br><br>- Creates clear and traceable cost savings that can be reported to finance and reinvested into initiatives that improve resilience, automation, or user experience.<br><br> | Formula: Σ (Monthly cost × # inefficient assets). Dataset: {ineff_count} inefficient assets costing above ${avg_cost_combo:,.2f}. | Scatter shows a dense cluster of low-utilization, high-cost assets in the upper-left quadrant. |
-| Consolidate workloads across servers | **Phase 1 – Plan Consolidation:** Identify low load workloads that can safely coexist on shared hosts by reviewing performance requirements, data sensitivity, and fault tolerance so that consolidation does not create new risk.<br><br>**Phase 2 – Execute Migration:** Migrate selected workloads to shared or more efficient hosts in a controlled manner and ensure that monitoring, backups, and access controls are updated to reflect the new placement.<br><br>**Phase 3 – Power Down and Review:** Power down redundant systems that no longer host active workloads and review cost and utilization after one month to verify that savings and performance expectations are being met. | - Reduces total operational costs by lowering the number of active servers that require power, cooling, support contracts, and cloud subscription fees.<br><br>- Increases utilization of the remaining servers which means money spent on infrastructure is converted into more useful work instead of idle capacity.<br><br>- Decreases the number of platforms that teams need to manage which simplifies patching, incident response, and configuration management activities.<br><br>- Provides a measurable before and after picture that demonstrates optimization success to stakeholders and strengthens the case for further consolidation rounds.<br><br> | Formula: (Power saved × $/kWh) + (Support hours saved × Rate). Dataset: low CPU assets demonstrate waste potential. | Scatter’s low utilization region with non trivial monthly cost reflects excess cost opportunity. |
+| Decommission underutilized high-cost assets | **Phase 1 – Identify:** Identify systems that consistently run below 30 percent utilization over a reasonable time window by using trend data rather than a single snapshot so that you focus on truly underutilized assets instead of temporary dips.<br><br>**Phase 2 – Validate:** Validate workload dependencies and ownership for each candidate system to confirm that no critical services, integrations, or compliance obligations depend on it before any shutdown is planned.<br><br>**Phase 3 – Decommission or Merge:** Decommission idle assets or merge their remaining workloads onto better utilized platforms and update inventory, monitoring, and cost allocation records so that there are no hidden ghost systems left consuming spend. | - Eliminates recurring maintenance and license costs for servers that are no longer required which directly reduces monthly infrastructure and software bills.<br><br>- Reduces the time engineers spend patching, backing up, and monitoring low value assets which frees up capacity for modernization and higher impact work.<br><br>- Shrinks the physical and logical footprint of the estate which lowers complexity in capacity planning and simplifies security and compliance checks.<br><br>- Creates clear and traceable cost savings that can be reported to finance and reinvested into initiatives that improve resilience, automation, or user experience.<br><br> | Formula: Σ (Monthly cost × # inefficient assets); right-size scenario: compute cost × 25% on assets below 40% CPU. Dataset: {ineff_count} inefficient assets costing above ${avg_cost_combo:,.2f}; right-sizing {int(rsize['assets_rightsized']):,} assets saves ${rsize['savings_usd']:,.2f}/month ({rsize['savings_pct']:.2f}%) with {int(rsize['assets_at_risk']):,} assets at risk afterwards. | Scatter shows a dense cluster of low-utilization, high-cost assets in the upper-left quadrant. |
+| Consolidate workloads across servers | **Phase 1 – Plan Consolidation:** Identify low load workloads that can safely coexist on shared hosts by reviewing performance requirements, data sensitivity, and fault tolerance so that consolidation does not create new risk.<br><br>**Phase 2 – Execute Migration:** Migrate selected workloads to shared or more efficient hosts in a controlled manner and ensure that monitoring, backups, and access controls are updated to reflect the new placement.<br><br>**Phase 3 – Power Down and Review:** Power down redundant systems that no longer host active workloads and review cost and utilization after one month to verify that savings and performance expectations are being met. | - Reduces total operational costs by lowering the number of active servers that require power, cooling, support contracts, and cloud subscription fees.<br><br>- Increases utilization of the remaining servers which means money spent on infrastructure is converted into more useful work instead of idle capacity.<br><br>- Decreases the number of platforms that teams need to manage which simplifies patching, incident response, and configuration management activities.<br><br>- Provides a measurable before and after picture that demonstrates optimization success to stakeholders and strengthens the case for further consolidation rounds.<br><br> | Formula: Σ cost of consolidated assets × (1 − 1/ratio). Dataset: 2:1 consolidation of {int(consol['assets_consolidated']):,} assets below 30% CPU saves ${consol['savings_usd']:,.2f}/month ({consol['savings_pct']:.2f}%); assets at or above 85% afterwards: {int(consol['assets_at_risk']):,} (baseline {int(whatif.loc['Baseline', 'assets_at_risk']):,}). | Scatter’s low utilization region with non trivial monthly cost reflects excess cost opportunity. |
 | Renegotiate vendor contracts | **Phase 1 – Audit High-Cost Nodes:** Audit the set of highest cost nodes and their associated licenses, reserved instances, and support contracts so that you understand exactly what is being paid for and at what unit rate.<br><br>**Phase 2 – Review Contract Terms:** Review contract duration, commitment levels, and usage patterns against actual demand to uncover mismatches such as over sized reservations or underused premium tiers.<br><br>**Phase 3 – Negotiate and Realign:** Negotiate volume discounts, reshape commitments, or switch to more appropriate tiers and ensure that procurement, finance, and technical teams are aligned on the new structure. | - Lowers fixed costs by aligning contract terms and license levels more closely with actual usage which reduces waste in overpriced or unnecessary entitlements.<br><br>- Improves long term cost predictability because negotiated discounts and right sized reservations create a more stable monthly spend profile.<br><br>- Unlocks budget that can be redirected to optimization, resilience, or innovation instead of being locked into inefficient contract shapes.<br><br>- Strengthens the organization’s negotiating position with vendors by demonstrating clear understanding of usage data and internal optimization efforts.<br><br> | Formula: Δ Rate × Total Subscription Cost. Dataset: Cost distribution is skewed toward a small number of high spend nodes. | Histogram confirms that a few nodes consume a large portion of total spend which justifies focused contract review. |
 """,
                 "performance": f"""
@@ -149,8 +156,8 @@ Why this matters: Understanding where cost is concentrated enables you to direct
     with st.expander("📌 ROI Projection on Optimization Initiatives"):
         if {"estimated_cost_savings_usd", "optimization_investment_usd"} <= set(df.columns):
             df = df.copy()
-            df["estimated_cost_savings_usd"] = pd.to_numeric(df["estimated_cost_savings_usd"], errors="coerce")
-            df["optimization_investment_usd"] = pd.to_numeric(df["optimization_investment_usd"], errors="coerce")
+            df["estimated_cost_savings_usd"] = as_numeric(df["estimated_cost_savings_usd"], errors="coerce")
+            df["optimization_investment_usd"] = as_numeric(df["optimization_investment_usd"], errors="coerce")
             df["roi"] = (df["estimated_cost_savings_usd"] / df["optimization_investment_usd"].replace(0, np.nan)) * 100
 
             # Graph 1: Bar chart ROI by Asset
@@ -256,3 +263,70 @@ Why this matters: The distribution separates capital engines from capital drag s
 """
             }
             render_cio_tables("ROI Projection — CIO Recommendations", cio_roi)
+
+    # ======================================================
+    # Subtarget 3: What-if Scenarios (Savings vs Risk)
+    # ======================================================
+    with st.expander("📌 What-if Scenarios: Savings vs Capacity Risk"):
+        if {"cost_per_month_usd", "avg_cpu_utilization"} <= set(df.columns):
+            grid = scenario_grid(
+                growth_pct=[0, 10, 20, 30],
+                consolidation_ratio=[1, 1.5, 2, 3],
+                rightsizing_pct=[0, 15, 25, 40],
+                tiering_pct=[0, 20, 40],
+            )
+            sims = evaluate_scenarios(df, grid)
+
+            # Graph 1: every scenario's monthly savings against the share of assets pushed to ≥85%
+            fig5 = px.scatter(
+                sims,
+                x="risk_share_pct",
+                y="savings_usd",
+                color="growth_pct",
+                hover_name="name",
+                title="What-if Scenarios — Monthly Savings vs Assets at Risk",
+                labels={"risk_share_pct": "Assets at ≥85% Utilization (%)", "savings_usd": "Monthly Savings (USD)",
+                        "growth_pct": "Demand Growth (%)"},
+                color_continuous_scale=PX_SEQ[::-1],
+            )
+            st.plotly_chart(fig5, use_container_width=True, key="whatif_scatter")
+
+            no_levers = (sims["consolidation_ratio"] == 1) & (sims["rightsizing_pct"] == 0) & (sims["tiering_pct"] == 0)
+            base = sims[no_levers & (sims["growth_pct"] == 0)].iloc[0]
+            grown = sims[no_levers & (sims["growth_pct"] == 30)].iloc[0]
+            safe = sims[(sims["growth_pct"] == 0) & (sims["assets_at_risk"] <= base["assets_at_risk"])]
+            best_safe = safe.sort_values("savings_usd", ascending=False).iloc[0]
+            best_any = sims.sort_values("savings_usd", ascending=False).iloc[0]
+
+            st.write(f"""
+What this graph is: A scatter of {len(sims):,} what-if scenarios, each combining a demand growth level, a consolidation ratio for assets below 30% CPU, a right-sizing cut for assets below 40% CPU, and a share of storage moved to a cheaper tier.  
+X-axis: Share of assets whose projected CPU, memory, storage, or network utilization reaches 85% or more under the scenario.  
+Y-axis: Projected monthly savings against today's total of ${base['projected_cost_usd']:,.2f}.  
+What it shows in your data: Today {int(base['assets_at_risk']):,} assets ({base['risk_share_pct']:.2f}%) are already at or above 85%. The largest saving that does not add a single at-risk asset is ${best_safe['savings_usd']:,.2f}/month ({best_safe['savings_pct']:.2f}%) from {best_safe['name']}. The largest saving overall is ${best_any['savings_usd']:,.2f}/month but leaves {int(best_any['assets_at_risk']):,} assets ({best_any['risk_share_pct']:.2f}%) at risk. Growth of 30% with no optimization would push {int(grown['assets_at_risk']):,} assets ({grown['risk_share_pct']:.2f}%) over the threshold.
+
+How to read it operationally:  
+Frontier: The upper-left edge holds the scenarios worth considering; anything below or to the right of it saves less for the same risk, or takes more risk for the same saving.  
+Growth bands: Each colour is one demand growth level, so the same optimization moves right as growth rises; plan levers against the growth band you expect over the budget period.  
+Packing: Aggressive consolidation ratios save the most but concentrate load, which is why they drift right; pair them with the right-sizing and tiering levers rather than using them alone.
+
+Why this matters: Savings targets and capacity risk are set by the same decisions; evaluating every combination together shows which savings are free and which are bought with headroom.
+""")
+
+            cio_whatif = {
+                "cost": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Adopt the best risk-neutral lever mix | **Phase 1 – Select:** Take the highest-saving scenario that adds no at-risk assets and confirm its candidate lists (consolidation and right-sizing) with service owners.<br><br>**Phase 2 – Execute:** Apply the levers in waves, largest cost first, and track utilization after each wave.<br><br>**Phase 3 – Re-run:** Re-run the scenarios on the next data refresh so the mix follows the estate as it changes. | - Captures savings without spending capacity headroom.<br><br>- Gives finance a figure that is backed by the same data operations uses.<br><br> | Formula: Σ baseline cost − Σ projected cost. Dataset: {best_safe['name']} saves ${best_safe['savings_usd']:,.2f}/month ({best_safe['savings_pct']:.2f}%) with {int(best_safe['assets_at_risk']):,} assets at risk (baseline {int(base['assets_at_risk']):,}). | Highest point on the scatter at the baseline risk level. |
+""",
+                "performance": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Budget headroom for expected growth | **Phase 1 – Size:** Pick the growth band that matches the demand forecast.<br><br>**Phase 2 – Protect:** Hold back consolidation on assets that the growth band pushes over 85%.<br><br>**Phase 3 – Review:** Compare actual growth against the band each quarter. | - Prevents optimization from turning into saturation incidents as demand grows.<br><br> | Formula: assets with projected utilization ≥ 85%. Dataset: 30% growth alone puts {int(grown['assets_at_risk']):,} assets ({grown['risk_share_pct']:.2f}%) at risk. | Growth colour bands shift the whole cloud to the right. |
+""",
+                "satisfaction": f"""
+| Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Publish the savings-vs-risk trade-off | **Phase 1 – Share:** Share the chosen scenario and its risk figure with service owners.<br><br>**Phase 2 – Agree:** Agree the acceptable at-risk share before aggressive levers are used.<br><br>**Phase 3 – Report:** Report realised savings and incidents against the scenario. | - Keeps service owners confident that cost work will not degrade their services.<br><br> | Formula: risk share = at-risk assets ÷ total assets. Dataset: the maximum-saving scenario leaves {best_any['risk_share_pct']:.2f}% of assets at risk. | Right-hand points show what the largest savings cost in headroom. |
+"""
+            }
+            render_cio_tables("What-if Scenarios — CIO Recommendations", cio_whatif)
@@ -2,6 +2,8 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils_capacity.metric_block import as_numeric
+from utils_capacity.aggregate_store import capacity_aggregates
 
 # 🔹 Helper to render CIO tables with 3 nested expanders (Option A format)
 def render_cio_tables(title, cio_data):
@@ -15,14 +17,15 @@ def render_cio_tables(title, cio_data):
 
 
 def energy_efficiency(df):
+    agg = capacity_aggregates(df)
     # ======================================================
     # Subtarget 1: Energy Consumption vs Utilization
     # ======================================================
     with st.expander("📌 Energy Consumption vs Utilization"):
         if {"avg_cpu_utilization", "energy_consumption_kwh"} <= set(df.columns):
             df = df.copy()
-            df["avg_cpu_utilization"] = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
-            df["energy_consumption_kwh"] = pd.to_numeric(df["energy_consumption_kwh"], errors="coerce")
+            df["avg_cpu_utilization"] = as_numeric(df["avg_cpu_utilization"], errors="coerce")
+            df["energy_consumption_kwh"] = as_numeric(df["energy_consumption_kwh"], errors="coerce")
 
             # Graph 1: Scatter — Energy vs CPU Utilization
             fig1 = px.scatter(
@@ -37,9 +40,9 @@ def energy_efficiency(df):
 
             # Dynamic analysis
             corr = df["avg_cpu_utilization"].corr(df["energy_consumption_kwh"])
-            max_kwh = float(df["energy_consumption_kwh"].max())
-            min_kwh = float(df["energy_consumption_kwh"].min())
-            avg_kwh = float(df["energy_consumption_kwh"].mean())
+            max_kwh = agg.total("energy_consumption_kwh", "max")
+            min_kwh = agg.total("energy_consumption_kwh", "min")
+            avg_kwh = agg.total("energy_consumption_kwh", "mean")
             high_util = df.loc[df["avg_cpu_utilization"].idxmax()]
             low_util = df.loc[df["avg_cpu_utilization"].idxmin()]
             st.write(f"""
@@ -90,8 +93,8 @@ def energy_efficiency(df):
 """)
 
             # CIO Tables for Energy vs Utilization
-            total_cost = float(df["cost_per_month_usd"].sum()) if "cost_per_month_usd" in df.columns else 0.0
-            total_sav = float(df["potential_savings_usd"].sum()) if "potential_savings_usd" in df.columns else 0.0
+            total_cost = agg.total("cost_per_month_usd", "sum") if "cost_per_month_usd" in df.columns else 0.0
+            total_sav = agg.total("potential_savings_usd", "sum") if "potential_savings_usd" in df.columns else 0.0
             cio_energy = {
                 "cost": f"""
 | Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
@@ -123,7 +126,7 @@ def energy_efficiency(df):
     with st.expander("📌 Facility Power Usage Effectiveness (PUE)"):
         if "pue" in df.columns:
             df = df.copy()
-            df["pue"] = pd.to_numeric(df["pue"], errors="coerce")
+            df["pue"] = as_numeric(df["pue"], errors="coerce")
             if "date" in df.columns:
                 df["date"] = pd.to_datetime(df["date"], errors="coerce")
 
@@ -1,6 +1,7 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils_capacity.aggregate_store import capacity_aggregates
 
 # --- Visual identity: blue & white (professional) ---
 px.defaults.template = "plotly_white"
@@ -48,7 +49,7 @@ These figures establish the baseline performance and financial standing of the c
         # Visualization 1: Cost Distribution by Component Type
         # ================================
         if "component_type" in df.columns and "cost_per_month_usd" in df.columns:
-            cost_by_type = df.groupby("component_type")["cost_per_month_usd"].sum().reset_index()
+            cost_by_type = capacity_aggregates(df).table("component_type", "cost_per_month_usd", "sum")
             fig = px.pie(
                 cost_by_type,
                 values="cost_per_month_usd",
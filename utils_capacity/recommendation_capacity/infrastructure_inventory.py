@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils_capacity.aggregate_store import capacity_aggregates
 
 # --- Visual identity: professional blue & white ---
 px.defaults.template = "plotly_white"
@@ -21,6 +22,7 @@ def _fmt_num(v):
         return "N/A"
 
 def infrastructure_inventory(df):
+    agg = capacity_aggregates(df)
 
     # ============================
     # Asset Distribution by Component Type
@@ -37,19 +39,19 @@ def infrastructure_inventory(df):
             have_down = "downtime_minutes" in df.columns
 
             cost_by_type = (
-                df.groupby("component_type")["cost_per_month_usd"].sum().reset_index()
+                agg.table("component_type", "cost_per_month_usd", "sum")
                 if have_cost else pd.DataFrame()
             )
             savings_by_type = (
-                df.groupby("component_type")["potential_savings_usd"].sum().reset_index()
+                agg.table("component_type", "potential_savings_usd", "sum")
                 if have_savings else pd.DataFrame()
             )
             inc_by_type = (
-                df.groupby("component_type")["incident_count"].sum().reset_index()
+                agg.table("component_type", "incident_count", "sum")
                 if have_inc else pd.DataFrame()
             )
             down_by_type = (
-                df.groupby("component_type")["downtime_minutes"].sum().reset_index()
+                agg.table("component_type", "downtime_minutes", "sum")
                 if have_down else pd.DataFrame()
             )
 
@@ -280,26 +282,26 @@ Why this matters: Targeting the highest cost types accelerates OPEX reduction wi
     with st.expander("📌 Asset Count by Location"):
         if {"location", "asset_id"} <= set(df.columns):
 
-            loc_counts = df.groupby("location")["asset_id"].nunique().reset_index()
+            loc_counts = agg.assets("location")
             have_cost = "cost_per_month_usd" in df.columns
             have_sav = "potential_savings_usd" in df.columns
             have_inc = "incident_count" in df.columns
             have_down = "downtime_minutes" in df.columns
 
             cost_by_loc = (
-                df.groupby("location")["cost_per_month_usd"].sum().reset_index()
+                agg.table("location", "cost_per_month_usd", "sum")
                 if have_cost else pd.DataFrame()
             )
             sav_by_loc = (
-                df.groupby("location")["potential_savings_usd"].sum().reset_index()
+                agg.table("location", "potential_savings_usd", "sum")
                 if have_sav else pd.DataFrame()
             )
             inc_by_loc = (
-                df.groupby("location")["incident_count"].sum().reset_index()
+                agg.table("location", "incident_count", "sum")
                 if have_inc else pd.DataFrame()
             )
             down_by_loc = (
-                df.groupby("location")["downtime_minutes"].sum().reset_index()
+                agg.table("location", "downtime_minutes", "sum")
                 if have_down else pd.DataFrame()
             )
 
@@ -350,7 +352,7 @@ It also clarifies where executive updates should focus during incidents and plan
                 st.plotly_chart(fig2, use_container_width=True, key="infra_location_box")
 
                 # Compute medians and spread for narrative
-                med_by_loc = df.groupby("location")["cost_per_month_usd"].median().reset_index(name="median_cost")
+                med_by_loc = agg.table("location", "cost_per_month_usd", "median", name="median_cost")
                 max_med_row = med_by_loc.loc[med_by_loc["median_cost"].idxmax()]
                 min_med_row = med_by_loc.loc[med_by_loc["median_cost"].idxmin()]
                 overall_min = float(df["cost_per_month_usd"].min())
@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils_capacity.metric_block import as_numeric
 
 # 🔹 Helper to render CIO tables with 3 nested expanders (Option A format)
 def render_cio_tables(title, cio_data):
@@ -44,15 +45,15 @@ def network_capacity(df):
 
     # 2) Create network_capacity_gbps from network_bandwidth_gbps if missing
     if "network_capacity_gbps" not in d.columns and "network_bandwidth_gbps" in d.columns:
-        d["network_capacity_gbps"] = pd.to_numeric(
+        d["network_capacity_gbps"] = as_numeric(
             d["network_bandwidth_gbps"], errors="coerce"
         )
 
     # 3) Create network_bandwidth_usage_gbps from bandwidth * avg_network_utilization
     if "network_bandwidth_usage_gbps" not in d.columns:
         if {"network_bandwidth_gbps", "avg_network_utilization"} <= set(d.columns):
-            bw = pd.to_numeric(d["network_bandwidth_gbps"], errors="coerce")
-            util = pd.to_numeric(d["avg_network_utilization"], errors="coerce")
+            bw = as_numeric(d["network_bandwidth_gbps"], errors="coerce")
+            util = as_numeric(d["avg_network_utilization"], errors="coerce")
             d["network_bandwidth_usage_gbps"] = bw * (util / 100.0)
 
     # ======================================================
@@ -191,7 +192,7 @@ Why this matters: The shape of the utilization distribution exposes whether the
             pass
         else:
             d2 = d.copy()
-            d2["network_bandwidth_usage_gbps"] = pd.to_numeric(
+            d2["network_bandwidth_usage_gbps"] = as_numeric(
                 d2["network_bandwidth_usage_gbps"], errors="coerce"
             )
 
@@ -284,8 +285,8 @@ Why this matters: The traffic share pattern determines how fragile or robust you
             # High utilisation windows from earlier, if capacity exists
             if {"network_bandwidth_gbps", "network_capacity_gbps"} <= set(d.columns):
                 util_pct_series = (
-                    pd.to_numeric(d["network_bandwidth_usage_gbps"], errors="coerce") /
-                    pd.to_numeric(d["network_capacity_gbps"], errors="coerce").replace(0, np.nan)
+                    as_numeric(d["network_bandwidth_usage_gbps"], errors="coerce") /
+                    as_numeric(d["network_capacity_gbps"], errors="coerce").replace(0, np.nan)
                 ) * 100
                 high_util_nodes = int((util_pct_series > 80).sum())
             else:
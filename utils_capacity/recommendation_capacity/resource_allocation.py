@@ -1,6 +1,7 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils_capacity.aggregate_store import capacity_aggregates
 
 # --- Visual identity: professional blue & white (global) ---
 px.defaults.template = "plotly_white"
@@ -134,7 +135,7 @@ It also supports a more predictable experience for users and simplifies capacity
     with st.expander("📌 Rightsizing Recommendations by Component"):
         if {"component_type", "avg_cpu_utilization"} <= set(df.columns):
 
-            comp_avg = df.groupby("component_type")["avg_cpu_utilization"].mean().reset_index()
+            comp_avg = capacity_aggregates(df).table("component_type", "avg_cpu_utilization")
 
             # Graph 1: Bar chart for CPU utilization by component
             fig_comp_bar = px.bar(
@@ -3,6 +3,7 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils_capacity.metric_block import as_numeric
 
 # --- Visual identity: professional blue & white ---
 px.defaults.template = "plotly_white"
@@ -25,7 +26,7 @@ def resource_efficiency(df):
     # ======================
     with st.expander("📌 Underutilized Assets"):
         if "avg_cpu_utilization" in df.columns:
-            low_util = df[pd.to_numeric(df["avg_cpu_utilization"], errors="coerce") < 30]
+            low_util = df[as_numeric(df["avg_cpu_utilization"], errors="coerce") < 30]
 
             # Graph 1: Bar chart for underutilized assets
             fig_bar = px.bar(
@@ -41,9 +42,9 @@ def resource_efficiency(df):
             # --- Analysis (formatted like reference) ---
             total_assets = len(df)
             low_assets = len(low_util)
-            avg_util_all = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce").mean() if total_assets else 0
-            min_util_all = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce").min() if total_assets else 0
-            max_util_all = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce").max() if total_assets else 0
+            avg_util_all = as_numeric(df["avg_cpu_utilization"], errors="coerce").mean() if total_assets else 0
+            min_util_all = as_numeric(df["avg_cpu_utilization"], errors="coerce").min() if total_assets else 0
+            max_util_all = as_numeric(df["avg_cpu_utilization"], errors="coerce").max() if total_assets else 0
             pct_low = (low_assets / total_assets * 100) if total_assets else 0.0
 
             st.write(f"""
@@ -103,14 +104,14 @@ Shifting the curve modestly to the right without driving assets into saturation
 
             # CIO Recommendation Tables (Benefits expanded, Phases more detailed)
             low_cost = float(
-                pd.to_numeric(
-                    df.loc[pd.to_numeric(df["avg_cpu_utilization"], errors="coerce") < 30, "cost_per_month_usd"],
+                as_numeric(
+                    df.loc[as_numeric(df["avg_cpu_utilization"], errors="coerce") < 30, "cost_per_month_usd"],
                     errors="coerce"
                 ).fillna(0).sum()
             ) if "cost_per_month_usd" in df.columns else 0
             low_savings = float(
-                pd.to_numeric(
-                    df.loc[pd.to_numeric(df["avg_cpu_utilization"], errors="coerce") < 30, "potential_savings_usd"],
+                as_numeric(
+                    df.loc[as_numeric(df["avg_cpu_utilization"], errors="coerce") < 30, "potential_savings_usd"],
                     errors="coerce"
                 ).fillna(0).sum()
             ) if "potential_savings_usd" in df.columns else 0
@@ -146,7 +147,7 @@ Shifting the curve modestly to the right without driving assets into saturation
     with st.expander("📌 Overutilized Assets"):
         if "avg_cpu_utilization" in df.columns:
             df = df.copy()
-            cpu_num = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
+            cpu_num = as_numeric(df["avg_cpu_utilization"], errors="coerce")
             high_util = df[cpu_num > 85]
 
             # Graph 1: Bar chart for overutilized assets
@@ -225,10 +226,10 @@ Using this view regularly reduces surprise incidents and gives leadership a clea
 
             # CIO Recommendations (Benefits expanded, Phases detailed)
             high_cost = float(
-                pd.to_numeric(df.loc[cpu_num > 85, "cost_per_month_usd"], errors="coerce").fillna(0).sum()
+                as_numeric(df.loc[cpu_num > 85, "cost_per_month_usd"], errors="coerce").fillna(0).sum()
             ) if "cost_per_month_usd" in df.columns else 0
             high_savings = float(
-                pd.to_numeric(df.loc[cpu_num > 85, "potential_savings_usd"], errors="coerce").fillna(0).sum()
+                as_numeric(df.loc[cpu_num > 85, "potential_savings_usd"], errors="coerce").fillna(0).sum()
             ) if "potential_savings_usd" in df.columns else 0
 
             cio_over = {
@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils_capacity.metric_block import as_numeric
 
 # --- Visual identity: professional blue & white (global) ---
 px.defaults.template = "plotly_white"
@@ -27,8 +28,8 @@ def risk_assessment(df):
     with st.expander("📌 Capacity Risk Heatmap"):
         if {"avg_cpu_utilization", "avg_memory_utilization"} <= set(df.columns):
             df = df.copy()
-            df["avg_cpu_utilization"] = pd.to_numeric(df["avg_cpu_utilization"], errors="coerce")
-            df["avg_memory_utilization"] = pd.to_numeric(df["avg_memory_utilization"], errors="coerce")
+            df["avg_cpu_utilization"] = as_numeric(df["avg_cpu_utilization"], errors="coerce")
+            df["avg_memory_utilization"] = as_numeric(df["avg_memory_utilization"], errors="coerce")
             df["risk_score"] = (df["avg_cpu_utilization"] * 0.6) + (df["avg_memory_utilization"] * 0.4)
 
             # Graph 1: Heatmap of risk (blue scale)
@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils_capacity.metric_block import as_numeric
 
 # 🔹 Helper to render CIO tables with 3 nested expanders (Option A format)
 def render_cio_tables(title, cio_data):
@@ -14,7 +15,7 @@ def render_cio_tables(title, cio_data):
         st.markdown(cio_data["satisfaction"], unsafe_allow_html=True)
 
 def _to_num(s):
-    return pd.to_numeric(s, errors="coerce")
+    return as_numeric(s, errors="coerce")
 
 def _fmt_cur(v):
     try:
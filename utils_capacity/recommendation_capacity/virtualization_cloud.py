@@ -1,6 +1,7 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils_capacity.scenario_engine import standard_scenarios
 
 # --- Visual identity: professional blue & white (global) ---
 px.defaults.template = "plotly_white"
@@ -105,14 +106,17 @@ Why it matters: Shaping the utilization distribution toward the middle reduces o
             pot_savings = df["potential_savings_usd"].sum() if "potential_savings_usd" in df.columns else 0
             high_util_count = (df["avg_cpu_utilization"] > 85).sum()
             low_util_count = (df["avg_cpu_utilization"] < 30).sum()
+            whatif = standard_scenarios(df)
+            consol = whatif.loc["Consolidate 2:1 below 30% CPU"]
+            rsize = whatif.loc["Right-size 25% below 40% CPU"]
 
             # CIO Tables — VM Utilization Efficiency
             cio_vm_eff = {
                 "cost": f"""
 | Recommendation | Explanation (Phased) | Benefits | Cost Calculation | Evidence & Graph Interpretation |
 |---|---|---|---|---|
-| Consolidate underutilized virtual machines | Phase 1: Identify virtual machines with average CPU utilization below 30% using the histogram and bar chart and confirm with application owners that no critical or hidden batch workloads depend on them.<br><br>Phase 2: Plan and execute migration of any remaining workloads from these low use VMs onto shared hosts and mark truly idle instances for decommission so that capacity is pooled more efficiently.<br><br>Phase 3: After consolidation, review utilization, cost, and incident trends for the affected VMs over at least one full billing cycle to verify that savings are real and that no service regression has occurred.<br><br> | - Reduces ongoing operating expenditure because fewer virtual machines and underlying hosts need to be powered, licensed, and supported for the same amount of business work.<br><br>- Cuts the amount of idle or low value capacity in the fleet which means more of the cloud or on premises spend is directly aligned with real usage and demand.<br><br>- Shrinks the logical and physical footprint of the environment which simplifies monitoring, backup, and patching activities for operations teams.<br><br>- Improves overall resource utilization which supports sustainability and efficiency targets without compromising availability or response times for users.<br><br> | Formula: Savings Ratio = potential_savings_usd ÷ cost_per_month_usd<br>Dataset: ${pot_savings:,.2f}/${total_cost:,.2f} = {(pot_savings/total_cost if total_cost else 0):.2f}<br>Result: Indicates how much of current monthly cost could be reclaimed through consolidation.<br> | Histogram left tail confirms {low_util_count} low use VMs below 30% utilization and the bar chart pinpoints the specific VM names that sit in that low efficiency cohort. |
-| Implement automated rightsizing policies | Phase 1: Enable or configure cloud and virtualization recommendations that analyze historical CPU and memory utilization for each VM and propose smaller or more appropriate instance sizes where usage is persistently low.<br><br>Phase 2: Review the recommendations with platform and application teams and apply rightsizing changes in controlled waves so that resource allocations are adjusted without destabilizing workloads.<br><br>Phase 3: Reassess utilization, performance, and cost each quarter to refine thresholds and ensure that rightsizing policies continue to reflect actual workload behavior as systems evolve.<br><br> | - Reduces overspending on compute capacity by aligning VM sizes more closely to the resources that workloads actually use rather than worst case assumptions.<br><br>- Lowers manual effort for engineers by turning recurring rightsizing decisions into standard policy driven workflows instead of one off tuning exercises.<br><br>- Improves visibility into capacity posture for leadership because the estate gradually converges on a consistent sizing approach with fewer extreme outliers.<br><br>- Creates a sustainable and repeatable optimization loop so that new workloads are regularly corrected if they drift away from their ideal size over time.<br><br> | Formula: Overprovisioned capacity cost = (Overprovisioned vCPU hours × Cost per vCPU hour)<br>Dataset: Average utilization of {avg_util:.2f}% across VMs indicates where high vCPU counts are not fully used.<br>Result: Highlights the financial impact of persistent underuse relative to allocated capacity.<br> | Bar chart shows many VMs operating well below peak capacity while paying for higher tiers, indicating rightsizing opportunities flagged by the utilization spread. |
+| Consolidate underutilized virtual machines | Phase 1: Identify virtual machines with average CPU utilization below 30% using the histogram and bar chart and confirm with application owners that no critical or hidden batch workloads depend on them.<br><br>Phase 2: Plan and execute migration of any remaining workloads from these low use VMs onto shared hosts and mark truly idle instances for decommission so that capacity is pooled more efficiently.<br><br>Phase 3: After consolidation, review utilization, cost, and incident trends for the affected VMs over at least one full billing cycle to verify that savings are real and that no service regression has occurred.<br><br> | - Reduces ongoing operating expenditure because fewer virtual machines and underlying hosts need to be powered, licensed, and supported for the same amount of business work.<br><br>- Cuts the amount of idle or low value capacity in the fleet which means more of the cloud or on premises spend is directly aligned with real usage and demand.<br><br>- Shrinks the logical and physical footprint of the environment which simplifies monitoring, backup, and patching activities for operations teams.<br><br>- Improves overall resource utilization which supports sustainability and efficiency targets without compromising availability or response times for users.<br><br> | Formula: Savings Ratio = potential_savings_usd ÷ cost_per_month_usd<br>Dataset: ${pot_savings:,.2f}/${total_cost:,.2f} = {(pot_savings/total_cost if total_cost else 0):.2f}<br>Result: Indicates how much of current monthly cost could be reclaimed through consolidation.<br>Scenario: 2:1 consolidation of {int(consol['assets_consolidated']):,} VMs below 30% CPU saves ${consol['savings_usd']:,.2f}/month ({consol['savings_pct']:.2f}%).<br> | Histogram left tail confirms {low_util_count} low use VMs below 30% utilization and the bar chart pinpoints the specific VM names that sit in that low efficiency cohort. |
+| Implement automated rightsizing policies | Phase 1: Enable or configure cloud and virtualization recommendations that analyze historical CPU and memory utilization for each VM and propose smaller or more appropriate instance sizes where usage is persistently low.<br><br>Phase 2: Review the recommendations with platform and application teams and apply rightsizing changes in controlled waves so that resource allocations are adjusted without destabilizing workloads.<br><br>Phase 3: Reassess utilization, performance, and cost each quarter to refine thresholds and ensure that rightsizing policies continue to reflect actual workload behavior as systems evolve.<br><br> | - Reduces overspending on compute capacity by aligning VM sizes more closely to the resources that workloads actually use rather than worst case assumptions.<br><br>- Lowers manual effort for engineers by turning recurring rightsizing decisions into standard policy driven workflows instead of one off tuning exercises.<br><br>- Improves visibility into capacity posture for leadership because the estate gradually converges on a consistent sizing approach with fewer extreme outliers.<br><br>- Creates a sustainable and repeatable optimization loop so that new workloads are regularly corrected if they drift away from their ideal size over time.<br><br> | Formula: Overprovisioned capacity cost = (Overprovisioned vCPU hours × Cost per vCPU hour)<br>Dataset: Average utilization of {avg_util:.2f}% across VMs indicates where high vCPU counts are not fully used.<br>Result: Highlights the financial impact of persistent underuse relative to allocated capacity.<br>Scenario: removing 25% of capacity from {int(rsize['assets_rightsized']):,} VMs below 40% CPU saves ${rsize['savings_usd']:,.2f}/month ({rsize['savings_pct']:.2f}%), leaving {int(rsize['assets_at_risk']):,} VMs at or above 85%.<br> | Bar chart shows many VMs operating well below peak capacity while paying for higher tiers, indicating rightsizing opportunities flagged by the utilization spread. |
 | Rebalance VM-to-host density | Phase 1: Analyze host level metrics to understand which physical or logical hosts are lightly loaded and which are carrying dense sets of virtual machines that are still under overall capacity limits.<br><br>Phase 2: Carefully migrate or evacuate low use VMs from multiple underutilized hosts onto a smaller number of consolidated hosts while respecting redundancy and fault domain requirements.<br><br>Phase 3: Once workloads are concentrated appropriately, power down, repurpose, or reclassify the freed hosts and update inventory and monitoring systems so that cost reductions are captured and maintained.<br><br> | - Lowers compute, energy, and facility costs by reducing the number of active hosts required to support the current workload mix while keeping enough headroom for growth and failover.<br><br>- Reduces operational complexity because there are fewer servers to patch, monitor, and troubleshoot which streamlines day to day run activities.<br><br>- Increases the overall efficiency of the virtualization layer by ensuring that remaining hosts run closer to their optimal utilization range.<br><br>- Frees up hardware capacity that can be reused for new projects, lab environments, or disaster recovery without immediate capital expenditure.<br><br> | Formula: Savings = (Number of hosts avoided × Monthly cost per host)<br>Dataset: Consolidation potential is indicated by the population of VMs below 30% utilization shown in the histogram.<br>Result: Quantifies cost impact of retiring or repurposing lightly utilized hosts after consolidation.<br> | Histogram distribution supports high consolidation potential and the VM bar chart identifies where underloaded VMs can be grouped onto fewer hosts. |
 """,
                 "performance": f"""
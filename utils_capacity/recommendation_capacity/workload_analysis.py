@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import re
+from utils_capacity.aggregate_store import capacity_aggregates
 
 # ======================================================
 # Helper – CIO Table Renderer
@@ -28,7 +29,7 @@ def workload_analysis(df):
     # ======================================================
     with st.expander("📌 Workload by Component Type"):
         if {"component_type", "avg_cpu_utilization"} <= set(df.columns):
-            comp_avg = df.groupby("component_type")["avg_cpu_utilization"].mean().reset_index()
+            comp_avg = capacity_aggregates(df).table("component_type", "avg_cpu_utilization")
 
             # --- Graph 1: Average CPU Utilization per Component ---
             fig_comp = px.bar(
@@ -20,6 +20,7 @@ from utils_capacity.recommendation_capacity.cost_benefit import cost_benefit
 from utils_capacity.recommendation_capacity.risk_assessment import risk_assessment
 from utils_capacity.recommendation_capacity.actionable_insight import actionable_insight
 from utils_capacity.recommendation_capacity.implementation_plan import implementation_plan
+from utils_capacity.metric_block import as_numeric
 
 
 def recommendations_capacity(df):
@@ -100,7 +101,7 @@ def recommendations_capacity(df):
     total_cost = 0.0
     if "cost_per_month_usd" in df_filtered.columns:
         # Use numeric coercion to be safe if the column is object-typed strings
-        total_cost = pd.to_numeric(df_filtered["cost_per_month_usd"], errors="coerce").fillna(0).sum()
+        total_cost = as_numeric(df_filtered["cost_per_month_usd"], errors="coerce").fillna(0).sum()
         col5.metric("Total Monthly Cost (USD)", f"${total_cost:,.2f}")
     else:
         col5.metric("Total Monthly Cost (USD)", "N/A")
@@ -66,6 +66,8 @@ from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle, Paragraph
 from reportlab.lib.styles import getSampleStyleSheet
+from cow_context import shared_view
+from utils_capacity.metric_block import as_numeric
 
 # DOCX (optional)
 try:
@@ -299,7 +301,7 @@ def _compute_overview_kpis(df: pd.DataFrame) -> Dict[str, Any]:
     def _mean_col(col):
         if col not in d.columns:
             return None
-        vals = pd.to_numeric(d[col], errors="coerce")
+        vals = as_numeric(d[col], errors="coerce")
         vals = vals[vals.notna()]
         if vals.empty:
             return None
@@ -308,7 +310,7 @@ def _compute_overview_kpis(df: pd.DataFrame) -> Dict[str, Any]:
     def _sum_col(col):
         if col not in d.columns:
             return None
-        vals = pd.to_numeric(d[col], errors="coerce")
+        vals = as_numeric(d[col], errors="coerce")
         vals = vals[vals.notna()]
         if vals.empty:
             return None
@@ -819,7 +821,7 @@ def _capture_module(mod, fn_name: str, df: pd.DataFrame, section_title: str) ->
     try:
         setattr(mod, "st", STShim())
         setattr(mod, "render_cio_tables", capture_cio)
-        getattr(mod, fn_name)(df.copy())
+        getattr(mod, fn_name)(shared_view(df))
     finally:
         if orig_st is not None:
             setattr(mod, "st", orig_st)
@@ -992,13 +994,13 @@ def report_capacity(
             agg = {}
 
             if "avg_cpu_utilization" in tmp.columns:
-                agg["avg_cpu_utilization"] = lambda s: pd.to_numeric(s, errors="coerce").mean()
+                agg["avg_cpu_utilization"] = lambda s: as_numeric(s, errors="coerce").mean()
             if "avg_memory_utilization" in tmp.columns:
-                agg["avg_memory_utilization"] = lambda s: pd.to_numeric(s, errors="coerce").mean()
+                agg["avg_memory_utilization"] = lambda s: as_numeric(s, errors="coerce").mean()
             if "avg_storage_utilization" in tmp.columns:
-                agg["avg_storage_utilization"] = lambda s: pd.to_numeric(s, errors="coerce").mean()
+                agg["avg_storage_utilization"] = lambda s: as_numeric(s, errors="coerce").mean()
             if "cost_per_month_usd" in tmp.columns:
-                agg["cost_per_month_usd"] = lambda s: pd.to_numeric(s, errors="coerce").sum()
+                agg["cost_per_month_usd"] = lambda s: as_numeric(s, errors="coerce").sum()
 
             if agg:
                 monthly = (
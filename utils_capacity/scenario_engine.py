@@ -0,0 +1,233 @@
+# utils_capacity/scenario_engine.py
+
+import itertools
+import warnings
+from dataclasses import dataclass, astuple, fields
+
+import numpy as np
+import pandas as pd
+
+from cache_registry import session_store
+from utils_capacity.metric_block import as_numeric
+
+# ─────────────────────────────────────────────────────────────
+# What-if capacity scenarios
+# Every lever is a per-scenario scalar; every asset metric is a per-asset
+# vector. Broadcasting them gives (scenario × asset) matrices, so hundreds of
+# scenarios are one set of NumPy operations. Summaries are cached per
+# (dataset, scenario) so re-asking for a scenario (slider reruns) is a lookup.
+# Exports carry one row per asset per day, so each asset enters the vectors
+# once, as its latest snapshot; every count in a summary is a count of assets.
+# ─────────────────────────────────────────────────────────────
+UTILIZATION_COLUMNS = {
+    "cpu": "avg_cpu_utilization",
+    "memory": "avg_memory_utilization",
+    "storage": "avg_storage_utilization",
+    "network": "avg_network_utilization",
+}
+COST_COLUMN = "cost_per_month_usd"
+ASSET_COLUMN = "asset_id"
+SNAPSHOT_COLUMN = "data_date"
+_STORE = "capacity_scenarios"
+_CACHE_LIMIT = 5000   # cached scenario summaries per session
+_CHUNK_CELLS = 2_000_000  # scenario × asset cells evaluated per pass (bounds peak memory)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One what-if setting. Percentages are 0–100; ratios are ≥ 1."""
+    name: str = "Baseline"
+    growth_pct: float = 0.0                # demand growth applied to all utilization metrics
+    consolidation_ratio: float = 1.0       # N:1 consolidation of low-CPU assets (1 = none)
+    consolidation_below: float = 30.0      # CPU % under which an asset is a consolidation candidate
+    rightsizing_pct: float = 0.0           # capacity (and compute cost) removed from oversized assets
+    rightsizing_below: float = 40.0        # CPU % under which an asset is oversized
+    tiering_pct: float = 0.0               # share of used storage moved to a cheaper tier
+    tier_cost_ratio: float = 0.4           # cheaper tier unit cost relative to primary storage
+    storage_cost_share: float = 0.3        # share of monthly asset cost that is storage
+    risk_threshold: float = 85.0           # projected utilization at/above this counts as at risk
+
+    def key(self) -> tuple:
+        return astuple(self)[1:]           # the name does not change the outcome
+
+
+def scenario_grid(base: Scenario = Scenario(), **levers) -> list:
+    """Cartesian product of lever values, e.g. scenario_grid(growth_pct=[0, 10, 20], rightsizing_pct=[0, 25])."""
+    names = list(levers)
+    grid = []
+    for values in itertools.product(*(levers[n] for n in names)):
+        label = ", ".join(f"{n}={v:g}" for n, v in zip(names, values))
+        grid.append(Scenario(**{**_as_dict(base), **dict(zip(names, values)), "name": label or base.name}))
+    return grid
+
+
+def _as_dict(s: Scenario) -> dict:
+    return {f.name: getattr(s, f.name) for f in fields(s)}
+
+
+# =========================
+# Asset vectors
+# =========================
+@dataclass
+class AssetVectors:
+    util: dict            # metric -> (n,) float64, NaN where missing
+    cost: np.ndarray      # (n,) monthly cost, 0 where missing
+    token: int            # content hash of the inputs (scenario cache key)
+
+    @property
+    def n(self) -> int:
+        return self.cost.size
+
+
+def latest_per_asset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per asset: its latest `data_date` snapshot (last row when undated). Rows without an
+    asset id cannot be matched to other days and are kept as they are. Frames without an asset id
+    column are taken as one row per asset already.
+    """
+    if ASSET_COLUMN not in df.columns:
+        return df
+    ids = df[ASSET_COLUMN]
+    when = (pd.to_datetime(df[SNAPSHOT_COLUMN], errors="coerce") if SNAPSHOT_COLUMN in df.columns
+            else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]"))
+    keyed = pd.DataFrame({"id": ids.to_numpy(), "when": when.to_numpy()})   # positional index
+    named = keyed[ids.notna().to_numpy()]
+    latest = named.sort_values("when", kind="stable", na_position="first").drop_duplicates("id", keep="last")
+    keep = np.sort(np.concatenate([latest.index.to_numpy(), np.flatnonzero(ids.isna().to_numpy())]))
+    return df if len(keep) == len(df) else df.iloc[keep]
+
+
+def asset_vectors(df: pd.DataFrame) -> AssetVectors:
+    """Per-asset metric and cost vectors of `df`, one entry per asset (see latest_per_asset)."""
+    df = latest_per_asset(df)
+    cols = [c for c in UTILIZATION_COLUMNS.values() if c in df.columns]
+    if COST_COLUMN in df.columns:
+        cols.append(COST_COLUMN)
+    data = pd.DataFrame({c: as_numeric(df[c], errors="coerce") for c in cols}, index=df.index).astype("float64")
+    util = {m: data[c].to_numpy() for m, c in UTILIZATION_COLUMNS.items() if c in data.columns}
+    cost = data[COST_COLUMN].fillna(0).to_numpy() if COST_COLUMN in data.columns else np.zeros(len(df))
+    token = int(pd.util.hash_pandas_object(data, index=False).sum()) if len(data.columns) else len(df)
+    return AssetVectors(util=util, cost=cost, token=token)
+
+
+# =========================
+# Vectorized evaluation
+# =========================
+def _levers(scenarios) -> dict:
+    """Scenario list -> lever name -> (s, 1) column for broadcasting against (1, n) assets."""
+    return {f.name: np.array([getattr(s, f.name) for s in scenarios], dtype="float64")[:, None]
+            for f in fields(Scenario) if f.name != "name"}
+
+
+def simulate(vectors: AssetVectors, scenarios) -> dict:
+    """
+    Projected (scenario × asset) matrices:
+      util[metric] projected utilization (uncapped, %), cost projected monthly cost,
+      at_risk bool (any metric ≥ the scenario's risk threshold).
+    """
+    L = _levers(scenarios)
+    cpu = vectors.util.get("cpu")
+    cpu_row = (cpu if cpu is not None else np.full(vectors.n, np.nan))[None, :]
+
+    # Rightsizing: oversized assets lose a share of capacity -> same load on less capacity
+    rightsized = (cpu_row < L["rightsizing_below"]) & (L["rightsizing_pct"] > 0)
+    rs_keep = np.where(rightsized, 1 - L["rightsizing_pct"] / 100.0, 1.0)
+
+    # Consolidation: N:1 packing of low-CPU assets -> N× load per remaining host, 1/N of the cost
+    cpu_after_rs = cpu_row / rs_keep
+    consolidated = (cpu_after_rs < L["consolidation_below"]) & (L["consolidation_ratio"] > 1)
+    packing = np.where(consolidated, L["consolidation_ratio"], 1.0)
+
+    growth = 1 + L["growth_pct"] / 100.0
+    util = {}
+    for metric, values in vectors.util.items():
+        u = values[None, :] * growth * packing
+        if metric in ("cpu", "memory"):
+            u = u / rs_keep
+        if metric == "storage":
+            u = u * (1 - L["tiering_pct"] / 100.0)
+        util[metric] = u
+
+    cost = vectors.cost[None, :]
+    storage_share = L["storage_cost_share"]
+    compute_cost = cost * (1 - storage_share) * rs_keep
+    tier = L["tiering_pct"] / 100.0
+    storage_cost = cost * storage_share * (1 - tier + tier * L["tier_cost_ratio"])
+    projected_cost = (compute_cost + storage_cost) / packing
+
+    at_risk = np.zeros((len(scenarios), vectors.n), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        for u in util.values():
+            at_risk |= u >= L["risk_threshold"]
+    return {"util": util, "cost": projected_cost, "at_risk": at_risk, "consolidated": consolidated,
+            "rightsized": rightsized}
+
+
+def _summarize(vectors: AssetVectors, scenarios) -> pd.DataFrame:
+    step = max(1, _CHUNK_CELLS // max(vectors.n, 1))
+    cols = {}
+    for i in range(0, len(scenarios), step):
+        m = simulate(vectors, scenarios[i:i + step])
+        part = {
+            "projected_cost_usd": m["cost"].sum(axis=1),
+            "assets_at_risk": m["at_risk"].sum(axis=1),
+            "assets_consolidated": m["consolidated"].sum(axis=1),
+            "assets_rightsized": m["rightsized"].sum(axis=1),
+        }
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN metric -> NaN mean
+            for metric, u in m["util"].items():
+                part[f"projected_{metric}_pct"] = np.nanmean(np.clip(u, 0, 100), axis=1)
+        for k, v in part.items():
+            cols.setdefault(k, []).append(v)
+
+    base_cost = float(vectors.cost.sum())
+    out = pd.DataFrame([_as_dict(s) for s in scenarios])
+    for k in [c for c in cols if c.startswith("projected_") and c.endswith("_pct")]:
+        out[k] = np.concatenate(cols[k])
+    out["projected_cost_usd"] = np.concatenate(cols["projected_cost_usd"])
+    out["savings_usd"] = base_cost - out["projected_cost_usd"]
+    out["savings_pct"] = out["savings_usd"] / base_cost * 100 if base_cost else 0.0
+    out["assets_at_risk"] = np.concatenate(cols["assets_at_risk"])
+    out["risk_share_pct"] = out["assets_at_risk"] / vectors.n * 100 if vectors.n else 0.0
+    out["assets_consolidated"] = np.concatenate(cols["assets_consolidated"])
+    out["assets_rightsized"] = np.concatenate(cols["assets_rightsized"])
+    return out
+
+
+def _cache():
+    return session_store(_STORE, _CACHE_LIMIT)
+
+
+def evaluate_scenarios(df: pd.DataFrame, scenarios) -> pd.DataFrame:
+    """
+    One summary row per scenario: projected mean utilization per metric, projected monthly cost,
+    savings vs today, assets at risk. Scenarios already evaluated on this data come from the cache;
+    the rest are evaluated together in one vectorized pass.
+    """
+    scenarios = list(scenarios)
+    vectors = asset_vectors(df)
+    cache = _cache()
+    rows = {s.key(): cache[(vectors.token, s.key())] for s in scenarios if (vectors.token, s.key()) in cache}
+    missing = list({s.key(): s for s in scenarios if s.key() not in rows}.values())
+    if missing:
+        fresh = _summarize(vectors, missing)
+        for s, row in zip(missing, fresh.drop(columns="name").to_dict("records")):
+            rows[s.key()] = cache[(vectors.token, s.key())] = row
+    return pd.DataFrame([{"name": s.name, **rows[s.key()]} for s in scenarios])
+
+
+# Levers the recommendation tables quote (one representative setting per lever, plus all combined)
+STANDARD_SCENARIOS = [
+    Scenario(name="Baseline"),
+    Scenario(name="12-month growth (15%)", growth_pct=15),
+    Scenario(name="Consolidate 2:1 below 30% CPU", consolidation_ratio=2),
+    Scenario(name="Right-size 25% below 40% CPU", rightsizing_pct=25),
+    Scenario(name="Tier 30% of storage", tiering_pct=30),
+    Scenario(name="All levers + 15% growth", growth_pct=15, consolidation_ratio=2, rightsizing_pct=25, tiering_pct=30),
+]
+
+
+def standard_scenarios(df: pd.DataFrame) -> pd.DataFrame:
+    """Outcomes of STANDARD_SCENARIOS, indexed by scenario name."""
+    return evaluate_scenarios(df, STANDARD_SCENARIOS).set_index("name")
@@ -0,0 +1,30 @@
+# utils_capacity/schema.py
+from schema_registry import ColumnSpec, DomainSchema, TokenRule, register
+
+# Capacity inventory exports: the critical metrics are declared with their units so that name
+# tokens such as "time" (avg_response_time_ms) or "uptime" never route them through date parsing.
+SCHEMA = register(DomainSchema(
+    domain="capacity",
+    columns=(
+        ColumnSpec("cpu_cores", "numeric"),
+        ColumnSpec("memory_gb", "numeric", unit="gb"),
+        ColumnSpec("storage_tb", "numeric", unit="tb"),
+        ColumnSpec("network_bandwidth_gbps", "numeric", unit="gbps"),
+        ColumnSpec("incident_count", "numeric"),
+        ColumnSpec("downtime_minutes", "numeric", unit="minutes"),
+        ColumnSpec("avg_response_time_ms", "numeric", unit="ms"),
+        ColumnSpec("energy_consumption_kwh", "numeric", unit="kwh"),
+        ColumnSpec("co2_emission_kg", "numeric", unit="kg"),
+        ColumnSpec("cost_per_month_usd", "numeric", unit="currency"),
+        ColumnSpec("potential_savings_usd", "numeric", unit="currency"),
+        ColumnSpec("sustainability_score", "numeric"),
+    ),
+    rules=(
+        # percentages keep their own parsing (decimal commas, proportion scaling) in the cleaner
+        TokenRule(("utilization", "uptime", "percent", "growth_pct"), ColumnSpec(dtype="text", unit="percent")),
+        TokenRule(("flag", "status", "bottleneck"), ColumnSpec(dtype="bool", na=False, min_share=0.6,
+                                                               true_values=frozenset({"true", "yes", "1"}),
+                                                               false_values=frozenset({"false", "no", "0"}))),
+        TokenRule(("date", "time", "timestamp"), ColumnSpec(dtype="datetime", dayfirst=True)),
+    ),
+))
@@ -1,5 +1,8 @@
 import pandas as pd
 import streamlit as st
+from cleaning_diff import paged_dataframe
+from dimension_encoding import encode_dimensions
+from duplicate_index import duplicate_index
 
 def data_cleaning_change(df, uploaded_file):
     st.success("✅ File successfully loaded!")
@@ -15,10 +18,10 @@ def data_cleaning_change(df, uploaded_file):
     st.write("**Sample Data:**")
     st.dataframe(df.head())
 
-    duplicate_rows = df[df.duplicated()]
-    st.write(f"🔁 **Duplicate Rows Found:** {duplicate_rows.shape[0]}")
-    if not duplicate_rows.empty:
-        st.dataframe(duplicate_rows)
+    dups = duplicate_index(df)
+    st.write(f"🔁 **Duplicate Rows Found:** {dups.count}")
+    if dups.count:
+        paged_dataframe(df.iloc[dups.sample()], key="change_raw_dup_page")
 
     
     # --- Convert date and duration fields ---
@@ -52,6 +55,9 @@ def data_cleaning_change(df, uploaded_file):
     if 'implemented_date' in df.columns and 'request_date' in df.columns:
         df['total_change_lead_time'] = (df['implemented_date'] - df['request_date']).dt.total_seconds() / 86400
 
+    # --- Dimension columns -> categoricals ---
+    df = encode_dimensions(df)
+
     # --- Post-cleaning Summary ---
     st.subheader("🧼 After Cleaning Overview")
     st.write(f"**Number of Rows:** {df.shape[0]}")
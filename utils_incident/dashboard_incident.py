@@ -6,6 +6,9 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
+from cache_registry import cached
+from dataset_stats import frame_stats
+
 # ---- Visual defaults ----
 px.defaults.template = "plotly_white"
 PX_PALETTE = px.colors.qualitative.Safe
@@ -37,7 +40,7 @@ def _apply_bar_labels(fig, show_labels: bool, fmt: str = None):
     return fig
 
 
-@st.cache_data(show_spinner=False)
+@cached
 def _prep_base(df: pd.DataFrame):
     d = df.copy()
 
@@ -178,6 +181,7 @@ def _compute_incident_kpis(df: pd.DataFrame) -> dict:
 def dashboard_incident(df: pd.DataFrame):
     st.markdown("## 🚨 Incident Management Dashboard")
     df = _prep_base(df)
+    stats = frame_stats(df, "dashboard_incident")  # date span from the catalog, not a scan per rerun
 
     # =========================================================
     # Sidebar: Column-aware, context-aware filters
@@ -189,9 +193,8 @@ def dashboard_incident(df: pd.DataFrame):
         st.markdown("### 🔎 Filters")
 
         # ---------- DATE RANGE (drives option lists below) ----------
-        if "created_date" in df.columns and not pd.isna(df["created_date"]).all():
-            min_d = pd.to_datetime(df["created_date"]).min()
-            max_d = pd.to_datetime(df["created_date"]).max()
+        if "created_date" in df.columns and stats.date_bounds("created_date"):
+            min_d, max_d = stats.date_bounds("created_date")
             date_range = st.date_input(
                 "Date range",
                 value=(min_d.date(), max_d.date()),
@@ -2,6 +2,9 @@ import pandas as pd
 import streamlit as st
 import io
 import re
+from cleaning_diff import diff_frames, paged_dataframe, profile_raw, render_diff
+from dimension_encoding import arrow_safe_categorical, encode_dimensions
+from duplicate_index import build_index, near_duplicate_key
 
 # --------- helpers ---------
 def to_snake(name: str) -> str:
@@ -26,7 +29,7 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
       - Lists/dicts/tuples in cells -> string
       - Pandas nullable Int64 -> float64 (preserve NaN)
       - datetimes -> naive datetime64[ns]
-      - categoricals -> string
+      - categoricals kept dictionary-encoded (labels as strings)
     """
     out = df.copy()
 
@@ -56,9 +59,9 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
         elif pd.api.types.is_datetime64_any_dtype(s):
             out[col] = pd.to_datetime(s, errors="coerce").dt.tz_localize(None)
 
-        # 4) categoricals -> string
-        elif pd.api.types.is_categorical_dtype(s):
-            out[col] = s.astype("string")
+        # 4) categoricals stay categorical (Arrow dictionary); only labels are stringified
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = arrow_safe_categorical(s)
 
     return out
 
@@ -70,8 +73,9 @@ def _dtype_table(df: pd.DataFrame, title: str) -> pd.DataFrame:
 
 # --------- main cleaning pipeline ---------
 def data_cleaning_incident(df, uploaded_file):
-    # keep a RAW snapshot (exactly as uploaded)
-    raw_df_snapshot = df.copy(deep=True)
+    # keep a RAW snapshot (exactly as uploaded): a copy-on-write view, profiled once for the raw-vs-cleaned diff
+    raw_df_snapshot = df.copy(deep=False)
+    raw_profile = profile_raw(raw_df_snapshot)
 
     st.success("✅ File successfully loaded!")
 
@@ -82,32 +86,32 @@ def data_cleaning_incident(df, uploaded_file):
 
     # a) number of rows and columns
     col1, col2 = st.columns(2)
-    col1.metric("Rows (Raw)", raw_df_snapshot.shape[0])
-    col2.metric("Columns (Raw)", raw_df_snapshot.shape[1])
+    col1.metric("Rows (Raw)", raw_profile.rows)
+    col2.metric("Columns (Raw)", len(raw_profile.columns))
 
     # b) total missing values
-    total_missing_raw = int(raw_df_snapshot.isnull().sum().sum())
+    total_missing_raw = raw_profile.total_missing
     m1, _m2 = st.columns(2)
     m1.metric("Total Missing Values (Raw)", total_missing_raw)
 
     # c) data types
     st.markdown("**Data Types (Raw)**")
-    st.dataframe(_dtype_table(raw_df_snapshot, "Raw dtypes"), use_container_width=True)
+    st.dataframe(raw_profile.dtype_table(), use_container_width=True)
 
     # d) missing value table
     col_mv, _ = st.columns([3, 1])
     with col_mv:
         st.markdown("**Missing Values by Column (Raw)**")
         st.dataframe(
-            raw_df_snapshot.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+            raw_profile.missing_table(),
             use_container_width=True
         )
 
     # e) duplicated rows
-    dup_count_raw = int(raw_df_snapshot.duplicated().sum())
+    dup_count_raw = raw_profile.duplicates
     st.write(f"**Duplicated Rows (Raw):** {dup_count_raw}")
     if dup_count_raw > 0:
-        st.dataframe(raw_df_snapshot[raw_df_snapshot.duplicated()], use_container_width=True)
+        paged_dataframe(raw_df_snapshot.iloc[raw_profile.duplicates_index.sample()], key="incident_raw_dup_page")
 
     # f) datetime columns (raw)
     raw_datetime_cols = [c for c in raw_df_snapshot.columns if pd.api.types.is_datetime64_any_dtype(raw_df_snapshot[c])]
@@ -177,6 +181,9 @@ def data_cleaning_incident(df, uploaded_file):
     if 'created_time' in df.columns and 'resolved_time' in df.columns:
         df['resolution_time'] = (df['resolved_time'] - df['created_time']).dt.total_seconds() / 3600
 
+    # Dimension columns -> categoricals (int codes + one copy of each label) for every downstream groupby/filter
+    df = encode_dimensions(df)
+
     # ==============================
     # ii. AFTER CLEANING
     # ==============================
@@ -188,7 +195,8 @@ def data_cleaning_incident(df, uploaded_file):
     ac2.metric("Columns (Cleaned)", df.shape[1])
 
     # b) total missing value
-    total_missing_clean = int(df.isnull().sum().sum())
+    diff = diff_frames(raw_profile, df, col_map)
+    total_missing_clean = int(diff.missing_table()["Missing"].sum())
     cm1, _cm2 = st.columns(2)
     cm1.metric("Total Missing Values (Cleaned)", total_missing_clean)
 
@@ -199,7 +207,7 @@ def data_cleaning_incident(df, uploaded_file):
     # d) missing value table
     st.markdown("**Missing Values by Column (Cleaned)**")
     st.dataframe(
-        df.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+        diff.missing_table(),
         use_container_width=True
     )
 
@@ -210,6 +218,14 @@ def data_cleaning_incident(df, uploaded_file):
     cleaned_datetime_cols = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
     st.write("**Datetime Columns Detected (Cleaned):** " + (", ".join(cleaned_datetime_cols) if cleaned_datetime_cols else "None"))
 
+    # Near-duplicate incidents: same id with the same subject once case, punctuation and RE:/FW: prefixes are ignored
+    near_key, near_label = near_duplicate_key(df)
+    if near_key is not None:
+        near = build_index(near_key)
+        st.write(f"**Near-Duplicate Incidents ({near_label}):** {near.count}")
+        if near.count:
+            paged_dataframe(df.iloc[near.sample()], key="incident_near_dup_page")
+
     # g) sample data
     st.markdown("**Sample Cleaned Data:**")
     st.dataframe(df.head(), use_container_width=True)
@@ -219,25 +235,7 @@ def data_cleaning_incident(df, uploaded_file):
     # ==============================
     st.subheader("🔍 Compare Raw Data vs Cleaned Data")
 
-    # Build dtype tables
-    dtypes_raw = _dtype_table(raw_df_snapshot, "Raw dtypes")
-    dtypes_clean = _dtype_table(df, "Cleaned dtypes")
-
-    # Add a normalized key for raw columns so they align with cleaned
-    dtypes_raw["Column (standardized)"] = dtypes_raw["Column"].map(col_map)
-    dtypes_clean = dtypes_clean.rename(columns={"Column": "Column (standardized)"})
-
-    # Merge on the standardized column name
-    dtype_compare = dtypes_raw.merge(dtypes_clean, on="Column (standardized)", how="outer")
-    dtype_compare = dtype_compare.rename(columns={"Column": "Raw Column"})
-    # >>> mark dropped columns in comparison <<<
-    dropped_mask = dtype_compare["Cleaned dtypes"].isna() & dtype_compare["Raw dtypes"].notna()
-    dtype_compare.loc[dropped_mask, "Cleaned dtypes"] = "dropped"
-    # Reorder for readability
-    dtype_compare = dtype_compare[["Raw Column", "Column (standardized)", "Raw dtypes", "Cleaned dtypes"]].fillna("—")
-
-    st.markdown("**Data Types (Aligned by Standardized Name)**")
-    st.dataframe(dtype_compare, use_container_width=True)
+    render_diff(diff)
 
     # b) sample data — STACKED (Raw on top, Cleaned below)
     st.markdown("**Sample – Raw Data**")
@@ -276,24 +274,10 @@ def data_cleaning_incident(df, uploaded_file):
     view_option = st.radio("Select which data to view:", ("Raw Data", "Cleaned Data"), horizontal=True)
     with st.expander("📂 Click to view full table"):
         if view_option == "Raw Data":
-            file_name = uploaded_file.name.lower() if hasattr(uploaded_file, "name") else ""
-            try:
-                if file_name.endswith(".csv"):
-                    raw_df = pd.read_csv(uploaded_file)
-                elif file_name.endswith((".xlsx", ".xls")):
-                    raw_df = pd.read_excel(uploaded_file, engine="openpyxl")
-                else:
-                    st.error("❌ Unsupported file format. Please upload CSV or Excel.")
-                    raw_df = None
-
-                if raw_df is not None:
-                    st.markdown("### 🗃️ Raw Data (Full Table)")
-                    st.dataframe(raw_df, use_container_width=True)
-
-            except Exception as e:
-                st.error(f"⚠️ Could not read raw file: {e}")
+            st.markdown("### 🗃️ Raw Data (Full Table)")
+            paged_dataframe(raw_df_snapshot, key="incident_raw_page")
         else:
             st.markdown("### 🧼 Cleaned Data (Full Table)")
-            st.dataframe(df, use_container_width=True)
+            paged_dataframe(df, key="incident_clean_page")
 
     return df
@@ -13,6 +13,7 @@ from utils_incident.recommendation.incident_trends import incident_trends
 from utils_incident.recommendation.service_impact import service_impact
 from utils_incident.recommendation.resolution_action import resolution_action
 from utils_incident.report_incident import _compute_overview_kpis
+from date_range_filter import date_range_filter
 
 
 # ---------- Safe local fallback if upstream KPIs are missing ----------
@@ -105,50 +106,9 @@ def recommendation_incident(df: pd.DataFrame):
     st.subheader("Select Date Range")
 
     # ---------------- Date filter ----------------
-    if "created_time" in df.columns and not df["created_time"].isna().all():
-        df = df.copy()
-        df["created_time"] = pd.to_datetime(df["created_time"], errors="coerce")
-        df["created_date"] = df["created_time"].dt.date
-
-        min_date = df["created_date"].min()
-        max_date = df["created_date"].max()
-
-        col1, col2 = st.columns(2)
-        with col1:
-            start_date = st.date_input(
-                "Start Date",
-                value=min_date,
-                min_value=min_date,
-                max_value=max_date,
-                key="start_date_picker",
-            )
-        with col2:
-            end_date = st.date_input(
-                "End Date",
-                value=max_date,
-                min_value=min_date,
-                max_value=max_date,
-                key="end_date_picker",
-            )
-
-        st.markdown(
-            f"🗓️ **Selected Range:** `{start_date.strftime('%d/%m/%Y')}` → `{end_date.strftime('%d/%m/%Y')}`"
-        )
-
-        reset_filter = st.button("🔁 Reset to Default", key="reset_button_2")
-
-        if reset_filter:
-            df_filtered = df.copy()
-            st.info("Showing all available data (no date filter applied).")
-        elif start_date > end_date:
-            st.warning("⚠️ Start date is after end date. Please select a valid range.")
-            return
-        else:
-            df_filtered = df[
-                (df["created_date"] >= start_date) & (df["created_date"] <= end_date)
-            ]
-    else:
-        df_filtered = df.copy()
+    df_filtered = date_range_filter(df)
+    if df_filtered is None:
+        return
 
     st.markdown("---")
 
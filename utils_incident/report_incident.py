@@ -65,6 +65,7 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle, Paragraph
+from cow_context import shared_view
 
 # DOCX (optional)
 try:
@@ -914,7 +915,7 @@ def _capture_module(mod, fn_name: str, df: pd.DataFrame, section_title: str) ->
     try:
         setattr(mod, "st", STShim())
         setattr(mod, "render_cio_tables", capture_cio)
-        getattr(mod, fn_name)(df.copy())
+        getattr(mod, fn_name)(shared_view(df))
     finally:
         if orig_st is not None:
             setattr(mod, "st", orig_st)
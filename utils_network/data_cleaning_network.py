@@ -1,5 +1,9 @@
 import pandas as pd
 import streamlit as st
+from cleaning_executor import ExecutionReport
+from dimension_encoding import encode_dimensions
+from schema_registry import apply_schema
+from utils_network.schema import SCHEMA
 
 def data_cleaning_network(df, uploaded_file):
     st.success("✅ File successfully loaded!")
@@ -19,26 +23,16 @@ def data_cleaning_network(df, uploaded_file):
     # ✅ Normalize column names
     df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
 
-    # Convert dates
-    for col in ["timestamp","firmware_update"]:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors="coerce")
-
-    # Normalize boolean-like columns
-    def _to_bool(x):
-        if pd.isna(x): return pd.NA
-        s = str(x).strip().lower()
-        if s in {"true","yes","y","1"}: return True
-        if s in {"false","no","n","0"}: return False
-        return pd.NA
-
-    for bcol in ["config_change","qos_policy_violation"]:
-        if bcol in df.columns:
-            df[bcol] = df[bcol].map(_to_bool)
+    timings = ExecutionReport()   # per-column timings of the parallel cleaning steps
+    # Dates and boolean flags as declared in utils_network/schema.py (plan cached per column layout)
+    df, plan = apply_schema(SCHEMA.domain, df, report=timings)
 
     # Drop very sparse columns
     df = df.loc[:, df.isnull().mean() <= 0.5]
 
+    # Dimension columns -> categoricals (int codes + one copy of each label) for every downstream groupby/filter
+    df = encode_dimensions(df, report=timings)
+
     st.subheader("🧼 After Cleaning Overview")
     st.write(f"**Number of Rows:** {df.shape[0]}")
     st.write(f"**Number of Columns:** {df.shape[1]}")
@@ -46,6 +40,11 @@ def data_cleaning_network(df, uploaded_file):
     st.write(df.isnull().sum())
     st.dataframe(df.head())
 
+    with st.expander("🧭 Cleaning Plan (schema)"):
+        st.dataframe(plan.summary(), use_container_width=True)
+        st.caption(f"⏱️ {timings.summary()}")
+        st.dataframe(timings.table(), use_container_width=True)
+
     # Compare raw vs cleaned
     st.subheader("🔍 Compare Full Raw vs Cleaned Data")
     view_option = st.radio("Select which data to view:", ("Raw Data","Cleaned Data"), horizontal=True)
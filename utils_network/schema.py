@@ -0,0 +1,13 @@
+# utils_network/schema.py
+from schema_registry import ColumnSpec, DomainSchema, register
+
+# Network device telemetry: typed columns for data_cleaning_network (see schema_registry)
+SCHEMA = register(DomainSchema(
+    domain="network",
+    columns=(
+        ColumnSpec("timestamp", "datetime", aliases=("datetime", "date_time", "time")),
+        ColumnSpec("firmware_update", "datetime", aliases=("firmware_update_date", "last_firmware_update")),
+        ColumnSpec("config_change", "bool", aliases=("configuration_change", "config_changed")),
+        ColumnSpec("qos_policy_violation", "bool", aliases=("qos_violation",)),
+    ),
+))
@@ -8,6 +8,10 @@ import io
 import re
 import uuid
 from typing import Optional
+from cache_registry import cached
+from dataset_stats import frame_stats
+from dimension_encoding import arrow_safe_categorical
+from utils_scorecard.scorecard_engine import PILLARS, scorecard_table
 
 # ─────────────────────────────────────────────────────────────
 # Mesiniaga palettes / theme
@@ -51,7 +55,7 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
       - Lists/dicts/tuples in cells -> string
       - Pandas nullable Int64 -> float64 (preserve NaN)
       - datetimes -> naive datetime64[ns]
-      - categoricals -> string
+      - categoricals kept dictionary-encoded (labels as strings)
     """
     out = df.copy()
     for col in out.columns:
@@ -70,8 +74,8 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
             out[col] = s.astype("float64")
         elif pd.api.types.is_datetime64_any_dtype(s):
             out[col] = pd.to_datetime(s, errors="coerce").dt.tz_localize(None)
-        elif pd.api.types.is_categorical_dtype(s):
-            out[col] = s.astype("string")
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = arrow_safe_categorical(s)
     return out
 
 
@@ -176,7 +180,7 @@ def _smooth_7(gdf, xcol, ycols):
     return out
 
 
-@st.cache_data(show_spinner=False)
+@cached
 def _prep_scorecard_base(df: Optional[pd.DataFrame]) -> pd.DataFrame:
     """
     Light prep for scorecard dashboard. Safe for None / non-DF / empty.
@@ -227,16 +231,17 @@ def dashboard_scorecard(df: Optional[pd.DataFrame]):
 
     # ---------------- Sidebar controls ----------------
     date_col = _first_present(df, "report_date_parsed", "created_date", "report_date")
+    stats = frame_stats(df, "dashboard_scorecard")  # filter options / date span from the catalog, not a scan per rerun
 
     with st.sidebar:
         st.markdown("### 🔎 Filters")
 
         # Date range widget (safe)
-        if date_col and date_col in df.columns and not pd.Series(df[date_col]).dropna().empty:
-            _cd = pd.to_datetime(df[date_col], errors="coerce").dropna()
-            if not _cd.empty:
-                min_d = _cd.min().date()
-                max_d = _cd.max().date()
+        if date_col and date_col in df.columns and stats.nulls(date_col) < len(df):
+            _bounds = stats.date_bounds(date_col)
+            if _bounds:
+                min_d = _bounds[0].date()
+                max_d = _bounds[1].date()
                 date_range = st.date_input(
                     "Date range",
                     value=(min_d, max_d),
@@ -250,7 +255,7 @@ def dashboard_scorecard(df: Optional[pd.DataFrame]):
             date_range = None
 
         def _opt(col):
-            return sorted([v for v in df[col].dropna().astype(str).unique()]) if col in df.columns else []
+            return stats.options(col)
 
         dept = st.multiselect("Department", _opt("department"), key="score_flt_dept")
         pri = st.multiselect("Priority", _opt("priority") or _opt("Priority"), key="score_flt_pri")
@@ -280,9 +285,9 @@ def dashboard_scorecard(df: Optional[pd.DataFrame]):
     if clear:
         dept = pri = tech = cat = rstat = []
         if date_col and date_col in df_filtered.columns:
-            _cd = pd.to_datetime(df_filtered[date_col], errors="coerce").dropna()
-            if not _cd.empty:
-                date_range = (_cd.min().date(), _cd.max().date())
+            _bounds = stats.date_bounds(date_col)
+            if _bounds:
+                date_range = (_bounds[0].date(), _bounds[1].date())
             else:
                 date_range = None
 
@@ -319,7 +324,15 @@ def dashboard_scorecard(df: Optional[pd.DataFrame]):
         df_filtered["report_date_only"] = df_filtered["report_date_parsed"].dt.date
         df_filtered["report_month"] = df_filtered["report_date_parsed"].dt.to_period("M").astype(str)
 
-    # 3) KPI derivations
+    # 3) KPI derivations (pillar means / totals come from the shared scorecard table)
+    table = scorecard_table(df_filtered, key=("dashboard", date_range, tuple(dept), tuple(pri), tuple(tech),
+                                              tuple(cat), tuple(rstat)))
+    tot = table.totals()
+
+    def _kpi(key):
+        v = tot.get(key)
+        return None if v is None or pd.isna(v) else float(v)
+
     total_opened = None
     total_closed = None
     avg_uptime = None
@@ -331,19 +344,13 @@ def dashboard_scorecard(df: Optional[pd.DataFrame]):
         total_opened = int(daily_open["ticket_count"].sum()) if not daily_open.empty else 0
 
     if "incident_count" in df_filtered.columns:
-        total_opened = int(pd.to_numeric(df_filtered["incident_count"], errors="coerce").fillna(0).sum())
+        total_opened = int(_kpi("incident_count") or 0)
 
     if "changes_successful" in df_filtered.columns:
-        total_closed = int(pd.to_numeric(df_filtered["changes_successful"], errors="coerce").fillna(0).sum())
+        total_closed = int(_kpi("changes_successful") or 0)
 
     # Uptime
-    uptime_source = "uptime_percent" if "uptime_percent" in df_filtered.columns else None
-    if not uptime_source:
-        cand = [c for c in df_filtered.columns if ("uptime" in c or "availability" in c)]
-        if cand:
-            uptime_source = cand[0]
-    if uptime_source and uptime_source in df_filtered.columns:
-        avg_uptime = float(pd.to_numeric(df_filtered[uptime_source], errors="coerce").dropna().mean()) if len(df_filtered) else None
+    avg_uptime = _kpi("uptime_percent")
 
     # SLA normalize
     if "sla_rr_norm" not in df_filtered.columns and "sla_response_resolution" in df_filtered.columns:
@@ -365,39 +372,19 @@ def dashboard_scorecard(df: Optional[pd.DataFrame]):
         sla_rr_not = int(vc.get("Not Met", 0))
 
     # Extended KPIs
-    avg_csat = float(pd.to_numeric(df_filtered["customer_satisfaction"], errors="coerce").dropna().mean()) \
-        if "customer_satisfaction" in df_filtered.columns else None
-    avg_nps = float(pd.to_numeric(df_filtered["nps_score"], errors="coerce").dropna().mean()) \
-        if "nps_score" in df_filtered.columns else None
-    avg_resp_mins = float(pd.to_numeric(df_filtered["avg_response_time_mins"], errors="coerce").dropna().mean()) \
-        if "avg_response_time_mins" in df_filtered.columns else None
-    avg_resolution_mins = float(pd.to_numeric(df_filtered["avg_resolution_time_mins"], errors="coerce").dropna().mean()) \
-        if "avg_resolution_time_mins" in df_filtered.columns else None
-    sd_resp_mins = float(pd.to_numeric(df_filtered["service_desk_response_time"], errors="coerce").dropna().mean()) \
-        if "service_desk_response_time" in df_filtered.columns else None
-    total_sec_incidents = int(pd.to_numeric(df_filtered["security_incidents"], errors="coerce").fillna(0).sum()) \
-        if "security_incidents" in df_filtered.columns else None
-    total_vuln_found = int(pd.to_numeric(df_filtered["vulnerabilities_found"], errors="coerce").fillna(0).sum()) \
-        if "vulnerabilities_found" in df_filtered.columns else None
-
-    # Compliance rate mean
-    avg_compliance_pct = None
-    if "compliance_rate" in df_filtered.columns:
-        avg_compliance_pct = float(pd.to_numeric(df_filtered["compliance_rate"], errors="coerce").dropna().mean())
-    elif "compliance_status" in df_filtered.columns:
-        _map = {
-            "compliant": True, "yes": True, "pass": True, "true": True, "1": True,
-            "non-compliant": False, "non compliant": False, "no": False, "fail": False, "false": False, "0": False
-        }
-        _m = df_filtered["compliance_status"].astype(str).str.strip().str.lower().map(_map)
-        if _m.notna().any():
-            avg_compliance_pct = float(_m.mean() * 100.0)
+    avg_csat = _kpi("customer_satisfaction")
+    avg_nps = _kpi("nps_score")
+    avg_resp_mins = _kpi("avg_response_time_mins")
+    avg_resolution_mins = _kpi("avg_resolution_time_mins")
+    sd_resp_mins = _kpi("service_desk_response_time")
+    total_sec_incidents = int(_kpi("security_incidents") or 0) if "security_incidents" in df_filtered.columns else None
+    total_vuln_found = int(_kpi("vulnerabilities_found") or 0) if "vulnerabilities_found" in df_filtered.columns else None
+
+    # Compliance rate mean (compliance_rate, else share of compliant statuses)
+    avg_compliance_pct = _kpi("compliance_pct")
 
     # Fleet avg util
-    util_cols = [c for c in ["cpu_utilization", "memory_utilization", "disk_utilization", "network_utilization"]
-                 if c in df_filtered.columns]
-    fleet_avg_util = float(pd.to_numeric(df_filtered[util_cols].stack(), errors="coerce").dropna().mean()) \
-        if util_cols else None
+    fleet_avg_util = _kpi("utilization")
 
     k1, k2, k3, k4 = st.columns(4)
     k1.metric("Total Tickets Opened", f"{total_opened:,}" if total_opened is not None else "—")
@@ -426,6 +413,53 @@ def dashboard_scorecard(df: Optional[pd.DataFrame]):
         st.info("No rows match the current filters. Adjust filters to see charts.")
         return df_filtered
 
+    # =========================================================
+    # Composite Scorecard (weighted pillar scores, 0–100)
+    # =========================================================
+    if _kpi("composite_score") is not None:
+        st.markdown("---")
+        st.markdown("### 🏁 Composite Scorecard")
+        s1, s2 = st.columns(2)
+        with s1:
+            dims = {"Service": "service_name", "Service Owner": "service_owner"}
+            dims = {k: v for k, v in dims.items() if v in df_filtered.columns}
+            if dims:
+                dim_label = st.radio("Score by:", list(dims), horizontal=True, key="score_composite_dim")
+                by = table.rollup(dims[dim_label]).dropna(subset=["composite_score"])
+                by = by.sort_values("composite_score", ascending=True).head(10)
+                fig = px.bar(
+                    by,
+                    x=dims[dim_label],
+                    y="composite_score",
+                    title=f"Lowest Composite Score by {dim_label} (Top 10)",
+                    hover_data=[f"{p}_score" for p in PILLARS if f"{p}_score" in by.columns],
+                    color_discrete_sequence=BLUE_TONES,
+                )
+                fig.update_yaxes(range=[0, 100])
+                _maybe_labels_bar(fig, show_labels, by["composite_score"].round(1))
+                st.plotly_chart(fig, use_container_width=True, key="score_composite_bar")
+        with s2:
+            monthly = table.rollup("month").dropna(subset=["composite_score"])
+            if not monthly.empty:
+                long = monthly.melt(
+                    id_vars="month",
+                    value_vars=["composite_score"] + [f"{p}_score" for p in PILLARS],
+                    var_name="score",
+                    value_name="value",
+                ).dropna(subset=["value"])
+                long["score"] = long["score"].str.replace("_score", "").str.title()
+                fig = px.line(
+                    long.sort_values("month"),
+                    x="month",
+                    y="value",
+                    color="score",
+                    title=f"Composite & Pillar Scores by Month (overall {tot['composite_score']:.1f})",
+                    markers=True,
+                    color_discrete_sequence=BLUE_TONES,
+                )
+                fig.update_yaxes(range=[0, 105])
+                st.plotly_chart(fig, use_container_width=True, key="score_composite_month_line")
+
     # =========================================================
     # 1) Service Overview
     # =========================================================
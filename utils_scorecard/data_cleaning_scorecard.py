@@ -3,7 +3,12 @@ import numpy as np
 import streamlit as st
 import io
 import re
-import unicodedata
+from cleaning_diff import diff_frames, paged_dataframe, profile_raw, render_diff
+from cleaning_executor import ExecutionReport
+from dimension_encoding import arrow_safe_categorical, encode_dimensions
+from schema_registry import apply_schema
+from utils_scorecard.schema import SCHEMA
+from utils_scorecard.text_cleaning import clean_placeholders, coerce_numeric_columns
 
 # --------- helpers ---------
 def to_snake(name: str) -> str:
@@ -32,8 +37,8 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
             out[col] = s.astype("float64")
         elif pd.api.types.is_datetime64_any_dtype(s):
             out[col] = pd.to_datetime(s, errors="coerce").dt.tz_localize(None)
-        elif pd.api.types.is_categorical_dtype(s):
-            out[col] = s.astype("string")
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = arrow_safe_categorical(s)
     return out
 
 def _dtype_table(df: pd.DataFrame, title: str) -> pd.DataFrame:
@@ -41,8 +46,9 @@ def _dtype_table(df: pd.DataFrame, title: str) -> pd.DataFrame:
 
 # --------- main cleaning pipeline (SCORECARD) ---------
 def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
-    # keep a RAW snapshot (exactly as uploaded)
-    raw_df_snapshot = df.copy(deep=True)
+    # keep a RAW snapshot (exactly as uploaded): a copy-on-write view, profiled once for the raw-vs-cleaned diff
+    raw_df_snapshot = df.copy(deep=False)
+    raw_profile = profile_raw(raw_df_snapshot)
 
     st.success("✅ File successfully loaded!")
 
@@ -52,28 +58,28 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
     st.subheader("🔍 Before Cleaning")
 
     col1, col2 = st.columns(2)
-    col1.metric("Rows (Raw)", raw_df_snapshot.shape[0])
-    col2.metric("Columns (Raw)", raw_df_snapshot.shape[1])
+    col1.metric("Rows (Raw)", raw_profile.rows)
+    col2.metric("Columns (Raw)", len(raw_profile.columns))
 
-    total_missing_raw = int(raw_df_snapshot.isnull().sum().sum())
+    total_missing_raw = raw_profile.total_missing
     m1, _m2 = st.columns(2)
     m1.metric("Total Missing Values (Raw)", total_missing_raw)
 
     st.markdown("**Data Types (Raw)**")
-    st.dataframe(_dtype_table(raw_df_snapshot, "Raw dtypes"), use_container_width=True)
+    st.dataframe(raw_profile.dtype_table(), use_container_width=True)
 
     col_mv, _ = st.columns([3, 1])
     with col_mv:
         st.markdown("**Missing Values by Column (Raw)**")
         st.dataframe(
-            raw_df_snapshot.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+            raw_profile.missing_table(),
             use_container_width=True
         )
 
-    dup_count_raw = int(raw_df_snapshot.duplicated().sum())
+    dup_count_raw = raw_profile.duplicates
     st.write(f"**Duplicated Rows (Raw):** {dup_count_raw}")
     if dup_count_raw > 0:
-        st.dataframe(raw_df_snapshot[raw_df_snapshot.duplicated()], use_container_width=True)
+        paged_dataframe(raw_df_snapshot.iloc[raw_profile.duplicates_index.sample()], key="scorecard_raw_dup_page")
 
     raw_datetime_cols = [c for c in raw_df_snapshot.columns if pd.api.types.is_datetime64_any_dtype(raw_df_snapshot[c])]
     st.write("**Datetime Columns Detected (Raw):** " + (", ".join(raw_datetime_cols) if raw_datetime_cols else "None"))
@@ -96,60 +102,18 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
         o, n = example_pair
         st.info(f"Column names standardized to **snake_case** (example: “{o}” → “{n}”).")
 
-    # STEP 2 — Unicode-safe placeholder cleaning
-    PLACEHOLDERS = {
-        "", "na", "n/a", "none", "null", "missing", "blank", "empty",
-        "-", "--", "---", "nan", ".", "#n/a", "#na", "?", "n\\a", "n.a",
-        "nil", "undefined", "no data"
-    }
-    def _clean_cell(x):
-        if isinstance(x, str):
-            s = unicodedata.normalize("NFKC", x)
-            s = re.sub(r"[\u200B-\u200D\uFEFF\u2060\xa0]", "", s)  # zero-widths & nbsp
-            s = s.strip()
-            if s.lower() in PLACEHOLDERS:
-                return np.nan
-            return s
-        return np.nan if pd.isna(x) else x
-    df = df.applymap(_clean_cell)
-
-    # STEP 3 — Datetime inference (controlled)
-    potential_dt_cols = [c for c in df.columns if any(k in c for k in ["date", "time", "created", "resolved", "updated", "report"])]
-    for col in potential_dt_cols:
-        if df[col].dtype == "object" and not pd.to_numeric(df[col], errors="coerce").notna().all():
-            df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-
-    # STEP 4 — Numeric columns (known scorecard metrics)
-    numeric_like = [
-        "uptime_percent", "sla_availability", "avg_response_time_mins",
-        "avg_resolution_time_mins", "service_desk_response_time"
-    ]
-    for col in numeric_like:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # STEP 5 — Generic numeric-like coercion (strip commas, spaces, %)
-    for col in df.columns:
-        if df[col].dtype == "object":
-            cleaned = df[col].astype(str).apply(lambda x: re.sub(r"[,\s%]", "", x))
-            # Only coerce if it looks numeric-ish for a decent share; else leave as object
-            coerced = pd.to_numeric(cleaned, errors="coerce")
-            if coerced.notna().mean() >= 0.6:
-                df[col] = coerced
-
-    # STEP 6 — SLA / duration columns (e.g., *_duration, *_elapsed)
-    duration_cols = [c for c in df.columns if any(k in c for k in ["duration", "elapsed"])]
-    for col in duration_cols:
-        df[col] = pd.to_timedelta(df[col], errors="coerce")
-
-    # STEP 7 — Boolean-like normalization
-    bool_cols = [c for c in df.columns if any(k in c for k in ["status", "flag", "breached", "overdue"])]
-    for col in bool_cols:
-        df[col] = df[col].astype(str).str.strip().str.lower().map({
-            "true": True, "false": False, "yes": True, "no": False, "1": True, "0": False
-        })
-
-    # STEP 8 — Derived columns (month, resolution_hours)
+    # STEP 2 — Unicode-safe placeholder cleaning (each distinct string normalised once per column)
+    timings = ExecutionReport()   # per-column timings of the parallel steps below
+    df = clean_placeholders(df, report=timings)
+
+    # STEP 3 — Schema-typed columns (utils_scorecard/schema.py): known metrics with units, dates,
+    #          durations and boolean flags, one conversion per column; the plan is cached per layout
+    df, plan = apply_schema(SCHEMA.domain, df, report=timings)
+
+    # STEP 4 — Generic numeric-like coercion (strip commas, spaces, %); only if >= 60% of rows parse
+    df = coerce_numeric_columns(df, report=timings)
+
+    # STEP 5 — Derived columns (month, resolution_hours)
     if "created_time" in df.columns:
         df["month"] = pd.to_datetime(df["created_time"], errors="coerce").dt.to_period("M")
     elif "report_date" in df.columns:
@@ -160,7 +124,7 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
         rt = pd.to_datetime(df["resolved_time"], errors="coerce")
         df["resolution_hours"] = (rt - ct).dt.total_seconds() / 3600
 
-    # STEP 9 — Asset type hint
+    # STEP 6 — Asset type hint
     if any("software" in c for c in df.columns):
         df["asset_type"] = "Software"
     elif any("hardware" in c for c in df.columns):
@@ -168,7 +132,7 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
     else:
         df["asset_type"] = "Unspecified"
 
-    # STEP 10 — Preserve key scorecard fields; drop >50% missing otherwise
+    # STEP 7 — Preserve key scorecard fields; drop >50% missing otherwise
     critical_cols = [
         "sla_change_adherence", "sla_response_resolution", "sla_availability",
         "compliance_status", "report_date", "uptime_percent",
@@ -180,16 +144,19 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
     dropped_cols = missing_ratio.index[~keep_mask].tolist()
     df = df.loc[:, keep_mask]
 
-    # STEP 11 — Fill key categoricals
+    # STEP 8 — Fill key categoricals
     for col in ["compliance_status", "service_owner", "service_category"]:
         if col in df.columns:
             df[col] = df[col].fillna("Unknown")
 
-    # STEP 12 — Data-completeness flags for numeric SLAs
+    # STEP 9 — Data-completeness flags for numeric SLAs
     for col in ["sla_availability", "uptime_percent", "avg_response_time_mins", "avg_resolution_time_mins"]:
         if col in df.columns:
             df[f"{col}_data_available"] = np.where(df[col].notna(), "Available", "Missing")
 
+    # Dimension columns -> categoricals (int codes + one copy of each label) for every downstream groupby/filter
+    df = encode_dimensions(df, report=timings)
+
     # ==============================
     # ii. AFTER CLEANING
     # ==============================
@@ -199,7 +166,8 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
     ac1.metric("Rows (Cleaned)", df.shape[0])
     ac2.metric("Columns (Cleaned)", df.shape[1])
 
-    total_missing_clean = int(df.isnull().sum().sum())
+    diff = diff_frames(raw_profile, df, col_map)
+    total_missing_clean = int(diff.missing_table()["Missing"].sum())
     cm1, _cm2 = st.columns(2)
     cm1.metric("Total Missing Values (Cleaned)", total_missing_clean)
 
@@ -208,7 +176,7 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
 
     st.markdown("**Missing Values by Column (Cleaned)**")
     st.dataframe(
-        df.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+        diff.missing_table(),
         use_container_width=True
     )
 
@@ -217,6 +185,11 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
     cleaned_datetime_cols = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
     st.write("**Datetime Columns Detected (Cleaned):** " + (", ".join(cleaned_datetime_cols) if cleaned_datetime_cols else "None"))
 
+    with st.expander("🧭 Cleaning Plan (schema)"):
+        st.dataframe(plan.summary(), use_container_width=True)
+        st.caption(f"⏱️ {timings.summary()}")
+        st.dataframe(timings.table(), use_container_width=True)
+
     st.markdown("**Sample Cleaned Data:**")
     st.dataframe(df.head(), use_container_width=True)
 
@@ -225,20 +198,7 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
     # ==============================
     st.subheader("🔍 Compare Raw Data vs Cleaned Data")
 
-    dtypes_raw = _dtype_table(raw_df_snapshot, "Raw dtypes")
-    dtypes_clean = _dtype_table(df, "Cleaned dtypes")
-
-    dtypes_raw["Column (standardized)"] = dtypes_raw["Column"].map(col_map)
-    dtypes_clean = dtypes_clean.rename(columns={"Column": "Column (standardized)"})
-
-    dtype_compare = dtypes_raw.merge(dtypes_clean, on="Column (standardized)", how="outer")
-    dtype_compare = dtype_compare.rename(columns={"Column": "Raw Column"})
-    dropped_mask = dtype_compare["Cleaned dtypes"].isna() & dtype_compare["Raw dtypes"].notna()
-    dtype_compare.loc[dropped_mask, "Cleaned dtypes"] = "dropped"
-    dtype_compare = dtype_compare[["Raw Column", "Column (standardized)", "Raw dtypes", "Cleaned dtypes"]].fillna("—")
-
-    st.markdown("**Data Types (Aligned by Standardized Name)**")
-    st.dataframe(dtype_compare, use_container_width=True)
+    render_diff(diff)
 
     st.markdown("**Sample – Raw Data**")
     st.dataframe(raw_df_snapshot.head(), use_container_width=True)
@@ -277,10 +237,10 @@ def data_cleaning_scorecard(df: pd.DataFrame, uploaded_file):
         view_option = st.radio("Select which data to view:", ("Raw Data", "Cleaned Data"), horizontal=True)
         if view_option == "Raw Data":
             st.markdown("### 🗃️ Raw Data (Full Table)")
-            st.dataframe(arrow_sanitize_df(raw_df_snapshot), use_container_width=True)
+            paged_dataframe(raw_df_snapshot, key="scorecard_raw_page", transform=arrow_sanitize_df)
         else:
             st.markdown("### 🧼 Cleaned Data (Full Table)")
-            st.dataframe(arrow_sanitize_df(df), use_container_width=True)
+            paged_dataframe(df, key="scorecard_clean_page", transform=arrow_sanitize_df)
 
     st.success("✅ Data fully cleaned and ready for scorecard analytics.")
     return df
@@ -2,6 +2,8 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 
+from utils_scorecard.scorecard_engine import monthly
+
 # ---------- Mesiniaga palette ----------
 MES_BLUE = ["#004C99", "#007ACC", "#3399FF", "#66B2FF", "#9BD1FF"]
 
@@ -35,10 +37,7 @@ def change_management(df_filtered):
     # ---------------------- 5(a) Successful Changes Implemented ----------------------
     with st.expander("📌 Number of Successful Changes Implemented"):
         if {"changes_successful","report_month"} <= set(df_filtered.columns):
-            cm = (
-                df_filtered.groupby("report_month")["changes_successful"]
-                .sum().reset_index().sort_values("report_month")
-            )
+            cm = monthly(df_filtered, ["changes_successful"])
 
             fig = px.bar(
                 cm, x="report_month", y="changes_successful",
@@ -111,10 +110,7 @@ def change_management(df_filtered):
     # ---------------------- 5(b) Emergency Changes ----------------------
     with st.expander("📌 Number of Emergency Changes"):
         if {"changes_emergency","report_month"} <= set(df_filtered.columns):
-            em = (
-                df_filtered.groupby("report_month")["changes_emergency"]
-                .sum().reset_index().sort_values("report_month")
-            )
+            em = monthly(df_filtered, ["changes_emergency"])
             fig = px.line(
                 em, x="report_month", y="changes_emergency", markers=True,
                 title="Emergency Changes per Month",
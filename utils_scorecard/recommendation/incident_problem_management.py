@@ -2,6 +2,8 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 
+from utils_scorecard.scorecard_engine import monthly
+
 # ---------- Mesiniaga palette helpers ----------
 MES_BLUE = ["#004C99", "#007ACC", "#3399FF", "#66B2FF", "#9BD1FF"]
 
@@ -35,13 +37,7 @@ def incident_problem_management(df_filtered):
     # ---------------------- 4(a) Incident and Problem Trends ----------------------
     with st.expander("📌 Incident & Problem Trends Over Time"):
         if {"incident_count","problem_count","report_month"} <= set(df_filtered.columns):
-            tr = (
-                df_filtered
-                .groupby("report_month")[["incident_count","problem_count"]]
-                .sum()
-                .reset_index()
-                .sort_values("report_month")
-            )
+            tr = monthly(df_filtered, ["incident_count", "problem_count"])
 
             fig = px.line(
                 tr, x="report_month", y=["incident_count","problem_count"],
@@ -5,6 +5,8 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 
+from utils_scorecard.scorecard_engine import monthly
+
 # ========== Mesiniaga Theme ==========
 MES_BLUE = ["#004C99", "#007ACC", "#3399FF", "#66B2FF", "#9BD1FF"]
 
@@ -68,12 +70,7 @@ def service_availability(df_filtered: pd.DataFrame):
             st.warning("⚠️ No valid uptime data found after cleaning.")
             st.stop()
 
-        ts = (
-            df_clean.groupby("report_month")["uptime_percent"]
-            .mean()
-            .reset_index()
-            .sort_values("report_month")
-        )
+        ts = monthly(df_filtered, ["uptime_percent"]).dropna(subset=["uptime_percent"])
 
         # Step 4: Chart
         fig = px.line(
@@ -198,13 +195,7 @@ def service_availability(df_filtered: pd.DataFrame):
             # ---- LOCALIZED UPTIME SUMMARY FOR THIS BLOCK (prevents UnboundLocalError) ----
             avg, rng = np.nan, np.nan
             if {"report_month", "uptime_percent"} <= set(df_filtered.columns):
-                ts_u = (
-                    df_filtered.dropna(subset=["uptime_percent"])
-                    .groupby("report_month")["uptime_percent"]
-                    .mean()
-                    .reset_index()
-                    .sort_values("report_month")
-                )
+                ts_u = monthly(df_filtered, ["uptime_percent"]).dropna(subset=["uptime_percent"])
                 if not ts_u.empty:
                     avg = float(ts_u["uptime_percent"].mean())
                     rng = float(ts_u["uptime_percent"].max() - ts_u["uptime_percent"].min())
@@ -249,8 +240,7 @@ def service_availability(df_filtered: pd.DataFrame):
     # ---------------------- 2(c) Historical Availability Trends ----------------------
     with st.expander("📌 Historical Availability Trends"):
         if {"report_month", "uptime_percent"} <= set(df_filtered.columns):
-            ts = df_filtered.groupby("report_month")["uptime_percent"].mean().reset_index()
-            ts = ts.sort_values("report_month")
+            ts = monthly(df_filtered, ["uptime_percent"]).dropna(subset=["uptime_percent"])
             fig = px.area(
                 ts, x="report_month", y="uptime_percent",
                 title="Historical Availability Trend (Mean Uptime%)",
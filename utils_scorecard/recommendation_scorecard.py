@@ -12,6 +12,7 @@ from utils_scorecard.recommendation.change_management import change_management
 from utils_scorecard.recommendation.service_desk_performance import service_desk_performance
 from utils_scorecard.recommendation.security_metrics import security_metrics
 from utils_scorecard.recommendation.capacity_scalability import capacity_scalability
+from utils_scorecard.scorecard_engine import score_summary, scorecard_table
 
 
 def recommendation_scorecard(df):
@@ -36,14 +37,17 @@ def recommendation_scorecard(df):
 
         if reset_filter:
             df_filtered = df.copy()
+            table_key = ("recommendation", None, None)
             st.info("Showing all available data (no date filter applied).")
         elif start_date > end_date:
             st.warning("⚠️ Start date is after end date. Please select a valid range.")
             return
         else:
             df_filtered = df[(df['created_date'] >= start_date) & (df['created_date'] <= end_date)]
+            table_key = ("recommendation", start_date, end_date)
     else:
         df_filtered = df.copy()
+        table_key = ("recommendation", None, None)
 
     st.markdown("---")
 
@@ -84,6 +88,29 @@ def recommendation_scorecard(df):
         col5.metric("Departments Involved", df_filtered["department"].nunique())
     else:
         col5.metric("Departments Involved", "N/A")
+
+    # Composite scorecard (shared scorecard table)
+    summary = score_summary(scorecard_table(df_filtered, key=table_key))
+    col6, col7, col8, col9 = st.columns(4)
+    col6.metric("Composite Score", f"{summary['composite_score']:.1f}" if summary["composite_score"] is not None else "N/A")
+    col7.metric(
+        "Weakest Pillar",
+        summary["weakest_pillar"].title() if summary["weakest_pillar"] else "N/A",
+        f"{summary['weakest_pillar_score']:.1f}" if summary["weakest_pillar"] else None,
+        delta_color="off",
+    )
+    col8.metric(
+        "Lowest-Scoring Service",
+        summary["lowest_service_name"] or "N/A",
+        f"{summary['lowest_service_name_score']:.1f}" if summary["lowest_service_name"] else None,
+        delta_color="off",
+    )
+    col9.metric(
+        "Lowest-Scoring Owner",
+        summary["lowest_service_owner"] or "N/A",
+        f"{summary['lowest_service_owner_score']:.1f}" if summary["lowest_service_owner"] else None,
+        delta_color="off",
+    )
 #--------------------------------------------------------------------------------------------------------------------------
 
     # 📊 SERVICE OVERVIEW ANALYSIS
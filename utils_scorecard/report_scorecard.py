@@ -54,6 +54,8 @@ from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle, Paragraph
 from reportlab.lib.styles import getSampleStyleSheet
+from cow_context import shared_view
+from utils_scorecard.scorecard_engine import PILLARS, score_summary, scorecard_table
 
 # DOCX (optional)
 try:
@@ -196,6 +198,7 @@ def _compute_overview_kpis(df: pd.DataFrame) -> Dict[str, Any]:
       - Open Tickets (Backlog)
       - Avg Resolution Time (hrs)  [derived from service_availability field as per UI]
       - Departments Involved
+      - Composite Service Score / Weakest Pillar  [shared scorecard table]
     """
     total_tickets = int(len(df))
 
@@ -207,6 +210,8 @@ def _compute_overview_kpis(df: pd.DataFrame) -> Dict[str, Any]:
         closed_count = int(closed_mask.sum())
         open_count = int(total_tickets - closed_count)
 
+    summary = score_summary(scorecard_table(df))
+
     avg_res_str = "N/A"
     if "service_availability" in df.columns and not df["service_availability"].dropna().empty:
         vals = pd.to_numeric(df["service_availability"], errors="coerce")
@@ -226,8 +231,26 @@ def _compute_overview_kpis(df: pd.DataFrame) -> Dict[str, Any]:
         "Open Tickets (Backlog)": (int(open_count) if open_count is not None else "N/A"),
         "Avg Resolution Time (hrs)": avg_res_str,
         "Departments Involved": dept_val,
+        "Composite Service Score": (f"{summary['composite_score']:.1f}" if summary["composite_score"] is not None else "N/A"),
+        "Weakest Pillar": (summary["weakest_pillar"].title() if summary["weakest_pillar"] else "N/A"),
     }
 
+
+def _scorecard_appendix(table, by: str) -> pd.DataFrame:
+    """Pillar and composite scores per `by` value from the scorecard table, formatted for the report."""
+    t = table.rollup(by).dropna(subset=["composite_score"])
+    if t.empty:
+        return pd.DataFrame()
+    t = t.sort_values(by if by == "month" else "composite_score")
+    cols = {by: by.replace("_", " ").title(), "rows": "Records"}
+    cols.update({f"{p}_score": p.title() for p in PILLARS if t[f"{p}_score"].notna().any()})
+    cols["composite_score"] = "Composite"
+    out = t[list(cols)].rename(columns=cols)
+    for c in list(cols.values())[2:]:
+        out[c] = out[c].map(lambda v: "—" if pd.isna(v) else f"{v:.1f}")
+    out["Records"] = out["Records"].astype(int)
+    return out.reset_index(drop=True)
+
 def _build_kpi_figure(kpis: Dict[str, Any]) -> "go.Figure":
     """Optional KPI figure (currently not embedded, but kept for extension)."""
     titles = [
@@ -825,7 +848,7 @@ def _capture_module(mod, fn_name: str, df: pd.DataFrame, section_title: str) ->
     try:
         setattr(mod, 'st', STShim())
         setattr(mod, 'render_cio_tables', capture_cio)
-        getattr(mod, fn_name)(df.copy())
+        getattr(mod, fn_name)(shared_view(df))
     finally:
         if orig_st is not None:
             setattr(mod, 'st', orig_st)
@@ -892,6 +915,14 @@ def report_scorecard(
         monthly["month"] = monthly["created_time"].astype(str)
         appendices["Monthly Ticket Volume (table)"] = monthly[["month", "tickets"]]
 
+    table = scorecard_table(df)
+    for by, name in (("service_name", "Scorecard by Service (table)"),
+                     ("service_owner", "Scorecard by Service Owner (table)"),
+                     ("month", "Scorecard by Month (table)")):
+        scored = _scorecard_appendix(table, by)
+        if not scored.empty:
+            appendices[name] = scored
+
     model = ReportModel(
         title=title,
         client_name=client_name,
@@ -0,0 +1,29 @@
+# utils_scorecard/schema.py
+import numpy as np
+
+from schema_registry import ColumnSpec, DomainSchema, TokenRule, register
+
+# Service scorecard exports: known metrics are declared; other columns are typed by name tokens.
+# Dates are only parsed from text columns that are not plain numbers (Excel serials stay numeric).
+_DATE = dict(dayfirst=True, text_only=True)
+_FLAG = dict(true_values=frozenset({"true", "yes", "1"}), false_values=frozenset({"false", "no", "0"}), na=np.nan)
+
+SCHEMA = register(DomainSchema(
+    domain="scorecard",
+    columns=(
+        ColumnSpec("report_date", "datetime", **_DATE),
+        ColumnSpec("created_time", "datetime", **_DATE),
+        ColumnSpec("resolved_time", "datetime", **_DATE),
+        ColumnSpec("uptime_percent", "numeric", unit="percent"),
+        ColumnSpec("sla_availability", "numeric", unit="percent"),
+        ColumnSpec("avg_response_time_mins", "numeric", unit="minutes"),
+        ColumnSpec("avg_resolution_time_mins", "numeric", unit="minutes"),
+        ColumnSpec("service_desk_response_time", "numeric", unit="minutes"),
+        ColumnSpec("compliance_status", "text"),
+    ),
+    rules=(
+        TokenRule(("status", "flag", "breached", "overdue"), ColumnSpec(dtype="bool", **_FLAG)),
+        TokenRule(("duration", "elapsed"), ColumnSpec(dtype="timedelta")),
+        TokenRule(("date", "time", "created", "resolved", "updated", "report"), ColumnSpec(dtype="datetime", **_DATE)),
+    ),
+))
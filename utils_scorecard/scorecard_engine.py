@@ -0,0 +1,359 @@
+# utils_scorecard/scorecard_engine.py
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import pandas as pd
+import numpy as np
+
+from cache_registry import cached, current_scope, fingerprint, session_store
+
+# ─────────────────────────────────────────────────────────────
+# Scorecard KPI rollup
+# One grouped pass over the scorecard frame produces a compact table with one
+# cell per (service_name, service_owner, month) holding only mergeable numbers:
+# sums for counts and (sum, n) pairs for means. Any rollup — per service,
+# per owner, per month, or the whole period — is a re-sum of cells, and the
+# pillar scores plus the weighted composite are computed on the rollup.
+#
+# Pillars (each 0–100, higher is better):
+#   availability  mean uptime %
+#   response      100 × min(1, target / mean response mins)
+#   resolution    100 × min(1, target / mean resolution mins)
+#   change        successful / (successful + emergency) changes × 100
+#   security      mean of compliance % and 100 × (1 − security events per record), floored at 0
+#   capacity      100 while mean utilization ≤ target, falling linearly to 0 at 100 %
+# The composite is the weighted mean of the pillars a rollup has data for.
+#
+# Tables are kept per dataset in session state, keyed by the source columns'
+# fingerprint (a fixed row sample on large frames, as cached engines key their
+# frames). When a frame arrives whose leading rows match a table already
+# stored (a month appended to the upload), only the new rows are grouped and
+# their cells added to the stored ones. Repeat calls on the same frame within
+# a run (one per chart) return the table without fingerprinting again, and a
+# caller that passes its filter state as `key` gets the table from the cache
+# registry by (dataset, version, key) without touching the frame's values.
+# ─────────────────────────────────────────────────────────────
+KEYS = ("service_name", "service_owner", "month")
+PILLARS = ("availability", "response", "resolution", "change", "security", "capacity")
+DEFAULT_WEIGHTS = {
+    "availability": 0.25,
+    "response": 0.15,
+    "resolution": 0.15,
+    "change": 0.15,
+    "security": 0.15,
+    "capacity": 0.15,
+}
+TARGETS = {
+    "response_mins": 30.0,       # mean response at or under this scores 100
+    "resolution_mins": 480.0,    # mean resolution at or under this scores 100
+    "capacity_pct": 70.0,        # mean utilization at or under this scores 100
+}
+MEANS = {                        # output column -> source column candidates (first present wins)
+    "uptime_percent": ("uptime_percent",),
+    "avg_response_time_mins": ("avg_response_time_mins",),
+    "avg_resolution_time_mins": ("avg_resolution_time_mins",),
+    "service_desk_response_time": ("service_desk_response_time",),
+    "customer_satisfaction": ("customer_satisfaction",),
+    "nps_score": ("nps_score",),
+}
+SUMS = ("incident_count", "problem_count", "changes_successful", "changes_emergency",
+        "security_incidents", "vulnerabilities_found")
+UTILIZATION = ("cpu_utilization", "memory_utilization", "disk_utilization", "network_utilization")
+DATE_COLUMNS = ("report_date", "report_date_parsed", "created_time", "created_date")
+
+_COMPLIANT = {
+    "compliant": 1.0, "yes": 1.0, "pass": 1.0, "true": 1.0, "1": 1.0,
+    "non-compliant": 0.0, "non compliant": 0.0, "no": 0.0, "fail": 0.0, "false": 0.0, "0": 0.0,
+}
+_SLA = {"met": 1.0, "met.": 1.0, "not met": 0.0, "not_met": 0.0, "not-met": 0.0, "notmet": 0.0}
+
+_STORE = "scorecard_tables"
+_MAX_TABLES = 8
+_RECENT_FRAMES = 8
+
+_recent: "OrderedDict[int, tuple]" = OrderedDict()   # id(frame) -> (weakref to frame, rows, used, table)
+_recent_lock = threading.Lock()
+
+
+def _num(s: pd.Series) -> np.ndarray:
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _tokens(s: pd.Series, mapping: dict) -> np.ndarray:
+    """Map labels through `mapping` once per distinct value (unmapped / missing -> NaN)."""
+    codes, uniques = pd.factorize(s)
+    values = np.array([mapping.get(str(u).strip().lower(), np.nan) for u in uniques] + [np.nan])
+    return values[codes]
+
+
+def uptime_column(df: pd.DataFrame):
+    """uptime_percent, else the first uptime/availability column (as the dashboard and modules pick it)."""
+    if "uptime_percent" in df.columns:
+        return "uptime_percent"
+    return next((c for c in df.columns if "uptime" in c or "availability" in c), None)
+
+
+def _date_column(df: pd.DataFrame):
+    return next((c for c in DATE_COLUMNS if c in df.columns), None)
+
+
+def _month_codes(df: pd.DataFrame):
+    """(codes, labels): months since year 0 per row (-1 without a date) and "YYYY-MM" per code."""
+    col = _date_column(df)
+    if col is None:
+        return np.full(len(df), -1), {}
+    month = pd.to_datetime(df[col], errors="coerce").to_numpy().astype("datetime64[M]")
+    codes = np.where(np.isnat(month), -1, month.astype("int64") + 1970 * 12)
+    return codes, {c: f"{c // 12:04d}-{c % 12 + 1:02d}" for c in np.unique(codes[codes >= 0])}
+
+
+def _measures(df: pd.DataFrame) -> dict:
+    """Per-row mergeable columns: sums, (sum, n) pairs for means, SLA / compliance hits."""
+    m = {"rows": np.ones(len(df))}
+
+    def mean_pair(name, values):
+        seen = ~np.isnan(values)
+        m[f"{name}__sum"] = np.where(seen, values, 0.0)
+        m[f"{name}__n"] = seen.astype("float64")
+
+    up = uptime_column(df)
+    for name, candidates in MEANS.items():
+        col = up if name == "uptime_percent" else next((c for c in candidates if c in df.columns), None)
+        if col is not None:
+            mean_pair(name, _num(df[col]))
+    for col in SUMS:
+        if col in df.columns:
+            m[col] = np.nan_to_num(_num(df[col]))
+
+    if "compliance_rate" in df.columns:
+        mean_pair("compliance_pct", _num(df["compliance_rate"]))
+    elif "compliance_status" in df.columns:
+        mean_pair("compliance_pct", _tokens(df["compliance_status"], _COMPLIANT) * 100.0)
+    for name, col in (("sla_rr_met", "sla_response_resolution"), ("sla_change_met", "sla_change_adherence")):
+        if col in df.columns:
+            mean_pair(name, _tokens(df[col], _SLA))
+
+    util = [c for c in UTILIZATION if c in df.columns]
+    if util:
+        block = np.column_stack([_num(df[c]) for c in util])
+        seen = ~np.isnan(block)
+        m["utilization__sum"] = np.where(seen, block, 0.0).sum(axis=1)
+        m["utilization__n"] = seen.sum(axis=1).astype("float64")
+    return m
+
+
+def _cells(df: pd.DataFrame) -> pd.DataFrame:
+    """Group `df` into (service_name, service_owner, month) cells with bincount."""
+    keys = {col: pd.factorize(df[col]) for col in KEYS[:2] if col in df.columns}
+    month, month_labels = _month_codes(df)
+    cell = np.zeros(len(df), dtype="int64")
+    for codes in [codes for codes, _ in keys.values()] + [month]:
+        cell = cell * (int(codes.max(initial=-1)) + 2) + (codes + 1)
+    cell_ids, inverse = np.unique(cell, return_inverse=True)
+
+    first = np.zeros(len(cell_ids), dtype="int64")
+    first[inverse[::-1]] = np.arange(len(df))[::-1]          # a representative row per cell
+    out = {}
+    for col, (codes, uniques) in keys.items():
+        c = codes[first]
+        out[col] = pd.Series(np.asarray(uniques, dtype=object)[c], dtype=object).astype(str).where(c >= 0)
+    out["month"] = pd.Series([month_labels.get(c) for c in month[first]], dtype=object)
+    for name, values in _measures(df).items():
+        out[name] = np.bincount(inverse, weights=values, minlength=len(cell_ids))
+    return pd.DataFrame(out)
+
+
+def _merge(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Cells of `a` plus cells of `b` (same key -> measures added)."""
+    keys = [k for k in KEYS if k in a.columns]
+    both = pd.concat([a, b], ignore_index=True)
+    return both.groupby(keys, as_index=False, sort=False, dropna=False).sum()
+
+
+def _target_score(mean: pd.Series, target: float) -> pd.Series:
+    """100 at or under `target`, 100 × target / mean above it (NaN without data)."""
+    return (100 * target / mean.where(mean > target, target)).where(mean.notna())
+
+
+def _scores(t: pd.DataFrame, weights: dict) -> pd.DataFrame:
+    """Means from (sum, n) pairs, then pillar scores and the weighted composite."""
+    pairs = [c[:-5] for c in t.columns if c.endswith("__sum")]
+    out = t.drop(columns=[f"{c}{p}" for c in pairs for p in ("__sum", "__n")])
+    for c in pairs:
+        out[c] = t[f"{c}__sum"] / t[f"{c}__n"].where(t[f"{c}__n"] > 0)
+
+    nan = pd.Series(np.nan, index=out.index)
+    col = lambda name: out[name] if name in out.columns else nan   # noqa: E731
+    pillars = pd.DataFrame(index=out.index)
+    pillars["availability"] = col("uptime_percent").clip(0, 100)
+    response = col("avg_response_time_mins") if "avg_response_time_mins" in out.columns else col("service_desk_response_time")
+    pillars["response"] = _target_score(response, TARGETS["response_mins"])
+    pillars["resolution"] = _target_score(col("avg_resolution_time_mins"), TARGETS["resolution_mins"])
+    changes = col("changes_successful") + col("changes_emergency")
+    pillars["change"] = 100 * col("changes_successful") / changes.where(changes > 0)
+
+    security = [col("compliance_pct").clip(0, 100)]
+    if {"security_incidents", "vulnerabilities_found"} & set(out.columns):
+        events = out.reindex(columns=["security_incidents", "vulnerabilities_found"]).fillna(0).sum(axis=1)
+        security.append((100 * (1 - events / out["rows"])).clip(lower=0))
+    pillars["security"] = pd.concat(security, axis=1).mean(axis=1)
+    pillars["capacity"] = (100 * (100 - col("utilization")) / (100 - TARGETS["capacity_pct"])).clip(0, 100)
+
+    w = pd.Series({p: float(weights.get(p, 0.0)) for p in PILLARS})
+    present = pillars[list(PILLARS)].notna()
+    weight_sum = present.mul(w, axis=1).sum(axis=1)
+    composite = pillars[list(PILLARS)].fillna(0).mul(w, axis=1).sum(axis=1) / weight_sum.where(weight_sum > 0)
+    return pd.concat([out, pillars.add_suffix("_score"), composite.rename("composite_score")], axis=1)
+
+
+@dataclass
+class ScorecardTable:
+    """
+    Mergeable scorecard cells for one dataset.
+      - cells: one row per (service_name, service_owner, month) with rows, the SUMS columns and
+               <mean>__sum / <mean>__n pairs (uptime_percent, response/resolution mins, compliance_pct,
+               sla_rr_met, sla_change_met, utilization, ...). month is "YYYY-MM" (NaN without a date).
+      - rows: source rows tabled; appended_rows: how many of them came in through an incremental append
+    """
+    cells: pd.DataFrame
+    rows: int = 0
+    appended_rows: int = 0
+    _rollups: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def empty(self) -> bool:
+        return self.cells.empty
+
+    def rollup(self, by=("service_name",), weights=None, dropna=True) -> pd.DataFrame:
+        """
+        Per-`by` table (any of service_name, service_owner, month; () for one total row) with the
+        summed counts, the means under their source names, the six <pillar>_score columns and
+        composite_score.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        memo = (tuple(by), tuple(sorted(weights.items())), dropna)
+        if memo not in self._rollups:
+            c = self.cells
+            values = [col for col in c.columns if col not in KEYS]
+            if any(b not in c.columns for b in by):
+                t = c.iloc[0:0][values]                  # dimension not in this dataset
+            elif not by:
+                t = c[values].sum().to_frame().T
+            else:
+                if dropna:
+                    c = c.dropna(subset=by)
+                t = c.groupby(by, as_index=False, sort=True, dropna=dropna)[values].sum()
+            self._rollups[memo] = _scores(t, weights)
+        return self._rollups[memo].copy()
+
+    def totals(self, weights=None) -> dict:
+        """Whole-dataset means, sums and scores as a dict."""
+        row = self.rollup((), weights)
+        return row.iloc[0].to_dict() if not row.empty else {}
+
+
+def _used_columns(df: pd.DataFrame) -> list:
+    """Columns the table reads; helper columns the views add (report_month, ...) do not change its identity."""
+    extra = ("compliance_rate", "compliance_status", "sla_response_resolution", "sla_change_adherence",
+             uptime_column(df))
+    return [c for c in df.columns
+            if c in KEYS or c in SUMS or c in UTILIZATION or c in DATE_COLUMNS or c in MEANS or c in extra]
+
+
+def _store():
+    return session_store(_STORE, _MAX_TABLES)
+
+
+def build_table(df: pd.DataFrame) -> ScorecardTable:
+    return ScorecardTable(cells=_cells(df), rows=len(df))
+
+
+def _recall(df: pd.DataFrame, used: list):
+    with _recent_lock:
+        hit = _recent.get(id(df))
+    if hit is not None and hit[0]() is df and hit[1] == len(df) and hit[2] == used:
+        return hit[3]
+    return None
+
+
+def _remember(df: pd.DataFrame, used: list, table: ScorecardTable) -> None:
+    with _recent_lock:
+        _recent[id(df)] = (weakref.ref(df), len(df), used, table)
+        _recent.move_to_end(id(df))
+        while len(_recent) > _RECENT_FRAMES:
+            _recent.popitem(last=False)
+
+
+@cached(max_entries=_MAX_TABLES)
+def _keyed_table(_df: pd.DataFrame, used: tuple, key) -> ScorecardTable:
+    return _content_table(_df, list(used))
+
+
+def scorecard_table(df: pd.DataFrame, key=None) -> ScorecardTable:
+    """
+    Scorecard table for `df`, built once per dataset. If `df` starts with the rows of a dataset
+    already tabled this session (same source columns), only the remaining rows are grouped and merged in.
+    `key` is the caller's filter state (hashable): with a dataset active, the table is looked up by
+    (dataset, version, key) instead of by the frame's content.
+    """
+    used = _used_columns(df)
+    table = _recall(df, used)
+    if table is None and key is not None and current_scope()[0] is not None:
+        table = _keyed_table(df, tuple(used), key)
+        if table.rows != len(df):
+            table = None
+    if table is None:
+        table = _content_table(df, used)
+    _remember(df, used, table)
+    return table
+
+
+def _content_table(df: pd.DataFrame, used: list) -> ScorecardTable:
+    signature = tuple(map(str, used))
+    source = df[used]
+    token = (len(df), fingerprint(source), signature)
+    store = _store()
+    if token not in store:
+        base = max(
+            (key for key in store
+             if key[2] == signature and 0 < key[0] < len(df) and fingerprint(source.iloc[:key[0]]) == key[1]),
+            key=lambda key: key[0], default=None,
+        )
+        if base is None:
+            table = build_table(df)
+        else:
+            old = store[base]
+            table = ScorecardTable(cells=_merge(old.cells, _cells(df.iloc[base[0]:])), rows=len(df),
+                                   appended_rows=old.appended_rows + len(df) - base[0])
+        store[token] = table
+    return store[token]
+
+
+def score_summary(table: ScorecardTable, weights=None) -> dict:
+    """Headline scores: composite, weakest pillar, and the lowest-scoring service / owner (None where absent)."""
+    tot = table.totals(weights)
+    composite = tot.get("composite_score")
+    pillars = {p: tot.get(f"{p}_score") for p in PILLARS}
+    pillars = {p: v for p, v in pillars.items() if v is not None and not pd.isna(v)}
+    out = {
+        "composite_score": None if composite is None or pd.isna(composite) else float(composite),
+        "weakest_pillar": min(pillars, key=pillars.get) if pillars else None,
+        "weakest_pillar_score": min(pillars.values()) if pillars else None,
+    }
+    for key in ("service_name", "service_owner"):
+        t = table.rollup(key, weights).dropna(subset=["composite_score"]) if key in table.cells.columns else None
+        low = t.loc[t["composite_score"].idxmin()] if t is not None and not t.empty else None
+        out[f"lowest_{key}"] = None if low is None else str(low[key])
+        out[f"lowest_{key}_score"] = None if low is None else float(low["composite_score"])
+    return out
+
+
+def monthly(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Month rollup of `columns` from the shared table, keyed `report_month` as the views label it."""
+    t = scorecard_table(df).rollup("month")
+    return (t[["month"] + list(columns)].rename(columns={"month": "report_month"})
+            .sort_values("report_month").reset_index(drop=True))
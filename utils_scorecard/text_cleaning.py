@@ -0,0 +1,108 @@
+# utils_scorecard/text_cleaning.py
+
+import numpy as np
+import pandas as pd
+
+from cleaning_executor import ExecutionReport, run_columns
+
+# ─────────────────────────────────────────────────────────────
+# Column-wise text cleaning
+# Scorecard exports repeat a small vocabulary of strings (service names,
+# owners, statuses, formatted numbers) over hundreds of thousands of rows.
+# Each text column is factorized once and only its distinct values are
+# normalised (NFKC, zero-width removal, strip, placeholder -> NaN) with
+# `.str` accessors; the row values are then a take() of the cleaned
+# uniques. Numeric-likeness is probed on a row sample first, so plain
+# text columns are never converted in full just to be rejected.
+# ─────────────────────────────────────────────────────────────
+PLACEHOLDERS = frozenset({
+    "", "na", "n/a", "none", "null", "missing", "blank", "empty",
+    "-", "--", "---", "nan", ".", "#n/a", "#na", "?", "n\\a", "n.a",
+    "nil", "undefined", "no data"
+})
+ZERO_WIDTH = "[\u200b-\u200d\ufeff\u2060\xa0]"    # zero-widths & nbsp (escapes resolved by Python)
+NUMERIC_NOISE = r"[,\s%]"                          # thousands separators, spaces, percent signs
+NUMERIC_SHARE = 0.6                                # share of rows that must parse to convert a column
+PROBE_ROWS = 2_000                                 # sample size for the numeric-likeness probe
+PROBE_MARGIN = 0.1                                 # skip the full pass when the probe is this far below
+
+
+def is_text(s: pd.Series) -> bool:
+    """Python-object or pandas string column (what read_csv gives text on pandas 2 and 3)."""
+    return s.dtype == object or pd.api.types.is_string_dtype(s.dtype)
+
+
+def _rebuild(s: pd.Series, codes: np.ndarray, values: np.ndarray, dtype=None) -> pd.Series:
+    """Row values from per-unique `values` (code -1 -> NaN)."""
+    out = np.append(values, np.nan)[codes] if (codes < 0).any() else values[codes]
+    return pd.Series(out, index=s.index, name=s.name, dtype=dtype)
+
+
+def _clean_uniques(uniques) -> np.ndarray:
+    u = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+    is_str = np.fromiter((isinstance(x, str) for x in u), dtype=bool, count=len(u))
+    if is_str.any():
+        t = u[is_str].astype("string")
+        wide = ~t.str.isascii().to_numpy(dtype=bool)     # NFKC and the zero-width set only touch non-ASCII
+        if wide.any():
+            t[wide] = t[wide].str.normalize("NFKC").str.replace(ZERO_WIDTH, "", regex=True)
+        t = t.str.strip()
+        t = t.where(~t.str.lower().isin(PLACEHOLDERS).to_numpy(dtype=bool))
+        u[is_str] = t.astype(object).where(t.notna(), np.nan)
+    return u.to_numpy(dtype=object)
+
+
+def clean_text_column(s: pd.Series) -> pd.Series:
+    """Unicode-normalised, trimmed text with placeholder tokens as NaN; non-text columns are returned as-is."""
+    if not is_text(s):
+        return s
+    codes, uniques = pd.factorize(s)
+    return _rebuild(s, codes, _clean_uniques(uniques), dtype=s.dtype)
+
+
+def clean_placeholders(df: pd.DataFrame, report: ExecutionReport = None, workers: int = None) -> pd.DataFrame:
+    """`clean_text_column` over every text column (one pass per distinct value, not per cell; columns in parallel)."""
+    text = [c for c in df.columns if is_text(df[c])]
+    if not text:
+        return df
+    out = df.copy()
+    for col, cleaned in run_columns(df, [(c, clean_text_column) for c in text], "placeholders", workers, report).items():
+        out[col] = cleaned
+    return out
+
+
+def _parse(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values.astype(str).str.replace(NUMERIC_NOISE, "", regex=True), errors="coerce")
+
+
+def coerce_numeric_like(s: pd.Series, threshold: float = NUMERIC_SHARE) -> pd.Series:
+    """
+    Numbers from a text column whose values mostly parse once commas, spaces and % are removed
+    (at least `threshold` of all rows); otherwise `s` unchanged. A row sample is parsed first and
+    columns clearly below the threshold are left without parsing the rest.
+    """
+    if not is_text(s) or not len(s):
+        return s
+    if len(s) > PROBE_ROWS:
+        probe = s.sample(n=PROBE_ROWS, random_state=0)
+        if _parse(probe).notna().mean() < threshold - PROBE_MARGIN:
+            return s
+    codes, uniques = pd.factorize(s)
+    parsed = _parse(pd.Series(np.asarray(uniques, dtype=object), dtype=object))
+    hits = parsed.notna().to_numpy()
+    if hits[codes[codes >= 0]].sum() < threshold * len(s):
+        return s
+    values = parsed.to_numpy(dtype="float64" if (codes < 0).any() else None)
+    return _rebuild(s, codes, values)
+
+
+def coerce_numeric_columns(df: pd.DataFrame, threshold: float = NUMERIC_SHARE, report: ExecutionReport = None,
+                           workers: int = None) -> pd.DataFrame:
+    """`coerce_numeric_like` over every text column (in parallel); returns the same frame when nothing converts."""
+    tasks = [(c, lambda s: coerce_numeric_like(s, threshold)) for c in df.columns if is_text(df[c])]
+    out = df
+    for col, converted in run_columns(df, tasks, "numeric-like", workers, report).items():
+        if out is df:
+            out = df.copy()
+        out[col] = converted
+    return out
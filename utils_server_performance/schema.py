@@ -0,0 +1,11 @@
+# utils_server_performance/schema.py
+from schema_registry import ColumnSpec, DomainSchema, register
+
+# Server performance samples: typed columns for data_cleaning_server (see schema_registry)
+SCHEMA = register(DomainSchema(
+    domain="server",
+    columns=(
+        ColumnSpec("timestamp", "datetime", aliases=("datetime", "date_time", "time")),
+        ColumnSpec("downtime_incident", "bool", aliases=("downtime_flag",)),
+    ),
+))
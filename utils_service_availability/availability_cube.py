@@ -0,0 +1,195 @@
+# utils_service_availability/availability_cube.py
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from cache_registry import cached
+
+# ─────────────────────────────────────────────────────────────
+# Service × month availability cube
+# One groupby over the (filtered) availability frame produces a cell per
+# (service_name, service_category, month) holding only mergeable numbers:
+# sums for additive measures and (weighted sum, weight) pairs for means.
+# Any coarser view — per service, per month, per category, totals — is a
+# re-sum of cells, so the availability charts, KPIs and CIO tables slice
+# the cube instead of grouping the rows again. Slicing a cached cube is
+# level with the per-chart groupbys at about 50k rows and ahead above that;
+# a cube built from scratch pays off from about 100k rows. Smaller uploads
+# pay up to twice the groupby time (benchmarks/availability_cube.py --sweep).
+# ─────────────────────────────────────────────────────────────
+REPORT_MINUTES = 1440          # each report row covers one report day; uptime is weighted by it
+ADDITIVE = ["downtime_minutes", "incident_count", "estimated_cost_downtime"]
+MEANS = {                      # column -> weight per non-null row
+    "uptime_percentage": REPORT_MINUTES,
+    "recovery_time_minutes": 1,
+    "rto_target_minutes": 1,
+    "sla_met": 1,
+    "cpu_utilization": 1,
+    "memory_utilization": 1,
+    "disk_utilization": 1,
+    "network_utilization": 1,
+}
+ATTRIBUTES = ["service_category"]   # service-level attributes kept in the cell key
+SUBSETS = {                         # row subset -> (column, lower-cased value)
+    "scheduled": ("maintenance_type", "scheduled"),
+    "emergency": ("change_type", "emergency"),
+}
+_SLA_TOKENS = {"true": 1.0, "yes": 1.0, "1": 1.0, "1.0": 1.0, "false": 0.0, "no": 0.0, "0": 0.0, "0.0": 0.0}
+
+
+def to_float(s: pd.Series) -> np.ndarray:
+    """Column as float64 values; unparseable and missing entries become NaN."""
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _labels_match(s: pd.Series, match) -> np.ndarray:
+    """Row mask for `match(normalised label)`, evaluated once per distinct value instead of per row."""
+    codes, uniques = pd.factorize(s)
+    keep = np.array([match(str(u).strip().lower()) for u in uniques] + [False])
+    return keep[codes]            # code -1 (missing) -> the trailing False
+
+
+def _sla(s: pd.Series) -> np.ndarray:
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return to_float(s)
+    codes, uniques = pd.factorize(s)
+    values = np.array([_SLA_TOKENS.get(str(u).strip().lower(), np.nan) for u in uniques] + [np.nan])
+    return values[codes]
+
+
+def _measures(df: pd.DataFrame) -> dict:
+    """Per-row mergeable columns: additive values, weighted sums + weights, subset counts."""
+    m = {"rows": np.ones(len(df))}
+    for col in ADDITIVE:
+        if col in df.columns:
+            m[col] = np.nan_to_num(to_float(df[col]))
+    for col, weight in MEANS.items():
+        if col in df.columns:
+            v = _sla(df[col]) if col == "sla_met" else to_float(df[col])
+            seen = ~np.isnan(v)
+            m[f"{col}__sum"] = np.where(seen, v * weight, 0.0)
+            m[f"{col}__w"] = seen * float(weight)
+    if {"recovery_time_minutes", "rto_target_minutes"} <= set(df.columns):
+        gap = to_float(df["recovery_time_minutes"]) - to_float(df["rto_target_minutes"])
+        with np.errstate(invalid="ignore"):
+            m["rto_breaches"] = (gap > 0).astype("float64")
+        m["minutes_over_rto"] = np.nan_to_num(np.clip(gap, 0, None))
+
+    change = df["change_type"] if "change_type" in df.columns else df.get("maintenance_type")
+    for name, (col, value) in SUBSETS.items():
+        source = change if col == "change_type" else df.get(col)
+        if source is None:
+            continue
+        hit = _labels_match(source, value.__eq__)
+        m[f"{name}_count"] = hit.astype("float64")
+        for add in ("downtime_minutes", "estimated_cost_downtime", "uptime_percentage__sum", "uptime_percentage__w"):
+            if add in m:
+                m[f"{name}_{add}"] = np.where(hit, m[add], 0.0)
+    return m
+
+
+def _finish(t: pd.DataFrame) -> pd.DataFrame:
+    """Turn (sum, weight) pairs back into means named like the source column."""
+    pairs = [c[:-5] for c in t.columns if c.endswith("__sum")]
+    means = {col: t[f"{col}__sum"] / t[f"{col}__w"].where(t[f"{col}__w"] > 0) for col in pairs}
+    kept = t.drop(columns=[f"{col}{part}" for col in pairs for part in ("__sum", "__w")])
+    return pd.concat([kept, pd.DataFrame(means, index=t.index)], axis=1)
+
+
+@dataclass
+class AvailabilityCube:
+    """
+    Mergeable cells for one dataset.
+      - cells: one row per (service_name, service_category, month) with rows, downtime_minutes,
+               incident_count, estimated_cost_downtime, <mean>__sum / <mean>__w pairs, rto_breaches,
+               minutes_over_rto and scheduled_* / emergency_* subset measures. month is "YYYY-MM"
+               (NaN for rows without a report_date).
+    """
+    cells: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        return self.cells.empty
+
+    def has(self, measure: str) -> bool:
+        return measure in self.cells.columns or f"{measure}__sum" in self.cells.columns
+
+    def slice(self, by=("service_name",), services=None, months=None, dropna=True) -> pd.DataFrame:
+        """
+        Re-summed view grouped by `by` (any of service_name, service_category, month; () for one
+        total row). Means come back under their source column names (uptime_percentage, sla_met, ...).
+        Slices are not memoised: the cube is shared across sessions, and re-summing its cells costs
+        less than keeping every view.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        c = self.cells
+        if services is not None:
+            c = c[c["service_name"].astype(str).isin([str(s) for s in services])]
+        if months is not None:
+            c = c[c["month"].isin(list(months))]
+        if "month" in by and dropna:
+            c = c[c["month"].notna()]
+        values = [col for col in c.columns if col not in ("service_name", "month", *ATTRIBUTES)]
+        if not by:
+            return _finish(c[values].sum().to_frame().T)
+        t = c.groupby(by, as_index=False, observed=True, sort=True, dropna=dropna)[values].sum()
+        return _finish(t)
+
+    def total(self, measure: str) -> float:
+        """Whole-dataset value of one measure (sum for additive ones, weighted mean for means)."""
+        row = self.slice(())
+        return float(row[measure].iloc[0]) if measure in row.columns else float("nan")
+
+
+# ---------- cells ----------
+def month_codes(df: pd.DataFrame):
+    """(codes, labels): months since year 0 per row (-1 without a report_date) and "YYYY-MM" per code."""
+    if "report_date" not in df.columns:
+        return np.full(len(df), -1), {}
+    month = pd.to_datetime(df["report_date"], errors="coerce").to_numpy().astype("datetime64[M]")
+    codes = np.where(np.isnat(month), -1, month.astype("int64") + 1970 * 12)
+    return codes, {c: f"{c // 12:04d}-{c % 12 + 1:02d}" for c in np.unique(codes[codes >= 0])}
+
+
+def cell_ids(df: pd.DataFrame, keys) -> tuple:
+    """
+    (inverse, cells) for grouping `df` by `keys`: the cell of every row, and one row per cell with its
+    key labels (str; NaN where the row had none). "month" is the report_date month ("YYYY-MM"); other
+    keys absent from `df` are skipped. Sum a per-row measure into the cells with
+    np.bincount(inverse, weights=values, minlength=len(cells)).
+    """
+    # Integer codes per key column, combined into one cell id
+    factors = {col: pd.factorize(df[col]) for col in keys if col != "month" and col in df.columns}
+    month, month_labels = month_codes(df) if "month" in keys else (None, None)
+    parts = [codes for codes, _ in factors.values()] + ([month] if month is not None else [])
+    cell = np.zeros(len(df), dtype="int64")
+    for codes in parts:
+        cell = cell * (int(codes.max(initial=-1)) + 2) + (codes + 1)
+    ids, inverse = np.unique(cell, return_inverse=True)
+
+    first = np.zeros(len(ids), dtype="int64")
+    first[inverse[::-1]] = np.arange(len(df))[::-1]          # a representative row per cell
+    cells = {}
+    for col in keys:
+        if col == "month":
+            cells[col] = pd.Series([month_labels.get(c) for c in month[first]], dtype=object)
+        elif col in factors:
+            codes, uniques = factors[col]
+            c = codes[first]
+            cells[col] = pd.Series(np.asarray(uniques, dtype=object)[c], dtype=object).astype(str).where(c >= 0)
+    return inverse, pd.DataFrame(cells, index=pd.RangeIndex(len(ids)))
+
+
+def build_cube(df: pd.DataFrame) -> AvailabilityCube:
+    if "service_name" not in df.columns:
+        return AvailabilityCube(cells=pd.DataFrame(columns=["service_name", "month", "rows"]))
+    inverse, cells = cell_ids(df, ["service_name", *ATTRIBUTES, "month"])
+    for name, values in _measures(df).items():
+        cells[name] = np.bincount(inverse, weights=values, minlength=len(cells))
+    return AvailabilityCube(cells=cells)
+
+
+@cached
+def availability_cube(df: pd.DataFrame) -> AvailabilityCube:
+    """Service × month cube for `df`, materialised once per dataset content (shared by all views)."""
+    return build_cube(df)
@@ -0,0 +1,343 @@
+# utils_service_availability/availability_engine.py
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from cache_registry import session_store
+
+# ─────────────────────────────────────────────────────────────
+# Outage-interval availability
+# Every service's outages become [start, end) intervals; overlapping or
+# touching outages are merged so no minute is counted twice. Uptime, MTBF,
+# MTTR and RTO gap then come from interval arithmetic against any window and
+# any period grid (D/W/M/Q/Y or the whole window), with no per-chart groupby.
+#
+# Interval source, first match wins:
+#   1) explicit start/end columns (OUTAGE_COLUMN_PAIRS), end falling back to
+#      start + downtime_minutes;
+#   2) daily reports: each service's reported downtime_minutes are laid
+#      end-to-end in report order, each report starting at its report_date
+#      or when the previous one ends, whichever is later; an outage longer
+#      than what is left of the day carries on into the following days and
+#      every reported minute is counted once.
+# Uptime is measured over observed time only: the days a service has a
+# report, plus its outages (a carried outage is observed downtime). Days
+# without a report are left out of the denominator rather than counted as
+# up. An outage log without report dates is observed from each service's
+# first to its last outage.
+# Results are cached per (dataset, service, window, granularity).
+# ─────────────────────────────────────────────────────────────
+OUTAGE_COLUMN_PAIRS = [
+    ("outage_start", "outage_end"),
+    ("incident_start", "incident_end"),
+    ("start_time", "end_time"),
+]
+FREQ_LABELS = {"D": "Daily", "W": "Weekly", "M": "Monthly", "Q": "Quarterly", "Y": "Yearly"}
+DAY = np.timedelta64(1, "D").astype("timedelta64[ns]").astype("int64")
+MINUTE = 60 * 10**9
+
+_INTERVALS_STORE = "availability_intervals"
+_METRICS_STORE = "availability_metrics"
+_INTERVALS_LIMIT = 8      # outage interval sets (datasets) kept per session
+_CACHE_LIMIT = 2000       # (service, window, granularity) metric frames kept per session
+
+# Additive per (service, period) figures; the ratio columns are rebuilt from these after any rollup
+_ADDITIVE = ["window_minutes", "downtime_minutes", "outages", "failures", "reports",
+             "recovery_minutes_total", "recovery_reports", "rto_minutes_total", "rto_reports",
+             "rto_breaches", "minutes_over_rto", "rto_gap_total", "rto_gap_reports"]
+
+
+def _num(s: pd.Series) -> np.ndarray:
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _ns(s: pd.Series) -> np.ndarray:
+    return pd.to_datetime(s, errors="coerce").to_numpy(dtype="datetime64[ns]").astype("int64")
+
+
+_NAT = np.datetime64("NaT", "ns").astype("int64")
+
+
+# =========================
+# Outage intervals
+# =========================
+@dataclass
+class OutageIntervals:
+    """
+    Merged outages and per-report figures for one dataset (times as int64 ns).
+      - services: service names (code i -> services[i])
+      - code/start/end: merged, non-overlapping outages sorted by (code, start)
+      - seen_code/seen_start/seen_end: merged observed time per service (report days and outages)
+      - events: per report row: code, at (ns), incidents, recovery, rto
+    """
+    services: pd.Index
+    code: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    seen_code: np.ndarray
+    seen_start: np.ndarray
+    seen_end: np.ndarray
+    events: dict
+    has_incidents: bool
+    source: str
+    token: int
+
+    @property
+    def empty(self) -> bool:
+        return len(self.services) == 0
+
+
+def _raw_intervals(df: pd.DataFrame, day: np.ndarray, down: np.ndarray):
+    """(start, end, source) per row before merging; NaT/empty rows are dropped by the caller."""
+    for a, b in OUTAGE_COLUMN_PAIRS:
+        if a in df.columns:
+            start = _ns(df[a])
+            end = _ns(df[b]) if b in df.columns else np.full(len(df), _NAT)
+            fill = (end == _NAT) & (start != _NAT) & ~np.isnan(down)
+            end = np.where(fill, start + np.nan_to_num(down * MINUTE).astype("int64"), end)
+            return start, end, f"{a}/{b}"
+
+    # Daily reports, per service in day order: end_i = max(day_i, end_i-1) + minutes_i, i.e. with C the running
+    # total of minutes, end_i = C_i + max over j <= i of (day_j - C_j-1)
+    dur = (np.nan_to_num(np.clip(down, 0, None)) * MINUTE).astype("int64")
+    frame = pd.DataFrame({"svc": df["service_name"].astype(str).to_numpy(), "day": day, "dur": dur})
+    frame = frame[day != _NAT].sort_values(["svc", "day"], kind="stable")
+    total = frame.groupby("svc", sort=False)["dur"].cumsum()
+    free = (frame["day"] - (total - frame["dur"])).groupby(frame["svc"], sort=False).cummax()
+    end = np.full(len(df), _NAT)
+    end[frame.index.to_numpy()] = (total + free).to_numpy()
+    start = np.where(end == _NAT, _NAT, end - dur)
+    return start, end, "report_date + downtime_minutes"
+
+
+def _merge(code: np.ndarray, start: np.ndarray, end: np.ndarray):
+    """Union of [start, end) per code -> sorted, non-overlapping intervals."""
+    order = np.lexsort((start, code))
+    code, start, end = code[order], start[order], end[order]
+    reach = pd.Series(end).groupby(code, sort=False).cummax().to_numpy()
+    prev_reach = np.r_[np.iinfo("int64").min, reach[:-1]]
+    new = np.r_[True, code[1:] != code[:-1]] | (start > prev_reach)
+    m_start = start[new]
+    m_end = np.maximum.reduceat(end, np.flatnonzero(new)) if len(end) else end
+    return code[new], m_start, m_end
+
+
+def _build_intervals(df: pd.DataFrame, token: int) -> OutageIntervals:
+    svc = df["service_name"].astype(str)
+    day = _ns(df["report_date"]) if "report_date" in df.columns else np.full(len(df), _NAT)
+    day = np.where(day == _NAT, _NAT, day - day % DAY)
+    down = _num(df["downtime_minutes"]) if "downtime_minutes" in df.columns else np.full(len(df), np.nan)
+    start, end, source = _raw_intervals(df, day, down)
+
+    services = pd.Index(pd.unique(svc.to_numpy())).sort_values()
+    code_all = services.get_indexer(svc.to_numpy())
+
+    anchor = np.where(day != _NAT, day, np.where(start != _NAT, start - start % DAY, _NAT))
+    ok = anchor != _NAT
+    keep = (start != _NAT) & (end != _NAT) & (end > start)
+    code, m_start, m_end = _merge(code_all[keep], start[keep], end[keep])
+
+    # Observed time per service: its report days (an outage log without them: first to last outage day),
+    # joined with its outages
+    if (day != _NAT).any():
+        has_day = day != _NAT
+        o_code, o_start, o_end = code_all[has_day], day[has_day], day[has_day] + DAY
+    else:
+        n = len(services)
+        o_start = np.full(n, np.iinfo("int64").max)
+        o_end = np.full(n, np.iinfo("int64").min)
+        np.minimum.at(o_start, code_all[ok], anchor[ok])
+        np.maximum.at(o_end, code_all[ok], anchor[ok] + DAY)
+        o_code = np.flatnonzero(o_start < o_end)
+        o_start, o_end = o_start[o_code], o_end[o_code]
+    seen_code, seen_start, seen_end = _merge(np.r_[o_code, code], np.r_[o_start, m_start], np.r_[o_end, m_end])
+
+    def col(name):
+        return _num(df[name]) if name in df.columns else np.full(len(df), np.nan)
+
+    events = {
+        "code": code_all[ok],
+        "at": anchor[ok],
+        "incidents": col("incident_count")[ok],
+        "recovery": col("recovery_time_minutes")[ok],
+        "rto": col("rto_target_minutes")[ok],
+    }
+    return OutageIntervals(services=services, code=code, start=m_start, end=m_end,
+                           seen_code=seen_code, seen_start=seen_start, seen_end=seen_end, events=events,
+                           has_incidents="incident_count" in df.columns, source=source, token=token)
+
+
+def _token(df: pd.DataFrame) -> int:
+    cols = [c for c in ["service_name", "report_date", "downtime_minutes", "incident_count",
+                        "recovery_time_minutes", "rto_target_minutes", *sum(map(list, OUTAGE_COLUMN_PAIRS), [])]
+            if c in df.columns]
+    return int(pd.util.hash_pandas_object(df[cols], index=False).sum()) if len(df) else 0
+
+
+def outage_intervals(df: pd.DataFrame) -> OutageIntervals:
+    """Merged outage intervals for `df` (needs service_name), built once per dataset content."""
+    token = _token(df)
+    cache = session_store(_INTERVALS_STORE, _INTERVALS_LIMIT)
+    if token not in cache:
+        cache[token] = _build_intervals(df, token)
+    return cache[token]
+
+
+# =========================
+# Window / period arithmetic
+# =========================
+def _bounds(w0: int, w1: int, freq):
+    """Period edges (int64 ns) covering [w0, w1) and their labels."""
+    if freq is None:
+        return np.array([w0, w1], dtype="int64"), ["All"]
+    periods = pd.period_range(pd.Timestamp(w0), pd.Timestamp(w1 - 1), freq=freq)
+    edges = periods.start_time.to_numpy(dtype="datetime64[ns]").astype("int64")
+    last = (periods[-1] + 1).start_time.to_datetime64().astype("datetime64[ns]").astype("int64")
+    return np.r_[edges, last], [str(p) for p in periods]
+
+
+def _split(code: np.ndarray, start: np.ndarray, end: np.ndarray, wanted: np.ndarray, w0: int, w1: int,
+           edges: np.ndarray):
+    """
+    Intervals of wanted services clipped to [w0, w1) and split at period edges:
+    (code, first period, piece code, piece period, piece length in ns).
+    """
+    m = wanted[code]
+    c, s, e = code[m], np.maximum(start[m], w0), np.minimum(end[m], w1)
+    live = e > s
+    c, s, e = c[live], s[live], e[live]
+    p0 = np.searchsorted(edges, s, side="right") - 1
+    p1 = np.searchsorted(edges, e - 1, side="right") - 1
+    span = p1 - p0 + 1
+    rep = np.repeat(np.arange(len(c)), span)
+    p = p0[rep] + (np.arange(len(rep)) - np.repeat(np.cumsum(span) - span, span))
+    overlap = np.minimum(e[rep], edges[p + 1]) - np.maximum(s[rep], edges[p])
+    return c, p0, c[rep], p, overlap
+
+
+def _metrics(ix: OutageIntervals, codes: np.ndarray, w0: int, w1: int, freq) -> pd.DataFrame:
+    edges, labels = _bounds(w0, w1, freq)
+    P = len(labels)
+    S = len(ix.services)
+    cell = lambda c, p: c * P + p  # noqa: E731
+    ncell = S * P
+    wanted = np.zeros(S, dtype=bool)
+    wanted[codes] = True
+
+    # Window minutes per (service, period): observed time ∩ request window ∩ period
+    _, _, pc, pp, length = _split(ix.seen_code, ix.seen_start, ix.seen_end, wanted, w0, w1, edges)
+    window = np.bincount(cell(pc, pp), weights=length, minlength=ncell)
+
+    # Outages clipped to the request window, then split at period edges (always inside observed time)
+    c, p0, pc, pp, length = _split(ix.code, ix.start, ix.end, wanted, w0, w1, edges)
+    downtime = np.bincount(cell(pc, pp), weights=length, minlength=ncell) / MINUTE
+    outages = np.bincount(cell(c, p0), minlength=ncell)
+
+    # Report-level figures in the window
+    ev = ix.events
+    em = wanted[ev["code"]] & (ev["at"] >= w0) & (ev["at"] < w1)
+    ec, ep = ev["code"][em], np.searchsorted(edges, ev["at"][em], side="right") - 1
+    idx = cell(ec, ep)
+
+    def total(values):
+        v = values[em]
+        ok = ~np.isnan(v)
+        return (np.bincount(idx[ok], weights=v[ok], minlength=ncell),
+                np.bincount(idx[ok], minlength=ncell))
+
+    inc_sum, _ = total(ev["incidents"])
+    rec_sum, rec_n = total(ev["recovery"])
+    rto_sum, rto_n = total(ev["rto"])
+    with np.errstate(invalid="ignore"):
+        gap = ev["recovery"] - ev["rto"]
+    gap_sum, gap_n = total(gap)
+    over_sum, _ = total(np.where(gap > 0, gap, np.where(np.isnan(gap), np.nan, 0.0)))
+    breaches, _ = total(np.where(np.isnan(gap), np.nan, (gap > 0).astype("float64")))
+    reports = np.bincount(idx, minlength=ncell)
+
+    out = pd.DataFrame({
+        "service_name": np.repeat(ix.services.to_numpy(), P),
+        "period": np.tile(np.asarray(labels, dtype=object), S),
+        "period_start": pd.to_datetime(np.tile(edges[:-1], S)),
+        "window_minutes": window / MINUTE,
+        "downtime_minutes": downtime,
+        "outages": outages,
+        "failures": inc_sum if ix.has_incidents else outages.astype("float64"),
+        "reports": reports,
+        "recovery_minutes_total": rec_sum, "recovery_reports": rec_n,
+        "rto_minutes_total": rto_sum, "rto_reports": rto_n,
+        "rto_breaches": breaches, "minutes_over_rto": over_sum,
+        "rto_gap_total": gap_sum, "rto_gap_reports": gap_n,
+    })
+    out = out[np.repeat(wanted, P) & (out["window_minutes"] > 0)]
+    return _ratios(out.reset_index(drop=True))
+
+
+def _ratios(out: pd.DataFrame) -> pd.DataFrame:
+    """Uptime, MTBF, MTTR and RTO columns from the additive ones."""
+    up = out["window_minutes"] - out["downtime_minutes"]
+    failures = out["failures"].where(out["failures"] > 0)
+    out["uptime_pct"] = up / out["window_minutes"].where(out["window_minutes"] > 0) * 100
+    out["mtbf_hours"] = up / failures / 60
+    out["mttr_minutes"] = out["downtime_minutes"] / failures
+    out["reported_mttr_minutes"] = out["recovery_minutes_total"] / out["recovery_reports"].where(out["recovery_reports"] > 0)
+    out["avg_rto_minutes"] = out["rto_minutes_total"] / out["rto_reports"].where(out["rto_reports"] > 0)
+    out["rto_gap_minutes"] = out["rto_gap_total"] / out["rto_gap_reports"].where(out["rto_gap_reports"] > 0)
+    out["rto_compliance_pct"] = (1 - out["rto_breaches"] / out["rto_gap_reports"].where(out["rto_gap_reports"] > 0)) * 100
+    return out
+
+
+# =========================
+# Public API
+# =========================
+def availability_window(df: pd.DataFrame):
+    """Default window: first to last observed day (inclusive, outages carried past a report included)."""
+    ix = outage_intervals(df)
+    if not len(ix.seen_start):
+        return None, None
+    return pd.Timestamp(ix.seen_start.min()), pd.Timestamp(ix.seen_end.max())
+
+
+def availability(df: pd.DataFrame, freq: str = None, start=None, end=None, services=None) -> pd.DataFrame:
+    """
+    One row per (service_name, period) with uptime_pct over observed time (reported days and
+    outages; unreported days are not counted as up), mtbf_hours, mttr_minutes,
+    reported_mttr_minutes, avg_rto_minutes, rto_gap_minutes, rto_breaches, rto_compliance_pct
+    and the additive minutes/counts behind them.
+      freq:  None (whole window), "D", "W", "M", "Q" or "Y"
+      start/end: window [start, end]; defaults to the data span (end date inclusive)
+      services: subset of service names (default all)
+    Each (service, window, freq) result is cached; only services not yet computed are evaluated.
+    """
+    if "service_name" not in df.columns or df.empty:
+        return pd.DataFrame(columns=["service_name", "period", "period_start", *_ADDITIVE])
+    ix = outage_intervals(df)
+    d0, d1 = availability_window(df)
+    if d0 is None:
+        return pd.DataFrame(columns=["service_name", "period", "period_start", *_ADDITIVE])
+    w0 = pd.Timestamp(start).normalize() if start is not None else d0
+    w1 = pd.Timestamp(end).normalize() + pd.Timedelta(days=1) if end is not None else d1
+    w0, w1 = int(w0.value), int(w1.value)
+
+    names = ix.services if services is None else pd.Index([str(s) for s in services]).intersection(ix.services)
+    cache = session_store(_METRICS_STORE, _CACHE_LIMIT)
+    key = lambda s: (ix.token, s, freq, w0, w1)  # noqa: E731
+    found = {s: cache[key(s)] for s in names if key(s) in cache}
+    missing = [s for s in names if s not in found]
+    if missing and w1 > w0:
+        fresh = _metrics(ix, ix.services.get_indexer(missing), w0, w1, freq)
+        parts = dict(tuple(fresh.groupby("service_name", sort=False)))
+        for s in missing:
+            found[s] = cache[key(s)] = parts.get(s, fresh.iloc[0:0])
+    frames = [found[s] for s in names if s in found]
+    if not frames:
+        return pd.DataFrame(columns=["service_name", "period", "period_start", *_ADDITIVE])
+    return pd.concat(frames, ignore_index=True)
+
+
+def rollup(metrics: pd.DataFrame, by="period") -> pd.DataFrame:
+    """Re-aggregate availability() rows (e.g. all services per period) and rebuild the ratios."""
+    by = [by] if isinstance(by, str) else list(by)
+    keys = by + (["period_start"] if "period" in by and "period_start" not in by else [])
+    out = metrics.groupby(keys, as_index=False, sort=True)[_ADDITIVE].sum()
+    return _ratios(out)
@@ -0,0 +1,139 @@
+# utils_service_availability/cost_attribution.py
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from cache_registry import cached
+from utils_service_availability.availability_cube import cell_ids, to_float
+
+# ─────────────────────────────────────────────────────────────
+# Downtime cost attribution
+# A cost model turns each report row's downtime minutes into RM as array
+# operations (no per-row apply). The priced rows are then summed once into
+# cells keyed by (service_name, business_impact, root_cause, month), so
+# cost by service, impact tier, root cause or month — or any pair of them —
+# is a re-sum of cells. Results are cached per (dataset, model, rate, tiers)
+# and shared by the dashboard, the business-impact section and the report.
+# ─────────────────────────────────────────────────────────────
+DIMENSIONS = ["service_name", "business_impact", "root_cause", "month"]
+DIMENSION_LABELS = {
+    "service_name": "Service",
+    "business_impact": "Business Impact Tier",
+    "root_cause": "Root Cause",
+    "month": "Month",
+}
+COST_MODELS = {
+    "reported": "Reported cost (estimated_cost_downtime as recorded)",
+    "flat": "Flat RM/min × downtime minutes",
+    "tiered": "Impact-tier RM/min × downtime minutes",
+    "service": "Each service's own RM/min × downtime minutes",
+}
+# Multiplier on the base RM/min per business impact tier (labels matched case-insensitively; others ×1)
+DEFAULT_TIERS = (("critical", 3.0), ("high", 2.0), ("medium", 1.0), ("low", 0.5))
+MEASURES = ["cost", "reported_cost", "downtime_minutes", "rows", "cost_rows"]
+
+
+def derived_rate(df: pd.DataFrame) -> float:
+    """Blended RM per downtime minute from the data (total reported cost / total minutes)."""
+    if not {"downtime_minutes", "estimated_cost_downtime"} <= set(df.columns):
+        return float("nan")
+    minutes = np.nansum(to_float(df["downtime_minutes"]))
+    return float(np.nansum(to_float(df["estimated_cost_downtime"])) / minutes) if minutes > 0 else float("nan")
+
+
+def _tier_multiplier(s: pd.Series, tiers) -> np.ndarray:
+    """Per-row multiplier, looked up once per distinct tier label."""
+    table = {str(k).strip().lower(): float(v) for k, v in tiers}
+    codes, uniques = pd.factorize(s)
+    lookup = np.array([table.get(str(u).strip().lower(), 1.0) for u in uniques] + [1.0])
+    return lookup[codes]
+
+
+def row_costs(df: pd.DataFrame, model: str = "reported", rate: float = None, tiers=DEFAULT_TIERS) -> np.ndarray:
+    """
+    RM per report row under `model` (see COST_MODELS). `rate` is the base RM/min for the
+    flat / tiered models and the fallback for services without their own rate; None = derived_rate(df).
+    """
+    if model not in COST_MODELS:
+        raise ValueError(f"Unknown cost model '{model}'. Choose one of: {', '.join(COST_MODELS)}")
+    reported = to_float(df["estimated_cost_downtime"]) if "estimated_cost_downtime" in df.columns else np.full(len(df), np.nan)
+    if model == "reported":
+        return np.nan_to_num(reported)
+
+    minutes = np.nan_to_num(to_float(df["downtime_minutes"])) if "downtime_minutes" in df.columns else np.zeros(len(df))
+    base = derived_rate(df) if rate is None else float(rate)
+    base = 0.0 if np.isnan(base) else base
+    if model == "flat":
+        return minutes * base
+    if model == "tiered":
+        mult = _tier_multiplier(df["business_impact"], tiers) if "business_impact" in df.columns else 1.0
+        return minutes * base * mult
+
+    # service: reported cost / minutes per service, services without priced minutes fall back to base
+    if "service_name" not in df.columns:
+        return minutes * base
+    codes, uniques = pd.factorize(df["service_name"])
+    idx = np.where(codes >= 0, codes, len(uniques))
+    cost_sum = np.bincount(idx, weights=np.nan_to_num(reported), minlength=len(uniques) + 1)
+    min_sum = np.bincount(idx, weights=np.where(np.isnan(reported), 0.0, minutes), minlength=len(uniques) + 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per_service = np.where(min_sum > 0, cost_sum / min_sum, base)
+    return minutes * per_service[idx]
+
+
+@dataclass
+class CostAttribution:
+    """
+    Priced downtime for one dataset under one cost model.
+      - cells: one row per (service_name, business_impact, root_cause, month) present in the data with
+               cost (model RM), reported_cost, downtime_minutes, rows and cost_rows (rows with a reported cost)
+      - model / rate: cost model name and the base RM/min it used
+    """
+    cells: pd.DataFrame
+    model: str
+    rate: float
+
+    @property
+    def dimensions(self) -> list:
+        return [d for d in DIMENSIONS if d in self.cells.columns]
+
+    @property
+    def total(self) -> float:
+        return float(self.cells["cost"].sum()) if not self.cells.empty else 0.0
+
+    def by(self, dims="service_name") -> pd.DataFrame:
+        """Cost re-summed by one or more dimensions, with share of total and effective RM/min, costliest first."""
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        missing = [d for d in dims if d not in self.cells.columns]
+        if missing or self.cells.empty:
+            return pd.DataFrame(columns=dims + MEASURES + ["share", "rm_per_min"])
+        t = self.cells.groupby(dims, as_index=False, observed=True, sort=False)[MEASURES].sum()
+        total = t["cost"].sum()
+        t["share"] = t["cost"] / total if total else 0.0
+        t["rm_per_min"] = t["cost"] / t["downtime_minutes"].where(t["downtime_minutes"] > 0)
+        return t.sort_values("cost", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def build_attribution(df: pd.DataFrame, model: str = "reported", rate: float = None, tiers=DEFAULT_TIERS) -> CostAttribution:
+    cost = row_costs(df, model, rate, tiers)
+    base = derived_rate(df) if rate is None else float(rate)
+
+    keys = [d for d in DIMENSIONS if d != "month" or "report_date" in df.columns]
+    inverse, cells = cell_ids(df, keys)
+    reported = to_float(df["estimated_cost_downtime"]) if "estimated_cost_downtime" in df.columns else np.full(len(df), np.nan)
+    minutes = to_float(df["downtime_minutes"]) if "downtime_minutes" in df.columns else np.zeros(len(df))
+    for name, values in {
+        "cost": cost,
+        "reported_cost": np.nan_to_num(reported),
+        "downtime_minutes": np.nan_to_num(minutes),
+        "rows": np.ones(len(df)),
+        "cost_rows": (~np.isnan(reported)).astype("float64"),
+    }.items():
+        cells[name] = np.bincount(inverse, weights=values, minlength=len(cells))
+    return CostAttribution(cells=cells, model=model, rate=base)
+
+
+@cached
+def cost_attribution(df: pd.DataFrame, model: str = "reported", rate: float = None, tiers=DEFAULT_TIERS) -> CostAttribution:
+    """Cost attribution for `df` under `model`, computed once per (dataset, model, rate, tiers)."""
+    return build_attribution(df, model, rate, tuple(tiers))
@@ -5,6 +5,11 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from cache_registry import cached
+from dataset_stats import frame_stats
+from utils_service_availability.availability_cube import availability_cube
+from utils_service_availability.cost_attribution import COST_MODELS, DIMENSION_LABELS, cost_attribution
+
 # ---- Visual defaults (match ticket dashboard) ----
 BLUE_TONES = [
     "#004C99",  # navy blue (brand)
@@ -34,7 +39,7 @@ def _apply_bar_labels(fig, show_labels: bool, fmt: str = None):
     fig.update_traces(texttemplate=fmt if fmt else "%{y}", textposition="outside", cliponaxis=False)
     return fig
 
-@st.cache_data(show_spinner=False)
+@cached
 def _prep_base(df: pd.DataFrame):
     d = df.copy()
 
@@ -112,15 +117,15 @@ def _to_num(s):
 def dashboard_service(df: pd.DataFrame):
     st.markdown("## 📊 Executive Visual Dashboard — Service Availability")
     df = _prep_base(df)
+    stats = frame_stats(df, "dashboard_service")  # filter options / date span from the catalog, not a scan per rerun
 
     # ---------------- Sidebar controls ----------------
     with st.sidebar:
         st.markdown("### 🔎 Filters")
 
         # Date range on report_date
-        if "report_day" in df.columns and not pd.isna(df["report_day"]).all():
-            min_d = pd.to_datetime(df["report_day"]).min()
-            max_d = pd.to_datetime(df["report_day"]).max()
+        if "report_day" in df.columns and stats.date_bounds("report_day"):
+            min_d, max_d = stats.date_bounds("report_day")
             date_range = st.date_input(
                 "Report Date range",
                 value=(min_d, max_d),
@@ -131,7 +136,7 @@ def dashboard_service(df: pd.DataFrame):
             date_range = None
 
         def _opt(col):
-            return sorted([v for v in df[col].dropna().astype(str).unique()]) if col in df.columns else []
+            return stats.options(col)
 
         svc = st.multiselect("Service Name", _opt("service_name"), key="svc_flt_service")
         cat = st.multiselect("Service Category", _opt("service_category"), key="svc_flt_cat")
@@ -146,6 +151,7 @@ def dashboard_service(df: pd.DataFrame):
         show_labels = st.toggle("Show bar labels", value=True, key="svc_lbls")
         show_rangeslider = st.toggle("Show range slider on time-series", value=True, key="svc_rs")
         show_smoothing = st.toggle("Show 7-day moving average where relevant", value=False, key="svc_smooth")
+        cost_model = st.selectbox("Downtime cost model", list(COST_MODELS), format_func=COST_MODELS.get, key="svc_cost_model")
 
         st.markdown("---")
         clear = st.button("Clear all filters", use_container_width=True, key="svc_clear")
@@ -155,10 +161,8 @@ def dashboard_service(df: pd.DataFrame):
 
     if clear:
         svc = cat = owner = stake = mtype = []
-        if "report_day" in df_filtered.columns and not df_filtered["report_day"].isna().all():
-            min_d = pd.to_datetime(df_filtered["report_day"]).min().date()
-            max_d = pd.to_datetime(df_filtered["report_day"]).max().date()
-            date_range = (min_d, max_d)
+        if "report_day" in df_filtered.columns and stats.date_bounds("report_day"):
+            date_range = tuple(d.date() for d in stats.date_bounds("report_day"))
 
     if date_range and "report_day" in df_filtered.columns:
         start_date, end_date = date_range if isinstance(date_range, tuple) else (date_range, date_range)
@@ -183,14 +187,12 @@ def dashboard_service(df: pd.DataFrame):
     st.markdown("### 🔹 Key Metrics")
     k1, k2, k3, k4 = st.columns(4)
 
-    avg_uptime = (pd.to_numeric(df_filtered.get("uptime_percentage", pd.Series(dtype=float)), errors="coerce").mean()
-                  if "uptime_percentage" in df_filtered.columns else np.nan)
-    total_dt = (pd.to_numeric(df_filtered.get("downtime_minutes", pd.Series(dtype=float)), errors="coerce").sum()
-                if "downtime_minutes" in df_filtered.columns else np.nan)
-    total_inc = (pd.to_numeric(df_filtered.get("incident_count", pd.Series(dtype=float)), errors="coerce").sum()
-                 if "incident_count" in df_filtered.columns else np.nan)
-    total_cost = (pd.to_numeric(df_filtered.get("estimated_cost_downtime", pd.Series(dtype=float)), errors="coerce").sum()
-                  if "estimated_cost_downtime" in df_filtered.columns else np.nan)
+    # Service × month cube: the KPIs and every service / category / month chart below slice it
+    cube = availability_cube(df_filtered)
+    avg_uptime = cube.total("uptime_percentage") if "uptime_percentage" in df_filtered.columns else np.nan
+    total_dt = cube.total("downtime_minutes") if "downtime_minutes" in df_filtered.columns else np.nan
+    total_inc = cube.total("incident_count") if "incident_count" in df_filtered.columns else np.nan
+    total_cost = cube.total("estimated_cost_downtime") if "estimated_cost_downtime" in df_filtered.columns else np.nan
 
     k1.metric("Average Uptime (%)", f"{avg_uptime:.2f}%" if pd.notna(avg_uptime) else "N/A")
     k2.metric("Total Downtime (mins)", f"{total_dt:,.0f}" if pd.notna(total_dt) else "N/A")
@@ -253,8 +255,8 @@ def dashboard_service(df: pd.DataFrame):
     # Total downtime by service (minutes)
     with c2:
         if {"service_name", "downtime_minutes"}.issubset(df_filtered.columns):
-            svc_down = (df_filtered.groupby("service_name", as_index=False)["downtime_minutes"]
-                        .sum().sort_values("downtime_minutes", ascending=False))
+            svc_down = (cube.slice("service_name")[["service_name", "downtime_minutes"]]
+                        .sort_values("downtime_minutes", ascending=False))
             fig = px.bar(svc_down, x="service_name", y="downtime_minutes",
                          title="Total Downtime by Service (Minutes)",
                          text="downtime_minutes", labels={"service_name": "Service"},
@@ -266,8 +268,7 @@ def dashboard_service(df: pd.DataFrame):
 
     # MTTR vs RTO scatter
     if {"service_name", "recovery_time_minutes", "rto_target_minutes"}.issubset(df_filtered.columns):
-        mttr = (df_filtered.groupby("service_name", as_index=False)[["recovery_time_minutes", "rto_target_minutes"]]
-                .mean().dropna())
+        mttr = cube.slice("service_name")[["service_name", "recovery_time_minutes", "rto_target_minutes"]].dropna()
         if not mttr.empty:
             fig = px.scatter(mttr, x="rto_target_minutes", y="recovery_time_minutes",
                              text="service_name",
@@ -280,8 +281,8 @@ def dashboard_service(df: pd.DataFrame):
     c3, c4 = st.columns(2)
     with c3:
         if {"service_category", "estimated_cost_downtime"}.issubset(df_filtered.columns):
-            cat_cost = (df_filtered.groupby("service_category", as_index=False)["estimated_cost_downtime"]
-                        .sum().sort_values("estimated_cost_downtime", ascending=False))
+            cat_cost = (cube.slice("service_category")[["service_category", "estimated_cost_downtime"]]
+                        .sort_values("estimated_cost_downtime", ascending=False))
             fig = px.bar(cat_cost, x="service_category", y="estimated_cost_downtime",
                          title="Estimated Downtime Cost by Category (RM)",
                          text="estimated_cost_downtime",
@@ -294,8 +295,8 @@ def dashboard_service(df: pd.DataFrame):
     # SLA compliance by service
     with c4:
         if {"service_name", "sla_met"}.issubset(df_filtered.columns):
-            sla = (df_filtered.groupby("service_name", as_index=False)["sla_met"]
-                   .mean().assign(sla_pct=lambda x: 100 * x["sla_met"]))
+            sla = (cube.slice("service_name")[["service_name", "sla_met"]]
+                   .assign(sla_pct=lambda x: 100 * x["sla_met"]))
             fig = px.bar(sla.sort_values("sla_pct", ascending=False),
                          x="service_name", y="sla_pct", title="SLA Compliance by Service (%)",
                          text="sla_pct", labels={"sla_pct": "SLA Met (%)"},
@@ -314,8 +315,8 @@ def dashboard_service(df: pd.DataFrame):
     # Top 10 services by downtime COST
     with o1:
         if {"service_name", "estimated_cost_downtime"}.issubset(df_filtered.columns):
-            top10 = (df_filtered.groupby("service_name", as_index=False)["estimated_cost_downtime"]
-                     .sum().sort_values("estimated_cost_downtime", ascending=False).head(10))
+            top10 = (cube.slice("service_name")[["service_name", "estimated_cost_downtime"]]
+                     .sort_values("estimated_cost_downtime", ascending=False).head(10))
             fig = px.bar(top10, x="service_name", y="estimated_cost_downtime",
                          title="Top 10 Services by Downtime Cost (RM)",
                          text="estimated_cost_downtime",
@@ -340,7 +341,7 @@ def dashboard_service(df: pd.DataFrame):
 
     # Category share (donut)
     if {"service_category", "estimated_cost_downtime"}.issubset(df_filtered.columns):
-        cat_summary = (df_filtered.groupby("service_category", as_index=False)["estimated_cost_downtime"].sum())
+        cat_summary = cube.slice("service_category")[["service_category", "estimated_cost_downtime"]]
         if not cat_summary.empty:
             fig = px.pie(
                 cat_summary,
@@ -362,8 +363,8 @@ def dashboard_service(df: pd.DataFrame):
     with r1:
         # Average uptime by service (ranked)
         if {"service_name", "uptime_percentage"}.issubset(df_filtered.columns):
-            uptime_summary = (df_filtered.groupby("service_name", as_index=False)["uptime_percentage"]
-                              .mean().sort_values("uptime_percentage", ascending=False))
+            uptime_summary = (cube.slice("service_name")[["service_name", "uptime_percentage"]]
+                              .sort_values("uptime_percentage", ascending=False))
             fig = px.bar(uptime_summary, x="service_name", y="uptime_percentage",
                          title="Average Uptime by Service (%)",
                          text="uptime_percentage", labels={"uptime_percentage": "Uptime (%)"},
@@ -401,12 +402,11 @@ def dashboard_service(df: pd.DataFrame):
 
     h1, h2 = st.columns(2)
     if "report_date" in df_filtered.columns:
-        tmp = df_filtered.dropna(subset=["report_date"]).copy()
-        tmp["month"] = pd.to_datetime(tmp["report_date"], errors="coerce").dt.to_period("M").astype(str)
+        by_month = cube.slice("month")
 
         with h1:
-            if {"uptime_percentage"}.issubset(tmp.columns):
-                monthly_uptime = tmp.groupby("month", as_index=False)["uptime_percentage"].mean()
+            if "uptime_percentage" in df_filtered.columns:
+                monthly_uptime = by_month[["month", "uptime_percentage"]]
                 fig = px.line(monthly_uptime, x="month", y="uptime_percentage",
                               title="Average Uptime (Monthly)", markers=True,
                               labels={"uptime_percentage": "Uptime (%)"},
@@ -414,8 +414,8 @@ def dashboard_service(df: pd.DataFrame):
                 st.plotly_chart(fig, use_container_width=True, key="svc_hist_monthly_uptime")
 
         with h2:
-            if "estimated_cost_downtime" in tmp.columns:
-                monthly_cost = tmp.groupby("month", as_index=False)["estimated_cost_downtime"].sum()
+            if "estimated_cost_downtime" in df_filtered.columns:
+                monthly_cost = by_month[["month", "estimated_cost_downtime"]]
                 fig = px.bar(monthly_cost, x="month", y="estimated_cost_downtime",
                              title="Monthly Downtime Cost (RM)",
                              text="estimated_cost_downtime",
@@ -425,9 +425,9 @@ def dashboard_service(df: pd.DataFrame):
                 st.plotly_chart(fig, use_container_width=True, key="svc_hist_monthly_cost")
 
         # Multi-line: service uptime comparison over time
-        if {"service_name", "uptime_percentage"}.issubset(tmp.columns):
-            monthly_service = (tmp.groupby(["month", "service_name"], as_index=False)
-                               .agg(avg_uptime=("uptime_percentage", "mean")))
+        if {"service_name", "uptime_percentage"}.issubset(df_filtered.columns):
+            monthly_service = (cube.slice(["month", "service_name"])[["month", "service_name", "uptime_percentage"]]
+                               .rename(columns={"uptime_percentage": "avg_uptime"}))
             if not monthly_service.empty:
                 fig = px.line(monthly_service, x="month", y="avg_uptime", color="service_name",
                               markers=True, title="Service Uptime Comparison Over Time",
@@ -445,10 +445,8 @@ def dashboard_service(df: pd.DataFrame):
     pm1, pm2 = st.columns(2)
     with pm1:
         if {"report_date", "maintenance_type"}.issubset(df_filtered.columns):
-            tmp = df_filtered.dropna(subset=["report_date"]).copy()
-            tmp["month"] = pd.to_datetime(tmp["report_date"], errors="coerce").dt.to_period("M").astype(str)
-            scheduled = tmp[tmp["maintenance_type"].astype(str).str.lower() == "scheduled"]
-            monthly_sched = scheduled.groupby("month").size().reset_index(name="maintenance_count")
+            monthly_sched = (cube.slice("month").query("scheduled_count > 0")[["month", "scheduled_count"]]
+                             .rename(columns={"scheduled_count": "maintenance_count"}))
             if not monthly_sched.empty:
                 fig = px.bar(
                     monthly_sched, x="month", y="maintenance_count",
@@ -466,11 +464,11 @@ def dashboard_service(df: pd.DataFrame):
 
     with pm2:
         if {"service_name", "maintenance_type", "downtime_minutes"}.issubset(df_filtered.columns):
-            planned = df_filtered[df_filtered["maintenance_type"].astype(str).str.lower() == "scheduled"].copy()
+            planned = cube.slice("service_name").query("scheduled_count > 0")
             if not planned.empty:
-                planned["downtime_minutes"] = _to_num(planned["downtime_minutes"])
-                downtime_summary = (planned.groupby("service_name", as_index=False)["downtime_minutes"]
-                                    .sum().sort_values("downtime_minutes", ascending=False))
+                downtime_summary = (planned[["service_name", "scheduled_downtime_minutes"]]
+                                    .rename(columns={"scheduled_downtime_minutes": "downtime_minutes"})
+                                    .sort_values("downtime_minutes", ascending=False))
                 fig = px.bar(
                     downtime_summary, x="service_name", y="downtime_minutes",
                     title="Planned Downtime Duration by Service",
@@ -493,18 +491,16 @@ def dashboard_service(df: pd.DataFrame):
     st.markdown("### 🚨 Emergency Changes")
 
     # Normalize change_type if dataset uses maintenance_type
-    df_ec = df_filtered.copy()
-    if "change_type" not in df_ec.columns and "maintenance_type" in df_ec.columns:
-        df_ec["change_type"] = df_ec["maintenance_type"]
+    # (the cube's emergency_* measures read change_type, falling back to maintenance_type)
+    ec_cols = set(df_filtered.columns)
+    if "change_type" not in ec_cols and "maintenance_type" in ec_cols:
+        ec_cols.add("change_type")
 
     ec1, ec2 = st.columns(2)
     with ec1:
         need = {"report_date", "change_type"}
-        if need.issubset(df_ec.columns):
-            t = df_ec.dropna(subset=["report_date"]).copy()
-            t["month"] = pd.to_datetime(t["report_date"], errors="coerce").dt.to_period("M").astype(str)
-            emer = t[t["change_type"].astype(str).str.lower() == "emergency"]
-            monthly = emer.groupby("month", as_index=False).size().rename(columns={"size": "emergency_count"})
+        if need.issubset(ec_cols):
+            monthly = cube.slice("month").query("emergency_count > 0")[["month", "emergency_count"]]
             if not monthly.empty:
                 fig = px.bar(
                     monthly, x="month", y="emergency_count",
@@ -522,18 +518,12 @@ def dashboard_service(df: pd.DataFrame):
 
     with ec2:
         need = {"report_date", "change_type", "uptime_percentage", "downtime_minutes"}
-        if need.issubset(df_ec.columns):
-            t = df_ec.copy()
-            emer = t[t["change_type"].astype(str).str.lower() == "emergency"].copy()
+        if need.issubset(ec_cols):
+            emer = cube.slice("month").query("emergency_count > 0")
             if not emer.empty:
-                emer["report_date"] = pd.to_datetime(emer["report_date"], errors="coerce")
-                emer["month"] = emer["report_date"].dt.to_period("M").astype(str)
-                emer["uptime_percentage"] = _to_num(emer["uptime_percentage"])
-                emer["downtime_minutes"] = _to_num(emer["downtime_minutes"])
-                impact = emer.groupby("month", as_index=False).agg(
-                    avg_uptime=("uptime_percentage", "mean"),
-                    total_downtime=("downtime_minutes", "sum")
-                )
+                impact = emer[["month", "emergency_uptime_percentage", "emergency_downtime_minutes"]].rename(
+                    columns={"emergency_uptime_percentage": "avg_uptime",
+                             "emergency_downtime_minutes": "total_downtime"})
 
                 # Show line (uptime) overlayed with bars (downtime) in one figure for compact view
                 fig = px.bar(
@@ -561,10 +551,8 @@ def dashboard_service(df: pd.DataFrame):
     with sr1:
         need = {"service_name", "recovery_time_minutes"}
         if need.issubset(df_filtered.columns):
-            t = df_filtered.copy()
-            t["recovery_time_minutes"] = _to_num(t["recovery_time_minutes"])
-            mttr = (t.groupby("service_name", as_index=False)["recovery_time_minutes"]
-                    .mean().rename(columns={"recovery_time_minutes": "avg_recovery"})
+            mttr = (cube.slice("service_name")[["service_name", "recovery_time_minutes"]]
+                    .rename(columns={"recovery_time_minutes": "avg_recovery"})
                     .sort_values("avg_recovery", ascending=False))
             if not mttr.empty:
                 fig = px.bar(
@@ -585,12 +573,8 @@ def dashboard_service(df: pd.DataFrame):
     with sr2:
         need = {"service_name", "recovery_time_minutes", "rto_target_minutes"}
         if need.issubset(df_filtered.columns):
-            t = df_filtered.copy()
-            t["recovery_time_minutes"] = _to_num(t["recovery_time_minutes"])
-            t["rto_target_minutes"] = _to_num(t["rto_target_minutes"])
-            t["rto_breach"] = t["recovery_time_minutes"] > t["rto_target_minutes"]
-            rto = (t.groupby("service_name", as_index=False)["rto_breach"]
-                   .sum().rename(columns={"rto_breach": "breaches"})
+            rto = (cube.slice("service_name")[["service_name", "rto_breaches"]]
+                   .rename(columns={"rto_breaches": "breaches"})
                    .sort_values("breaches", ascending=False))
             if not rto.empty:
                 fig = px.bar(
@@ -610,11 +594,7 @@ def dashboard_service(df: pd.DataFrame):
 
     # Monthly MTTR trend (full width)
     if {"report_date", "recovery_time_minutes"}.issubset(df_filtered.columns):
-        t = df_filtered.dropna(subset=["report_date"]).copy()
-        t["report_date"] = pd.to_datetime(t["report_date"], errors="coerce")
-        t["month"] = t["report_date"].dt.to_period("M").astype(str)
-        t["recovery_time_minutes"] = _to_num(t["recovery_time_minutes"])
-        monthly = t.groupby("month", as_index=False)["recovery_time_minutes"].mean().rename(columns={"recovery_time_minutes": "avg_mttr"})
+        monthly = cube.slice("month")[["month", "recovery_time_minutes"]].rename(columns={"recovery_time_minutes": "avg_mttr"})
         if not monthly.empty:
             fig = px.line(
                 monthly, x="month", y="avg_mttr", markers=True,
@@ -636,10 +616,8 @@ def dashboard_service(df: pd.DataFrame):
     with bi1:
         need = {"service_name", "estimated_cost_downtime"}
         if need.issubset(df_filtered.columns):
-            t = df_filtered.copy()
-            t["estimated_cost_downtime"] = _to_num(t["estimated_cost_downtime"])
-            df_cost = (t.groupby("service_name", as_index=False)["estimated_cost_downtime"]
-                       .sum().sort_values("estimated_cost_downtime", ascending=False))
+            df_cost = (cube.slice("service_name")[["service_name", "estimated_cost_downtime"]]
+                       .sort_values("estimated_cost_downtime", ascending=False))
             if not df_cost.empty:
                 fig = px.bar(
                     df_cost, x="service_name", y="estimated_cost_downtime",
@@ -700,6 +678,31 @@ def dashboard_service(df: pd.DataFrame):
     else:
         st.warning("⚠️ Missing required columns: service_name, recovery_time_minutes, rto_target_minutes")
 
+    # Downtime cost attribution (full width) — priced by the sidebar cost model
+    if {"downtime_minutes", "estimated_cost_downtime"} & set(df_filtered.columns):
+        attribution = cost_attribution(df_filtered, cost_model)
+        if attribution.dimensions:
+            dim = st.radio("Attribute downtime cost by", attribution.dimensions, horizontal=True,
+                           format_func=DIMENSION_LABELS.get, key="svc_bi_cost_dim")
+            by_dim = attribution.by(dim)
+            if dim == "month":
+                by_dim = by_dim.sort_values("month")
+            if not by_dim.empty and attribution.total:
+                fig = px.bar(
+                    by_dim, x=dim, y="cost",
+                    title=f"Downtime Cost by {DIMENSION_LABELS[dim]} (RM) — {COST_MODELS[cost_model]}",
+                    text="cost",
+                    hover_data={"share": ":.1%", "downtime_minutes": ":,.0f", "rm_per_min": ":,.2f"},
+                    labels={dim: DIMENSION_LABELS[dim], "cost": "Cost (RM)", "share": "Share of cost",
+                            "downtime_minutes": "Downtime (mins)", "rm_per_min": "RM/min"},
+                    color_discrete_sequence=PX_SEQ
+                )
+                fig.update_traces(texttemplate="RM %{text:,.0f}" if show_labels else None)
+                fig.update_layout(xaxis_tickangle=-15)
+                st.plotly_chart(fig, use_container_width=True, key="svc_bi_cost_attribution")
+            else:
+                st.info("No downtime cost to attribute for the selected filters.")
+
     # =========================================================
     # 🧩 Resource Utilization & Scalability (graphs only)
     # =========================================================
@@ -710,12 +713,8 @@ def dashboard_service(df: pd.DataFrame):
     with ru1:
         need = {"service_name", "cpu_utilization", "memory_utilization", "disk_utilization", "network_utilization"}
         if need.issubset(df_filtered.columns):
-            util = df_filtered.groupby("service_name", as_index=False).agg({
-                "cpu_utilization": "mean",
-                "memory_utilization": "mean",
-                "disk_utilization": "mean",
-                "network_utilization": "mean",
-            }).round(1)
+            util = cube.slice("service_name")[["service_name", "cpu_utilization", "memory_utilization",
+                                               "disk_utilization", "network_utilization"]].round(1)
             df_long = util.melt(id_vars="service_name", var_name="Resource", value_name="Utilization (%)")
             if not df_long.empty:
                 fig = px.bar(
@@ -733,11 +732,7 @@ def dashboard_service(df: pd.DataFrame):
     with ru2:
         need = {"service_name", "cpu_utilization", "incident_count", "downtime_minutes"}
         if need.issubset(df_filtered.columns):
-            corr = df_filtered.groupby("service_name", as_index=False).agg({
-                "cpu_utilization": "mean",
-                "incident_count": "sum",
-                "downtime_minutes": "sum",
-            })
+            corr = cube.slice("service_name")[["service_name", "cpu_utilization", "incident_count", "downtime_minutes"]]
             if not corr.empty:
                 fig = px.scatter(
                     corr, x="cpu_utilization", y="incident_count",
@@ -3,6 +3,9 @@ import streamlit as st
 import io
 import re
 import numpy as np
+from cleaning_diff import diff_frames, paged_dataframe, profile_raw, render_diff
+from dimension_encoding import arrow_safe_categorical, encode_dimensions
+from duplicate_index import build_index
 
 # --------- helpers ---------
 PLACEHOLDERS = {'#N/A','N/A','n/a','NA','null','NULL','########','#####','', ' ', '#VALUE!'}
@@ -29,7 +32,7 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
       - Lists/dicts/tuples in cells -> string
       - Pandas nullable Int64 -> float64 (preserve NaN)
       - datetimes -> naive datetime64[ns]
-      - categoricals -> string
+      - categoricals kept dictionary-encoded (labels as strings)
     """
     out = df.copy()
 
@@ -59,9 +62,9 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
         elif pd.api.types.is_datetime64_any_dtype(s):
             out[col] = pd.to_datetime(s, errors="coerce").dt.tz_localize(None)
 
-        # 4) categoricals -> string
-        elif pd.api.types.is_categorical_dtype(s):
-            out[col] = s.astype("string")
+        # 4) categoricals stay categorical (Arrow dictionary); only labels are stringified
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = arrow_safe_categorical(s)
 
     return out
 
@@ -71,23 +74,28 @@ def _dtype_table(df: pd.DataFrame, title: str) -> pd.DataFrame:
         title: [str(t) for t in df.dtypes.values]
     })
 
-def _strip_currency_commas(text: str) -> str:
-    """Remove currency symbols, commas, and parentheses-negatives -> -value."""
-    if text is None or (isinstance(text, float) and np.isnan(text)):
-        return text
-    s = str(text).strip()
-    s = (s.replace('RM', '').replace('rm', '')
-           .replace('MYR', '').replace('myr', '')
-           .replace(',', ''))
-    if re.match(r'^\(.*\)$', s):  # (1234) -> -1234
-        s = f"-{s[1:-1]}"
-    return s.strip()
+_CURRENCY_RE = r'RM|rm|MYR|myr|,'
+_UNIT_RE = r'(minutes?|mins?)'
+_NUMBER_RE = r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?'
+
+def _parse_number_series(s: pd.Series, strip: str = _CURRENCY_RE) -> pd.Series:
+    """
+    Vectorized currency / number parser -> float64 (NaN where unparseable).
+      - numeric columns pass straight through
+      - currency symbols (RM, MYR), thousands commas and `strip` tokens removed in one pass
+      - parentheses negatives: (1,234) -> -1234
+    Non-numbers are masked by one regex match and the rest cast in bulk (no per-row to_numeric).
+    """
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return pd.to_numeric(s, errors='coerce').astype('float64')
+    t = s.astype('string').str.replace(strip, '', regex=True).str.strip()
+    t = t.str.replace(r'^\((.*)\)$', r'-\1', regex=True).str.strip()
+    return t.where(t.str.fullmatch(_NUMBER_RE).fillna(False)).astype('float64')
 
 def _to_int_series(s: pd.Series) -> pd.Series:
     """Coerce minutes-like strings -> Int64 minutes."""
-    s = s.apply(_strip_currency_commas)
-    s = s.astype(str).str.replace(r'(minutes?|mins?)', '', regex=True).str.strip()
-    return pd.to_numeric(s, errors='coerce').round(0).astype('Int64')
+    vals = _parse_number_series(s, strip=f"{_CURRENCY_RE}|{_UNIT_RE}")
+    return vals.round(0).astype('Int64')
 
 def _parse_uptime_percent(s: pd.Series) -> pd.Series:
     """Keep uptime as float percent (e.g., 99.95). Handles %, comma, dot, and proportions."""
@@ -114,8 +122,9 @@ def _auto_parse_report_date(s: pd.Series) -> pd.Series:
 
 # --------- main cleaning pipeline ---------
 def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) -> pd.DataFrame:
-    # keep a RAW snapshot (exactly as uploaded)
-    raw_df_snapshot = df.copy(deep=True)
+    # keep a RAW snapshot (exactly as uploaded): a copy-on-write view, profiled once for the raw-vs-cleaned diff
+    raw_df_snapshot = df.copy(deep=False)
+    raw_profile = profile_raw(raw_df_snapshot)
     raw_filename = getattr(uploaded_file, "name", "service_availability.xlsx")
 
     st.success("✅ File successfully loaded!")
@@ -127,32 +136,32 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
 
     # a) number of rows and columns
     col1, col2 = st.columns(2)
-    col1.metric("Rows (Raw)", raw_df_snapshot.shape[0])
-    col2.metric("Columns (Raw)", raw_df_snapshot.shape[1])
+    col1.metric("Rows (Raw)", raw_profile.rows)
+    col2.metric("Columns (Raw)", len(raw_profile.columns))
 
     # b) total missing values
-    total_missing_raw = int(raw_df_snapshot.isnull().sum().sum())
+    total_missing_raw = raw_profile.total_missing
     m1, _m2 = st.columns(2)
     m1.metric("Total Missing Values (Raw)", total_missing_raw)
 
     # c) data types
     st.markdown("**Data Types (Raw)**")
-    st.dataframe(_dtype_table(raw_df_snapshot, "Raw dtypes"), use_container_width=True)
+    st.dataframe(raw_profile.dtype_table(), use_container_width=True)
 
     # d) missing value table
     col_mv, _ = st.columns([3, 1])
     with col_mv:
         st.markdown("**Missing Values by Column (Raw)**")
         st.dataframe(
-            raw_df_snapshot.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+            raw_profile.missing_table(),
             use_container_width=True
         )
 
     # e) duplicated rows
-    dup_count_raw = int(raw_df_snapshot.duplicated().sum())
+    dup_count_raw = raw_profile.duplicates
     st.write(f"**Duplicated Rows (Raw):** {dup_count_raw}")
     if dup_count_raw > 0:
-        st.dataframe(raw_df_snapshot[raw_df_snapshot.duplicated()], use_container_width=True)
+        paged_dataframe(raw_df_snapshot.iloc[raw_profile.duplicates_index.sample()], key="service_raw_dup_page")
 
     # f) datetime columns (raw)
     raw_datetime_cols = [c for c in raw_df_snapshot.columns if pd.api.types.is_datetime64_any_dtype(raw_df_snapshot[c])]
@@ -194,8 +203,7 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
             df[col] = _to_int_series(df[col])
 
     if 'estimated_cost_downtime' in df.columns:
-        s = df['estimated_cost_downtime'].apply(_strip_currency_commas)
-        df['estimated_cost_downtime'] = pd.to_numeric(s, errors='coerce').round(0).astype('Int64')
+        df['estimated_cost_downtime'] = _parse_number_series(df['estimated_cost_downtime']).round(0).astype('Int64')
 
     # 3) SLA / boolean-like coercions (only when ≥80% mappable)
     for col in df.columns:
@@ -227,10 +235,11 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
                        .dt.to_timestamp())
 
     # 6) Duplicates: drop exact row duplicates only
-    dup_count = int(df.duplicated().sum())
+    clean_dups = build_index(df)      # one row hash: count and filter
+    dup_count = clean_dups.count
     if dup_count:
         st.info(f"🔁 Dropping exact duplicate rows: {dup_count}")
-        df = df.drop_duplicates()
+        df = df[clean_dups.keep()]
 
     # 7) Final dtype stabilization
     for c in ["downtime_minutes","recovery_time_minutes","rto_target_minutes","incident_count","estimated_cost_downtime"]:
@@ -239,6 +248,9 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
     if 'uptime_percentage' in df.columns:
         df['uptime_percentage'] = df['uptime_percentage'].astype('Float64')
 
+    # Dimension columns -> categoricals (int codes + one copy of each label) for every downstream groupby/filter
+    df = encode_dimensions(df)
+
     # ==============================
     # ii. AFTER CLEANING
     # ==============================
@@ -250,7 +262,8 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
     ac2.metric("Columns (Cleaned)", df.shape[1])
 
     # b) total missing value
-    total_missing_clean = int(df.isnull().sum().sum())
+    diff = diff_frames(raw_profile, df, col_map)
+    total_missing_clean = int(diff.missing_table()["Missing"].sum())
     cm1, _cm2 = st.columns(2)
     cm1.metric("Total Missing Values (Cleaned)", total_missing_clean)
 
@@ -261,7 +274,7 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
     # d) missing value table
     st.markdown("**Missing Values by Column (Cleaned)**")
     st.dataframe(
-        df.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+        diff.missing_table(),
         use_container_width=True
     )
 
@@ -278,27 +291,7 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
     # ==============================
     st.subheader("🔍 Compare Raw Data vs Cleaned Data")
 
-    # Build dtype tables
-    dtypes_raw = _dtype_table(raw_df_snapshot, "Raw dtypes")
-    dtypes_clean = _dtype_table(df, "Cleaned dtypes")
-
-    # Add a normalized key for raw columns so they align with cleaned
-    dtypes_raw["Column (standardized)"] = dtypes_raw["Column"].map(col_map)
-    dtypes_clean = dtypes_clean.rename(columns={"Column": "Column (standardized)"})
-
-    # Merge on the standardized column name
-    dtype_compare = dtypes_raw.merge(dtypes_clean, on="Column (standardized)", how="outer")
-    dtype_compare = dtype_compare.rename(columns={"Column": "Raw Column"})
-
-    # Mark columns that existed in raw but not in cleaned as 'dropped'
-    dropped_mask = dtype_compare["Cleaned dtypes"].isna() & dtype_compare["Raw dtypes"].notna()
-    dtype_compare.loc[dropped_mask, "Cleaned dtypes"] = "dropped"
-
-    # Reorder for readability and fill remaining blanks
-    dtype_compare = dtype_compare[["Raw Column", "Column (standardized)", "Raw dtypes", "Cleaned dtypes"]].fillna("—")
-
-    st.markdown("**Data Types (Aligned by Standardized Name)**")
-    st.dataframe(dtype_compare, use_container_width=True)
+    render_diff(diff)
 
     # b) sample data — STACKED (Raw on top, Cleaned below)
     st.markdown("**Sample – Raw Data**")
@@ -338,25 +331,11 @@ def data_cleaning_service_availability(df: pd.DataFrame, uploaded_file=None) ->
     st.subheader("🔎 Full Table Viewer")
     view_option = st.radio("Select which data to view:", ("Raw Data", "Cleaned Data"), horizontal=True)
     with st.expander("📂 Click to view full table"):
-        if view_option == "Raw Data" and uploaded_file is not None:
-            file_name = getattr(uploaded_file, "name", "").lower()
-            try:
-                if file_name.endswith(".csv"):
-                    raw_df = pd.read_csv(uploaded_file)
-                elif file_name.endswith((".xlsx", ".xls")):
-                    raw_df = pd.read_excel(uploaded_file, engine="openpyxl")
-                else:
-                    st.error("❌ Unsupported file format. Please upload CSV or Excel.")
-                    raw_df = None
-
-                if raw_df is not None:
-                    st.markdown("### 🗃️ Raw Data (Full Table)")
-                    st.dataframe(raw_df, use_container_width=True)
-
-            except Exception as e:
-                st.error(f"⚠️ Could not read raw file: {e}")
+        if view_option == "Raw Data":
+            st.markdown("### 🗃️ Raw Data (Full Table)")
+            paged_dataframe(raw_df_snapshot, key="service_raw_page")
         else:
             st.markdown("### 🧼 Cleaned Data (Full Table)")
-            st.dataframe(df, use_container_width=True)
+            paged_dataframe(df, key="service_clean_page")
 
     return df
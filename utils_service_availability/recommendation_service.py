@@ -14,48 +14,30 @@ from utils_service_availability.recommendation_service_availability.emergency_ch
 from utils_service_availability.recommendation_service_availability.service_recovery import service_recovery
 from utils_service_availability.recommendation_service_availability.business_impact import business_impact
 from utils_service_availability.recommendation_service_availability.resource_utilization import resource_utilization
+from utils_service_availability.results_bus import section_results
+from date_range_filter import date_range_filter
 
 
 def recommendation_service(df):
 
     if 'created_time' in df.columns and not df['created_time'].isna().all():
-        df['created_time'] = pd.to_datetime(df['created_time'], errors='coerce')
-        df['created_date'] = df['created_time'].dt.date
-        min_date = df['created_date'].min()
-        max_date = df['created_date'].max()
-
         st.markdown("---")
         st.subheader("Select Date Range")
 
-        col1, col2 = st.columns(2)
-        with col1:
-            start_date = st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date, key="start_date_picker")
-        with col2:
-            end_date = st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date, key="end_date_picker")
-
-        st.markdown(f"🗓️ **Selected Range:** `{start_date.strftime('%d/%m/%Y')}` → `{end_date.strftime('%d/%m/%Y')}`")
-
-        reset_filter = st.button("🔁 Reset to Default", key="reset_button_2")
-
-        if reset_filter:
-            df_filtered = df.copy()
-            st.info("Showing all available data (no date filter applied).")
-        elif start_date > end_date:
-            st.warning("⚠️ Start date is after end date. Please select a valid range.")
-            return
-        else:
-            df_filtered = df[(df['created_date'] >= start_date) & (df['created_date'] <= end_date)]
-    else:
-        df_filtered = df.copy()
+    df_filtered = date_range_filter(df)
+    if df_filtered is None:
+        return
 
 #------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
     col1, col2, col3, col4 = st.columns(4)
 
-    avg_uptime = df["uptime_percentage"].mean() if "uptime_percentage" in df.columns else np.nan
-    total_dt   = df["downtime_minutes"].sum() if "downtime_minutes" in df.columns else np.nan
-    total_inc  = df["incident_count"].sum() if "incident_count" in df.columns else np.nan
-    total_cost = df["estimated_cost_downtime"].sum() if "estimated_cost_downtime" in df.columns else np.nan
+    # Overview KPIs as published on the results bus (the executive summary reads the same entry)
+    kpi = section_results(df, "executive_summary")
+    avg_uptime = kpi["avg_uptime"]
+    total_dt   = kpi["total_downtime"]
+    total_inc  = kpi["total_incidents"]
+    total_cost = kpi["total_cost"]
 
     col1.metric("Average Uptime (%)", f"{avg_uptime:.2f}%" if pd.notna(avg_uptime) else "N/A")
     col2.metric("Total Downtime (mins)", f"{total_dt:,.0f}" if pd.notna(total_dt) else "N/A")
@@ -4,6 +4,8 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 
+from utils_service_availability.cost_attribution import cost_attribution
+
 # ============================
 # Company visual theme
 # ============================
@@ -38,12 +40,11 @@ def business_impact(df: pd.DataFrame):
     if "estimated_cost_downtime" in df_num.columns:
         df_num["estimated_cost_downtime"] = _to_num(df_num["estimated_cost_downtime"])
 
+    # Reported downtime cost attributed by service / impact tier (shared with the dashboard and report)
+    attribution = cost_attribution(df, "reported")
     avg_rm_per_min = np.nan
     if {"downtime_minutes", "estimated_cost_downtime"}.issubset(df_num.columns):
-        total_cost_all = float(df_num["estimated_cost_downtime"].sum(skipna=True))
-        total_min_all = float(df_num["downtime_minutes"].sum(skipna=True))
-        if total_min_all > 0:
-            avg_rm_per_min = total_cost_all / total_min_all  # RM per downtime minute (derived from your data)
+        avg_rm_per_min = attribution.rate  # RM per downtime minute (derived from your data)
 
     # --------------------------------------------------------
     # A. Total Estimated Downtime Cost per Service
@@ -55,12 +56,8 @@ def business_impact(df: pd.DataFrame):
         else:
             # include minutes so we can use them in cost calcs
             df_cost = (
-                df_num.groupby("service_name", as_index=False)
-                .agg({
-                    "downtime_minutes": "sum",
-                    "estimated_cost_downtime": "sum"
-                })
-                .sort_values("estimated_cost_downtime", ascending=False)
+                attribution.by("service_name")
+                .rename(columns={"cost": "estimated_cost_downtime"})[["service_name", "downtime_minutes", "estimated_cost_downtime"]]
             )
 
             fig = px.bar(
@@ -169,13 +166,13 @@ f"""**What this graph is:** A **bar chart** showing **total estimated downtime c
             has_cost = "estimated_cost_downtime" in df_num.columns
             impact_cost = None
             if has_cost:
-                impact_cost = (
-                    df_num.groupby("business_impact", as_index=False)
-                    .agg(avg_cost=("estimated_cost_downtime", "mean"),
-                         total_cost=("estimated_cost_downtime", "sum"),
-                         count=("estimated_cost_downtime", "size"))
-                    .sort_values("total_cost", ascending=False)
-                )
+                tiers = attribution.by("business_impact")
+                impact_cost = pd.DataFrame({
+                    "business_impact": tiers["business_impact"],
+                    "avg_cost": tiers["cost"] / tiers["cost_rows"].where(tiers["cost_rows"] > 0),
+                    "total_cost": tiers["cost"],
+                    "count": tiers["rows"].astype(int),
+                })
 
             st.markdown("### Analysis – Business Impact Levels")
             if impact_cost is not None:
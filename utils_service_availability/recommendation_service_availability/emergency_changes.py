@@ -5,6 +5,9 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 
+from utils_service_availability.availability_cube import availability_cube
+from utils_service_availability.results_bus import section_results
+
 # Company visual theme (white + blue)
 px.defaults.template = "plotly_white"
 PRIMARY_BLUE = "#004C99"
@@ -30,7 +33,33 @@ def _to_num(s):
 # ============================================================
 # 7️⃣ Emergency Changes and Their Impact
 # ============================================================
+def headline_metrics(df: pd.DataFrame) -> dict:
+    """Emergency-change figures this section publishes (read here, by the executive summary and the report)."""
+    if not {"change_type", "maintenance_type"} & set(df.columns):
+        return {}
+    cube = availability_cube(df)      # emergency_* reads change_type, falling back to maintenance_type
+    if not cube.has("emergency_count"):
+        return {}
+    monthly = cube.slice("month").query("emergency_count > 0")
+    monthly = monthly.reindex(columns=["month", "emergency_count", "emergency_downtime_minutes",
+                                       "emergency_estimated_cost_downtime", "emergency_uptime_percentage"])
+    out = {
+        "monthly": monthly,
+        "emergency_count": float(monthly["emergency_count"].sum()),
+        "emergency_downtime_minutes": float(monthly["emergency_downtime_minutes"].sum()),
+        "emergency_cost": float(monthly["emergency_estimated_cost_downtime"].sum()),
+        "avg_monthly_emergency_downtime": float(monthly["emergency_downtime_minutes"].mean()) if not monthly.empty else np.nan,
+    }
+    mins = out["emergency_downtime_minutes"]
+    out["emergency_rm_per_min"] = out["emergency_cost"] / mins if mins > 0 else np.nan
+    if not monthly.empty:
+        peak = monthly.loc[monthly["emergency_count"].idxmax()]
+        out.update(peak_emergency_month=peak["month"], peak_emergency_count=float(peak["emergency_count"]))
+    return out
+
+
 def emergency_changes(df: pd.DataFrame):
+    results = section_results(df, "emergency_changes")
 
     # ----------------------------------------------
     # 7a. Emergency Changes Made to Services
@@ -47,25 +76,22 @@ def emergency_changes(df: pd.DataFrame):
             df["report_date"] = pd.to_datetime(df["report_date"], errors="coerce")
             df["month"] = df["report_date"].dt.to_period("M").astype(str)
 
-            emer_df = df[df["change_type"].astype(str).str.lower().eq("emergency")].copy()
-            if emer_df.empty:
+            by_month = results["monthly"]
+            if by_month.empty:
                 st.info("✅ No emergency changes recorded in this dataset.")
             else:
-                monthly = emer_df.groupby("month", as_index=False)["change_type"].count()
-                monthly = monthly.rename(columns={"change_type": "emergency_count"})
+                monthly = by_month[["month", "emergency_count"]]
 
                 # (Optional) compute RM/min for emergencies if cost & downtime available
-                has_costmins = {"estimated_cost_downtime", "downtime_minutes"}.issubset(emer_df.columns)
+                has_costmins = {"estimated_cost_downtime", "downtime_minutes"}.issubset(df.columns)
                 avg_rm_per_min_em = np.nan
                 total_em_rm = np.nan
                 total_em_min = np.nan
                 if has_costmins:
-                    emer_df["estimated_cost_downtime"] = _to_num(emer_df["estimated_cost_downtime"])
-                    emer_df["downtime_minutes"] = _to_num(emer_df["downtime_minutes"])
-                    total_em_rm = float(emer_df["estimated_cost_downtime"].sum())
-                    total_em_min = float(emer_df["downtime_minutes"].sum())
+                    total_em_rm = results["emergency_cost"]
+                    total_em_min = results["emergency_downtime_minutes"]
                     if total_em_min > 0:
-                        avg_rm_per_min_em = total_em_rm / total_em_min
+                        avg_rm_per_min_em = results["emergency_rm_per_min"]
 
                 # --- Graph: Emergency changes per month (Mesiniaga theme)
                 fig = px.bar(
@@ -118,16 +144,8 @@ def emergency_changes(df: pd.DataFrame):
 
                 # Compute average downtime per emergency month for use in CIO table
                 avg_d = np.nan
-                if "downtime_minutes" in emer_df.columns:
-                    tmp_d = (
-                        emer_df
-                        .copy()
-                        .assign(downtime_minutes=_to_num(emer_df["downtime_minutes"]))
-                        .groupby("month", as_index=False)["downtime_minutes"]
-                        .sum()
-                    )
-                    if not tmp_d.empty:
-                        avg_d = float(tmp_d["downtime_minutes"].mean())
+                if "downtime_minutes" in df.columns:
+                    avg_d = results["avg_monthly_emergency_downtime"]
 
                 cio_7a = {
                     "cost": f"""
@@ -174,27 +192,21 @@ def emergency_changes(df: pd.DataFrame):
             df["change_type"] = df["maintenance_type"]
 
         if required.issubset(df.columns):
-            emer_df = df[df["change_type"].astype(str).str.lower().eq("emergency")].copy()
-            if emer_df.empty:
+            if results["monthly"].empty:
                 st.info("✅ No emergency change data found for impact analysis.")
             else:
-                emer_df["report_date"] = pd.to_datetime(emer_df["report_date"], errors="coerce")
-                emer_df["month"] = emer_df["report_date"].dt.to_period("M").astype(str)
-                emer_df["uptime_percentage"] = _to_num(emer_df["uptime_percentage"])
-                emer_df["downtime_minutes"] = _to_num(emer_df["downtime_minutes"])
-
-                impact = emer_df.groupby("month", as_index=False).agg(
-                    avg_uptime=("uptime_percentage", "mean"),
-                    total_downtime=("downtime_minutes", "sum")
+                impact = (
+                    results["monthly"][["month", "emergency_uptime_percentage", "emergency_downtime_minutes"]]
+                    .rename(columns={"emergency_uptime_percentage": "avg_uptime",
+                                     "emergency_downtime_minutes": "total_downtime"})
                 )
 
                 # Calculate RM/min for emergencies if cost column exists
                 avg_rm_per_min = np.nan
                 total_cost = np.nan
                 tot_min_all = float(impact["total_downtime"].sum())
-                if "estimated_cost_downtime" in emer_df.columns:
-                    emer_df["estimated_cost_downtime"] = _to_num(emer_df["estimated_cost_downtime"])
-                    total_cost = float(emer_df["estimated_cost_downtime"].sum())
+                if "estimated_cost_downtime" in df.columns:
+                    total_cost = results["emergency_cost"]
                     if tot_min_all > 0:
                         avg_rm_per_min = total_cost / tot_min_all
 
@@ -5,6 +5,9 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 
+from utils_service_availability.availability_cube import availability_cube
+from utils_service_availability.results_bus import section_results
+
 # --- Mesiniaga theme ---
 px.defaults.template = "plotly_white"
 MES_BLUE = ["#004C99", "#007ACC", "#3399FF", "#66B2FF", "#9BD1FF"]
@@ -45,20 +48,7 @@ def _to_num(x):
     return pd.to_numeric(x, errors="coerce")
 
 
-def executive_summary(df: pd.DataFrame):
-    """
-    IT Service Availability – Executive Summary (compatible with the attached dataset)
-    Columns detected and used when present:
-      - report_date, service_name, service_category, service_owner, stakeholder
-      - uptime_percentage, downtime_minutes, incident_count, major_incident, root_cause
-      - recovery_time_minutes, rto_target_minutes, sla_target, sla_met
-      - maintenance_type, maintenance_window, maintenance_impact
-      - business_impact, estimated_cost_downtime
-      - cpu_utilization, memory_utilization, disk_utilization, network_utilization
-      - capacity_status, improvement_action, month
-    """
-
-    # ------------------ Prep ------------------
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     if "Unnamed: 0" in df.columns:
         df = df.drop(columns=["Unnamed: 0"])
@@ -91,6 +81,51 @@ def executive_summary(df: pd.DataFrame):
     ]:
         if c in df.columns:
             df[c] = df[c].clip(lower=0)
+    return df
+
+
+def headline_metrics(df: pd.DataFrame) -> dict:
+    """Overview KPIs published on the results bus (read here, by the page KPI cards and the report KPI page)."""
+    d = _prepare(df)
+    cube = availability_cube(d)
+
+    def total(col):
+        return cube.total(col) if col in d.columns and d[col].notna().any() else np.nan
+
+    return {
+        "avg_uptime": total("uptime_percentage"),
+        "total_downtime": total("downtime_minutes"),
+        "total_incidents": total("incident_count"),
+        "total_cost": total("estimated_cost_downtime"),
+        "services": int(d["service_name"].nunique()) if "service_name" in d.columns else np.nan,
+    }
+
+
+def executive_summary(df: pd.DataFrame):
+    """
+    IT Service Availability – Executive Summary (compatible with the attached dataset)
+    Columns detected and used when present:
+      - report_date, service_name, service_category, service_owner, stakeholder
+      - uptime_percentage, downtime_minutes, incident_count, major_incident, root_cause
+      - recovery_time_minutes, rto_target_minutes, sla_target, sla_met
+      - maintenance_type, maintenance_window, maintenance_impact
+      - business_impact, estimated_cost_downtime
+      - cpu_utilization, memory_utilization, disk_utilization, network_utilization
+      - capacity_status, improvement_action, month
+    """
+
+    # Published results for this dataset (keyed on the frame as handed in, before prep)
+    kpi = section_results(df, "executive_summary")
+    published = {
+        name: section_results(df, name)
+        for name in ("incident_analysis", "planned_maintenance", "emergency_changes", "resource_utilization")
+    }
+
+    # ------------------ Prep ------------------
+    df = _prepare(df)
+
+    # Service × month cube of the prepared frame: KPIs and per-service / per-category views slice it
+    cube = availability_cube(df)
 
     # ============================================================
     # 1️⃣ Key KPI Overview (cards + clear line breaks in Analysis)
@@ -100,26 +135,10 @@ def executive_summary(df: pd.DataFrame):
 
         col1, col2, col3, col4 = st.columns(4)
 
-        avg_uptime = (
-            df["uptime_percentage"].mean()
-            if "uptime_percentage" in df.columns
-            else np.nan
-        )
-        total_dt = (
-            df["downtime_minutes"].sum()
-            if "downtime_minutes" in df.columns
-            else np.nan
-        )
-        total_inc = (
-            df["incident_count"].sum()
-            if "incident_count" in df.columns
-            else np.nan
-        )
-        total_cost = (
-            df["estimated_cost_downtime"].sum()
-            if "estimated_cost_downtime" in df.columns
-            else np.nan
-        )
+        avg_uptime = kpi["avg_uptime"]
+        total_dt = kpi["total_downtime"]
+        total_inc = kpi["total_incidents"]
+        total_cost = kpi["total_cost"]
 
         st.markdown("#### Analysis")
         bullets = []
@@ -242,8 +261,7 @@ def executive_summary(df: pd.DataFrame):
     if {"service_name", "downtime_minutes"}.issubset(df.columns):
         with st.expander("📌 Total Downtime by Service", expanded=False):
             svc_down = (
-                df.groupby("service_name", as_index=False)["downtime_minutes"]
-                .sum()
+                cube.slice("service_name")[["service_name", "downtime_minutes"]]
                 .sort_values("downtime_minutes", ascending=False)
             )
             if not svc_down.empty:
@@ -328,10 +346,9 @@ def executive_summary(df: pd.DataFrame):
     }.issubset(df.columns):
         with st.expander("📌 Recovery Time vs RTO", expanded=False):
             mttr = (
-                df.groupby("service_name", as_index=False)[
-                    ["recovery_time_minutes", "rto_target_minutes"]
+                cube.slice("service_name")[
+                    ["service_name", "recovery_time_minutes", "rto_target_minutes"]
                 ]
-                .mean()
                 .dropna(subset=["recovery_time_minutes", "rto_target_minutes"])
             )
             if not mttr.empty:
@@ -420,10 +437,9 @@ def executive_summary(df: pd.DataFrame):
             "📌 Cost of Downtime by Service Category", expanded=False
         ):
             cat_cost = (
-                df.groupby("service_category", as_index=False)[
-                    "estimated_cost_downtime"
+                cube.slice("service_category")[
+                    ["service_category", "estimated_cost_downtime"]
                 ]
-                .sum()
                 .sort_values("estimated_cost_downtime", ascending=False)
             )
             if not cat_cost.empty:
@@ -508,8 +524,7 @@ def executive_summary(df: pd.DataFrame):
     if {"service_name", "sla_met"}.issubset(df.columns):
         with st.expander("📌 SLA Compliance by Service", expanded=False):
             sla = (
-                df.groupby("service_name", as_index=False)["sla_met"]
-                .mean()
+                cube.slice("service_name")[["service_name", "sla_met"]]
                 .assign(sla_pct=lambda x: 100 * x["sla_met"])
             )
             if not sla.empty:
@@ -612,6 +627,42 @@ def executive_summary(df: pd.DataFrame):
             bullets.append(
                 "• **Recovery Performance** – MTTR vs RTO reveals which services breach response objectives."
             )
+
+        # Headline figures published by the later sections (same values they show)
+        inc = published["incident_analysis"]
+        if inc.get("peak_day") is not None:
+            bullets.append(
+                f"• **Incident Peaks** – {inc['total_incidents']:,.0f} incidents in total, averaging "
+                f"{inc['avg_daily_incidents']:.1f} per day and peaking at {inc['peak_day_incidents']:,.0f} on "
+                f"{_fmt_date(inc['peak_day'])}"
+                + (f"; top root cause by cost is **{inc['top_root_cause']}** (RM {inc['top_root_cause_cost']:,.0f})."
+                   if "top_root_cause" in inc else ".")
+            )
+        pm = published["planned_maintenance"]
+        if pm.get("scheduled_count"):
+            bullets.append(
+                f"• **Planned Maintenance** – {pm['scheduled_count']:,.0f} scheduled activities"
+                + (f" accounting for {pm['scheduled_downtime_minutes']:,.0f} minutes and RM {pm['scheduled_cost']:,.0f}"
+                   if pd.notna(pm["scheduled_downtime_minutes"]) and pd.notna(pm["scheduled_cost"]) else "")
+                + (f"; busiest month {pm['peak_maintenance_month']} ({pm['peak_maintenance_count']:,.0f})."
+                   if "peak_maintenance_month" in pm else ".")
+            )
+        ec = published["emergency_changes"]
+        if ec.get("emergency_count"):
+            bullets.append(
+                f"• **Emergency Changes** – {ec['emergency_count']:,.0f} emergency changes causing "
+                f"{ec['emergency_downtime_minutes']:,.0f} minutes of downtime (RM {ec['emergency_cost']:,.0f})"
+                + (f"; peak month {ec['peak_emergency_month']} with {ec['peak_emergency_count']:,.0f}."
+                   if "peak_emergency_month" in ec else ".")
+            )
+        ru = published["resource_utilization"]
+        if "peak_resource" in ru:
+            bullets.append(
+                f"• **Resource Headroom** – Highest average load is "
+                f"{ru['peak_resource'].replace('_utilization', '').upper()} on **{ru['peak_resource_service']}** "
+                f"at {ru['peak_resource_pct']:.1f}%"
+                + (f"; portfolio CPU averages {ru['avg_cpu_utilization']:.1f}%." if pd.notna(ru.get("avg_cpu_utilization")) else ".")
+            )
         if bullets:
             st.markdown("<br>".join(bullets), unsafe_allow_html=True)
         else:
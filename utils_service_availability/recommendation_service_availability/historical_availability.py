@@ -5,6 +5,9 @@ import plotly.express as px
 import numpy as np
 from textwrap import dedent  # for cleaning indentation in markdown strings
 
+from utils_service_availability.availability_engine import availability
+from utils_service_availability.availability_cube import availability_cube
+
 
 # ============================================================
 # Helper Function for CIO Tables
@@ -34,12 +37,8 @@ def historical_availability(df: pd.DataFrame):
             df["month"] = df["report_date"].dt.to_period("M").astype(str)
 
             monthly = (
-                df.groupby("month")
-                .agg(
-                    avg_uptime=("uptime_percentage", "mean"),
-                    total_cost=("estimated_cost_downtime", "sum"),
-                )
-                .reset_index()
+                availability_cube(df).slice("month")[["month", "uptime_percentage", "estimated_cost_downtime"]]
+                .rename(columns={"uptime_percentage": "avg_uptime", "estimated_cost_downtime": "total_cost"})
                 .sort_values("month")
             )
 
@@ -187,10 +186,20 @@ def historical_availability(df: pd.DataFrame):
             df["report_date"] = pd.to_datetime(df["report_date"], errors="coerce")
             df["month"] = df["report_date"].dt.to_period("M").astype(str)
 
-            monthly_service = (
-                df.groupby(["month", "service_name"], as_index=False)
-                .agg(avg_uptime=("uptime_percentage", "mean"))
-            )
+            if "downtime_minutes" in df.columns:
+                # exact monthly uptime per service from merged outage intervals
+                monthly_service = (
+                    availability(df, "M")
+                    .rename(columns={"period": "month", "uptime_pct": "avg_uptime"})
+                    [["month", "service_name", "avg_uptime"]]
+                    .sort_values(["service_name", "month"])
+                )
+            else:
+                monthly_service = (
+                    availability_cube(df).slice(["month", "service_name"])
+                    [["month", "service_name", "uptime_percentage"]]
+                    .rename(columns={"uptime_percentage": "avg_uptime"})
+                )
 
             fig = px.line(
                 monthly_service,
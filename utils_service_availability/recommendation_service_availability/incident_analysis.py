@@ -6,6 +6,9 @@ import pandas as pd
 import numpy as np
 import uuid  # ✅ Added to generate unique keys
 
+from utils_service_availability.availability_cube import availability_cube
+from utils_service_availability.results_bus import section_results
+
 # ============================================================
 # Helper: Generate unique chart keys
 # ============================================================
@@ -36,10 +39,56 @@ except Exception:
     pass
 
 
+# ============================================================
+# Published headline figures (results bus)
+# ============================================================
+def headline_metrics(df: pd.DataFrame) -> dict:
+    """Incident figures this section publishes (read here, by the executive summary and the report)."""
+    out = {}
+    if {"report_date", "incident_count"}.issubset(df.columns):
+        daily = (
+            pd.to_numeric(df["incident_count"], errors="coerce")
+            .groupby(pd.to_datetime(df["report_date"], errors="coerce"))
+            .sum()
+            .rename_axis("report_date")
+            .reset_index(name="daily_incidents")
+        )
+        peak = daily.loc[daily["daily_incidents"].idxmax()] if not daily.empty else None
+        out.update(
+            daily=daily,
+            total_incidents=float(pd.to_numeric(df["incident_count"], errors="coerce").sum()),
+            avg_daily_incidents=float(daily["daily_incidents"].mean()) if not daily.empty else 0.0,
+            peak_day=peak["report_date"] if peak is not None else None,
+            peak_day_incidents=float(peak["daily_incidents"]) if peak is not None else 0.0,
+        )
+    if {"service_name", "incident_count", "estimated_cost_downtime"}.issubset(df.columns):
+        by_service = (
+            availability_cube(df).slice("service_name")[["service_name", "incident_count", "estimated_cost_downtime"]]
+            .rename(columns={"incident_count": "total_incidents", "estimated_cost_downtime": "total_cost"})
+            .sort_values("total_cost", ascending=False)
+        )
+        out["by_service"] = by_service
+        if not by_service.empty:
+            top = by_service.loc[by_service["total_incidents"].idxmax()]
+            out.update(top_incident_service=top["service_name"], top_incident_service_incidents=float(top["total_incidents"]))
+    if {"root_cause", "incident_count", "estimated_cost_downtime"}.issubset(df.columns):
+        root_causes = (
+            df.groupby("root_cause", as_index=False)
+            .agg(total_incidents=("incident_count", "sum"),
+                 total_cost=("estimated_cost_downtime", "sum"))
+            .sort_values("total_cost", ascending=False)
+        )
+        out["root_causes"] = root_causes
+        if not root_causes.empty:
+            out.update(top_root_cause=root_causes.iloc[0]["root_cause"], top_root_cause_cost=float(root_causes.iloc[0]["total_cost"]))
+    return out
+
+
 # ============================================================
 # INCIDENT ANALYSIS DASHBOARD SECTION
 # ============================================================
 def incident_analysis(df: pd.DataFrame):
+    results = section_results(df, "incident_analysis")
 
     # ============================================================
     # 5a. Summary of Incidents or Outages
@@ -67,10 +116,12 @@ def incident_analysis(df: pd.DataFrame):
             )
             st.plotly_chart(fig, use_container_width=True, key=unique_key("incident_summary_chart"))
 
-            total_incidents = df["incident_count"].sum()
-            daily = df.groupby("report_date")["incident_count"].sum().reset_index(name="daily_incidents")
-            avg_daily = daily["daily_incidents"].mean() if not daily.empty else 0.0
-            max_day_row = daily.loc[daily["daily_incidents"].idxmax()] if not daily.empty else None
+            total_incidents = results["total_incidents"]
+            avg_daily = results["avg_daily_incidents"]
+            max_day_row = (
+                {"report_date": results["peak_day"], "daily_incidents": results["peak_day_incidents"]}
+                if results["peak_day"] is not None else None
+            )
 
             st.markdown("### Analysis — Incident Summary")
             if max_day_row is not None:
@@ -140,12 +191,7 @@ f"""**What this graph is:** A **multi-line time series** showing **daily inciden
     with st.expander("📌 Impact Analysis of Incidents on Users and Business Operations"):
         required = {"service_name", "incident_count", "estimated_cost_downtime", "business_impact"}
         if required.issubset(df.columns):
-            impact_df = (
-                df.groupby("service_name", as_index=False)
-                .agg(total_incidents=("incident_count", "sum"),
-                     total_cost=("estimated_cost_downtime", "sum"))
-                .sort_values("total_cost", ascending=False)
-            )
+            impact_df = results["by_service"]
 
             fig = px.bar(
                 impact_df.head(10),
@@ -228,12 +274,7 @@ f"""**What this graph is:** A **ranked bar chart** of **total downtime cost (RM)
     with st.expander("📌 Root Cause Analysis for Major Incidents"):
         required = {"root_cause", "incident_count", "estimated_cost_downtime"}
         if required.issubset(df.columns):
-            rc = (
-                df.groupby("root_cause", as_index=False)
-                .agg(total_incidents=("incident_count", "sum"),
-                     total_cost=("estimated_cost_downtime", "sum"))
-                .sort_values("total_cost", ascending=False)
-            )
+            rc = results["root_causes"]
 
             fig = px.bar(
                 rc,
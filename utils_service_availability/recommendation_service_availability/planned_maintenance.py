@@ -4,6 +4,9 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 
+from utils_service_availability.availability_cube import availability_cube
+from utils_service_availability.results_bus import section_results
+
 # ============================================================
 # Mesiniaga visual theme
 # ============================================================
@@ -38,7 +41,41 @@ def render_cio_tables(title, cio_data):
 # ============================================================
 # Target 6 – Planned Maintenance and Downtime
 # ============================================================
+def headline_metrics(df: pd.DataFrame) -> dict:
+    """Scheduled-maintenance figures this section publishes (read here, by the executive summary and the report)."""
+    if "maintenance_type" not in df.columns:
+        return {}
+    cube = availability_cube(df)
+    if not cube.has("scheduled_count"):
+        return {}
+    monthly = (
+        cube.slice("month").query("scheduled_count > 0")[["month", "scheduled_count"]]
+        .rename(columns={"scheduled_count": "maintenance_count"})
+    )
+    out = {
+        "monthly": monthly,
+        "scheduled_count": cube.total("scheduled_count"),
+        "scheduled_downtime_minutes": cube.total("scheduled_downtime_minutes") if cube.has("scheduled_downtime_minutes") else np.nan,
+        "scheduled_cost": cube.total("scheduled_estimated_cost_downtime") if cube.has("scheduled_estimated_cost_downtime") else np.nan,
+    }
+    mins, cost = out["scheduled_downtime_minutes"], out["scheduled_cost"]
+    out["scheduled_rm_per_min"] = cost / mins if mins and mins > 0 else np.nan
+    if not monthly.empty:
+        peak = monthly.loc[monthly["maintenance_count"].idxmax()]
+        out.update(peak_maintenance_month=peak["month"], peak_maintenance_count=float(peak["maintenance_count"]))
+    if "service_name" in df.columns and cube.has("scheduled_downtime_minutes"):
+        planned = cube.slice("service_name").query("scheduled_count > 0")
+        out["by_service"] = (
+            planned.reindex(columns=["service_name", "scheduled_downtime_minutes", "scheduled_estimated_cost_downtime"])
+            .rename(columns={"scheduled_downtime_minutes": "downtime_minutes",
+                             "scheduled_estimated_cost_downtime": "estimated_cost_downtime"})
+            .sort_values("downtime_minutes", ascending=False)
+        )
+    return out
+
+
 def planned_maintenance(df: pd.DataFrame):
+    results = section_results(df, "planned_maintenance")
 
     # ========================================================
     # Subtarget 6a – Scheduled Maintenance Activities
@@ -60,26 +97,23 @@ def planned_maintenance(df: pd.DataFrame):
             else:
                 df["month"] = df["report_date"].dt.to_period("M").astype(str)
 
-                # Filter scheduled maintenance
-                scheduled = df[df["maintenance_type"].astype(str).str.lower() == "scheduled"].copy()
-
                 # 🔴 If no scheduled rows → info only, NO CIO table
-                if scheduled.empty:
+                if not results.get("scheduled_count"):
                     st.info("ℹ️ No rows with maintenance_type == 'scheduled'. Nothing to display for this subsection.")
                 else:
                     # Optional cost/min computation for data-backed formulas
-                    has_cost_cols = {"estimated_cost_downtime", "downtime_minutes"}.issubset(scheduled.columns)
+                    has_cost_cols = {"estimated_cost_downtime", "downtime_minutes"}.issubset(df.columns)
                     avg_cost_per_min = None
                     total_sched_cost = None
                     total_sched_mins = None
                     if has_cost_cols:
-                        total_sched_cost = pd.to_numeric(scheduled["estimated_cost_downtime"], errors="coerce").sum()
-                        total_sched_mins = pd.to_numeric(scheduled["downtime_minutes"], errors="coerce").sum()
+                        total_sched_cost = results["scheduled_cost"]
+                        total_sched_mins = results["scheduled_downtime_minutes"]
                         if total_sched_mins and total_sched_mins > 0:
-                            avg_cost_per_min = total_sched_cost / total_sched_mins
+                            avg_cost_per_min = results["scheduled_rm_per_min"]
 
                     # --- Graph 1: Number of Scheduled Maintenance per Month
-                    monthly_sched = scheduled.groupby("month").size().reset_index(name="maintenance_count")
+                    monthly_sched = results["monthly"]
 
                     # 🔴 If nothing after grouping → info only, NO CIO table
                     if monthly_sched.empty:
@@ -175,24 +209,12 @@ f"""**What this graph is:** A **monthly bar chart** showing **how many scheduled
         if missing2:
             st.warning(f"⚠️ Missing required columns: {missing2}")
         else:
-            planned = df[df["maintenance_type"].astype(str).str.lower() == "scheduled"].copy()
+            downtime_summary = results.get("by_service", pd.DataFrame())
 
             # 🔴 No scheduled rows → info only, NO CIO
-            if planned.empty:
+            if downtime_summary.empty:
                 st.info("ℹ️ No rows with maintenance_type == 'scheduled'. Cannot compute planned downtime by service.")
             else:
-                # Clean numeric for safe math
-                planned["downtime_minutes"] = pd.to_numeric(planned["downtime_minutes"], errors="coerce")
-                planned["estimated_cost_downtime"] = pd.to_numeric(planned["estimated_cost_downtime"], errors="coerce")
-
-                downtime_summary = (
-                    planned.groupby("service_name", as_index=False)
-                    .agg(
-                        downtime_minutes=("downtime_minutes", "sum"),
-                        estimated_cost_downtime=("estimated_cost_downtime", "sum"),
-                    )
-                    .sort_values("downtime_minutes", ascending=False)
-                )
 
                 # 🔴 If grouping yields nothing → info only, NO CIO
                 if downtime_summary.empty:
@@ -3,6 +3,9 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 
+from utils_service_availability.availability_cube import availability_cube
+from utils_service_availability.results_bus import section_results
+
 # ============================
 # Mesiniaga visual theme
 # ============================
@@ -29,10 +32,35 @@ def _to_num(x):
     return pd.to_numeric(x, errors="coerce")
 
 
+RESOURCES = ["cpu_utilization", "memory_utilization", "disk_utilization", "network_utilization"]
+
+
+def headline_metrics(df: pd.DataFrame) -> dict:
+    """Utilization figures this section publishes (read here, by the executive summary and the report)."""
+    present = [c for c in RESOURCES if c in df.columns]
+    if "service_name" not in df.columns or not present:
+        return {}
+    cube = availability_cube(df)
+    by_service = cube.slice("service_name")
+    out = {
+        "by_service": by_service.reindex(columns=["service_name", *present, "incident_count", "downtime_minutes"]),
+        **{f"avg_{c}": cube.total(c) for c in present},
+    }
+    if len(present) == len(RESOURCES):
+        out["utilization"] = by_service[["service_name", *RESOURCES]].round(1)
+    long = by_service.melt(id_vars="service_name", value_vars=present, var_name="resource", value_name="pct").dropna()
+    if not long.empty:
+        peak = long.loc[long["pct"].idxmax()]
+        out.update(peak_resource=peak["resource"], peak_resource_service=peak["service_name"],
+                   peak_resource_pct=float(peak["pct"]))
+    return out
+
+
 # ============================================================
 # Target 10 – Resource Utilization & Scalability
 # ============================================================
 def resource_utilization(df: pd.DataFrame):
+    results = section_results(df, "resource_utilization")
 
     # --------------------------------------------------------
     # 10a. Resource Utilization Overview (CPU/MEM/DISK/NET)
@@ -43,16 +71,7 @@ def resource_utilization(df: pd.DataFrame):
         if not set(need).issubset(df.columns):
             st.warning(f"⚠️ Missing required columns: {set(need) - set(df.columns)}")
         else:
-            work = df.copy()
-            for c in ["cpu_utilization","memory_utilization","disk_utilization","network_utilization"]:
-                work[c] = _to_num(work[c])
-
-            df_util = work.groupby("service_name", as_index=False).agg({
-                "cpu_utilization": "mean",
-                "memory_utilization": "mean",
-                "disk_utilization": "mean",
-                "network_utilization": "mean"
-            }).round(1)
+            df_util = results["utilization"]
 
             df_long = df_util.melt(id_vars="service_name",
                                    var_name="Resource",
@@ -158,16 +177,7 @@ f"""**What this graph is:** A **grouped bar chart** showing **average CPU, Memor
         if not set(need).issubset(df.columns):
             st.warning(f"⚠️ Missing required columns: {set(need) - set(df.columns)}")
         else:
-            work = df.copy()
-            work["cpu_utilization"]  = _to_num(work["cpu_utilization"])
-            work["incident_count"]   = _to_num(work["incident_count"])
-            work["downtime_minutes"] = _to_num(work["downtime_minutes"])
-
-            df_corr = work.groupby("service_name", as_index=False).agg({
-                "cpu_utilization": "mean",
-                "incident_count": "sum",
-                "downtime_minutes": "sum"
-            })
+            df_corr = results["by_service"][["service_name", "cpu_utilization", "incident_count", "downtime_minutes"]]
 
             fig2 = px.scatter(
                 df_corr,
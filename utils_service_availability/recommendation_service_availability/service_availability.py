@@ -4,6 +4,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import numpy as np
+from utils_service_availability.availability_engine import availability
+from utils_service_availability.availability_cube import availability_cube
 
 # ============================================================
 # Helper Function for CIO Tables
@@ -28,10 +30,10 @@ def service_availability(df: pd.DataFrame):
     with st.expander("📌 Availability Statistics per Service (Uptime %)"):
         required = {"service_name", "uptime_percentage"}
         if required.issubset(df.columns):
-            df_plot = df.copy()
+            cube = availability_cube(df)
+            by_service = cube.slice("service_name").set_index("service_name")
             uptime_summary = (
-                df_plot.groupby("service_name", as_index=False)["uptime_percentage"]
-                .mean()
+                by_service["uptime_percentage"].reset_index()
                 .sort_values("uptime_percentage", ascending=False)
             )
 
@@ -56,25 +58,17 @@ def service_availability(df: pd.DataFrame):
             incidents_available = "incident_count" in df.columns
 
             if cost_available:
-                svc_cost = (
-                    df.groupby("service_name", as_index=False)["estimated_cost_downtime"]
-                      .sum()
-                      .set_index("service_name")
-                )
+                svc_cost = by_service[["estimated_cost_downtime"]]
                 worst_cost_val = float(svc_cost.loc[worst["service_name"]]["estimated_cost_downtime"]) if worst["service_name"] in svc_cost.index else 0.0
                 best_cost_val  = float(svc_cost.loc[best["service_name"]]["estimated_cost_downtime"]) if best["service_name"] in svc_cost.index else 0.0
-                total_cost_val = float(df["estimated_cost_downtime"].fillna(0).sum())
+                total_cost_val = cube.total("estimated_cost_downtime")
             else:
                 worst_cost_val = best_cost_val = total_cost_val = 0.0
 
             if minutes_available:
-                svc_min = (
-                    df.groupby("service_name", as_index=False)["downtime_minutes"]
-                      .sum()
-                      .set_index("service_name")
-                )
+                svc_min = by_service[["downtime_minutes"]]
                 worst_min_val = float(svc_min.loc[worst["service_name"]]["downtime_minutes"]) if worst["service_name"] in svc_min.index else 0.0
-                total_min_val = float(df["downtime_minutes"].fillna(0).sum())
+                total_min_val = cube.total("downtime_minutes")
             else:
                 worst_min_val = total_min_val = 0.0
 
@@ -142,13 +136,9 @@ f"""**What this graph is:** A ranked bar chart showing **average uptime (%)** by
     with st.expander("📌 Downtime Incidents During the Reporting Period"):
         required = {"service_name", "downtime_minutes", "incident_count"}
         if required.issubset(df.columns):
-            df_plot = df.copy()
-            downtime = (
-                df_plot.groupby("service_name", as_index=False)
-                .agg({"downtime_minutes": "sum", "incident_count": "sum"})
-            )
+            downtime = availability_cube(df).slice("service_name")[["service_name", "downtime_minutes", "incident_count"]]
             downtime["avg_downtime_per_incident"] = downtime["downtime_minutes"] / downtime["incident_count"].replace(0, np.nan)
-            downtime["avg_downtime_per_incident"].replace([np.inf, np.nan], 0, inplace=True)
+            downtime["avg_downtime_per_incident"] = downtime["avg_downtime_per_incident"].replace([np.inf, np.nan], 0)
 
             fig = px.bar(
                 downtime.sort_values("downtime_minutes", ascending=False).head(10),
@@ -300,3 +290,81 @@ f"""**What this graph is:** A scatter plot comparing **SLA met (%)** against **u
             render_cio_tables("CIO – SLA Compliance Related to Availability", cio_3c)
         else:
             st.warning(f"⚠️ Missing columns: {required - set(df.columns)}")
+
+    # ============================================================
+    # 3d. Exact Availability from Outage Intervals
+    # ============================================================
+    with st.expander("📌 Exact Availability, MTBF and MTTR from Outage Intervals"):
+        required = {"service_name", "report_date", "downtime_minutes"}
+        if required.issubset(df.columns):
+            exact = availability(df).sort_values("uptime_pct", ascending=False)
+
+            fig = px.bar(
+                exact,
+                x="service_name",
+                y="uptime_pct",
+                title="Exact Uptime (%) per Service (Merged Outage Intervals)",
+                labels={"service_name": "Service Name", "uptime_pct": "Exact Uptime (%)"},
+                text="uptime_pct"
+            )
+            fig.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
+            st.plotly_chart(fig, use_container_width=True)
+
+            fig2 = px.scatter(
+                exact,
+                x="mtbf_hours",
+                y="mttr_minutes",
+                color="service_name",
+                size="downtime_minutes",
+                title="MTBF (hours) vs MTTR (minutes) per Service",
+                labels={"mtbf_hours": "MTBF (hours)", "mttr_minutes": "MTTR (minutes)", "downtime_minutes": "Downtime (mins)"}
+            )
+            st.plotly_chart(fig2, use_container_width=True)
+
+            best = exact.iloc[0]
+            worst = exact.iloc[-1]
+            fleet_uptime = (1 - exact["downtime_minutes"].sum() / exact["window_minutes"].sum()) * 100 if exact["window_minutes"].sum() else 0.0
+            shortest_mtbf = exact.loc[exact["mtbf_hours"].idxmin()] if exact["mtbf_hours"].notna().any() else None
+            longest_mttr = exact.loc[exact["mttr_minutes"].idxmax()] if exact["mttr_minutes"].notna().any() else None
+            rto_gap_worst = exact.loc[exact["rto_gap_minutes"].idxmax()] if exact["rto_gap_minutes"].notna().any() else None
+            mtbf_txt = f"**{shortest_mtbf['service_name']}** fails most often (MTBF **{shortest_mtbf['mtbf_hours']:.1f} h**)" if shortest_mtbf is not None else "No failures were recorded"
+            mttr_txt = f"**{longest_mttr['service_name']}** takes longest to restore (MTTR **{longest_mttr['mttr_minutes']:.1f} mins**)" if longest_mttr is not None else "no restore time could be derived"
+            gap_txt = f"The largest average RTO gap is **{rto_gap_worst['rto_gap_minutes']:+.1f} mins** on **{rto_gap_worst['service_name']}**." if rto_gap_worst is not None else ""
+
+            st.markdown("### 🧩 Analysis — Exact Availability")
+            st.write(
+f"""**What this graph is:** Uptime per service computed from outage intervals: each service's outages are merged so overlapping or repeated reports of the same outage are counted once, and uptime is the share of observed time not covered by an outage. Observed time is the days each service has a report, plus outages that run on past them; days without a report are left out rather than counted as up.  
+- **X-axis (bar):** Service name. **Y-axis:** Exact uptime (%).  
+- **Scatter:** MTBF (uptime hours per failure) against MTTR (downtime minutes per failure); bubble size is total downtime.
+
+**What it shows in your data:** Across all services, exact uptime is **{fleet_uptime:.3f}%**. **{best['service_name']}** is highest at **{best['uptime_pct']:.3f}%** and **{worst['service_name']}** is lowest at **{worst['uptime_pct']:.3f}%**. {mtbf_txt}, while {mttr_txt}. {gap_txt}
+
+**How to read it operationally:**  
+1) **Bottom-right of the scatter:** Rare, quick failures — the healthiest services.  
+2) **Top-left:** Frequent and slow failures — highest availability risk.  
+3) **Low MTBF only:** Invest in prevention (change control, capacity, redundancy).  
+4) **High MTTR only:** Invest in restoration (runbooks, automation, on-call readiness).
+
+**Why this matters:** Interval-based uptime does not double count overlapping outages, so it is the figure that should be compared against SLA and contract commitments."""
+            )
+
+            cio_3d = {
+                "cost": f"""
+| Recommendation | Explanation | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Report SLA credits from exact uptime | **Phase 1:** Use interval-based uptime as the single figure for SLA and credit calculations.<br><br>**Phase 2:** Reconcile it with the uptime reported by each service team.<br><br>**Phase 3:** Retire manual uptime adjustments once the figures agree. | - Avoids paying credits for double-counted outages.<br><br>- Gives finance and customers one defensible number.<br><br> | **Exact uptime = (window − merged downtime) ÷ window**; fleet value **{fleet_uptime:.3f}%**. | Bar chart per service; lowest **{worst['service_name']} = {worst['uptime_pct']:.3f}%**. |
+""",
+                "performance": f"""
+| Recommendation | Explanation | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Split reliability work by MTBF vs MTTR | **Phase 1:** Classify services as prevention-led (low MTBF) or restoration-led (high MTTR).<br><br>**Phase 2:** Assign the matching improvement backlog to each owner.<br><br>**Phase 3:** Track both measures monthly. | - Puts effort where it moves availability most.<br><br>- Avoids generic improvement plans. | **MTBF = uptime ÷ failures; MTTR = downtime ÷ failures.** | Scatter quadrants; {mtbf_txt}; {mttr_txt}. |
+""",
+                "satisfaction": f"""
+| Recommendation | Explanation | Benefits | Cost Calculation | Evidence & Graph Interpretation |
+|---|---|---|---|---|
+| Publish exact availability to service consumers | **Phase 1:** Share per-service exact uptime and MTTR in the monthly service review.<br><br>**Phase 2:** Explain any gap to the reported uptime.<br><br>**Phase 3:** Agree improvement targets with consumers. | - Builds trust through transparent, consistent figures.<br><br> | **Uptime gap = reported − exact** per service. | Highest **{best['service_name']} = {best['uptime_pct']:.3f}%**. |
+"""
+            }
+            render_cio_tables("CIO – Exact Availability from Outage Intervals", cio_3d)
+        else:
+            st.warning(f"⚠️ Missing columns: {required - set(df.columns)}")
@@ -4,6 +4,8 @@ import pandas as pd
 import numpy as np
 import re
 
+from utils_service_availability.availability_cube import availability_cube
+
 # ============================================================
 # Helper: CIO Table Renderer
 # ============================================================
@@ -73,14 +75,9 @@ def service_overview(df: pd.DataFrame):
 
         if not missing:
             # Aggregate
-            svc_summary = (
-                df.groupby("service_name", as_index=False)
-                .agg({
-                    "incident_count": "sum",
-                    "downtime_minutes": "sum",
-                    "estimated_cost_downtime": "sum",
-                })
-            )
+            svc_summary = availability_cube(df).slice("service_name")[
+                ["service_name", "incident_count", "downtime_minutes", "estimated_cost_downtime"]
+            ]
 
             # Totals for evidence & cost math
             total_cost_all = _safe_sum(svc_summary["estimated_cost_downtime"])
@@ -257,11 +254,9 @@ def service_overview(df: pd.DataFrame):
 
         if not missing:
             cat_summary = (
-                df.groupby("service_category", as_index=False)
-                .agg({
-                    "downtime_minutes": "sum",
-                    "estimated_cost_downtime": "sum",
-                })
+                availability_cube(df).slice("service_category")[
+                    ["service_category", "downtime_minutes", "estimated_cost_downtime"]
+                ]
                 .sort_values("estimated_cost_downtime", ascending=False)
             )
 
@@ -4,6 +4,8 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 
+from utils_service_availability.availability_engine import availability, rollup
+
 # ============================
 # Company visual theme
 # ============================
@@ -55,13 +57,17 @@ def service_recovery(df: pd.DataFrame):
         if tot_min > 0:
             avg_rm_per_min = tot_cost / tot_min
 
+    # Per-service and per-month recovery figures from the availability engine (cached per window)
+    by_service = availability(df)
+    by_month = rollup(availability(df, "M"))
+
     # ============================================================
     # 8a. Average Time Taken to Restore Services (MTTR)
     # ============================================================
     with st.expander("📌 Average Time Taken to Restore Services (MTTR)"):
         mttr = (
-            df.groupby("service_name", as_index=False)
-            .agg(avg_recovery=("recovery_time_minutes", "mean"), incidents=("incident_count", "sum"))
+            by_service.rename(columns={"reported_mttr_minutes": "avg_recovery", "failures": "incidents"})
+            [["service_name", "avg_recovery", "incidents"]]
             .sort_values("avg_recovery", ascending=False)
         )
 
@@ -144,19 +150,13 @@ f"""**What this graph is:** A **bar chart** showing **Mean Time to Recover (MTTR
     # 8b. Recovery Time Objective (RTO) Compliance
     # ============================================================
     with st.expander("📌 Recovery Time Objective (RTO) Compliance by Service"):
-        df["rto_breach"] = df["recovery_time_minutes"] > df["rto_target_minutes"]
-        df["minutes_over_target"] = (df["recovery_time_minutes"] - df["rto_target_minutes"]).clip(lower=0)
-
-        rto = (
-            df.groupby("service_name", as_index=False)
-            .agg(
-                total_incidents=("incident_count", "sum"),
-                breaches=("rto_breach", "sum"),
-                minutes_over=("minutes_over_target", "sum"),
-                avg_recovery=("recovery_time_minutes", "mean"),
-                avg_rto=("rto_target_minutes", "mean")
-            )
-        )
+        rto = by_service.rename(columns={
+            "failures": "total_incidents",
+            "rto_breaches": "breaches",
+            "minutes_over_rto": "minutes_over",
+            "reported_mttr_minutes": "avg_recovery",
+            "avg_rto_minutes": "avg_rto",
+        })[["service_name", "total_incidents", "breaches", "minutes_over", "avg_recovery", "avg_rto"]]
         rto["compliance_rate"] = (1 - (rto["breaches"] / rto["total_incidents"].replace(0, 1))) * 100
 
         # --- Graph: RTO Compliance (breaches)
@@ -262,13 +262,11 @@ f"""**What this graph is (contextual comparison):** A reading of **RTO breaches*
     # 8c. Monthly MTTR Trend
     # ============================================================
     with st.expander("📌 Monthly MTTR Trend Over Time"):
-        monthly = (
-            df.groupby("month", as_index=False)
-            .agg(
-                avg_mttr=("recovery_time_minutes", "mean"),
-                total_breaches=("rto_breach", "sum")
-            )
-        )
+        monthly = by_month.rename(columns={
+            "period": "month",
+            "reported_mttr_minutes": "avg_mttr",
+            "rto_breaches": "total_breaches",
+        })[["month", "avg_mttr", "total_breaches"]]
 
         # --- Graph: Monthly MTTR
         fig_mttr_monthly = px.line(
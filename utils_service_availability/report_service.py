@@ -56,6 +56,7 @@ from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle, Paragraph
 from reportlab.lib.styles import getSampleStyleSheet
+from cow_context import shared_view
 
 # DOCX (optional)
 try:
@@ -197,37 +198,19 @@ def _compute_overview_kpis(df: pd.DataFrame) -> Dict[str, Any]:
       - Total Downtime (mins)
       - Total Incidents
       - Total Downtime Cost (RM)
-    All values rendered safely as strings for the KPI table.
+    plus the emergency-change and scheduled-maintenance counts when those sections published them.
+    All values are read from the results bus (published while the sections were captured) and
+    rendered safely as strings for the KPI table.
     """
-    d = df.copy()
-
-    # Average uptime (%)
-    avg_uptime = np.nan
-    if "uptime_percentage" in d.columns:
-        vals = pd.to_numeric(d["uptime_percentage"], errors="coerce")
-        if vals.notna().any():
-            avg_uptime = float(vals.mean())
-
-    # Total downtime (mins)
-    total_dt = np.nan
-    if "downtime_minutes" in d.columns:
-        vals = pd.to_numeric(d["downtime_minutes"], errors="coerce")
-        if vals.notna().any():
-            total_dt = float(vals.sum())
-
-    # Total incidents
-    total_inc = np.nan
-    if "incident_count" in d.columns:
-        vals = pd.to_numeric(d["incident_count"], errors="coerce")
-        if vals.notna().any():
-            total_inc = float(vals.sum())
-
-    # Total downtime cost (RM)
-    total_cost = np.nan
-    if "estimated_cost_downtime" in d.columns:
-        vals = pd.to_numeric(d["estimated_cost_downtime"], errors="coerce")
-        if vals.notna().any():
-            total_cost = float(vals.sum())
+    from utils_service_availability.results_bus import section_results
+
+    kpi = section_results(df, "executive_summary")
+    avg_uptime = kpi["avg_uptime"]
+    total_dt = kpi["total_downtime"]
+    total_inc = kpi["total_incidents"]
+    total_cost = kpi["total_cost"]
+    emergency = section_results(df, "emergency_changes").get("emergency_count")
+    scheduled = section_results(df, "planned_maintenance").get("scheduled_count")
 
     def _fmt(v, fmt, fallback="N/A"):
         if v is None or (isinstance(v, float) and np.isnan(v)):
@@ -242,6 +225,8 @@ def _compute_overview_kpis(df: pd.DataFrame) -> Dict[str, Any]:
         "Total Downtime (mins)": _fmt(total_dt, lambda x: f"{x:,.0f}"),
         "Total Incidents": _fmt(total_inc, lambda x: f"{x:,.0f}"),
         "Total Downtime Cost (RM)": _fmt(total_cost, lambda x: f"{x:,.0f}"),
+        **({"Emergency Changes": _fmt(emergency, lambda x: f"{x:,.0f}")} if emergency is not None else {}),
+        **({"Scheduled Maintenance Activities": _fmt(scheduled, lambda x: f"{x:,.0f}")} if scheduled is not None else {}),
     }
 
 def _build_kpi_figure(kpis: Dict[str, Any]) -> "go.Figure":
@@ -840,7 +825,7 @@ def _capture_module(mod, fn_name: str, df: pd.DataFrame, section_title: str) ->
     try:
         setattr(mod, 'st', STShim())
         setattr(mod, 'render_cio_tables', capture_cio)
-        getattr(mod, fn_name)(df.copy())
+        getattr(mod, fn_name)(shared_view(df))
     finally:
         if orig_st is not None:
             setattr(mod, 'st', orig_st)
@@ -923,6 +908,25 @@ def report_service(
                 )
                 appendices["Monthly Availability & Downtime (table)"] = monthly_agg
 
+    # Downtime cost attribution (same cached result the dashboard and business-impact section use)
+    if "estimated_cost_downtime" in df.columns:
+        from utils_service_availability.cost_attribution import DIMENSION_LABELS, cost_attribution
+
+        attribution = cost_attribution(df, "reported")
+        for dim in attribution.dimensions:
+            t = attribution.by(dim)
+            if t.empty or not attribution.total:
+                continue
+            if dim == "month":
+                t = t.sort_values("month")
+            appendices[f"Downtime Cost by {DIMENSION_LABELS[dim]} (table)"] = pd.DataFrame({
+                DIMENSION_LABELS[dim]: t[dim],
+                "Cost (RM)": t["cost"].map("{:,.0f}".format),
+                "Share (%)": (t["share"] * 100).map("{:.1f}".format),
+                "Downtime (mins)": t["downtime_minutes"].map("{:,.0f}".format),
+                "RM/min": t["rm_per_min"].map(lambda v: f"{v:,.2f}" if pd.notna(v) else "N/A"),
+            })
+
     model = ReportModel(
         title=title,
         client_name=client_name,
@@ -0,0 +1,72 @@
+# utils_service_availability/results_bus.py
+import importlib
+import weakref
+
+import pandas as pd
+
+from cache_registry import session_store
+
+# ─────────────────────────────────────────────────────────────
+# Availability results bus
+# Each recommendation section computes its headline figures once per dataset
+# (its `headline_metrics(df)`) and publishes them here. The section itself,
+# the executive summary and the report KPI page all read the published
+# values, so a full pipeline run does each of those aggregations once —
+# whichever consumer asks first triggers the computation, the rest reuse it.
+# ─────────────────────────────────────────────────────────────
+_STORE = "availability_results_bus"
+_MAX_DATASETS = 8      # datasets (tokens) kept per session; oldest dropped first
+_PACKAGE = "utils_service_availability.recommendation_service_availability"
+
+# Sections that publish, and the module whose headline_metrics(df) computes them
+SECTIONS = {
+    "executive_summary": f"{_PACKAGE}.executive_summary",
+    "incident_analysis": f"{_PACKAGE}.incident_analysis",
+    "planned_maintenance": f"{_PACKAGE}.planned_maintenance",
+    "emergency_changes": f"{_PACKAGE}.emergency_changes",
+    "resource_utilization": f"{_PACKAGE}.resource_utilization",
+}
+
+_tokens = {}   # id(df) -> (weakref to df, token); the pipeline hands the same frame to every section
+
+
+def dataset_token(df: pd.DataFrame) -> int:
+    """Content hash of `df`, computed once per frame object."""
+    hit = _tokens.get(id(df))
+    if hit is not None and hit[0]() is df:
+        return hit[1]
+    token = int(pd.util.hash_pandas_object(df, index=False).sum()) if len(df) else 0
+    token ^= hash(tuple(map(str, df.columns)))
+    try:
+        _tokens[id(df)] = (weakref.ref(df), token)
+    except TypeError:
+        pass
+    if len(_tokens) > 64:
+        for key in [k for k, (ref, _) in _tokens.items() if ref() is None]:
+            _tokens.pop(key, None)
+    return token
+
+
+def _bus():
+    return session_store(_STORE, _MAX_DATASETS)
+
+
+def publish(df: pd.DataFrame, section: str, metrics: dict) -> dict:
+    """Record `metrics` as `section`'s results for this dataset and return them."""
+    _bus().setdefault(dataset_token(df), {})[section] = metrics
+    return metrics
+
+
+def published(df: pd.DataFrame, section: str = None):
+    """Results already published for this dataset: one section's dict (or None), or all sections."""
+    entry = _bus().get(dataset_token(df), {})
+    return entry if section is None else entry.get(section)
+
+
+def section_results(df: pd.DataFrame, section: str) -> dict:
+    """`section`'s published results for `df`, computing and publishing them on first request."""
+    found = published(df, section)
+    if found is None:
+        module = importlib.import_module(SECTIONS[section])
+        found = publish(df, section, module.headline_metrics(df))
+    return found
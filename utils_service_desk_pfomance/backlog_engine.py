@@ -0,0 +1,135 @@
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+
+from cache_registry import cached
+
+# Granularity keys used across the service desk views -> pandas period codes
+_PERIOD_FREQ = {"D": "D", "W": "W", "M": "M"}
+
+AGE_BINS = [0, 1, 3, 7, 14, 30, np.inf]
+AGE_LABELS = ["0–1d", "2–3d", "4–7d", "8–14d", "15–30d", ">30d"]
+
+
+def closure_column(df: pd.DataFrame):
+    """'resolved_time' if available, else 'completed_time', else None."""
+    for candidate in ["resolved_time", "completed_time"]:
+        if candidate in df.columns:
+            return candidate
+    return None
+
+
+@dataclass
+class BacklogSweep:
+    """
+    Sorted open/close event arrays for one selection of tickets.
+      - created: open timestamps, ascending
+      - closure: closure timestamp per ticket aligned with `created` (NaT = still open)
+      - closed:  closure timestamps, ascending
+    Every query below is a `searchsorted` over these arrays, so no groupby/merge is repeated.
+    """
+    created: np.ndarray
+    closure: np.ndarray
+    closed: np.ndarray
+
+    @property
+    def empty(self) -> bool:
+        return self.created.size == 0
+
+    @property
+    def start(self):
+        return pd.Timestamp(self.created[0]) if not self.empty else pd.NaT
+
+    @property
+    def end(self):
+        if self.empty:
+            return pd.NaT
+        last = self.created[-1]
+        if self.closed.size:
+            last = max(last, self.closed[-1])
+        return pd.Timestamp(last)
+
+    def open_as_of(self, as_of) -> int:
+        """Tickets opened at or before `as_of` and not yet closed at that instant."""
+        if self.empty:
+            return 0
+        t = np.datetime64(pd.Timestamp(as_of), "ns")
+        opened = np.searchsorted(self.created, t, side="right")
+        closed = np.searchsorted(self.closed, t, side="right")
+        return int(opened - closed)
+
+    def flow(self, freq: str = "D", active_only: bool = False) -> pd.DataFrame:
+        """
+        Arrivals, departures and end-of-period backlog per bucket ("D", "W" week start, "M" month start).
+        Columns: date, opened, closed, net, backlog. `active_only` drops buckets with no events.
+        """
+        cols = ["date", "opened", "closed", "net", "backlog"]
+        if self.empty:
+            return pd.DataFrame({"date": pd.DatetimeIndex([], dtype="datetime64[ns]"),
+                                 **{c: np.array([], dtype="int64") for c in cols[1:]}})
+
+        periods = pd.period_range(self.start.to_period(_PERIOD_FREQ[freq]),
+                                  self.end.to_period(_PERIOD_FREQ[freq]),
+                                  freq=_PERIOD_FREQ[freq])
+        starts = periods.start_time.to_numpy(dtype="datetime64[ns]")
+        edges = np.append(starts, np.datetime64((periods[-1] + 1).start_time, "ns"))
+
+        cum_opened = np.searchsorted(self.created, edges, side="left")
+        cum_closed = np.searchsorted(self.closed, edges, side="left")
+        out = pd.DataFrame({
+            "date": pd.DatetimeIndex(starts),
+            "opened": np.diff(cum_opened),
+            "closed": np.diff(cum_closed),
+        })
+        out["net"] = out["opened"] - out["closed"]
+        out["backlog"] = cum_opened[1:] - cum_closed[1:]
+        if active_only:
+            out = out[(out["opened"] > 0) | (out["closed"] > 0)].reset_index(drop=True)
+        return out[cols]
+
+    def open_ages(self, as_of=None) -> np.ndarray:
+        """Age in days of every ticket still open at `as_of` (defaults to the last event)."""
+        if self.empty:
+            return np.array([], dtype="float64")
+        t = np.datetime64(pd.Timestamp(self.end if as_of is None else as_of), "ns")
+        is_open = (self.created <= t) & (np.isnat(self.closure) | (self.closure > t))
+        return (t - self.created[is_open]) / np.timedelta64(1, "D")
+
+    def age_distribution(self, as_of=None) -> pd.DataFrame:
+        """Open-ticket counts per age bucket at `as_of`. Columns: age_bucket, tickets."""
+        ages = self.open_ages(as_of)
+        buckets = pd.cut(ages, bins=AGE_BINS, labels=AGE_LABELS, include_lowest=True)
+        counts = pd.Series(buckets).value_counts(sort=False).reindex(AGE_LABELS, fill_value=0)
+        return counts.rename_axis("age_bucket").reset_index(name="tickets")
+
+
+@cached
+def _build_sweep(frame: pd.DataFrame) -> BacklogSweep:
+    created = frame["created"].to_numpy(dtype="datetime64[ns]")
+    closure = frame["closure"].to_numpy(dtype="datetime64[ns]")
+
+    valid = ~np.isnat(created)
+    created, closure = created[valid], closure[valid]
+    # A closure stamped before its creation closes the ticket at creation (never negative backlog)
+    early = ~np.isnat(closure) & (closure < created)
+    closure[early] = created[early]
+
+    order = np.argsort(created, kind="stable")
+    created, closure = created[order], closure[order]
+    closed = np.sort(closure[~np.isnat(closure)])
+    return BacklogSweep(created=created, closure=closure, closed=closed)
+
+
+def backlog_sweep(df: pd.DataFrame) -> BacklogSweep:
+    """Event sweep over created_time and resolved/completed time; shared by recommendation, dashboard and report."""
+    n = len(df)
+    created = (pd.to_datetime(df["created_time"], errors="coerce") if "created_time" in df.columns
+               else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]"))
+    close_col = closure_column(df)
+    closure = (pd.to_datetime(df[close_col], errors="coerce") if close_col
+               else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]"))
+    frame = pd.DataFrame({
+        "created": created.to_numpy(dtype="datetime64[ns]") if n else np.array([], dtype="datetime64[ns]"),
+        "closure": closure.to_numpy(dtype="datetime64[ns]") if n else np.array([], dtype="datetime64[ns]"),
+    })
+    return _build_sweep(frame)
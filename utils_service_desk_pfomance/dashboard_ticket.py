@@ -5,6 +5,11 @@ import numpy as np
 import plotly.graph_objects as go
 from typing import Optional
 
+from cache_registry import cached
+from dataset_stats import frame_stats
+from utils_service_desk_pfomance.sla_engine import PRIORITY_ORDER, sla_aggregates
+from utils_service_desk_pfomance.backlog_engine import backlog_sweep, closure_column
+
 # ---- Visual defaults ----
 px.defaults.template = "plotly_white"
 PX_PALETTE = px.colors.qualitative.Safe
@@ -19,7 +24,7 @@ def _apply_bar_labels(fig, show_labels: bool, fmt: str = None):
     fig.update_traces(texttemplate=fmt if fmt else "%{y}", textposition="outside", cliponaxis=False)
     return fig
 
-@st.cache_data(show_spinner=False)
+@cached
 def _prep_base(df: Optional[pd.DataFrame]):
     """Cached light prep. Safe for None/empty input."""
     if df is None:
@@ -98,17 +103,17 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
 
     st.markdown("##  Executive Visual Dashboard")
     df = _prep_base(df)  # now safe for None/invalid
+    stats = frame_stats(df, "dashboard_ticket")  # filter options / date span from the catalog, not a scan per rerun
 
     # ---------------- Sidebar controls ----------------
     with st.sidebar:
         st.markdown("### 🔎 Filters")
 
         # Date range widget (safe)
-        if "created_date" in df.columns and not pd.Series(df["created_date"]).dropna().empty:
-            _cd = pd.to_datetime(df["created_date"], errors="coerce").dropna()
-            if not _cd.empty:
-                min_d = _cd.min()
-                max_d = _cd.max()
+        if "created_date" in df.columns and stats.nulls("created_date") < len(df):
+            _bounds = stats.date_bounds("created_date")
+            if _bounds:
+                min_d, max_d = _bounds
                 date_range = st.date_input(
                     "Date range",
                     value=(min_d.date(), max_d.date()),
@@ -122,7 +127,7 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
             date_range = None
 
         def _opt(col):
-            return sorted([v for v in df[col].dropna().astype(str).unique()]) if col in df.columns else []
+            return stats.options(col)
 
         dept = st.multiselect("Department", _opt("department"), key="flt_dept")
         pri  = st.multiselect("Priority",   _opt("priority") or _opt("Priority"), key="flt_pri")
@@ -147,9 +152,9 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
     if clear:
         dept = pri = tech = cat = rstat = []
         if "created_date" in df_filtered.columns and date_range:
-            _cd = pd.to_datetime(df_filtered["created_date"], errors="coerce").dropna()
-            if not _cd.empty:
-                date_range = ( _cd.min().date(), _cd.max().date() )
+            _bounds = stats.date_bounds("created_date")
+            if _bounds:
+                date_range = ( _bounds[0].date(), _bounds[1].date() )
             else:
                 date_range = None
 
@@ -186,8 +191,9 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
         k2.metric("Avg Resolution Time (hrs)", "N/A")
 
     k3.metric("Unique Departments", df_filtered['department'].nunique() if 'department' in df_filtered.columns else "N/A")
-    if "sla_met" in df_filtered.columns:
-        k4.metric("SLA Adherence", f"{(pd.to_numeric(df_filtered['sla_met'], errors='coerce').mean() * 100):.1f}%")
+    sla_agg = sla_aggregates(df_filtered)
+    if sla_agg.has_sla:
+        k4.metric("SLA Adherence", f"{sla_agg.overall_rate * 100:.1f}%")
     else:
         k4.metric("SLA Adherence", "—")
 
@@ -312,48 +318,38 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
                 fig = _apply_bar_labels(fig, show_labels)
                 st.plotly_chart(fig, use_container_width=True, key="dash_1c_open_by_priority")
 
+    # Open/close event sweep shared by the flow, backlog and ageing views below
+    sweep = backlog_sweep(df_filtered)
+    close_col = closure_column(df_filtered)
+    flow = sweep.flow(gran_key) if close_col else None
+
     with c4:
         if "created_time" in df_filtered.columns:
-            dfr = df_filtered.copy()
-            dfr["created_time"] = pd.to_datetime(dfr["created_time"], errors="coerce")
-            close_col = "resolved_time" if "resolved_time" in dfr.columns else ("completed_time" if "completed_time" in dfr.columns else None)
             if close_col:
-                dfr[close_col] = pd.to_datetime(dfr[close_col], errors="coerce")
-                opened = _safe_timecounts_from_index(
-                    dfr.dropna(subset=["created_time"]).set_index("created_time").sort_index().index,
-                    gran_key, "date"
-                ).rename(columns={"count":"opened"})
-                closed = _safe_timecounts_from_index(
-                    dfr.dropna(subset=[close_col]).set_index(close_col).sort_index().index,
-                    gran_key, "date"
-                ).rename(columns={"count":"closed"})
-                rate = pd.merge(opened, closed, on="date", how="outer").fillna(0).sort_values("date")
+                rate = flow[["date", "opened", "closed"]]
                 fig = px.line(rate, x="date", y=["opened","closed"], title="Closure vs Opening Rate Over Time", color_discrete_sequence=PX_SEQ)
                 if show_rangeslider:
                     fig.update_xaxes(rangeslider_visible=True)
                 fig.update_layout(hovermode="x unified")
                 st.plotly_chart(fig, use_container_width=True, key="dash_1c_closure_vs_opening")
 
-    # Row 3: Backlog
-    if "created_time" in df_filtered.columns:
-        dfb = df_filtered.copy()
-        close_col = "resolved_time" if "resolved_time" in dfb.columns else ("completed_time" if "completed_time" in dfb.columns else None)
-        if close_col:
-            op = _safe_timecounts_from_index(
-                dfb.dropna(subset=["created_time"]).set_index("created_time").sort_index().index,
-                gran_key, "date"
-            ).rename(columns={"count":"opened"})
-            cl = _safe_timecounts_from_index(
-                dfb.dropna(subset=[close_col]).set_index(close_col).sort_index().index,
-                gran_key, "date"
-            ).rename(columns={"count":"closed"})
-            rate = pd.merge(op, cl, on="date", how="outer").fillna(0).sort_values("date")
-            rate["backlog"] = (rate["opened"] - rate["closed"]).cumsum()
-            fig = px.line(rate, x="date", y="backlog", title="📈 Ticket Backlog Over Time", color_discrete_sequence=PX_SEQ)
+    # Row 3: Backlog | Open ticket ageing
+    if "created_time" in df_filtered.columns and close_col and not sweep.empty:
+        c5, c6 = st.columns(2)
+        with c5:
+            fig = px.line(flow, x="date", y="backlog", title="📈 Ticket Backlog Over Time", color_discrete_sequence=PX_SEQ)
             if show_rangeslider:
                 fig.update_xaxes(rangeslider_visible=True)
             fig.update_layout(hovermode="x unified")
             st.plotly_chart(fig, use_container_width=True, key="dash_1d_backlog")
+        with c6:
+            as_of = sweep.end
+            ages = sweep.age_distribution(as_of)
+            fig = px.bar(ages, x="age_bucket", y="tickets",
+                         title=f"Open Ticket Age as of {as_of:%d/%m/%Y} ({sweep.open_as_of(as_of):,} open)",
+                         labels={"age_bucket": "Age", "tickets": "Open Tickets"}, color_discrete_sequence=PX_SEQ)
+            fig = _apply_bar_labels(fig, show_labels)
+            st.plotly_chart(fig, use_container_width=True, key="dash_1d_open_age")
 
     # =========================================================
     # ⏱ Resolution & SLA Insights
@@ -620,25 +616,9 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
     st.markdown("---")
     st.markdown("### Service Level Agreements (SLAs)")
 
-    # Local helper so we don't touch the rest of the file
-    PRIORITY_ORDER = ["P1", "P2", "P3", "P5", "Service Request"]
-    def normalize_priority(series: pd.Series) -> pd.Series:
-        s = series.astype(str).str.strip()
-        s = (s.str.replace(r"^priority\s*", "", case=False, regex=True)
-               .str.replace(r"\s+", " ", regex=True))
-        s = s.str.upper()
-        s = s.str.replace(r"^P0$", "P1", regex=True)
-        s = s.str.replace(r"^P4$", "P3", regex=True)
-        s = s.str.replace(r"^(SR|SERVICE\s*REQ(?:UEST)?)$", "Service Request", case=False, regex=True)
-        s = s.where(s.isin(PRIORITY_ORDER))
-        return pd.Categorical(s, categories=PRIORITY_ORDER, ordered=True)
-
     # --- Graph 1: Stacked Bar Chart (Weekly SLA % met vs breached)
-    if "created_time" in df_filtered.columns and "sla_met" in df_filtered.columns:
-        work = df_filtered.copy()
-        work["created_date"] = pd.to_datetime(work["created_time"], errors="coerce").dt.to_period("W").dt.start_time
-        sla_weekly = work.groupby("created_date", dropna=True)["sla_met"].mean().reset_index()
-        sla_weekly["breach"] = 1 - sla_weekly["sla_met"]
+    if "created_time" in df_filtered.columns and sla_agg.has_sla:
+        sla_weekly = sla_agg.trend("W")[["created_date", "sla_met", "breach"]]
 
         if not sla_weekly.empty:
             avg_met_pct = float(sla_weekly["sla_met"].mean() * 100)
@@ -665,8 +645,8 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
         st.plotly_chart(fig, use_container_width=True)
 
     # --- Graph 2: Gauge / KPI Widget for SLA Performance
-    if "sla_met" in df_filtered.columns:
-        overall_sla_pct = float(pd.to_numeric(df_filtered["sla_met"], errors="coerce").mean() * 100)
+    if sla_agg.has_sla:
+        overall_sla_pct = float(sla_agg.overall_rate * 100)
 
         fig = go.Figure(go.Indicator(
             mode="gauge+number",
@@ -680,14 +660,12 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
         st.plotly_chart(fig, use_container_width=True)
 
     # --- Graph 3: SLA by Priority/Category (aligned to P1,P2,P3,P5,Service Request)
-    if "priority" in df_filtered.columns and "sla_met" in df_filtered.columns:
-        dfp = df_filtered.copy()
-        dfp["priority_std"] = normalize_priority(dfp["priority"])
-
-        # Aggregate mean SLA by fixed buckets; keep empty buckets for visibility
-        priority_sla = (dfp.groupby("priority_std", observed=True)["sla_met"]
-                          .mean()
+    if "priority" in df_filtered.columns and sla_agg.has_sla:
+        # Mean SLA by fixed buckets; keep empty buckets for visibility
+        priority_sla = (sla_agg.by_priority["rate"]
                           .reindex(PRIORITY_ORDER)
+                          .rename("sla_met")
+                          .rename_axis("priority_std")
                           .reset_index())
 
         # % labels; show "–" if no data in that bucket
@@ -725,10 +703,8 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
     # Determine breach availability up front and notify if none
     breach_count = None
     any_breach = None
-    if "sla_met" in df_filtered.columns:
-        sla_num = pd.to_numeric(df_filtered["sla_met"], errors="coerce")
-        breach_mask = sla_num.eq(0)
-        breach_count = int(breach_mask.sum())
+    if sla_agg.has_sla:
+        breach_count = sla_agg.breach_count
         any_breach = breach_count > 0
 
     if any_breach is False:
@@ -747,15 +723,8 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
 
     # --- Graph 1: Pareto Chart of Breach Reasons
     if "breach_reason" in df_filtered.columns:
-        # Use only breached rows when computing Pareto
-        if "sla_met" in df_filtered.columns:
-            mask = pd.to_numeric(df_filtered["sla_met"], errors="coerce").eq(0)
-            data_for_pareto = df_filtered.loc[mask]
-        else:
-            data_for_pareto = df_filtered
-
-        breach_summary = data_for_pareto["breach_reason"].value_counts(dropna=True).reset_index()
-        breach_summary.columns = ["reason", "count"]
+        # Breached rows only (engine falls back to all rows when no SLA outcome is known)
+        breach_summary = sla_agg.by_reason.copy()
         if not breach_summary.empty:
             breach_summary["cum_pct"] = breach_summary["count"].cumsum() / breach_summary["count"].sum() * 100
             top_reason = str(breach_summary.iloc[0]["reason"])
@@ -767,15 +736,10 @@ def dashboard_ticket(df: Optional[pd.DataFrame]):
             st.plotly_chart(fig, use_container_width=True)
 
     # --- Graph 2: Breaches by Priority (aligned to P1,P2,P3,P5,Service Request)
-    if "priority" in df_filtered.columns and "sla_met" in df_filtered.columns:
-        dfb = df_filtered.copy()
-        dfb["priority_std"] = normalize_priority(dfb["priority"])
-        sla_num = pd.to_numeric(dfb["sla_met"], errors="coerce")
-
-        breach_priority = (dfb[sla_num.eq(0)]
-                            .groupby("priority_std", observed=True)
-                            .size()
+    if "priority" in df_filtered.columns and sla_agg.has_sla:
+        breach_priority = (sla_agg.by_priority["breaches"]
                             .reindex(PRIORITY_ORDER, fill_value=0)
+                            .rename_axis("priority_std")
                             .reset_index(name="count"))
 
         fig = px.bar(
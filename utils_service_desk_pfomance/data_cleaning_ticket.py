@@ -2,6 +2,12 @@ import pandas as pd
 import streamlit as st
 import io
 import re
+from cleaning_diff import diff_frames, paged_dataframe, profile_raw, render_diff
+from cleaning_executor import ExecutionReport
+from dimension_encoding import arrow_safe_categorical, encode_dimensions
+from duplicate_index import build_index, near_duplicate_key
+from schema_registry import apply_schema
+from utils_service_desk_pfomance.schema import SCHEMA
 
 # --------- helpers ---------
 def to_snake(name: str) -> str:
@@ -30,8 +36,8 @@ def arrow_sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
             out[col] = s.astype("float64")
         elif pd.api.types.is_datetime64_any_dtype(s):
             out[col] = pd.to_datetime(s, errors="coerce").dt.tz_localize(None)
-        elif pd.api.types.is_categorical_dtype(s):
-            out[col] = s.astype("string")
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = arrow_safe_categorical(s)
     return out
 
 def _dtype_table(df: pd.DataFrame, title: str) -> pd.DataFrame:
@@ -39,8 +45,9 @@ def _dtype_table(df: pd.DataFrame, title: str) -> pd.DataFrame:
 
 # --------- main cleaning pipeline ---------
 def data_cleaning_ticket(df, uploaded_file):
-    # keep a RAW snapshot (exactly as uploaded)
-    raw_df_snapshot = df.copy(deep=True)
+    # keep a RAW snapshot (exactly as uploaded): a copy-on-write view, profiled once for the raw-vs-cleaned diff
+    raw_df_snapshot = df.copy(deep=False)
+    raw_profile = profile_raw(raw_df_snapshot)
 
     st.success("✅ File successfully loaded!")
 
@@ -50,28 +57,28 @@ def data_cleaning_ticket(df, uploaded_file):
     st.subheader("🔍 Before Cleaning")
 
     col1, col2 = st.columns(2)
-    col1.metric("Rows (Raw)", raw_df_snapshot.shape[0])
-    col2.metric("Columns (Raw)", raw_df_snapshot.shape[1])
+    col1.metric("Rows (Raw)", raw_profile.rows)
+    col2.metric("Columns (Raw)", len(raw_profile.columns))
 
-    total_missing_raw = int(raw_df_snapshot.isnull().sum().sum())
+    total_missing_raw = raw_profile.total_missing
     m1, _m2 = st.columns(2)
     m1.metric("Total Missing Values (Raw)", total_missing_raw)
 
     st.markdown("**Data Types (Raw)**")
-    st.dataframe(_dtype_table(raw_df_snapshot, "Raw dtypes"), use_container_width=True)
+    st.dataframe(raw_profile.dtype_table(), use_container_width=True)
 
     col_mv, _ = st.columns([3, 1])
     with col_mv:
         st.markdown("**Missing Values by Column (Raw)**")
         st.dataframe(
-            raw_df_snapshot.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+            raw_profile.missing_table(),
             use_container_width=True
         )
 
-    dup_count_raw = int(raw_df_snapshot.duplicated().sum())
+    dup_count_raw = raw_profile.duplicates
     st.write(f"**Duplicated Rows (Raw):** {dup_count_raw}")
     if dup_count_raw > 0:
-        st.dataframe(raw_df_snapshot[raw_df_snapshot.duplicated()], use_container_width=True)
+        paged_dataframe(raw_df_snapshot.iloc[raw_profile.duplicates_index.sample()], key="ticket_raw_dup_page")
 
     raw_datetime_cols = [c for c in raw_df_snapshot.columns if pd.api.types.is_datetime64_any_dtype(raw_df_snapshot[c])]
     st.write("**Datetime Columns Detected (Raw):** " + (", ".join(raw_datetime_cols) if raw_datetime_cols else "None"))
@@ -95,26 +102,9 @@ def data_cleaning_ticket(df, uploaded_file):
         o, n = example_pair
         st.info(f"Column names standardized to **snake_case** (example: “{o}” → “{n}”).")
 
-    # Durations (SLA)
-    for col in ['sla_resolution_time', 'sla_response_time', 'on_hold_duration']:
-        if col in df.columns:
-            df[col] = pd.to_timedelta(df[col], errors='coerce')
-
-    # Datetimes
-    for col in ['created_time', 'resolved_time']:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce', dayfirst=True)
-
-    # Response durations
-    for col in ['response_time_elapsed', 'time_elapsed']:
-        if col in df.columns:
-            df[col] = pd.to_timedelta(df[col], errors='coerce')
-
-    # Boolean-like
-    bool_cols = ['fcr', 'vip_user', 'reopened', 'first_response_overdue_status', 'overdue_status']
-    for col in bool_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.lower().map({'true': True, 'false': False, 'yes': True, 'no': False})
+    timings = ExecutionReport()   # per-column timings of the parallel cleaning steps
+    # SLA durations, datetimes and boolean flags as declared in utils_service_desk_pfomance/schema.py
+    df, plan = apply_schema(SCHEMA.domain, df, report=timings)
 
     # Month
     if 'created_time' in df.columns:
@@ -136,6 +126,9 @@ def data_cleaning_ticket(df, uploaded_file):
     if 'created_time' in df.columns and 'resolved_time' in df.columns:
         df['resolution_time'] = (df['resolved_time'] - df['created_time']).dt.total_seconds() / 3600
 
+    # Dimension columns -> categoricals (int codes + one copy of each label) for every downstream groupby/filter
+    df = encode_dimensions(df, report=timings)
+
     # ==============================
     # ii. AFTER CLEANING
     # ==============================
@@ -145,7 +138,8 @@ def data_cleaning_ticket(df, uploaded_file):
     ac1.metric("Rows (Cleaned)", df.shape[0])
     ac2.metric("Columns (Cleaned)", df.shape[1])
 
-    total_missing_clean = int(df.isnull().sum().sum())
+    diff = diff_frames(raw_profile, df, col_map)
+    total_missing_clean = int(diff.missing_table()["Missing"].sum())
     cm1, _cm2 = st.columns(2)
     cm1.metric("Total Missing Values (Cleaned)", total_missing_clean)
 
@@ -154,7 +148,7 @@ def data_cleaning_ticket(df, uploaded_file):
 
     st.markdown("**Missing Values by Column (Cleaned)**")
     st.dataframe(
-        df.isnull().sum().reset_index().rename(columns={"index": "Column", 0: "Missing"}),
+        diff.missing_table(),
         use_container_width=True
     )
 
@@ -163,6 +157,19 @@ def data_cleaning_ticket(df, uploaded_file):
     cleaned_datetime_cols = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
     st.write("**Datetime Columns Detected (Cleaned):** " + (", ".join(cleaned_datetime_cols) if cleaned_datetime_cols else "None"))
 
+    # Near-duplicate tickets: same id with the same subject once case, punctuation and RE:/FW: prefixes are ignored
+    near_key, near_label = near_duplicate_key(df)
+    if near_key is not None:
+        near = build_index(near_key)
+        st.write(f"**Near-Duplicate Tickets ({near_label}):** {near.count}")
+        if near.count:
+            paged_dataframe(df.iloc[near.sample()], key="ticket_near_dup_page")
+
+    with st.expander("🧭 Cleaning Plan (schema)"):
+        st.dataframe(plan.summary(), use_container_width=True)
+        st.caption(f"⏱️ {timings.summary()}")
+        st.dataframe(timings.table(), use_container_width=True)
+
     st.markdown("**Sample Cleaned Data:**")
     st.dataframe(df.head(), use_container_width=True)
 
@@ -171,20 +178,7 @@ def data_cleaning_ticket(df, uploaded_file):
     # ==============================
     st.subheader("🔍 Compare Raw Data vs Cleaned Data")
 
-    dtypes_raw = _dtype_table(raw_df_snapshot, "Raw dtypes")
-    dtypes_clean = _dtype_table(df, "Cleaned dtypes")
-
-    dtypes_raw["Column (standardized)"] = dtypes_raw["Column"].map(col_map)
-    dtypes_clean = dtypes_clean.rename(columns={"Column": "Column (standardized)"})
-
-    dtype_compare = dtypes_raw.merge(dtypes_clean, on="Column (standardized)", how="outer")
-    dtype_compare = dtype_compare.rename(columns={"Column": "Raw Column"})
-    dropped_mask = dtype_compare["Cleaned dtypes"].isna() & dtype_compare["Raw dtypes"].notna()
-    dtype_compare.loc[dropped_mask, "Cleaned dtypes"] = "dropped"
-    dtype_compare = dtype_compare[["Raw Column", "Column (standardized)", "Raw dtypes", "Cleaned dtypes"]].fillna("—")
-
-    st.markdown("**Data Types (Aligned by Standardized Name)**")
-    st.dataframe(dtype_compare, use_container_width=True)
+    render_diff(diff)
 
     st.markdown("**Sample – Raw Data**")
     st.dataframe(raw_df_snapshot.head(), use_container_width=True)
@@ -222,9 +216,9 @@ def data_cleaning_ticket(df, uploaded_file):
         # Use the in-memory snapshots you already have to avoid _UploadedShim issues
         if view_option == "Raw Data":
             st.markdown("### 🗃️ Raw Data (Full Table)")
-            st.dataframe(raw_df_snapshot, use_container_width=True)
+            paged_dataframe(raw_df_snapshot, key="ticket_raw_page")
         else:
             st.markdown("### 🧼 Cleaned Data (Full Table)")
-            st.dataframe(df, use_container_width=True)
+            paged_dataframe(df, key="ticket_clean_page")
 
     return df
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import numpy as np
+from cow_context import shared_view
 
 # --- Mesiniaga theme ---
 BLUE_TONES = [
@@ -40,7 +41,7 @@ def customer_satisfaction(df_filtered):
         if "feedback_score" in df_filtered.columns and "created_time" in df_filtered.columns:
 
             # Prep dates
-            df_local = df_filtered.copy()
+            df_local = shared_view(df_filtered)
             df_local["created_time"] = pd.to_datetime(df_local["created_time"], errors="coerce")
             df_local = df_local.dropna(subset=["created_time"])
             df_local["created_date"] = df_local["created_time"].dt.date
@@ -213,7 +214,7 @@ Why this matters: Variability drives unpredictability; compressing spread protec
     with st.expander("📌 Net Promoter Score (NPS)"):
         if "nps_category" in df_filtered.columns and "created_time" in df_filtered.columns:
 
-            dfn = df_filtered.copy()
+            dfn = shared_view(df_filtered)
             dfn["created_time"] = pd.to_datetime(dfn["created_time"], errors="coerce")
             dfn = dfn.dropna(subset=["created_time"])
             dfn["created_date"] = dfn["created_time"].dt.date
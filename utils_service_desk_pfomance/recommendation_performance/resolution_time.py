@@ -5,6 +5,9 @@ from datetime import datetime
 import numpy as np
 import plotly.graph_objects as go
 
+from utils_service_desk_pfomance.sla_engine import sla_aggregates
+from cow_context import shared_view
+
 # 🔹 Helper function to render CIO tables with 3 nested expanders
 def render_cio_tables(title, cio_data):
     st.subheader(title)
@@ -423,63 +426,22 @@ def resolution_time(df_filtered):
             else:
                 df_filtered["resolution_time_hours"] = pd.NA
 
-        # --- Prepare SLA reference values (minutes or hours) if available ---
-        # SLA response time (minutes)
-        sla_response_minutes = None
-        if "sla_response_time_minutes" in df_filtered.columns:
-            sla_response_minutes = pd.to_numeric(df_filtered["sla_response_time_minutes"], errors="coerce")
-        elif "sla_response_time" in df_filtered.columns:
-            col = df_filtered["sla_response_time"]
-            if pd.api.types.is_timedelta64_dtype(col):
-                sla_response_minutes = col.dt.total_seconds() / 60.0
-            else:
-                sla_response_minutes = pd.to_numeric(col, errors="coerce")
-        elif "sla_response_time_elapsed" in df_filtered.columns:
-            col = df_filtered["sla_response_time_elapsed"]
-            if pd.api.types.is_timedelta64_dtype(col):
-                sla_response_minutes = col.dt.total_seconds() / 60.0
-            else:
-                sla_response_minutes = pd.to_numeric(col, errors="coerce")
-
-        # SLA resolution time (hours)
-        sla_resolution_hours = None
-        if "sla_resolution_time_hours" in df_filtered.columns:
-            sla_resolution_hours = pd.to_numeric(df_filtered["sla_resolution_time_hours"], errors="coerce")
-        elif "sla_resolution_time" in df_filtered.columns:
-            col = df_filtered["sla_resolution_time"]
-            if pd.api.types.is_timedelta64_dtype(col):
-                sla_resolution_hours = col.dt.total_seconds() / 3600.0
-            else:
-                sla_resolution_hours = pd.to_numeric(col, errors="coerce")
-        elif "sla_resolution_time_elapsed" in df_filtered.columns:
-            col = df_filtered["sla_resolution_time_elapsed"]
-            if pd.api.types.is_timedelta64_dtype(col):
-                sla_resolution_hours = col.dt.total_seconds() / 3600.0
-            else:
-                sla_resolution_hours = pd.to_numeric(col, errors="coerce")
-
-        # --- Create sla_met if not present and we have reference + actuals ---
-        if not has_sla_met:
-            if "response_time_minutes" in df_filtered.columns and sla_response_minutes is not None:
-                df_filtered["sla_met"] = (pd.to_numeric(df_filtered["response_time_minutes"], errors="coerce") <= sla_response_minutes).astype(int)
-                has_sla_met = True
-            elif "resolution_time_hours" in df_filtered.columns and sla_resolution_hours is not None:
-                df_filtered["sla_met"] = (pd.to_numeric(df_filtered["resolution_time_hours"], errors="coerce") <= sla_resolution_hours).astype(int)
-                has_sla_met = True
-            else:
-                has_sla_met = "sla_met" in df_filtered.columns
+        # --- SLA compliance from the shared engine (supplied sla_met, else response/resolution vs SLA targets) ---
+        sla_agg = sla_aggregates(df_filtered)
+        has_sla_met = sla_agg.has_sla
+
+        # --- Working copy ---
+        df_sla = shared_view(df_filtered)
 
-        # --- Working copy & numeric safety ---
-        df_sla = df_filtered.copy()
-        if "sla_met" in df_sla.columns:
-            df_sla["sla_met"] = pd.to_numeric(df_sla["sla_met"], errors="coerce")
+        # Priority adherence, best → worst (standardized P-levels; other labels kept as-is)
+        sla_by_priority = (sla_agg.by_priority.loc[sla_agg.by_priority["known"] > 0, "rate"]
+                           .rename("sla_met").rename_axis("priority").reset_index()
+                           .sort_values("sla_met", ascending=False))
+        sla_by_priority["priority"] = sla_by_priority["priority"].astype(str)
 
                 # ---------- Graph A: Gauge + SLA Trend (fixed ordering) ----------
         if has_sla_met and "created_date" in df_sla.columns:
-            sla_trend = (
-                df_sla.groupby("created_date", dropna=True)["sla_met"]
-                .mean().reset_index().sort_values("created_date")
-            )
+            sla_trend = sla_agg.trend("D")[["created_date", "sla_met"]]
 
             # --- Compute robust metrics FIRST ---
             if not sla_trend.empty:
@@ -487,7 +449,7 @@ def resolution_time(df_filtered):
                 overall_sla_pct = float(sla_trend["sla_met"].mean() * 100)
                 first_sla_pct   = float(sla_trend["sla_met"].iloc[0] * 100)
                 pct_change      = ((latest_sla_pct - first_sla_pct) / max(first_sla_pct, 1e-9)) * 100
-                breaches_count  = int((pd.to_numeric(df_sla["sla_met"], errors="coerce") == 0).sum())
+                breaches_count  = sla_agg.breach_count
 
                 max_day_idx = sla_trend["sla_met"].idxmax()
                 min_day_idx = sla_trend["sla_met"].idxmin()
@@ -577,7 +539,6 @@ Why this matters: Adherence trend is the **heartbeat** of contractual performanc
 
         # ---------- Graph B: SLA by Priority (stacked/segmented) ----------
         if "priority" in df_sla.columns and has_sla_met:
-            sla_by_priority = df_sla.groupby("priority")["sla_met"].mean().reset_index().sort_values("sla_met", ascending=False)
             fig_bar_sla = px.bar(
                 sla_by_priority,
                 x="priority",
@@ -687,7 +648,7 @@ Why this matters: Adherence trend is the **heartbeat** of contractual performanc
         # ---------- CIO Tables (≥3 recs each; phased; detailed benefits; real values) ----------
         # Extract priority metrics if available for evidence/cost wording
         if "priority" in df_sla.columns and has_sla_met:
-            sla_by_priority_safe = df_sla.groupby("priority")["sla_met"].mean().reset_index().sort_values("sla_met", ascending=False)
+            sla_by_priority_safe = sla_by_priority
             if not sla_by_priority_safe.empty:
                 best = sla_by_priority_safe.iloc[0]
                 worst = sla_by_priority_safe.iloc[-1]
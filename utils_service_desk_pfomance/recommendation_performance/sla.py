@@ -3,6 +3,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from utils_service_desk_pfomance.sla_engine import PRIORITY_ORDER, sla_aggregates
+
 # ─────────────────────────────────────────────────────────────
 # Helper to render CIO tables with 3 nested expanders
 # ─────────────────────────────────────────────────────────────
@@ -15,37 +17,12 @@ def render_cio_tables(title, cio_data):
     with st.expander("Customer Satisfaction Improvement"):
         st.markdown(cio_data["satisfaction"], unsafe_allow_html=True)
 
-# ─────────────────────────────────────────────────────────────
-# Priority normalization + fixed order (align to your values)
-# ─────────────────────────────────────────────────────────────
-PRIORITY_ORDER = ["P1", "P2", "P3", "P5", "Service Request"]
-
-def normalize_priority(series: pd.Series) -> pd.Series:
-    s = series.astype(str).str.strip()
-
-    # Remove leading "Priority" text and normalize whitespace
-    s = (s.str.replace(r"^priority\s*", "", case=False, regex=True)
-           .str.replace(r"\s+", " ", regex=True))
-
-    # Standardize P-levels
-    s = s.str.upper()
-    s = s.str.replace(r"^P0$", "P1", regex=True)  # optional up-map
-    # NOTE: If you don't want to remap P4, comment out the next line
-    s = s.str.replace(r"^P4$", "P3", regex=True)
-
-    # Harmonize Service Request variants
-    s = s.str.replace(r"^(SR|SERVICE\s*REQ(?:UEST)?)$", "Service Request", case=False, regex=True)
-
-    # Only keep the target categories; others -> NaN (excluded downstream)
-    s = s.where(s.isin(PRIORITY_ORDER))
-
-    # Return as ordered categorical => stable, aligned plotting
-    return pd.Categorical(s, categories=PRIORITY_ORDER, ordered=True)
-
 # ─────────────────────────────────────────────────────────────
 # Main SLA section
 # ─────────────────────────────────────────────────────────────
 def sla(df_filtered: pd.DataFrame):
+    # Compliance for the whole selection, aggregated once and shared by every chart below
+    agg = sla_aggregates(df_filtered)
 
     # -------------------------------
     # Subtarget 6(a): SLA Performance Metrics
@@ -67,11 +44,8 @@ def sla(df_filtered: pd.DataFrame):
         avg_priority_pct = 0.0
 
         # --- Graph 1: Stacked Bar Chart (Weekly SLA % met vs breached)
-        if "created_time" in df_filtered.columns and "sla_met" in df_filtered.columns:
-            work = df_filtered.copy()
-            work["created_date"] = pd.to_datetime(work["created_time"], errors="coerce").dt.to_period("W").dt.start_time
-            sla_weekly = work.groupby("created_date", dropna=True)["sla_met"].mean().reset_index()
-            sla_weekly["breach"] = 1 - sla_weekly["sla_met"]
+        if "created_time" in df_filtered.columns and agg.has_sla:
+            sla_weekly = agg.trend("W")[["created_date", "sla_met", "breach"]]
 
             if not sla_weekly.empty:
                 avg_met_pct = float(sla_weekly["sla_met"].mean() * 100)
@@ -133,8 +107,8 @@ No weekly SLA rows are available in the current selection (average adherence **{
 """)
 
         # --- Graph 2: Gauge / KPI Widget for SLA Performance
-        if "sla_met" in df_filtered.columns:
-            overall_sla_pct = float(pd.to_numeric(df_filtered["sla_met"], errors="coerce").mean() * 100)
+        if agg.has_sla:
+            overall_sla_pct = float(agg.overall_rate * 100)
 
             fig = go.Figure(go.Indicator(
                 mode="gauge+number",
@@ -168,14 +142,12 @@ Overall, a high gauge value signals **predictable delivery**, while a low value
 """)
 
         # --- Graph 3: SLA by Priority/Category (aligned to P1,P2,P3,P5,Service Request)
-        if "priority" in df_filtered.columns and "sla_met" in df_filtered.columns:
-            dfp = df_filtered.copy()
-            dfp["priority_std"] = normalize_priority(dfp["priority"])
-
-            # Aggregate mean SLA by fixed buckets; keep empty buckets for visibility
-            priority_sla = (dfp.groupby("priority_std", observed=True)["sla_met"]
-                              .mean()
+        if "priority" in df_filtered.columns and agg.has_sla:
+            # Mean SLA by fixed buckets; keep empty buckets for visibility
+            priority_sla = (agg.by_priority["rate"]
                               .reindex(PRIORITY_ORDER)
+                              .rename("sla_met")
+                              .rename_axis("priority_std")
                               .reset_index())
 
             # % labels; show "–" if no data in that bucket
@@ -264,10 +236,8 @@ Overall, taller bars = **more targets met**; shorter bars = **risk pockets** nee
         # Determine breach availability up front and notify if none
         breach_count = None
         any_breach = None
-        if "sla_met" in df_filtered.columns:
-            sla_num = pd.to_numeric(df_filtered["sla_met"], errors="coerce")
-            breach_mask = sla_num.eq(0)
-            breach_count = int(breach_mask.sum())
+        if agg.has_sla:
+            breach_count = agg.breach_count
             any_breach = breach_count > 0
 
         if any_breach is False:
@@ -290,15 +260,8 @@ Overall, taller bars = **more targets met**; shorter bars = **risk pockets** nee
 
         # --- Graph 1: Pareto Chart of Breach Reasons
         if "breach_reason" in df_filtered.columns:
-            # Use only breached rows when computing Pareto
-            if "sla_met" in df_filtered.columns:
-                mask = pd.to_numeric(df_filtered["sla_met"], errors="coerce").eq(0)
-                data_for_pareto = df_filtered.loc[mask]
-            else:
-                data_for_pareto = df_filtered
-
-            breach_summary = data_for_pareto["breach_reason"].value_counts(dropna=True).reset_index()
-            breach_summary.columns = ["reason", "count"]
+            # Breached rows only (engine falls back to all rows when no SLA outcome is known)
+            breach_summary = agg.by_reason.copy()
             if not breach_summary.empty:
                 breach_summary["cum_pct"] = breach_summary["count"].cumsum() / breach_summary["count"].sum() * 100
                 top_reason = str(breach_summary.iloc[0]["reason"])
@@ -330,15 +293,10 @@ Overall, a steep cumulative curve confirms **few causes drive most breaches**.
 """)
 
         # --- Graph 2: Breaches by Priority (aligned to P1,P2,P3,P5,Service Request)
-        if "priority" in df_filtered.columns and "sla_met" in df_filtered.columns:
-            dfb = df_filtered.copy()
-            dfb["priority_std"] = normalize_priority(dfb["priority"])
-            sla_num = pd.to_numeric(dfb["sla_met"], errors="coerce")
-
-            breach_priority = (dfb[sla_num.eq(0)]
-                                .groupby("priority_std", observed=True)
-                                .size()
+        if "priority" in df_filtered.columns and agg.has_sla:
+            breach_priority = (agg.by_priority["breaches"]
                                 .reindex(PRIORITY_ORDER, fill_value=0)
+                                .rename_axis("priority_std")
                                 .reset_index(name="count"))
 
             fig = px.bar(
@@ -397,11 +355,9 @@ No breached tickets exist for the current filter—bars are empty.
 """)
 
         # --- Graph 3: Time Series of Breach Counts
-        if "created_time" in df_filtered.columns and "sla_met" in df_filtered.columns:
-            work2 = df_filtered.copy()
-            work2["created_date"] = pd.to_datetime(work2["created_time"], errors="coerce").dt.date
-            sla_num2 = pd.to_numeric(work2["sla_met"], errors="coerce")
-            breach_trend = work2[sla_num2.eq(0)].groupby("created_date").size().reset_index(name="breaches")
+        if "created_time" in df_filtered.columns and agg.has_sla:
+            breach_trend = agg.trend("D")
+            breach_trend = breach_trend.loc[breach_trend["breaches"] > 0, ["created_date", "breaches"]].reset_index(drop=True)
 
             fig = px.line(breach_trend, x="created_date", y="breaches", title="Time Series – Breach Counts")
             st.plotly_chart(fig, use_container_width=True)
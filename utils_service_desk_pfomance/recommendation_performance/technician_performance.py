@@ -5,6 +5,7 @@ from datetime import datetime
 import plotly.graph_objects as go
 from statsmodels.tsa.seasonal import seasonal_decompose
 import numpy as np
+from cow_context import shared_view
 
 # Mesiniaga theme
 MES_BLUE = ["#004C99", "#007ACC", "#3399FF", "#66B2FF", "#9BD1FF"]
@@ -290,7 +291,7 @@ def technician_performance(df_filtered):
                     break
 
             if metric_col and "technician" in df_filtered.columns:
-                tmp = df_filtered.copy()
+                tmp = shared_view(df_filtered)
                 # ✅ normalize to hours(float)
                 tmp[metric_col] = _to_hours(tmp[metric_col])
 
@@ -341,7 +342,7 @@ def technician_performance(df_filtered):
 
                 # Graph 3b: Trend line per technician (normalize first)
                 if "created_time" in df_filtered.columns:
-                    df_rt = df_filtered.copy()
+                    df_rt = shared_view(df_filtered)
                     df_rt[metric_col] = _to_hours(df_rt[metric_col])
 
                     df_rt["created_month"] = pd.to_datetime(
@@ -439,7 +440,7 @@ def technician_performance(df_filtered):
             resolution_col = "time_elapsed"
 
         if "technician" in df_filtered.columns and resolution_col is not None:
-            dfr = df_filtered.copy()
+            dfr = shared_view(df_filtered)
             # ✅ normalize to hours(float)
             dfr[resolution_col] = _to_hours(dfr[resolution_col])
 
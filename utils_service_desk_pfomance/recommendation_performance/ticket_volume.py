@@ -4,6 +4,8 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 
+from utils_service_desk_pfomance.backlog_engine import backlog_sweep, closure_column as closure_column_of
+
 # 🔹 Helper function to render CIO tables with 3 nested expanders
 def render_cio_tables(title, cio_data):
     st.subheader(title)
@@ -17,6 +19,8 @@ def render_cio_tables(title, cio_data):
 
 
 def ticket_volume(df_filtered):
+    # Open/close events sorted once; backlog and flow charts below query it
+    sweep = backlog_sweep(df_filtered)
 
     # ---------------------- 1a ----------------------
     with st.expander("📌 Number of Tickets Opened"): 
@@ -389,41 +393,13 @@ def ticket_volume(df_filtered):
         # --- New Graph: Closure vs Opening Rate ---
         # --- Closure vs Opening Rate Graph ---
         if {"request_status", "created_time"} <= set(df_filtered.columns):
-            df_rate = df_filtered.copy()
-
-            # Parse created_time
-            df_rate["created_time"] = pd.to_datetime(df_rate["created_time"], errors="coerce")
-
-            # ✅ Pick resolved_time if available, else fall back to completed_time
-            closure_column = None
-            if "resolved_time" in df_rate.columns:
-                closure_column = "resolved_time"
-            elif "completed_time" in df_rate.columns:
-                closure_column = "completed_time"
-
-            if closure_column:
-                df_rate[closure_column] = pd.to_datetime(df_rate[closure_column], errors="coerce")
-
-                # Opened = count by created_time
-                opened = (
-                    df_rate.groupby(df_rate["created_time"].dt.date)
-                    .size()
-                    .reset_index(name="opened")
-                    .rename(columns={"created_time": "date"})
-                )
+            # ✅ Closure = resolved_time if available, else completed_time
+            closure_column = closure_column_of(df_filtered)
 
-                # Closed = count by resolved_time/completed_time
-                closed = (
-                    df_rate.dropna(subset=[closure_column])
-                    .groupby(df_rate[closure_column].dt.date)
-                    .size()
-                    .reset_index(name="closed")
-                    .rename(columns={closure_column: "date"})
-                )
-
-                # ✅ Merge on the single unified "date"
-                rate = pd.merge(opened, closed, on="date", how="outer") \
-                        .fillna(0).sort_values("date")
+            if closure_column and not sweep.empty:
+                # Opened vs closed per day from the shared event sweep (days with any event)
+                rate = sweep.flow("D", active_only=True)[["date", "opened", "closed"]]
+                rate["date"] = rate["date"].dt.date
 
                 # Plot
                 fig2 = px.line(
@@ -469,6 +445,9 @@ def ticket_volume(df_filtered):
                 """)
 
 
+            elif closure_column:
+                st.info("No valid 'created_time' values after parsing; cannot compute opening vs closure rates.")
+                closure_vs_opening_available = False
             else:
                 st.warning("⚠️ No closure-related column ('resolved_time' or 'completed_time') found in dataset.")
                 closure_vs_opening_available = False
@@ -588,44 +567,13 @@ def ticket_volume(df_filtered):
     with st.expander("📌 Ticket Backlog (Unresolved Tickets)"):
 
         if {"created_time"} <= set(df_filtered.columns):
-            df_backlog = df_filtered.copy()
-
-            # Parse created_time
-            df_backlog["created_time"] = pd.to_datetime(df_backlog["created_time"], errors="coerce")
-
-            # ✅ Pick resolved_time if available, else fall back to completed_time
-            closure_column = None
-            if "resolved_time" in df_backlog.columns:
-                closure_column = "resolved_time"
-            elif "completed_time" in df_backlog.columns:
-                closure_column = "completed_time"
-
-            if closure_column:
-                df_backlog[closure_column] = pd.to_datetime(df_backlog[closure_column], errors="coerce")
-
-                # Opened = count by created_time
-                opened = (
-                    df_backlog.groupby(df_backlog["created_time"].dt.date)
-                    .size()
-                    .reset_index(name="opened")
-                    .rename(columns={"created_time": "date"})
-                )
-
-                # Closed = count by resolved_time/completed_time
-                closed = (
-                    df_backlog.dropna(subset=[closure_column])
-                    .groupby(df_backlog[closure_column].dt.date)
-                    .size()
-                    .reset_index(name="closed")
-                    .rename(columns={closure_column: "date"})
-                )
-
-                # ✅ Merge timeline
-                rate = pd.merge(opened, closed, on="date", how="outer") \
-                        .fillna(0).sort_values("date")
+            # ✅ Closure = resolved_time if available, else completed_time
+            closure_column = closure_column_of(df_filtered)
 
-                # --- Backlog Calculation ---
-                rate["backlog"] = (rate["opened"] - rate["closed"]).cumsum()
+            if closure_column and not sweep.empty:
+                # --- Backlog = open tickets at the end of each day (event sweep, no merge/cumsum) ---
+                rate = sweep.flow("D", active_only=True)[["date", "opened", "closed", "backlog"]]
+                rate["date"] = rate["date"].dt.date
 
                 # --- Graph: Backlog Trend ---
                 fig_backlog = px.line(
@@ -707,6 +655,8 @@ def ticket_volume(df_filtered):
 
 
 
+            elif closure_column:
+                st.info("No valid 'created_time' values after parsing; cannot compute the backlog trend.")
             else:
                 st.warning("⚠️ No closure-related column ('resolved_time' or 'completed_time') found in dataset.")
         else:
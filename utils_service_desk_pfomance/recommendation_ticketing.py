@@ -10,6 +10,8 @@ from utils_service_desk_pfomance.recommendation_performance.customer_satisfactio
 from utils_service_desk_pfomance.recommendation_performance.technician_performance import technician_performance
 from utils_service_desk_pfomance.recommendation_performance.incident_trends import incident_trends
 from utils_service_desk_pfomance.recommendation_performance.sla import sla
+from utils_service_desk_pfomance.sla_engine import sla_aggregates
+from date_range_filter import date_range_filter
 
 
 def recommendation_ticketing(df):
@@ -21,39 +23,10 @@ def recommendation_ticketing(df):
     KEY_END = "rec_end_date_picker"
     KEY_RESET = "rec_reset_button"
 
-    # ---- Build a working copy
-    df = df.copy()
-
-    # ---- Try to coerce created_time early so later code can rely on datetime
-    if "created_time" in df.columns:
-        df["created_time"] = pd.to_datetime(df["created_time"], errors="coerce")
-        df["created_date"] = df["created_time"].dt.date
-
-    # ---- Date filter UI
-    if "created_date" in df.columns and not df["created_date"].dropna().empty:
-        min_date = pd.Series(df["created_date"]).min()
-        max_date = pd.Series(df["created_date"]).max()
-
-        col1, col2 = st.columns(2)
-        with col1:
-            start_date = st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date, key=KEY_START)
-        with col2:
-            end_date = st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date, key=KEY_END)
-
-        st.markdown(f"🗓️ **Selected Range:** `{start_date.strftime('%d/%m/%Y')}` → `{end_date.strftime('%d/%m/%Y')}`")
-
-        reset_filter = st.button("🔁 Reset to Default", key=KEY_RESET)
-
-        if reset_filter:
-            df_filtered = df.copy()
-            st.info("Showing all available data (no date filter applied).")
-        elif start_date > end_date:
-            st.warning("⚠️ Start date is after end date. Please select a valid range.")
-            return
-        else:
-            df_filtered = df[(df["created_date"] >= start_date) & (df["created_date"] <= end_date)].copy()
-    else:
-        df_filtered = df.copy()
+    # ---- Date filter UI (sorted index + cached slices; created_time parsed once per dataset)
+    df_filtered = date_range_filter(df, start_key=KEY_START, end_key=KEY_END, reset_key=KEY_RESET)
+    if df_filtered is None:
+        return
 
     st.markdown("---")
 
@@ -146,15 +119,11 @@ def recommendation_ticketing(df):
             if not mh.empty:
                 peak_hour_str = str(int(mh.iloc[0]))
 
-    # SLA compliance if both columns exist & numeric
+    # SLA compliance from the shared engine (same aggregates the SLA section rendered)
     sla_str = "N/A"
-    if ("resolution_time" in df_filtered.columns) and ("sla_hours" in df_filtered.columns):
-        rt = pd.to_numeric(df_filtered["resolution_time"], errors="coerce")
-        sh = pd.to_numeric(df_filtered["sla_hours"], errors="coerce")
-        mask = pd.notna(rt) & pd.notna(sh)
-        if mask.any():
-            sla_comp = (rt[mask] <= sh[mask]).mean() * 100
-            sla_str = f"{sla_comp:.2f}%"
+    sla_agg = sla_aggregates(df_filtered)
+    if sla_agg.has_sla:
+        sla_str = f"{sla_agg.overall_rate * 100:.2f}%"
 
     dept_str = df_filtered["department"].nunique() if "department" in df_filtered.columns else "N/A"
     avg_res_for_summary = avg_res_str  # already computed safely above
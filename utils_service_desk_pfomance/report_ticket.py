@@ -54,6 +54,10 @@ from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle
 
+from utils_service_desk_pfomance.sla_engine import sla_aggregates
+from utils_service_desk_pfomance.backlog_engine import backlog_sweep
+from cow_context import shared_view
+
 # DOCX (optional)
 try:
     from docx import Document
@@ -1005,7 +1009,7 @@ def _capture_module(mod, fn_name: str, df: pd.DataFrame, section_title: str) ->
     try:
         setattr(mod, 'st', STShim())
         setattr(mod, 'render_cio_tables', capture_cio)
-        getattr(mod, fn_name)(df.copy())
+        getattr(mod, fn_name)(shared_view(df))
     finally:
         if orig_st is not None: setattr(mod, 'st', orig_st)
         if orig_render is not None: setattr(mod, 'render_cio_tables', orig_render)
@@ -1072,6 +1076,18 @@ def report_ticket(
             kpis["Open Tickets"] = f"{(df['request_status'].astype(str).str.lower()=='open').sum():,}"""
         except Exception:
             pass
+    try:
+        sweep = backlog_sweep(df)
+        if not sweep.empty and sweep.closed.size:
+            kpis[f"Open as of {sweep.end:%d/%m/%Y}"] = f"{sweep.open_as_of(sweep.end):,}"
+    except Exception:
+        pass
+    try:
+        sla_agg = sla_aggregates(df)
+        if sla_agg.has_sla:
+            kpis["SLA Adherence"] = f"{sla_agg.overall_rate * 100:.1f}%"
+    except Exception:
+        pass
     if "sla_breach" in df.columns:
         try:
             rate = (df["sla_breach"].astype(str).str.lower().isin(["1","true","yes"])).mean()*100
@@ -1081,7 +1097,7 @@ def report_ticket(
 
     appendices = {}
     if "created_time" in df.columns:
-        tmp = df.copy()
+        tmp = shared_view(df)
         tmp["created_time"] = pd.to_datetime(tmp["created_time"], errors="coerce")
         monthly = tmp.groupby(tmp["created_time"].dt.to_period("M")).size().reset_index(name="tickets")
         monthly["month"] = monthly["created_time"].astype(str)
@@ -0,0 +1,26 @@
+# utils_service_desk_pfomance/schema.py
+import numpy as np
+
+from schema_registry import ColumnSpec, DomainSchema, register
+
+# Service desk tickets: typed columns for data_cleaning_ticket (see schema_registry).
+# Flags are exported as true/false or yes/no; anything else stays missing.
+_FLAG = dict(true_values=frozenset({"true", "yes"}), false_values=frozenset({"false", "no"}), na=np.nan)
+
+SCHEMA = register(DomainSchema(
+    domain="ticket",
+    columns=(
+        ColumnSpec("created_time", "datetime", aliases=("created_date", "created_on"), dayfirst=True),
+        ColumnSpec("resolved_time", "datetime", aliases=("resolved_date", "resolved_on"), dayfirst=True),
+        ColumnSpec("sla_resolution_time", "timedelta"),
+        ColumnSpec("sla_response_time", "timedelta"),
+        ColumnSpec("on_hold_duration", "timedelta"),
+        ColumnSpec("response_time_elapsed", "timedelta"),
+        ColumnSpec("time_elapsed", "timedelta"),
+        ColumnSpec("fcr", "bool", aliases=("first_contact_resolution",), **_FLAG),
+        ColumnSpec("vip_user", "bool", aliases=("vip",), **_FLAG),
+        ColumnSpec("reopened", "bool", **_FLAG),
+        ColumnSpec("first_response_overdue_status", "bool", **_FLAG),
+        ColumnSpec("overdue_status", "bool", **_FLAG),
+    ),
+))
@@ -0,0 +1,276 @@
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+
+from cache_registry import cached
+
+# ─────────────────────────────────────────────────────────────
+# Priority normalization + fixed order (shared by every SLA view)
+# ─────────────────────────────────────────────────────────────
+PRIORITY_ORDER = ["P1", "P2", "P3", "P5", "Service Request"]
+
+# Per-ticket compliance codes (int8): 1 = met, 0 = breached, -1 = unknown
+SLA_MET, SLA_BREACHED, SLA_UNKNOWN = 1, 0, -1
+
+_FLAG_VOCAB = {
+    "true": 1, "yes": 1, "y": 1, "met": 1, "1": 1, "1.0": 1,
+    "false": 0, "no": 0, "n": 0, "breached": 0, "0": 0, "0.0": 0,
+}
+
+_COUNT_COLUMNS = [
+    "met", "known", "breaches",
+    "response_met", "response_known",
+    "resolution_met", "resolution_known",
+]
+
+
+def normalize_priority(series: pd.Series) -> pd.Series:
+    s = series.astype(str).str.strip()
+
+    # Remove leading "Priority" text and normalize whitespace
+    s = (s.str.replace(r"^priority\s*", "", case=False, regex=True)
+           .str.replace(r"\s+", " ", regex=True))
+
+    # Standardize P-levels
+    s = s.str.upper()
+    s = s.str.replace(r"^P0$", "P1", regex=True)  # optional up-map
+    # NOTE: If you don't want to remap P4, comment out the next line
+    s = s.str.replace(r"^P4$", "P3", regex=True)
+
+    # Harmonize Service Request variants
+    s = s.str.replace(r"^(SR|SERVICE\s*REQ(?:UEST)?)$", "Service Request", case=False, regex=True)
+
+    # Only keep the target categories; others -> NaN (excluded downstream)
+    s = s.where(s.isin(PRIORITY_ORDER))
+
+    # Return as ordered categorical => stable, aligned plotting
+    return pd.Categorical(s, categories=PRIORITY_ORDER, ordered=True)
+
+
+def _priority_key(series: pd.Series) -> pd.Series:
+    """Standardized bucket where one exists, otherwise the stripped raw label."""
+    std = pd.Series(normalize_priority(series), index=series.index).astype(object)
+    raw = series.where(series.notna()).astype("string").str.strip()
+    key = std.where(std.notna(), raw)
+    extras = sorted(set(key.dropna().astype(str)) - set(PRIORITY_ORDER))
+    return pd.Series(pd.Categorical(key, categories=PRIORITY_ORDER + extras), index=series.index)
+
+
+# =========================
+# Per-ticket compliance
+# =========================
+def _duration(df: pd.DataFrame, numeric_col: str, duration_cols, unit_seconds: float):
+    """Float duration (minutes/hours) from a numeric column or the first timedelta-like fallback."""
+    if numeric_col in df.columns:
+        return pd.to_numeric(df[numeric_col], errors="coerce")
+    for col in duration_cols:
+        if col in df.columns:
+            s = df[col]
+            if pd.api.types.is_timedelta64_dtype(s):
+                return s.dt.total_seconds() / unit_seconds
+            return pd.to_numeric(s, errors="coerce")
+    return None
+
+
+def _compare_state(actual, target, n: int) -> np.ndarray:
+    if actual is None or target is None:
+        return np.full(n, SLA_UNKNOWN, dtype=np.int8)
+    a = pd.Series(actual).to_numpy(dtype="float64", na_value=np.nan)
+    t = pd.Series(target).to_numpy(dtype="float64", na_value=np.nan)
+    state = np.where(a <= t, SLA_MET, SLA_BREACHED).astype(np.int8)
+    state[np.isnan(a) | np.isnan(t)] = SLA_UNKNOWN
+    return state
+
+
+def _flag_state(series: pd.Series) -> np.ndarray:
+    """Coerce a supplied met/breach flag (bool, 0/1, yes/no, ...) to int8 state codes."""
+    if pd.api.types.is_bool_dtype(series):
+        s = series.astype("boolean")
+        return np.where(s.isna(), SLA_UNKNOWN, s.fillna(False).astype(np.int8)).astype(np.int8)
+    if pd.api.types.is_numeric_dtype(series):
+        v = series.to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        mapped = series.astype("string").str.strip().str.lower().map(_FLAG_VOCAB)
+        numeric = pd.to_numeric(series, errors="coerce")
+        v = mapped.fillna(numeric).to_numpy(dtype="float64", na_value=np.nan)
+    state = np.where(v > 0, SLA_MET, SLA_BREACHED).astype(np.int8)
+    state[np.isnan(v)] = SLA_UNKNOWN
+    return state
+
+
+def sla_states(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-ticket SLA compliance as compact int8 codes (1 met, 0 breached, -1 unknown):
+      - response_sla_state:   response time vs sla_response_time
+      - resolution_sla_state: resolution time vs sla_resolution_time
+      - sla_state:            supplied `sla_met` if present, else response, else resolution
+    """
+    n = len(df)
+    response_minutes = _duration(df, "response_time_minutes", ["response_time_elapsed"], 60.0)
+    sla_response_minutes = _duration(
+        df, "sla_response_time_minutes", ["sla_response_time", "sla_response_time_elapsed"], 60.0
+    )
+    resolution_hours = _duration(df, "resolution_time_hours", ["resolution_time"], 3600.0)
+    sla_resolution_hours = _duration(
+        df, "sla_resolution_time_hours", ["sla_resolution_time", "sla_resolution_time_elapsed"], 3600.0
+    )
+
+    response = _compare_state(response_minutes, sla_response_minutes, n)
+    resolution = _compare_state(resolution_hours, sla_resolution_hours, n)
+
+    if "sla_met" in df.columns:
+        overall = _flag_state(df["sla_met"])
+    elif (response != SLA_UNKNOWN).any():
+        overall = response
+    else:
+        overall = resolution
+
+    return pd.DataFrame(
+        {
+            "sla_state": overall,
+            "response_sla_state": response,
+            "resolution_sla_state": resolution,
+        },
+        index=df.index,
+    )
+
+
+# =========================
+# Pre-aggregated compliance
+# =========================
+def _with_rates(counts: pd.DataFrame) -> pd.DataFrame:
+    out = counts.copy()
+    for prefix in ("", "response_", "resolution_"):
+        known = out[f"{prefix}known"]
+        out[f"{prefix}rate"] = (out[f"{prefix}met"] / known.where(known > 0)).astype("float64")
+    return out
+
+
+@dataclass
+class SlaAggregates:
+    """Compliance counts/rates by day, priority, category and breach reason for one selection."""
+    daily: pd.DataFrame
+    by_priority: pd.DataFrame
+    by_category: pd.DataFrame
+    by_reason: pd.DataFrame
+    totals: pd.Series
+
+    @property
+    def has_sla(self) -> bool:
+        return bool(self.totals["known"] > 0)
+
+    @property
+    def overall_rate(self) -> float:
+        return float(self.totals["rate"]) if self.has_sla else float("nan")
+
+    @property
+    def response_rate(self) -> float:
+        return float(self.totals["response_rate"])
+
+    @property
+    def resolution_rate(self) -> float:
+        return float(self.totals["resolution_rate"])
+
+    @property
+    def breach_count(self) -> int:
+        return int(self.totals["breaches"])
+
+    def trend(self, freq: str = "D") -> pd.DataFrame:
+        """
+        Daily ("D") or weekly ("W", week start) rows with at least one known SLA outcome:
+        columns created_date, sla_met (rate), breach (1 - rate), breaches (count).
+        """
+        counts = self.daily[_COUNT_COLUMNS]
+        if counts.empty:
+            return pd.DataFrame(columns=["created_date", "sla_met", "breach", "breaches"])
+        if freq == "W":
+            counts = counts.groupby(counts.index.to_period("W").start_time).sum()
+        counts = _with_rates(counts)
+        counts = counts[counts["known"] > 0]
+        out = pd.DataFrame({
+            "created_date": counts.index,
+            "sla_met": counts["rate"].to_numpy(),
+            "breach": 1 - counts["rate"].to_numpy(),
+            "breaches": counts["breaches"].to_numpy(),
+        })
+        if freq == "D":
+            out["created_date"] = pd.to_datetime(out["created_date"]).dt.date
+        return out
+
+
+def _engine_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Narrow frame of state codes + grouping keys; this is what the aggregate cache hashes."""
+    frame = sla_states(df)
+    if "created_time" in df.columns:
+        frame["created_date"] = pd.to_datetime(df["created_time"], errors="coerce").dt.normalize()
+    if "priority" in df.columns:
+        frame["priority_std"] = _priority_key(df["priority"])
+    if "category" in df.columns:
+        frame["category"] = df["category"].astype("category")
+    if "breach_reason" in df.columns:
+        frame["breach_reason"] = df["breach_reason"].astype("category")
+    return frame
+
+
+def _group_counts(counts: pd.DataFrame, key: pd.Series) -> pd.DataFrame:
+    return _with_rates(counts.groupby(key, observed=True, sort=True).sum())
+
+
+@cached
+def _build_aggregates(frame: pd.DataFrame) -> SlaAggregates:
+    sla = frame["sla_state"].to_numpy()
+    resp = frame["response_sla_state"].to_numpy()
+    res = frame["resolution_sla_state"].to_numpy()
+    counts = pd.DataFrame({
+        "met": (sla == SLA_MET).astype(np.int8),
+        "known": (sla != SLA_UNKNOWN).astype(np.int8),
+        "breaches": (sla == SLA_BREACHED).astype(np.int8),
+        "response_met": (resp == SLA_MET).astype(np.int8),
+        "response_known": (resp != SLA_UNKNOWN).astype(np.int8),
+        "resolution_met": (res == SLA_MET).astype(np.int8),
+        "resolution_known": (res != SLA_UNKNOWN).astype(np.int8),
+    }, index=frame.index)
+
+    empty = _with_rates(pd.DataFrame(columns=_COUNT_COLUMNS, dtype="int64"))
+    daily = _group_counts(counts, frame["created_date"]) if "created_date" in frame.columns else empty
+    daily.index.name = "created_date"
+
+    if "priority_std" in frame.columns:
+        by_priority = _group_counts(counts, frame["priority_std"])
+    else:
+        by_priority = empty.copy()
+    by_priority.index.name = "priority_std"
+
+    by_category = _group_counts(counts, frame["category"]) if "category" in frame.columns else empty.copy()
+    by_category.index.name = "category"
+
+    # Pareto input: breached rows only; all rows when no SLA outcome is known at all
+    if "breach_reason" in frame.columns:
+        reasons = frame["breach_reason"]
+        if (sla != SLA_UNKNOWN).any():
+            reasons = reasons[sla == SLA_BREACHED]
+        by_reason = reasons.value_counts(dropna=True).rename_axis("reason").reset_index(name="count")
+        by_reason = by_reason[by_reason["count"] > 0].reset_index(drop=True)
+        by_reason["reason"] = by_reason["reason"].astype(str)
+    else:
+        by_reason = pd.DataFrame(columns=["reason", "count"])
+
+    totals = _with_rates(counts.sum().to_frame().T).iloc[0]
+
+    return SlaAggregates(
+        daily=daily,
+        by_priority=by_priority,
+        by_category=by_category,
+        by_reason=by_reason,
+        totals=totals,
+    )
+
+
+@cached
+def sla_aggregates(df: pd.DataFrame) -> SlaAggregates:
+    """
+    Single entry point for every SLA chart, KPI and CIO table in the service desk domain. Cached per
+    (dataset scope, frame) so reruns skip the state derivation; the aggregates are also cached on the
+    narrow engine frame, so frames that differ only in unused columns share them.
+    """
+    return _build_aggregates(_engine_frame(df))
@@ -1,5 +1,9 @@
 import pandas as pd
 import streamlit as st
+from cleaning_executor import ExecutionReport
+from dimension_encoding import encode_dimensions
+from schema_registry import apply_schema
+from utils_sla.schema import SCHEMA
 
 def data_cleaning_sla(df, uploaded_file):
     st.success("✅ File successfully loaded!")
@@ -19,25 +23,16 @@ def data_cleaning_sla(df, uploaded_file):
     # --- Cleaning ---
     df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
 
-    # Convert dates
-    if "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-
-    # Normalize booleans
-    def _to_bool(x):
-        if pd.isna(x): return pd.NA
-        s = str(x).strip().lower()
-        if s in {"true","yes","y","1"}: return True
-        if s in {"false","no","n","0"}: return False
-        return pd.NA
-
-    for bcol in ["met","complaint"]:
-        if bcol in df.columns:
-            df[bcol] = df[bcol].map(_to_bool)
+    timings = ExecutionReport()   # per-column timings of the parallel cleaning steps
+    # Dates and booleans as declared in utils_sla/schema.py (plan cached per column layout)
+    df, plan = apply_schema(SCHEMA.domain, df, report=timings)
 
     # Drop too empty columns
     df = df.loc[:, df.isnull().mean() <= 0.5]
 
+    # --- Dimension columns -> categoricals ---
+    df = encode_dimensions(df, report=timings)
+
     # --- After Cleaning ---
     st.subheader("🧼 After Cleaning Overview")
     st.write(f"**Number of Rows:** {df.shape[0]}")
@@ -46,6 +41,11 @@ def data_cleaning_sla(df, uploaded_file):
     st.write(df.isnull().sum())
     st.dataframe(df.head())
 
+    with st.expander("🧭 Cleaning Plan (schema)"):
+        st.dataframe(plan.summary(), use_container_width=True)
+        st.caption(f"⏱️ {timings.summary()}")
+        st.dataframe(timings.table(), use_container_width=True)
+
     # --- Raw vs Cleaned ---
     st.subheader("🔍 Compare Full Raw vs Cleaned Data")
     view_option = st.radio("Select which data to view:", ("Raw Data", "Cleaned Data"), horizontal=True)
@@ -27,7 +27,7 @@ def service_impact(df):
             impact_weight = {"Low":1, "Medium":2, "High":3}
             dfx = df[df["met"] == False].copy()
             if _nonempty(dfx):
-                dfx["ImpactScore"] = dfx["impact"].map(impact_weight).fillna(0)
+                dfx["ImpactScore"] = dfx["impact"].astype(str).map(impact_weight).fillna(0)
                 svc_score = dfx.groupby("service")["ImpactScore"].sum().reset_index()
                 fig2 = px.bar(svc_score, x="service", y="ImpactScore",
                               color="ImpactScore", color_continuous_scale="Reds",
@@ -0,0 +1,12 @@
+# utils_sla/schema.py
+from schema_registry import ColumnSpec, DomainSchema, register
+
+# SLA compliance records: typed columns for data_cleaning_sla (see schema_registry)
+SCHEMA = register(DomainSchema(
+    domain="sla",
+    columns=(
+        ColumnSpec("date", "datetime", aliases=("sla_date", "report_date")),
+        ColumnSpec("met", "bool", aliases=("sla_met",)),
+        ColumnSpec("complaint", "bool", aliases=("customer_complaint",)),
+    ),
+))